@@ -0,0 +1,59 @@
+"""
+Time intersection and union alignment (io.adapters) of N symbols. Every
+symbol starts on its own date; for union alignment each also misses a random
+share of bars (ragged calendars), which would leave no common dates.
+
+    python benchmarks/bench_alignment.py --N 5000 --T 2500
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+
+def _histories(N: int, T: int, missing: float, seed: int = 0) -> dict:
+    from mrscore.io.history import History
+
+    rng = np.random.default_rng(seed)
+    calendar = np.datetime64("2010-01-01") + np.arange(T).astype("timedelta64[D]")
+    out = {}
+    for i in range(N):
+        start = int(rng.integers(0, T // 10))
+        keep = rng.random(T - start) >= missing
+        dates = calendar[start:][keep]
+        close = np.exp(np.cumsum(rng.normal(0.0, 0.01, size=dates.size)))
+        out[f"S{i}"] = History(symbol=f"S{i}", dates=dates, close=close)
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--N", type=int, default=5000)
+    parser.add_argument("--T", type=int, default=2500)
+    parser.add_argument("--missing", type=float, default=0.02)
+    args = parser.parse_args()
+
+    from mrscore.io.adapters import align_histories_intersection, align_histories_union
+    from mrscore.io.history import OHLC
+
+    full = _histories(args.N, args.T, 0.0)
+    ragged = _histories(args.N, args.T, args.missing)
+    symbols = list(full)
+    print(f"N={args.N} T={args.T} missing={args.missing}")
+
+    cases = [
+        ("intersection", lambda: align_histories_intersection(full, symbols=symbols, field=OHLC.CLOSE)),
+        ("union", lambda: align_histories_union(ragged, symbols=symbols, field=OHLC.CLOSE, fill="none")),
+        ("union+ffill", lambda: align_histories_union(ragged, symbols=symbols, field=OHLC.CLOSE, fill="ffill")),
+    ]
+    for name, fn in cases:
+        t0 = time.perf_counter()
+        panel = fn()
+        print(f"{name:>13}: {time.perf_counter() - t0:8.3f}s  shape={panel.values.shape}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""
+Time the rotation backtester on the top-B ratios of a synthetic panel:
+run_one() per ratio (reference loop) vs run_many() (one batched pass).
+
+    python benchmarks/bench_backtest.py --ratios 200 --bars 2500
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+
+def _config(store_equity_curve: bool):
+    from mrscore.config.models import RootConfig
+
+    return RootConfig.model_validate(
+        {
+            "config_version": 1,
+            "engine": {
+                "allow_overlapping_events": False,
+                "max_active_events": 1,
+                "freeze_mean_on_event": False,
+                "freeze_volatility_on_event": False,
+            },
+            "data": {
+                "price_field": "close",
+                "returns_mode": "log",
+                "min_bars_required": 60,
+                "tickers": ["TEST"],
+                "period": "1y",
+                "interval": "1d",
+            },
+            "mean_estimator": {"type": "rolling_sma", "params": {"window": 40}},
+            "volatility_estimator": {
+                "type": "ewma",
+                "params": {"span": 40, "min_periods": 20, "min_volatility": 0.0005, "volatility_unit": "returns"},
+            },
+            "deviation_detector": {"type": "zscore", "params": {"threshold": 1.5, "min_absolute_move": 0.0}},
+            "reversion_criteria": {"type": "soft_band", "params": {"z_tolerance": 0.4}},
+            "failure_criteria": {"type": "composite", "params": {"max_duration": 15, "max_zscore": 4.0}},
+            "scoring": {"by_direction": True, "by_volatility_bucket": False, "record_empty_scores": False},
+            "diagnostics": {"enabled": False},
+            "visualization": {"top_k": 5},
+            "ratio_universe": {"k_num": 3, "k_den": 3},
+            "backtest": {
+                "enabled": True,
+                "sizing": {"notional_per_trade": 10_000},
+                "costs": {"commission_bps": 0.5, "slippage_bps": 1.0},
+                "strategy": {"type": "ratio_mean_reversion", "params": {"signal_series": "log_ratio"}},
+                "output": {"store_equity_curve": store_equity_curve, "store_trades": True},
+            },
+        }
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ratios", type=int, default=200)
+    parser.add_argument("--bars", type=int, default=2500)
+    parser.add_argument("--symbols", type=int, default=40)
+    parser.add_argument("--no-equity-curve", action="store_true", help="skip building per-bar EquityPoints")
+    args = parser.parse_args()
+
+    from mrscore.app.composition_root import build_app
+    from mrscore.io.adapters import AlignedPanel
+    from mrscore.io.ratio import RatioSpec, build_equal_weight_basket
+
+    rng = np.random.default_rng(0)
+    T, N = args.bars, args.symbols
+    values = 50.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, size=(T, N)), axis=0))
+    panel = AlignedPanel(
+        dates=np.datetime64("2010-01-01") + np.arange(T).astype("timedelta64[D]"),
+        symbols=[f"S{i}" for i in range(N)],
+        values=values,
+    )
+    specs = []
+    for _ in range(args.ratios):
+        cols = rng.choice(N, size=6, replace=False)
+        specs.append(RatioSpec(build_equal_weight_basket(cols[:3]), build_equal_weight_basket(cols[3:])))
+    job_ids = [f"job{i}" for i in range(len(specs))]
+
+    backtester = build_app(_config(not args.no_equity_curve)).backtester
+    print(f"ratios={args.ratios} bars={T} symbols={N} equity_curve={not args.no_equity_curve}")
+
+    t0 = time.perf_counter()
+    loop = [backtester.run_one(panel=panel, ratio_spec=s, job_id=j) for s, j in zip(specs, job_ids)]
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = backtester.run_many(panel=panel, ratio_specs=specs, job_ids=job_ids)
+    t_batch = time.perf_counter() - t0
+
+    max_diff = max(abs(a.final_equity - b.final_equity) / b.final_equity for a, b in zip(batch, loop))
+    trades = sum(len(r.trades or []) for r in loop)
+    print(f"   run_one loop: {t_loop:8.3f}s  trades={trades}")
+    print(f"       run_many: {t_batch:8.3f}s  speedup={t_loop / t_batch:5.1f}x  max rel diff={max_diff:.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""
+Time MeanReversionEngine.run against run_event_driven on synthetic
+mean-reverting series, for a few thresholds and engine options.
+
+    python benchmarks/bench_event_driven.py --series 20 --bars 20000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+
+ENGINE_OPTIONS = {
+    "single": {},
+    "overlap3": {"allow_overlapping_events": True, "max_active_events": 3},
+    "freeze_mean": {"freeze_mean_on_event": True},
+    "freeze_both": {"freeze_mean_on_event": True, "freeze_volatility_on_event": True},
+}
+
+
+def _config(threshold: float, engine: dict):
+    from mrscore.config.models import RootConfig
+
+    return RootConfig.model_validate(
+        {
+            "config_version": 1,
+            "engine": {
+                "allow_overlapping_events": False,
+                "max_active_events": 1,
+                "freeze_mean_on_event": False,
+                "freeze_volatility_on_event": False,
+                **engine,
+            },
+            "data": {
+                "price_field": "close",
+                "returns_mode": "log",
+                "min_bars_required": 60,
+                "tickers": ["TEST"],
+                "period": "1y",
+                "interval": "1d",
+            },
+            "mean_estimator": {"type": "ema", "params": {"span": 20, "min_periods": 10}},
+            "volatility_estimator": {
+                "type": "ewma",
+                "params": {"span": 40, "min_periods": 20, "min_volatility": 0.0005, "volatility_unit": "returns"},
+            },
+            "deviation_detector": {"type": "zscore", "params": {"threshold": threshold, "min_absolute_move": 0.0}},
+            "reversion_criteria": {"type": "soft_band", "params": {"z_tolerance": 0.4}},
+            "failure_criteria": {"type": "composite", "params": {"max_duration": 15, "max_zscore": 4.0}},
+            "scoring": {"by_direction": True, "by_volatility_bucket": False, "record_empty_scores": False},
+            "diagnostics": {"enabled": False},
+            "visualization": {"top_k": 5},
+            "ratio_universe": {"k_num": 1, "k_den": 1},
+        }
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--series", type=int, default=20)
+    parser.add_argument("--bars", type=int, default=20_000)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[1.5, 2.0, 2.5])
+    args = parser.parse_args()
+
+    from mrscore.app.composition_root import build_app
+
+    rng = np.random.default_rng(0)
+    x = np.zeros((args.series, args.bars))
+    for t in range(1, args.bars):
+        x[:, t] = 0.95 * x[:, t - 1] + rng.normal(0.0, 0.01, size=args.series)
+    prices = np.exp(x)
+    returns = np.diff(x, axis=1)
+
+    print(f"B={args.series} T={args.bars}")
+    print(f"{'options':>12} {'threshold':>9} {'events/series':>13} {'run':>8} {'event-driven':>12} {'speedup':>8}")
+    for name, engine_opts in ENGINE_OPTIONS.items():
+        for threshold in args.thresholds:
+            engine = build_app(_config(threshold, engine_opts)).engine
+            timings = []
+            for fn in (engine.run, engine.run_event_driven):
+                t0 = time.perf_counter()
+                results = [fn(prices=prices[b], returns=returns[b]) for b in range(args.series)]
+                timings.append(time.perf_counter() - t0)
+                scores = np.array([r.score for r in results])
+                if fn == engine.run:
+                    ref, events = scores, np.mean([r.total_events for r in results])
+                elif not np.array_equal(scores, ref, equal_nan=True):
+                    raise SystemExit(f"{name} threshold={threshold}: scores differ from run()")
+            print(
+                f"{name:>12} {threshold:>9.2f} {events:>13.0f} {timings[0]:>7.2f}s {timings[1]:>11.2f}s "
+                f"{timings[0] / timings[1]:>7.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+"""
+Startup time of serving a ticker batch from the download cache: one
+compressed npz per ticker (legacy format) vs the single mmap history store
+(io.history_store).
+
+Each measurement runs in a fresh interpreter; the OS page cache is warm, so
+the numbers isolate open/decompress cost rather than disk reads.
+
+    python benchmarks/bench_history_cache.py --tickers 500 --bars 2500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+def _write_fixtures(root: Path, n_tickers: int, n_bars: int) -> None:
+    from mrscore.io.history import History
+    from mrscore.io.history_store import HistoryStore
+
+    rng = np.random.default_rng(0)
+    dates = np.arange(n_bars).astype("datetime64[D]")
+    histories = {}
+    for i in range(n_tickers):
+        close = np.exp(np.cumsum(rng.normal(0.0, 0.01, size=n_bars)))
+        h = History(symbol=f"S{i}", dates=dates, open=close, high=close * 1.01, low=close * 0.99, close=close)
+        histories[f"S{i}"] = h
+        np.savez_compressed(
+            root / f"S{i}.npz",
+            symbol=np.array([h.symbol]),
+            dates=h.dates,
+            open=h.open,
+            high=h.high,
+            low=h.low,
+            close=h.close,
+        )
+    HistoryStore(root / "histories.mrsh").put_many(histories)
+
+
+def _measure(root: Path, fmt: str, n_tickers: int) -> dict:
+    from mrscore.io.history_store import HistoryStore
+    from mrscore.io.yfinance_loader import _load_cached_history
+
+    keys = [f"S{i}" for i in range(n_tickers)]
+    t0 = time.perf_counter()
+    if fmt == "npz":
+        out = {key: _load_cached_history(root / f"{key}.npz") for key in keys}
+    else:
+        out = HistoryStore(root / "histories.mrsh").get_many(keys)
+    t_load = time.perf_counter() - t0
+    checksum = float(sum(h.close[-1] for h in out.values()))
+    t_touch = time.perf_counter() - t0
+    return {"format": fmt, "tickers": len(out), "load_s": round(t_load, 4), "load_and_read_s": round(t_touch, 4), "checksum": checksum}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=2500)
+    parser.add_argument("--measure", nargs=3, metavar=("ROOT", "FORMAT", "TICKERS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        root, fmt, n_tickers = args.measure
+        print(json.dumps(_measure(Path(root), fmt, int(n_tickers))))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_fixtures(root, args.tickers, args.bars)
+        print(f"tickers={args.tickers} bars={args.bars}")
+        for fmt in ("npz", "store"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--measure", str(root), fmt, str(args.tickers)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            print(out.strip().splitlines()[-1])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""
+Compare rescoring a tracked top-k after each new bar: a full engine.run per
+job over the extended series vs. one LiveRescorer.step.
+
+    python benchmarks/bench_live.py --symbols 14 --bars 1000 --top-k 50 --new-bars 20
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+
+def _config():
+    from mrscore.config.models import RootConfig
+
+    return RootConfig.model_validate(
+        {
+            "config_version": 1,
+            "engine": {
+                "allow_overlapping_events": False,
+                "max_active_events": 1,
+                "freeze_mean_on_event": False,
+                "freeze_volatility_on_event": False,
+            },
+            "data": {
+                "price_field": "close",
+                "returns_mode": "log",
+                "min_bars_required": 60,
+                "tickers": ["TEST"],
+                "period": "1y",
+                "interval": "1d",
+            },
+            "mean_estimator": {"type": "ema", "params": {"span": 20, "min_periods": 10}},
+            "volatility_estimator": {
+                "type": "ewma",
+                "params": {"span": 40, "min_periods": 20, "min_volatility": 0.0005, "volatility_unit": "returns"},
+            },
+            "deviation_detector": {"type": "zscore", "params": {"threshold": 2.0, "min_absolute_move": 0.0}},
+            "reversion_criteria": {"type": "soft_band", "params": {"z_tolerance": 0.4}},
+            "failure_criteria": {"type": "composite", "params": {"max_duration": 15, "max_zscore": 4.0}},
+            "scoring": {"by_direction": False, "by_volatility_bucket": False, "record_empty_scores": False},
+            "diagnostics": {"enabled": False},
+            "visualization": {"top_k": 5},
+            "ratio_universe": {"k_num": 2, "k_den": 2},
+        }
+    )
+
+
+def _panel(T: int, N: int, seed: int = 0):
+    from mrscore.io.adapters import AlignedPanel
+
+    rng = np.random.default_rng(seed)
+    return AlignedPanel(
+        dates=np.datetime64("2010-01-01") + np.arange(T).astype("timedelta64[D]"),
+        symbols=[f"S{i}" for i in range(N)],
+        values=50.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, size=(T, N)), axis=0)),
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=14)
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--new-bars", type=int, default=20)
+    args = parser.parse_args()
+
+    from mrscore.app.composition_root import build_app
+    from mrscore.app.live import LiveRescorer
+    from mrscore.app.scan import compute_returns_inplace
+    from mrscore.core.ratio_universe import AlignedPanel, RatioUniverse
+
+    logging.disable(logging.INFO)
+    config = _config()
+    engine = build_app(config).engine
+    T0 = args.bars - args.new_bars
+    panel = _panel(args.bars, args.symbols)
+    head = RatioUniverse(AlignedPanel(dates=panel.dates[:T0], symbols=panel.symbols, values=panel.values[:T0]))
+    jobs = list(head.iter_ratio_jobs(k_num=2, k_den=2, max_jobs=args.top_k))
+
+    t0 = time.perf_counter()
+    live = LiveRescorer.track(head, engine, jobs, returns_mode="log", vol_unit="returns")
+    track_time = time.perf_counter() - t0
+
+    full_time = 0.0
+    step_time = 0.0
+    for T in range(T0 + 1, args.bars + 1):
+        t0 = time.perf_counter()
+        live.step(panel.values[T - 1], panel.dates[T - 1])
+        live_scores = [r.score for r in live.results()]
+        step_time += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        ru = RatioUniverse(AlignedPanel(dates=panel.dates[:T], symbols=panel.symbols, values=panel.values[:T]))
+        full_scores = []
+        for job in jobs:
+            prices = ru.compute_ratio_series(job)
+            returns = np.empty(T - 1)
+            compute_returns_inplace(prices=prices, returns_out=returns, tmp_out=np.empty(T - 1), mode="log")
+            full_scores.append(engine.run(prices=prices, returns=returns).score)
+        full_time += time.perf_counter() - t0
+        assert np.array_equal(live_scores, full_scores, equal_nan=True)
+
+    n = args.new_bars
+    print(f"N={args.symbols} T={args.bars} jobs={len(jobs)} new_bars={n} (scores identical)")
+    print(f"{'track (once)':>14} {track_time * 1e3:>9.2f} ms")
+    print(f"{'full rescore':>14} {full_time / n * 1e3:>9.2f} ms/bar")
+    print(f"{'live step':>14} {step_time / n * 1e3:>9.2f} ms/bar  {full_time / step_time:>6.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
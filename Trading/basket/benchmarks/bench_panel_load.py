@@ -0,0 +1,102 @@
+"""
+Startup time and peak RSS of loading a price panel: compressed panel.npz
+vs the memory-mapped panel directory (io.panel_store).
+
+Each measurement runs in a fresh interpreter so ru_maxrss is not shared.
+
+    python benchmarks/bench_panel_load.py --T 20000 --N 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+def _write_fixtures(root: Path, T: int, N: int) -> None:
+    from mrscore.io.adapters import AlignedPanel
+    from mrscore.io.panel_store import write_mmap_panel
+
+    rng = np.random.default_rng(0)
+    values = np.exp(np.cumsum(rng.normal(0.0, 0.01, size=(T, N)), axis=0))
+    dates = np.arange(T).astype("datetime64[m]")
+    symbols = [f"S{i}" for i in range(N)]
+    np.savez_compressed(root / "panel.npz", dates=dates, symbols=np.asarray(symbols), values=values)
+    write_mmap_panel(root / "mmap", AlignedPanel(dates=dates, symbols=symbols, values=values))
+
+
+def _measure(root: Path, fmt: str, normalize: bool) -> dict:
+    from mrscore.core.ratio_universe import RatioJob, RatioUniverse
+    from mrscore.io.adapters import AlignedPanel
+    from mrscore.io.panel_store import open_mmap_panel
+
+    t0 = time.perf_counter()
+    if fmt == "npz":
+        with np.load(root / "panel.npz", allow_pickle=False) as data:
+            panel = AlignedPanel(dates=data["dates"], symbols=[str(s) for s in data["symbols"]], values=data["values"])
+    else:
+        panel = open_mmap_panel(root / "mmap")
+    t_load = time.perf_counter() - t0
+
+    ru = RatioUniverse(panel, normalize_by_first=normalize)
+    t_universe = time.perf_counter() - t0
+    ru.compute_ratio_series(RatioJob(k_num=1, k_den=1, num_id=0, den_id=1))
+    t_first_ratio = time.perf_counter() - t0
+
+    return {
+        "format": fmt,
+        "normalize_by_first": normalize,
+        "load_s": round(t_load, 4),
+        "universe_s": round(t_universe, 4),
+        "first_ratio_s": round(t_first_ratio, 4),
+        "peak_rss_mb": _status_mb("VmHWM"),
+        "anon_rss_mb": _status_mb("RssAnon"),
+    }
+
+
+def _status_mb(field: str) -> float:
+    # Linux /proc/self/status. Resident mmap pages are file-backed and can be
+    # dropped by the kernel; RssAnon is the memory a panel load really pins.
+    with open("/proc/self/status", encoding="ascii") as fh:
+        for line in fh:
+            if line.startswith(field + ":"):
+                return round(int(line.split()[1]) / 1024.0, 1)
+    return float("nan")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--T", type=int, default=20000)
+    parser.add_argument("--N", type=int, default=2000)
+    parser.add_argument("--measure", nargs=3, metavar=("ROOT", "FORMAT", "NORMALIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        root, fmt, normalize = args.measure
+        print(json.dumps(_measure(Path(root), fmt, normalize == "1")))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_fixtures(root, args.T, args.N)
+        print(f"panel T={args.T} N={args.N} ({args.T * args.N * 8 / 2**20:.0f} MB float64)")
+        for normalize in ("0", "1"):
+            for fmt in ("npz", "mmap"):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--measure", str(root), fmt, normalize],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                print(out.strip().splitlines()[-1])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
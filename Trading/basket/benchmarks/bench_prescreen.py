@@ -0,0 +1,125 @@
+"""
+Compare a full ratio-universe scan against two-stage scans that only send
+the best fraction of each block (by a cheap statistic) to the engine, and
+report the recall of the full scan's top-k.
+
+    python benchmarks/bench_prescreen.py --symbols 14 --bars 1000 --top-k 20
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+
+def _config():
+    from mrscore.config.models import RootConfig
+
+    return RootConfig.model_validate(
+        {
+            "config_version": 1,
+            "engine": {
+                "allow_overlapping_events": False,
+                "max_active_events": 1,
+                "freeze_mean_on_event": False,
+                "freeze_volatility_on_event": False,
+                "batch_size": 256,
+            },
+            "data": {
+                "price_field": "close",
+                "returns_mode": "log",
+                "min_bars_required": 60,
+                "tickers": ["TEST"],
+                "period": "1y",
+                "interval": "1d",
+            },
+            "mean_estimator": {"type": "ema", "params": {"span": 20, "min_periods": 10}},
+            "volatility_estimator": {
+                "type": "ewma",
+                "params": {"span": 40, "min_periods": 20, "min_volatility": 0.0005, "volatility_unit": "returns"},
+            },
+            "deviation_detector": {"type": "zscore", "params": {"threshold": 2.0, "min_absolute_move": 0.0}},
+            "reversion_criteria": {"type": "soft_band", "params": {"z_tolerance": 0.4}},
+            "failure_criteria": {"type": "composite", "params": {"max_duration": 15, "max_zscore": 4.0}},
+            "scoring": {"by_direction": False, "by_volatility_bucket": False, "record_empty_scores": False},
+            "diagnostics": {"enabled": False},
+            "visualization": {"top_k": 5},
+            "ratio_universe": {"k_num": 2, "k_den": 2},
+        }
+    )
+
+
+def _panel(T: int, N: int, seed: int = 0):
+    """Symbols share a random-walk factor; a third of them also trend, the rest revert around it."""
+    from mrscore.io.adapters import AlignedPanel
+
+    rng = np.random.default_rng(seed)
+    common = np.cumsum(rng.normal(0.0, 0.01, size=T))
+    phi = np.where(np.arange(N) % 3 == 0, 1.0, rng.uniform(0.8, 0.99, size=N))
+    x = np.zeros((T, N))
+    for t in range(1, T):
+        x[t] = phi * x[t - 1] + rng.normal(0.0, 0.01, size=N)
+    return AlignedPanel(
+        dates=np.datetime64("2010-01-01") + np.arange(T).astype("timedelta64[D]"),
+        symbols=[f"S{i}" for i in range(N)],
+        values=50.0 * np.exp(common[:, None] + x),
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=14)
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--block", type=int, default=None, help="jobs per pre-screen block (default: sized to batch_size)")
+    parser.add_argument("--fractions", type=float, nargs="+", default=[0.5, 0.25, 0.1])
+    args = parser.parse_args()
+
+    from mrscore.app.composition_root import build_app
+    from mrscore.app.scan import PruneStats, score_ratio_jobs
+    from mrscore.core.prescreen import PRESCREEN_METRICS, RatioPrescreen
+    from mrscore.core.ranking import TopKRanker
+    from mrscore.core.ratio_universe import RatioUniverse
+
+    logging.disable(logging.INFO)
+    config = _config()
+    engine = build_app(config).engine
+    ru = RatioUniverse(_panel(args.bars, args.symbols))
+    k = config.ratio_universe.k_num
+
+    def scan(prescreen):
+        ranker, pruned = TopKRanker(args.top_k), PruneStats()
+        t0 = time.perf_counter()
+        score_ratio_jobs(
+            ru=ru,
+            engine=engine,
+            jobs=ru.job_table(k_num=k, k_den=k),
+            ranker=ranker,
+            returns_mode="log",
+            vol_unit="returns",
+            batch_size=config.engine.batch_size,
+            prune_stats=pruned,
+            prescreen=prescreen,
+        )
+        return time.perf_counter() - t0, {r.job for r in ranker.items_sorted()}, pruned.screened
+
+    full_time, full_top, _ = scan(None)
+    jobs = len(ru.job_table(k_num=k, k_den=k))
+    print(f"N={args.symbols} T={args.bars} k={k} jobs={jobs} top_k={args.top_k} block={args.block or 'auto'}")
+    print(f"{'metric':>15} {'fraction':>8} {'scored':>8} {'time':>8} {'speedup':>8} {'recall':>7}")
+    print(f"{'full':>15} {1.0:>8.2f} {jobs:>8d} {full_time:>7.2f}s {1.0:>7.1f}x {1.0:>7.2f}")
+    for metric in PRESCREEN_METRICS:
+        for fraction in args.fractions:
+            seconds, top, screened = scan(RatioPrescreen(fraction, metric=metric, block=args.block))
+            recall = len(top & full_top) / len(full_top)
+            print(
+                f"{metric:>15} {fraction:>8.2f} {jobs - screened:>8d} {seconds:>7.2f}s "
+                f"{full_time / seconds:>7.1f}x {recall:>7.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""
+Time a parameter sweep (app.sweep.run_sweep) against re-running the batch
+engine once per grid point, on synthetic mean-reverting ratio series.
+
+    python benchmarks/bench_sweep.py --series 300 --bars 1000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+
+GRID = {
+    "mean_estimator.params.span": [10, 20, 40],
+    "deviation_detector.params.threshold": [1.0, 1.5, 2.0, 2.5],
+    "reversion_criteria.params.z_tolerance": [0.25, 0.5, 0.75],
+    "failure_criteria.params.max_duration": [10, 20, 40],
+}
+
+
+def _config():
+    from mrscore.config.models import RootConfig
+
+    return RootConfig.model_validate(
+        {
+            "config_version": 1,
+            "engine": {
+                "allow_overlapping_events": False,
+                "max_active_events": 1,
+                "freeze_mean_on_event": False,
+                "freeze_volatility_on_event": False,
+            },
+            "data": {
+                "price_field": "close",
+                "returns_mode": "log",
+                "min_bars_required": 60,
+                "tickers": ["TEST"],
+                "period": "1y",
+                "interval": "1d",
+            },
+            "mean_estimator": {"type": "ema", "params": {"span": 20, "min_periods": 10}},
+            "volatility_estimator": {
+                "type": "ewma",
+                "params": {"span": 40, "min_periods": 20, "min_volatility": 0.0005, "volatility_unit": "returns"},
+            },
+            "deviation_detector": {"type": "zscore", "params": {"threshold": 1.5, "min_absolute_move": 0.0}},
+            "reversion_criteria": {"type": "soft_band", "params": {"z_tolerance": 0.4}},
+            "failure_criteria": {"type": "composite", "params": {"max_duration": 15, "max_zscore": 4.0}},
+            "scoring": {"by_direction": False, "by_volatility_bucket": False, "record_empty_scores": False},
+            "diagnostics": {"enabled": False},
+            "visualization": {"top_k": 5},
+            "ratio_universe": {"k_num": 1, "k_den": 1},
+        }
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--series", type=int, default=300)
+    parser.add_argument("--bars", type=int, default=1000)
+    args = parser.parse_args()
+
+    from mrscore.app.composition_root import build_app
+    from mrscore.app.sweep import expand_grid, run_sweep
+
+    rng = np.random.default_rng(0)
+    x = np.zeros((args.series, args.bars))
+    for t in range(1, args.bars):
+        x[:, t] = 0.95 * x[:, t - 1] + rng.normal(0.0, 0.01, size=args.series)
+    prices = np.exp(x)
+    returns = np.log(prices[:, 1:]) - np.log(prices[:, :-1])
+
+    base = _config()
+    points = expand_grid(base, GRID)
+    print(f"series={args.series} bars={args.bars} points={len(points)}")
+
+    t0 = time.perf_counter()
+    reference = np.array(
+        [[r.score for r in build_app(p.config).engine.run_batch(prices=prices, returns=returns)] for p in points]
+    )
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = run_sweep(base_config=base, grid=GRID, prices=prices)
+    t_sweep = time.perf_counter() - t0
+
+    same = np.array_equal(result.scores, reference, equal_nan=True)
+    print(f"run_batch per point: {t_ref:8.3f}s")
+    print(f"          run_sweep: {t_sweep:8.3f}s  speedup={t_ref / t_sweep:5.1f}x  identical={same}")
+    print("           stages: " + "  ".join(f"{k}={v:.2f}s" for k, v in result.timings.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+"""
+Time full-series estimator paths: repeated update() on one long series, the
+batch twin over B series, and the bulk transform() on both.
+
+    python benchmarks/bench_transform.py --bars 100000 --series 200
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+
+def _estimators():
+    from mrscore.components.mean import EMA, KalmanMean, RollingSMA
+    from mrscore.components.volatility import EWMAVol, GARCH11Vol, RollingStd
+
+    return {
+        "rolling_sma": (RollingSMA(window=20), "prices"),
+        "ema": (EMA(span=20, min_periods=5), "prices"),
+        "kalman_mean": (KalmanMean(process_var=1e-3, obs_var=0.05, init_mean=1.0, init_var=1.0), "prices"),
+        "rolling_std": (RollingStd(window=20, min_periods=5, ddof=1, min_volatility=0.0005), "returns"),
+        "ewma": (EWMAVol(span=20, min_periods=5, min_volatility=0.0005), "returns"),
+        "garch11": (GARCH11Vol(omega=1e-6, alpha=0.08, beta=0.9, min_volatility=0.0005), "returns"),
+    }
+
+
+def _timed(fn) -> tuple[float, np.ndarray]:
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=100_000)
+    parser.add_argument("--series", type=int, default=200)
+    parser.add_argument("--block-bars", type=int, default=2500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    long_p = np.exp(np.cumsum(rng.normal(0.0, 0.01, size=args.bars)))
+    block_p = np.exp(np.cumsum(rng.normal(0.0, 0.01, size=(args.series, args.block_bars)), axis=1))
+    data = {
+        "prices": (long_p, block_p),
+        "returns": (np.diff(np.log(long_p)), np.diff(np.log(block_p), axis=1)),
+    }
+    print(f"long series: T={args.bars}; block: B={args.series} T={args.block_bars}")
+    print(f"{'estimator':>12} {'update loop':>12} {'transform':>10} {'batch twin':>11} {'transform':>10} {'max rel diff':>13}")
+
+    for name, (est, kind) in _estimators().items():
+        series, block = data[kind]
+
+        def loop():
+            est.reset()
+            return np.array([est.update(float(x)) for x in series])
+
+        def batch():
+            twin = est.batch(block.shape[0])
+            twin.reset()
+            out = np.empty_like(block)
+            for t in range(block.shape[1]):
+                out[:, t] = twin.update(block[:, t])
+            return out
+
+        t_loop, ref = _timed(loop)
+        t_tr, out = _timed(lambda: est.transform(series))
+        t_batch, ref_b = _timed(batch)
+        t_tr_b, out_b = _timed(lambda: est.transform(block))
+        diff = max(np.max(np.abs(out - ref) / np.abs(ref)), np.max(np.abs(out_b - ref_b) / np.abs(ref_b)))
+        print(f"{name:>12} {t_loop:11.3f}s {t_tr:9.4f}s {t_batch:10.3f}s {t_tr_b:9.4f}s {diff:13.1e}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,404 @@
+"""
+Throughput and memory suite for the mrscore hot paths, tracked against a
+checked-in baseline (benchmarks/baseline.json).
+
+Every case runs in a fresh process, so peak RSS is per case. Each case
+reports the best wall time over --repeat runs (after one warm-up run),
+jobs/s and bars/s from that time, the process peak RSS, and the
+tracemalloc peak of one extra traced run divided by its job count
+(alloc KiB/job: grows when per-job buffers stop being reused or results
+are retained), and the garbage collections triggered per 1000 jobs
+(gc/kjob: grows with the number of container objects held per job).
+
+    python benchmarks/suite.py                  # run all cases, diff against the baseline
+    python benchmarks/suite.py --filter engine  # cases whose id contains "engine"
+    python benchmarks/suite.py --check          # exit 1 when a case regressed past --tolerance
+    python benchmarks/suite.py --save           # write the results as the new baseline
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+# A case's setup returns (run, jobs, bars): run() does the work once, jobs and
+# bars count what one run processes (bars is None where it has no meaning).
+Setup = Callable[..., Tuple[Callable[[], object], int, Optional[int]]]
+
+
+def _config(**engine):
+    from mrscore.config.models import RootConfig
+
+    return RootConfig.model_validate(
+        {
+            "config_version": 1,
+            "engine": {
+                "allow_overlapping_events": False,
+                "max_active_events": 1,
+                "freeze_mean_on_event": False,
+                "freeze_volatility_on_event": False,
+                **engine,
+            },
+            "data": {
+                "price_field": "close",
+                "returns_mode": "log",
+                "min_bars_required": 60,
+                "tickers": ["TEST"],
+                "period": "1y",
+                "interval": "1d",
+            },
+            "mean_estimator": {"type": "ema", "params": {"span": 20, "min_periods": 10}},
+            "volatility_estimator": {
+                "type": "ewma",
+                "params": {"span": 40, "min_periods": 20, "min_volatility": 0.0005, "volatility_unit": "returns"},
+            },
+            "deviation_detector": {"type": "zscore", "params": {"threshold": 1.5, "min_absolute_move": 0.0}},
+            "reversion_criteria": {"type": "soft_band", "params": {"z_tolerance": 0.4}},
+            "failure_criteria": {"type": "composite", "params": {"max_duration": 15, "max_zscore": 4.0}},
+            "scoring": {"by_direction": True, "by_volatility_bucket": True, "volatility_buckets": 3, "record_empty_scores": False},
+            "diagnostics": {"enabled": False},
+            "visualization": {"top_k": 10},
+            "ratio_universe": {"k_num": 2, "k_den": 2},
+            "backtest": {
+                "enabled": True,
+                "sizing": {"notional_per_trade": 10_000},
+                "costs": {"commission_bps": 0.5, "slippage_bps": 1.0},
+                "strategy": {"type": "ratio_mean_reversion", "params": {"signal_series": "log_ratio"}},
+                "output": {"store_equity_curve": False, "store_trades": True},
+            },
+        }
+    )
+
+
+def _panel(T: int, N: int, seed: int = 0):
+    from mrscore.io.adapters import AlignedPanel
+
+    rng = np.random.default_rng(seed)
+    common = np.cumsum(rng.normal(0.0, 0.01, size=T))
+    x = np.zeros((T, N))
+    for t in range(1, T):
+        x[t] = 0.97 * x[t - 1] + rng.normal(0.0, 0.01, size=N)
+    return AlignedPanel(
+        dates=np.datetime64("2010-01-01") + np.arange(T).astype("timedelta64[D]"),
+        symbols=[f"S{i}" for i in range(N)],
+        values=50.0 * np.exp(common[:, None] + x),
+    )
+
+
+def _series(B: int, T: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    x = np.zeros((B, T))
+    for t in range(1, T):
+        x[:, t] = 0.95 * x[:, t - 1] + rng.normal(0.0, 0.01, size=B)
+    return np.exp(x), np.diff(x, axis=1)
+
+
+# ----------------------------
+# Cases
+# ----------------------------
+def setup_scan(*, T: int, N: int, k: int):
+    """RatioUniverse.scan: basket ratio series for every (k, k) job, no scoring."""
+    from mrscore.core.ratio_universe import RatioUniverse
+
+    ru = RatioUniverse(_panel(T, N))
+    jobs = ru.scan(k_num=k, k_den=k, process=lambda job, series: True, disallow_overlap=True)
+    return (lambda: ru.scan(k_num=k, k_den=k, process=lambda job, series: True, disallow_overlap=True)), jobs, jobs * T
+
+
+def setup_scan_score(
+    *,
+    T: int,
+    N: int,
+    k: int,
+    batch_size: Optional[int] = None,
+    event_driven: bool = False,
+    prescreen: Optional[float] = None,
+):
+    """
+    score_ratio_jobs: ratio series + engine + top-k ranker, the universe scan
+    inner loop. jobs counts every job considered, including pre-screened ones.
+    """
+    from mrscore.app.composition_root import build_app
+    from mrscore.app.scan import score_ratio_jobs
+    from mrscore.core.prescreen import RatioPrescreen
+    from mrscore.core.ranking import TopKRanker
+    from mrscore.core.ratio_universe import RatioUniverse
+
+    config = _config(batch_size=batch_size, event_driven=event_driven)
+    engine = build_app(config).engine
+    ru = RatioUniverse(_panel(T, N))
+
+    def run():
+        return score_ratio_jobs(
+            ru=ru,
+            engine=engine,
+            jobs=ru.iter_ratio_jobs(k_num=k, k_den=k, disallow_overlap=True),
+            ranker=TopKRanker(10),
+            returns_mode="log",
+            vol_unit="returns",
+            batch_size=batch_size,
+            prescreen=RatioPrescreen(prescreen) if prescreen is not None else None,
+        )
+
+    jobs = sum(1 for _ in ru.iter_ratio_jobs(k_num=k, k_den=k, disallow_overlap=True))
+    return run, jobs, jobs * T
+
+
+def setup_engine(*, B: int, T: int, mode: str, max_active: int = 1):
+    """
+    MeanReversionEngine on B independent series: run, run_event_driven or one
+    run_batch call; max_active > 1 allows that many overlapping events.
+    """
+    from mrscore.app.composition_root import build_app
+
+    engine = build_app(_config(allow_overlapping_events=max_active > 1, max_active_events=max_active)).engine
+    prices, returns = _series(B, T)
+    if mode == "batch":
+        return (lambda: engine.run_batch(prices=prices, returns=returns)), B, B * T
+    fn = engine.run if mode == "run" else engine.run_event_driven
+    return (lambda: [fn(prices=prices[b], returns=returns[b]) for b in range(B)]), B, B * T
+
+
+def setup_score_events(*, jobs: int, events: int, table: bool = False):
+    """
+    score_events on prebuilt EventSummary lists, or with table=True on the
+    equivalent EventTables the engine produces (direction + volatility-bucket
+    breakdowns).
+    """
+    from mrscore.core.results import Direction, EventStatus, EventSummary, EventTable
+    from mrscore.core.scoring import score_events
+
+    config = _config()
+    rng = np.random.default_rng(0)
+    statuses = list(EventStatus)
+    lists = []
+    for _ in range(jobs):
+        lists.append(
+            [
+                EventSummary(
+                    direction=Direction.UP if rng.random() < 0.5 else Direction.DOWN,
+                    status=statuses[int(rng.integers(0, 3))],
+                    start_index=i,
+                    end_index=i + 5,
+                    duration=5,
+                    start_price=1.0,
+                    start_mean=1.0,
+                    start_volatility=float(rng.uniform(0.005, 0.02)),
+                    start_zscore=2.0,
+                    max_abs_zscore=2.5,
+                    end_price=1.0,
+                )
+                for i in range(events)
+            ]
+        )
+
+    if table:
+        lists = [EventTable.from_summaries(ev) for ev in lists]
+
+    def run():
+        return [score_events(events=ev, scoring=config.scoring, diagnostics=config.diagnostics) for ev in lists]
+
+    return run, jobs, None
+
+
+def setup_align(*, N: int, T: int):
+    """align_histories_intersection over N symbols with staggered start dates."""
+    from mrscore.io.adapters import align_histories_intersection
+    from mrscore.io.history import OHLC, History
+
+    rng = np.random.default_rng(0)
+    calendar = np.datetime64("2010-01-01") + np.arange(T).astype("timedelta64[D]")
+    histories = {}
+    for i in range(N):
+        dates = calendar[int(rng.integers(0, T // 10)) :]
+        histories[f"S{i}"] = History(symbol=f"S{i}", dates=dates, close=np.exp(np.cumsum(rng.normal(0.0, 0.01, size=dates.size))))
+    symbols = list(histories)
+    return (lambda: align_histories_intersection(histories, symbols=symbols, field=OHLC.CLOSE)), N, N * T
+
+
+def setup_backtest(*, ratios: int, T: int, N: int, kernel: str):
+    """RotationBacktester on 3x3 basket ratios: run_one per ratio or one run_many call."""
+    from mrscore.app.composition_root import build_app
+    from mrscore.io.ratio import RatioSpec, build_equal_weight_basket
+
+    backtester = build_app(_config()).backtester
+    panel = _panel(T, N)
+    rng = np.random.default_rng(1)
+    specs = []
+    for _ in range(ratios):
+        cols = rng.choice(N, size=6, replace=False)
+        specs.append(RatioSpec(build_equal_weight_basket(cols[:3]), build_equal_weight_basket(cols[3:])))
+    ids = [f"job{i}" for i in range(ratios)]
+    if kernel == "batch":
+        return (lambda: backtester.run_many(panel=panel, ratio_specs=specs, job_ids=ids)), ratios, ratios * T
+    return (
+        lambda: [backtester.run_one(panel=panel, ratio_spec=s, job_id=j) for s, j in zip(specs, ids)]
+    ), ratios, ratios * T
+
+
+CASES: List[Tuple[str, Setup, Dict]] = [
+    ("scan", setup_scan, {"T": 1000, "N": 14, "k": 2}),
+    ("scan", setup_scan, {"T": 2500, "N": 14, "k": 2}),
+    ("scan", setup_scan, {"T": 1000, "N": 9, "k": 3}),
+    ("scan_score", setup_scan_score, {"T": 1000, "N": 8, "k": 2}),
+    ("scan_score", setup_scan_score, {"T": 1000, "N": 8, "k": 2, "batch_size": 256}),
+    ("scan_score", setup_scan_score, {"T": 1000, "N": 8, "k": 2, "event_driven": True}),
+    ("scan_score", setup_scan_score, {"T": 1000, "N": 8, "k": 2, "batch_size": 256, "prescreen": 0.1}),
+    ("engine", setup_engine, {"B": 50, "T": 2500, "mode": "run"}),
+    ("engine", setup_engine, {"B": 50, "T": 2500, "mode": "run", "max_active": 4}),
+    ("engine", setup_engine, {"B": 50, "T": 2500, "mode": "event_driven"}),
+    ("engine", setup_engine, {"B": 200, "T": 2500, "mode": "batch"}),
+    ("score_events", setup_score_events, {"jobs": 2000, "events": 50}),
+    ("score_events", setup_score_events, {"jobs": 2000, "events": 50, "table": True}),
+    ("align_intersection", setup_align, {"N": 2000, "T": 2500}),
+    ("backtest", setup_backtest, {"ratios": 50, "T": 2500, "N": 40, "kernel": "loop"}),
+    ("backtest", setup_backtest, {"ratios": 200, "T": 2500, "N": 40, "kernel": "batch"}),
+]
+
+
+def case_id(name: str, params: Dict) -> str:
+    return f"{name}[{','.join(f'{k}={v}' for k, v in params.items())}]"
+
+
+def _peak_rss_mib() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024.0 * 1024.0) if sys.platform == "darwin" else rss / 1024.0
+
+
+def _measure(index: int, repeat: int) -> Dict[str, float]:
+    """Run case `index` in this (fresh) process and return its metrics."""
+    logging.disable(logging.INFO)  # scans log per call
+    _, setup, params = CASES[index]
+    run, jobs, bars = setup(**params)
+    run()  # warm-up: imports, caches, first-touch allocations
+
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - t0)
+    peak_rss = _peak_rss_mib()
+
+    collections = _gc_collections()
+    run()
+    gc_runs = _gc_collections() - collections
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    run()
+    alloc_peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "jobs": jobs,
+        "jobs_per_s": jobs / best,
+        "bars_per_s": (bars / best) if bars is not None else None,
+        "peak_rss_mib": peak_rss,
+        "alloc_kib_per_job": alloc_peak / 1024.0 / max(jobs, 1),
+        "gc_per_kjob": gc_runs * 1000.0 / max(jobs, 1),
+    }
+
+
+def _gc_collections() -> int:
+    return sum(stats["collections"] for stats in gc.get_stats())
+
+
+def _round(x: Optional[float]) -> Optional[float]:
+    """3 significant digits, so baseline diffs show changes rather than noise."""
+    if x is None or x == 0:
+        return x
+    return float(f"{x:.3g}")
+
+
+# Metrics compared against the baseline, and the direction that counts as worse.
+TRACKED = {"jobs_per_s": -1, "peak_rss_mib": +1, "alloc_kib_per_job": +1}
+# Allocation changes below this many KiB per job are noise (interpreter caches, small lists).
+ALLOC_FLOOR_KIB = 4.0
+
+
+def _regressions(new: Dict, old: Dict, tolerance: float) -> List[str]:
+    out = []
+    for metric, worse in TRACKED.items():
+        a, b = new.get(metric), old.get(metric)
+        if a is None or not b:
+            continue
+        if metric == "alloc_kib_per_job" and abs(a - b) < ALLOC_FLOOR_KIB:
+            continue
+        change = a / b - 1.0
+        if change * worse > tolerance:
+            out.append(f"{metric} {change:+.0%}")
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", default="", help="only cases whose id contains this string")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="relative change that counts as a regression")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="write results to the baseline file")
+    parser.add_argument("--check", action="store_true", help="exit 1 when a case regressed")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())["cases"] if args.baseline.exists() else {}
+    selected = [i for i, (name, _, params) in enumerate(CASES) if args.filter in case_id(name, params)]
+
+    results: Dict[str, Dict] = {}
+    regressed: List[str] = []
+    print(f"{'case':<58} {'jobs/s':>10} {'bars/s':>10} {'rss MiB':>8} {'KiB/job':>8} {'gc/kjob':>8}  vs baseline")
+    for i in selected:
+        cid = case_id(CASES[i][0], CASES[i][2])
+        # a new process per case: peak RSS and allocator state do not leak between cases
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            metrics = {k: (v if k == "jobs" else _round(v)) for k, v in pool.submit(_measure, i, args.repeat).result().items()}
+        results[cid] = metrics
+
+        old = baseline.get(cid)
+        if old is None:
+            note = "new"
+        else:
+            problems = _regressions(metrics, old, args.tolerance)
+            note = "REGRESSED " + ", ".join(problems) if problems else f"jobs/s {metrics['jobs_per_s'] / old['jobs_per_s'] - 1.0:+.0%}"
+            if problems:
+                regressed.append(cid)
+        bars = f"{metrics['bars_per_s']:>10.3g}" if metrics["bars_per_s"] is not None else f"{'-':>10}"
+        print(
+            f"{cid:<58} {metrics['jobs_per_s']:>10.3g} {bars} {metrics['peak_rss_mib']:>8.1f} "
+            f"{metrics['alloc_kib_per_job']:>8.3g} {metrics['gc_per_kjob']:>8.3g}  {note}"
+        )
+
+    if args.save:
+        cases = dict(baseline)
+        cases.update(results)
+        meta = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+        }
+        args.baseline.write_text(json.dumps({"meta": meta, "cases": cases}, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+    if regressed:
+        print(f"{len(regressed)} case(s) regressed by more than {args.tolerance:.0%}")
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
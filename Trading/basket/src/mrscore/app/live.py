@@ -0,0 +1,282 @@
+# mrscore/app/live.py
+from __future__ import annotations
+
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+from mrscore.core.engine import LiveState
+from mrscore.core.ranking import RankedJob, TopKRanker
+from mrscore.core.ratio_universe import AlignedPanel, RatioJob, RatioUniverse
+from mrscore.core.results import ScoreResult
+from mrscore.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+_SNAPSHOT_VERSION = 2
+
+
+class LiveRescorer:
+    """
+    Keeps the engine state of a tracked set of ratio jobs (typically a scan's
+    top-k) so that each new panel bar costs O(jobs) instead of a rescan.
+
+    step() takes one raw panel row, builds every tracked ratio the way
+    RatioUniverse does (same first-row normalization, eps and dtype), and
+    advances each job's LiveState by one bar. While the panel's first row and
+    history are unchanged, results() equal a full engine.run() over the
+    extended series. The last bar may still be revised (a provisional close):
+    the state from before it is kept, and extend() steps the revised bar again.
+
+    to_dict() / from_dict() round-trip the whole set through JSON exactly
+    (io.cache.store_live_snapshot).
+    """
+
+    def __init__(
+        self,
+        engine,
+        *,
+        symbols: Sequence[str],
+        jobs: Sequence[RatioJob],
+        base: Optional[np.ndarray],
+        eps: float,
+        dtype: np.dtype,
+        returns_mode: str,
+        vol_unit: str,
+    ) -> None:
+        if not jobs:
+            raise ValueError("jobs must not be empty")
+        k_num, k_den = jobs[0].k_num, jobs[0].k_den
+        if any(job.k_num != k_num or job.k_den != k_den for job in jobs):
+            raise ValueError("tracked jobs must share k_num and k_den")
+        if vol_unit == "returns" and returns_mode == "none":
+            raise ValueError("volatility_unit is 'returns' but returns_mode is 'none'")
+        if vol_unit == "returns" and returns_mode not in ("log", "simple"):
+            raise ValueError(f"Invalid returns mode: {returns_mode}")
+
+        self.engine = engine
+        self.symbols = list(symbols)
+        self.jobs = list(jobs)
+        self.dtype = np.dtype(dtype)
+        self.base = np.asarray(base, dtype=self.dtype) if base is not None else None
+        self.eps = float(eps)
+        self.returns_mode = returns_mode
+        self.vol_unit = vol_unit
+
+        self.states: List[LiveState] = [engine.live_state() for _ in self.jobs]
+        self.last_prices = np.full(len(self.jobs), np.nan, dtype=self.dtype)
+        self.first_date: Optional[str] = None
+        self.last_date: Optional[str] = None
+        self.t = 0
+        # everything step() changes, as it was before the last bar
+        self._before_last: Optional[dict] = None
+        self._num_idx: Optional[np.ndarray] = None
+        self._den_idx: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    @classmethod
+    def track(
+        cls,
+        ru: RatioUniverse,
+        engine,
+        jobs: Sequence[RatioJob],
+        *,
+        returns_mode: str,
+        vol_unit: str,
+    ) -> "LiveRescorer":
+        """Start tracking `jobs` on everything `ru` holds (one pass over each job's series)."""
+        live = cls(
+            engine,
+            symbols=ru.symbols,
+            jobs=jobs,
+            base=ru.normalization_base,
+            eps=ru.eps,
+            dtype=ru.dtype,
+            returns_mode=returns_mode,
+            vol_unit=vol_unit,
+        )
+        lib_num = ru.get_basket_library(live.jobs[0].k_num)
+        lib_den = ru.get_basket_library(live.jobs[0].k_den)
+        live._set_baskets(
+            [lib_num.baskets[job.num_id] for job in live.jobs],
+            [lib_den.baskets[job.den_id] for job in live.jobs],
+        )
+        T = len(ru.dates)
+        if T == 0:
+            return live
+
+        step = engine.step
+        marks = []
+        previous = np.full(len(live.jobs), np.nan, dtype=live.dtype)
+        for m, job in enumerate(live.jobs):
+            prices = ru.compute_ratio_series(job)
+            returns = None
+            if vol_unit == "returns":
+                returns = _returns(prices[1:], prices[:-1], returns_mode)
+            state = live.states[m]
+            for t in range(T - 1):
+                step(state, prices[t], returns[t - 1] if returns is not None and t > 0 else None)
+            marks.append(state.mark())
+            previous[m] = prices[-2] if T > 1 else np.nan
+            step(state, prices[-1], returns[-1] if returns is not None and T > 1 else None)
+            live.last_prices[m] = prices[-1]
+        live._before_last = {
+            "t": T - 1,
+            "last_date": str(ru.dates[-2]) if T > 1 else None,
+            "last_prices": previous.tolist(),
+            "states": marks,
+        }
+        live.t = T
+        live.first_date = str(ru.dates[0])
+        live.last_date = str(ru.dates[-1])
+        return live
+
+    def _set_baskets(self, num: Sequence[Sequence[int]], den: Sequence[Sequence[int]]) -> None:
+        self._num_idx = np.asarray(num, dtype=np.intp)
+        self._den_idx = np.asarray(den, dtype=np.intp)
+
+    def step(self, bar: np.ndarray, date: Any = None) -> None:
+        """Advance every tracked job by one raw (unnormalized) panel row of shape (N,)."""
+        prices = self._ratio_prices(bar)
+        returns = None
+        if self.vol_unit == "returns" and self.t > 0:
+            returns = _returns(prices, self.last_prices, self.returns_mode)
+
+        self._before_last = {
+            "t": self.t,
+            "last_date": self.last_date,
+            "last_prices": self.last_prices.tolist(),
+            "states": [state.mark() for state in self.states],
+        }
+        step = self.engine.step
+        for m, state in enumerate(self.states):
+            step(state, prices[m], returns[m] if returns is not None else None)
+        self.last_prices = prices
+        if date is not None:
+            if self.t == 0:
+                self.first_date = str(date)
+            self.last_date = str(date)
+        self.t += 1
+
+    def _ratio_prices(self, bar: np.ndarray) -> np.ndarray:
+        x = np.asarray(bar, dtype=self.dtype)
+        if x.shape != (len(self.symbols),):
+            raise ValueError(f"bar must have shape ({len(self.symbols)},)")
+        if self.base is not None:
+            x = x / self.base
+        # ratio_universe: sum(X[t, num_idx]) / (sum(X[t, den_idx]) + eps)
+        prices = x[self._num_idx].sum(axis=1)
+        prices /= x[self._den_idx].sum(axis=1) + self.eps
+        return prices
+
+    def extend(self, panel: AlignedPanel) -> Optional[int]:
+        """
+        Step the rows of `panel` newer than the tracked ones and return how
+        many there were. A revised last tracked bar is stepped again from the
+        state before it. None if `panel` does not extend the tracked history
+        (other symbols, or a different first or last tracked date).
+        """
+        t = self.t
+        dates = panel.dates
+        if list(panel.symbols) != self.symbols or len(dates) < t:
+            return None
+        if t > 0 and (str(dates[0]) != self.first_date or str(dates[t - 1]) != self.last_date):
+            return None
+        start = t
+        if t > 0 and not np.array_equal(self._ratio_prices(panel.values[t - 1]), self.last_prices, equal_nan=True):
+            if self._before_last is None:
+                return None
+            logger.info("Last tracked bar %s was revised; stepping it again", self.last_date)
+            self._rewind()
+            start = t - 1
+        for row in range(start, len(dates)):
+            self.step(panel.values[row], dates[row])
+        return len(dates) - t
+
+    def _rewind(self) -> None:
+        """Undo the last step(): back to the state _before_last holds."""
+        before = self._before_last
+        for state, mark in zip(self.states, before["states"]):
+            state.rewind(mark)
+        self.last_prices = np.asarray(before["last_prices"], dtype=self.dtype)
+        self.t = int(before["t"])
+        self.last_date = before["last_date"]
+        if self.t == 0:
+            self.first_date = None
+        self._before_last = None
+
+    def results(self) -> List[ScoreResult]:
+        """ScoreResult of every tracked job over the bars stepped so far, in tracking order."""
+        return [self.engine.live_result(state) for state in self.states]
+
+    def top(self, k: int) -> List[RankedJob]:
+        """Best k tracked jobs by score (finite scores only; ties keep tracking order)."""
+        ranker = TopKRanker(k)
+        for order, (job, result) in enumerate(zip(self.jobs, self.results())):
+            if np.isfinite(result.score):
+                ranker.consider(job=job, score=result.score, order=order)
+        return ranker.items_sorted(descending=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "v": _SNAPSHOT_VERSION,
+            "symbols": self.symbols,
+            "base": self.base.tolist() if self.base is not None else None,
+            "eps": self.eps,
+            "dtype": self.dtype.str,
+            "returns_mode": self.returns_mode,
+            "vol_unit": self.vol_unit,
+            "k_num": self.jobs[0].k_num,
+            "k_den": self.jobs[0].k_den,
+            "jobs": [[job.num_id, job.den_id] for job in self.jobs],
+            "num_idx": self._num_idx.tolist(),
+            "den_idx": self._den_idx.tolist(),
+            "t": self.t,
+            "first_date": self.first_date,
+            "last_date": self.last_date,
+            "last_prices": self.last_prices.tolist(),
+            "before_last": self._before_last,
+            "states": [state.to_dict() for state in self.states],
+        }
+
+    @classmethod
+    def from_dict(cls, engine, data: dict) -> "LiveRescorer":
+        """Rebuild a to_dict() snapshot; `engine` must be built from the same config."""
+        if data.get("v") != _SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported live snapshot version: {data.get('v')!r}")
+        k_num, k_den = int(data["k_num"]), int(data["k_den"])
+        live = cls(
+            engine,
+            symbols=data["symbols"],
+            jobs=[RatioJob(k_num=k_num, k_den=k_den, num_id=int(n), den_id=int(d)) for n, d in data["jobs"]],
+            base=np.asarray(data["base"], dtype=np.float64) if data["base"] is not None else None,
+            eps=data["eps"],
+            dtype=np.dtype(data["dtype"]),
+            returns_mode=data["returns_mode"],
+            vol_unit=data["vol_unit"],
+        )
+        live._set_baskets(data["num_idx"], data["den_idx"])
+        live.t = int(data["t"])
+        live.first_date = data["first_date"]
+        live.last_date = data["last_date"]
+        live.last_prices = np.asarray(data["last_prices"], dtype=live.dtype)
+        live._before_last = data["before_last"]
+        live.states = [engine.live_state_from_dict(state) for state in data["states"]]
+        return live
+
+
+def _returns(prices: np.ndarray, previous: np.ndarray, mode: str) -> np.ndarray:
+    """Returns from `previous` to `prices`, with the same float ops as scan.compute_returns_inplace."""
+    out = np.empty(prices.shape, dtype=np.float64)
+    if mode == "simple":
+        np.divide(prices, previous, out=out)
+        out -= 1.0
+        return out
+    tmp = np.empty(prices.shape, dtype=np.float64)
+    np.log(prices, out=out)
+    np.log(previous, out=tmp)
+    out -= tmp
+    return out
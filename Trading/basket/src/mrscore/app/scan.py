@@ -0,0 +1,858 @@
+# mrscore/app/scan.py
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+import mmap
+import os
+import time
+
+import numpy as np
+
+from mrscore.config.models import RootConfig
+from mrscore.core.diagnostics import ScanStats
+from mrscore.core.prescreen import RatioPrescreen
+from mrscore.core.ranking import MultiTopKRanker, RankedJob, TopKRanker
+from mrscore.core.ratio_universe import AlignedPanel, BasketLibrary, RatioJob, RatioJobTable, RatioTile, RatioUniverse
+from mrscore.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def compute_returns_inplace(
+    *,
+    prices: np.ndarray,
+    returns_out: np.ndarray,
+    tmp_out: np.ndarray | None,
+    mode: str,
+) -> np.ndarray:
+    """
+    Compute returns from prices into a preallocated output array.
+
+    prices: shape (T,) or (B, T)
+    returns_out: shape (T-1,) or (B, T-1)
+    tmp_out: same shape as returns_out if mode=="log", else None
+    mode: "log" | "simple"
+    """
+    if mode == "simple":
+        np.divide(prices[..., 1:], prices[..., :-1], out=returns_out)
+        returns_out -= 1.0
+        return returns_out
+
+    if mode == "log":
+        if tmp_out is None:
+            raise ValueError("tmp_out is required for log returns")
+        np.log(prices[..., 1:], out=returns_out)   # log(p_t)
+        np.log(prices[..., :-1], out=tmp_out)      # log(p_{t-1})
+        returns_out -= tmp_out
+        return returns_out
+
+    raise ValueError(f"Invalid returns mode: {mode}")
+
+
+def job_order(ru: RatioUniverse, job: RatioJob) -> int:
+    """
+    Global tie-break key of a job: monotone in iteration order for both the
+    unordered (i < j) and the ordered layouts.
+    """
+    lib_den = ru.get_basket_library(job.k_den)
+    return job.num_id * lib_den.size + job.den_id
+
+
+@dataclass
+class PruneStats:
+    """
+    Early-abandon counters: jobs stopped before their last bar, and the bars
+    they skipped; `screened` counts jobs the pre-screen kept from the engine.
+    """
+    jobs: int = 0
+    bars: int = 0
+    screened: int = 0
+
+    def add(self, other: "PruneStats") -> None:
+        self.jobs += other.jobs
+        self.bars += other.bars
+        self.screened += other.screened
+
+
+class _RatioScorer:
+    """
+    Engine invocation shared by the job and tile scans: returns buffers,
+    run vs run_batch vs run_event_driven dispatch, and feeding finite scores
+    into the ranker. engine.event_driven scores one series per call, so it
+    takes precedence over batch_size.
+
+    With engine.early_abandon, each series gets the ranker cutoff as its
+    abandon threshold once the heap is full. Abandoned jobs could not have
+    entered the top-k; they count as processed (their score would have been
+    finite) and in `pruned`.
+
+    With scan_stats, every block counts its jobs, events and ranker outcomes,
+    and blocks holding a sampled job are timed stage by stage.
+
+    With rankings, every finite-score job is also offered to the extra
+    per-metric / per-group rankings (including jobs passed to on_score).
+
+    With prescreen, score_block() drops all but the best fraction of each
+    block before the engine; dropped jobs count in `pruned.screened` and are
+    not processed.
+    """
+
+    def __init__(
+        self,
+        *,
+        ru: RatioUniverse,
+        engine,
+        ranker: TopKRanker,
+        returns_mode: str,
+        vol_unit: str,
+        batch_size: int | None,
+        on_score: Optional[Callable[[RatioJob, float], None]],
+        prune_stats: Optional[PruneStats] = None,
+        scan_stats: Optional[ScanStats] = None,
+        rankings: Optional[MultiTopKRanker] = None,
+        prescreen: Optional[RatioPrescreen] = None,
+    ) -> None:
+        self.ru = ru
+        self.engine = engine
+        self.ranker = ranker
+        self.returns_mode = returns_mode
+        self.vol_unit = vol_unit
+        self.on_score = on_score
+        self.event_driven = bool(engine.config.engine.event_driven)
+        self.use_batch = (
+            batch_size is not None and batch_size > 1 and not self.event_driven and engine.supports_batch()
+        )
+        self.rows = batch_size if self.use_batch else 1
+        self.processed = 0
+        self.early_abandon = bool(engine.config.engine.early_abandon)
+        self.pruned = prune_stats if prune_stats is not None else PruneStats()
+        self.stats = scan_stats
+        self.rankings = rankings
+        self.prescreen = prescreen
+
+        T = ru._X.shape[0]
+        self.T = T
+        # Returns buffers (only if needed)
+        self.ret_buf = None
+        self.tmp_buf = None
+        if vol_unit == "returns":
+            if returns_mode == "none":
+                raise ValueError("volatility_unit is 'returns' but returns_mode is 'none'")
+            self.ret_buf = np.empty((self.rows, T - 1), dtype=np.float64)
+            if returns_mode == "log":
+                self.tmp_buf = np.empty((self.rows, T - 1), dtype=np.float64)
+
+    def score_block(self, jobs: Sequence[RatioJob] | RatioJobTable, prices: np.ndarray) -> None:
+        """Pre-screen a block of any length (prices has shape (len(jobs), T)), then score() it rows at a time."""
+        if self.prescreen is not None:
+            keep = self.prescreen.select(prices)
+            dropped = len(jobs) - len(keep)
+            if dropped:
+                self.pruned.screened += dropped
+                if self.stats is not None:
+                    self.stats.counters["screened_out"] += dropped
+                jobs = jobs.take(keep) if isinstance(jobs, RatioJobTable) else [jobs[i] for i in keep]
+                prices = prices[keep]
+        for m0 in range(0, len(jobs), self.rows):
+            self.score(jobs[m0 : m0 + self.rows], prices[m0 : m0 + self.rows])
+
+    def score(self, jobs: Sequence[RatioJob] | RatioJobTable, prices: np.ndarray) -> None:
+        """
+        Score len(jobs) <= rows series; prices has shape (len(jobs), T).
+
+        For a RatioJobTable, RatioJob objects are only built for jobs that
+        enter the ranker (or reach on_score).
+        """
+        n = len(jobs)
+        stats = self.stats
+        timed = stats is not None and stats.due("engine", n)
+        if timed:
+            t0 = perf_counter()
+        returns = None
+        if self.vol_unit == "returns":
+            assert self.ret_buf is not None
+            returns = compute_returns_inplace(
+                prices=prices,
+                returns_out=self.ret_buf[:n],
+                tmp_out=(self.tmp_buf[:n] if self.tmp_buf is not None else None),
+                mode=self.returns_mode,
+            )
+        if timed:
+            t1 = perf_counter()
+            stats.time("returns", t1 - t0, n)
+            scoring: list[float] = []
+            self.engine.scoring_timer = scoring.append
+        try:
+            orders, results = self._run_engine(jobs, prices, returns)
+        finally:
+            if timed:
+                self.engine.scoring_timer = None
+        if timed:
+            t2 = perf_counter()
+            scored = sum(scoring)
+            stats.time("engine", t2 - t1 - scored, n)
+            stats.time("scoring", scored, n)
+
+        counters = stats.counters if stats is not None else None
+        for m, (order, result) in enumerate(zip(orders, results)):
+            if result.abandoned_at is not None:
+                self.pruned.jobs += 1
+                self.pruned.bars += self.T - result.abandoned_at
+                self.processed += 1
+                continue
+
+            score = float(result.score)
+
+            # Skip NaN scores (e.g., record_empty_scores=False with 0 events)
+            if not np.isfinite(score):
+                continue
+
+            self.processed += 1
+            if self.rankings is not None:
+                self.rankings.consider(job=jobs[m], result=result, order=order)
+            if self.on_score is not None:
+                job = jobs[m]
+                self.on_score(job, score)
+            elif self.ranker.admits(score, order):
+                job = jobs[m]
+            else:
+                if counters is not None:
+                    counters["heap_rejections"] += 1
+                continue
+            if counters is not None:
+                self._count_push(counters, score, order)
+            self.ranker.consider(job=job, score=score, order=order)
+
+        if counters is not None:
+            _count_results(counters, results)
+            if timed:
+                stats.time("ranker", perf_counter() - t2, n)
+
+    def _run_engine(
+        self,
+        jobs: Sequence[RatioJob] | RatioJobTable,
+        prices: np.ndarray,
+        returns: Optional[np.ndarray],
+    ) -> tuple[list[int], list]:
+        """(job orders, engine results) for one block."""
+        if isinstance(jobs, RatioJobTable):
+            orders = jobs.orders(self.ru.get_basket_library(jobs.k_den).size).tolist()
+        else:
+            orders = [job_order(self.ru, job) for job in jobs]
+        floors = self._abandon_floors(orders) if self.early_abandon else None
+
+        if self.use_batch:
+            return orders, self.engine.run_batch(prices=prices, returns=returns, dates=self.ru.dates, abandon_below=floors)
+        if self.event_driven:
+            return orders, [
+                self.engine.run_event_driven(
+                    prices=prices[0],
+                    returns=(returns[0] if returns is not None else None),
+                    dates=self.ru.dates,
+                )
+            ]
+        return orders, [
+            self.engine.run(
+                prices=prices[0],
+                returns=(returns[0] if returns is not None else None),
+                dates=self.ru.dates,
+                abandon_below=(float(floors[0]) if floors is not None else None),
+            )
+        ]
+
+    def _count_push(self, counters: Dict[str, int], score: float, order: int) -> None:
+        if len(self.ranker) < self.ranker.k:
+            counters["heap_inserts"] += 1
+        elif self.ranker.admits(score, order):
+            counters["heap_replacements"] += 1
+        else:
+            counters["heap_rejections"] += 1
+
+    def _abandon_floors(self, orders: Sequence[int]) -> Optional[np.ndarray]:
+        """
+        Per-job abandon thresholds from the ranker cutoff: a bound strictly below
+        the floor means the ranker would reject the job. Jobs ordered after the
+        cutoff item also lose ties, so their floor is one ulp above its score.
+        """
+        cutoff = self.ranker.cutoff()
+        if cutoff is None:
+            return None
+        score, order = cutoff
+        return np.where(np.asarray(orders) > order, np.nextafter(score, np.inf), score)
+
+
+def _count_results(counters: Dict[str, int], results) -> None:
+    for result in results:
+        counters["jobs"] += 1
+        if result.abandoned_at is not None:
+            counters["abandoned"] += 1
+        elif not np.isfinite(result.score):
+            counters["nan_scores"] += 1
+        counters["events_opened"] += result.total_events
+        counters["events_reverted"] += result.reverted_events
+        counters["events_failed"] += result.failed_events
+        counters["events_expired"] += result.expired_events
+
+
+def score_ratio_jobs(
+    *,
+    ru: RatioUniverse,
+    engine,  # MeanReversionEngine, typed loosely to avoid import cycles
+    jobs: Iterable[RatioJob] | RatioJobTable,
+    ranker: TopKRanker,
+    returns_mode: str,
+    vol_unit: str,
+    batch_size: int | None = None,
+    on_score: Optional[Callable[[RatioJob, float], None]] = None,
+    basket_cache: Optional[bool] = None,
+    on_progress: Optional[Callable[[int, int], bool]] = None,
+    prune_stats: Optional[PruneStats] = None,
+    scan_stats: Optional[ScanStats] = None,
+    rankings: Optional[MultiTopKRanker] = None,
+    prescreen: Optional[RatioPrescreen] = None,
+) -> int:
+    """
+    Score ratio jobs with the engine and feed finite scores into `ranker`.
+
+    - uses preallocated buffers for ratio + returns
+    - with batch_size, scores blocks of ratios per engine.run_batch call
+    - with engine.event_driven, scores each ratio with engine.run_event_driven
+    - basket_cache overrides ru.basket_cache_enabled for this scan
+    - ties are broken by job_order(), so any split of the job space merges
+      back to the same top-k
+    - on_progress(consumed, processed) runs after every scored block, when all
+      `consumed` jobs so far are in the ranker; returning False stops the scan
+    - with engine.early_abandon, prune_stats accumulates the pruned jobs and
+      bars (abandoned jobs are counted as processed, never passed to on_score)
+    - a RatioJobTable is scored block by block from its id arrays; RatioJob
+      objects are only built for jobs that enter the ranker
+    - scan_stats accumulates counters and sampled stage timings (see ScanStats)
+    - rankings keeps extra top-k rankings by other metrics / per group (see
+      MultiTopKRanker); like `ranker`, it holds O(k) items whatever the scan size
+    - with prescreen, ratios are computed prescreen.block_for(rows) jobs at a
+      time and only the best fraction of each block is scored (see
+      RatioPrescreen); on_progress then runs once per block
+
+    Returns the number of jobs with a finite score.
+    """
+    scorer = _RatioScorer(
+        ru=ru,
+        engine=engine,
+        ranker=ranker,
+        returns_mode=returns_mode,
+        vol_unit=vol_unit,
+        batch_size=batch_size,
+        on_score=on_score,
+        prune_stats=prune_stats,
+        scan_stats=scan_stats,
+        rankings=rankings,
+        prescreen=prescreen,
+    )
+    # Reuse a buffer to avoid allocating (T,) arrays for every ratio
+    unit = prescreen.block_for(scorer.rows) if prescreen is not None else scorer.rows
+    price_buf = np.empty((unit, ru._X.shape[0]), dtype=np.float64)
+    block: list[RatioJob] = []
+    consumed = 0
+
+    def flush() -> bool:
+        nonlocal consumed
+        scorer.score_block(block, price_buf[: len(block)])
+        consumed += len(block)
+        block.clear()
+        return on_progress is None or on_progress(consumed, scorer.processed)
+
+    if isinstance(jobs, RatioJobTable):
+        for b0 in range(0, len(jobs), unit):
+            table = jobs[b0 : b0 + unit]
+            prices = price_buf[: len(table)]
+            timed = scan_stats is not None and scan_stats.due("ratio", len(table))
+            if timed:
+                t0 = perf_counter()
+            ru.compute_ratio_block_into(prices, table, use_cache=basket_cache)
+            if timed:
+                scan_stats.time("ratio", perf_counter() - t0, len(table))
+            scorer.score_block(table, prices)
+            consumed += len(table)
+            if on_progress is not None and not on_progress(consumed, scorer.processed):
+                break
+        return scorer.processed
+
+    for job in jobs:
+        if scan_stats is not None and scan_stats.due("ratio"):
+            t0 = perf_counter()
+            ru.compute_ratio_series_into(price_buf[len(block)], job, use_cache=basket_cache)
+            scan_stats.time("ratio", perf_counter() - t0)
+        else:
+            ru.compute_ratio_series_into(price_buf[len(block)], job, use_cache=basket_cache)
+        block.append(job)
+        if len(block) == unit and not flush():
+            return scorer.processed
+    if block:
+        flush()
+
+    return scorer.processed
+
+
+def score_ratio_tiles(
+    *,
+    ru: RatioUniverse,
+    engine,  # MeanReversionEngine, typed loosely to avoid import cycles
+    tiles: Iterable[RatioTile],
+    ranker: TopKRanker,
+    returns_mode: str,
+    vol_unit: str,
+    batch_size: int | None = None,
+    on_score: Optional[Callable[[RatioJob, float], None]] = None,
+    prune_stats: Optional[PruneStats] = None,
+    scan_stats: Optional[ScanStats] = None,
+    rankings: Optional[MultiTopKRanker] = None,
+    prescreen: Optional[RatioPrescreen] = None,
+) -> int:
+    """
+    Score the ratio tiles of RatioUniverse.scan_blocks() into `ranker`.
+
+    Tile columns go to the engine as (rows, T) views of the tile, with no
+    per-job series computation. The top-k equals score_ratio_jobs() over the
+    same jobs: job_order() tie-breaks make it independent of visiting order.
+    With scan_stats, every tile counts as sampled for the ratio stage (a
+    tile is built in one call for many jobs). rankings is fed as in
+    score_ratio_jobs(); prescreen selects within each tile (prescreen.block
+    does not apply).
+
+    Returns the number of jobs with a finite score.
+    """
+    scorer = _RatioScorer(
+        ru=ru,
+        engine=engine,
+        ranker=ranker,
+        returns_mode=returns_mode,
+        vol_unit=vol_unit,
+        batch_size=batch_size,
+        on_score=on_score,
+        prune_stats=prune_stats,
+        scan_stats=scan_stats,
+        rankings=rankings,
+        prescreen=prescreen,
+    )
+    # the tile generator builds tile.values: time from the end of one tile to the next
+    t0 = perf_counter()
+    for tile in tiles:
+        if scan_stats is not None:
+            scan_stats.due("ratio", tile.size)
+            scan_stats.time("ratio", perf_counter() - t0, tile.size)
+        scorer.score_block(tile.jobs(), tile.values.T)  # (M, T) view
+        t0 = perf_counter()
+
+    return scorer.processed
+
+
+class ScanCheckpointer:
+    """
+    on_progress hook for score_ratio_jobs that persists scan state.
+
+    Calls save(position, processed) at most every `interval_s` seconds, and
+    once more as soon as a stop is requested (request_stop doubles as a
+    SIGTERM handler); the scan then stops at that consistent point.
+    """
+
+    def __init__(
+        self,
+        save: Callable[[int, int], None],
+        *,
+        interval_s: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._save = save
+        self._interval_s = float(interval_s)
+        self._clock = clock
+        self._last = clock()
+        self.stop_requested = False
+        self.saves = 0
+
+    def request_stop(self, *_: Any) -> None:
+        self.stop_requested = True
+
+    def __call__(self, position: int, processed: int) -> bool:
+        now = self._clock()
+        if self.stop_requested or now - self._last >= self._interval_s:
+            self._save(position, processed)
+            self._last = now
+            self.saves += 1
+        return not self.stop_requested
+
+
+# -----------------------------------------------------------------------------
+# Sharded multi-process scan
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class ScanShard:
+    """
+    A contiguous slice of the job sequence: job indices in [start, stop)
+    (see RatioUniverse.job_at), truncated after max_jobs jobs (None = no limit).
+    """
+    index: int
+    start: int
+    stop: int
+    max_jobs: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ParallelScanResult:
+    processed_jobs: int
+    shards: int
+    top: list[RankedJob]
+    pruned: PruneStats = field(default_factory=PruneStats)
+    stats: Optional[ScanStats] = None
+    rankings: Optional[MultiTopKRanker] = None
+
+
+def plan_scan_shards(
+    ru: RatioUniverse,
+    *,
+    k_num: int,
+    k_den: int,
+    n_shards: int,
+    unordered_if_equal_k: bool = True,
+    disallow_overlap: bool = False,
+    max_jobs: Optional[int] = None,
+) -> list[ScanShard]:
+    """
+    Split the job sequence into up to `n_shards` contiguous job-index ranges of
+    roughly equal size.
+
+    Ranges split the index space evenly, except when overlap filtering is
+    combined with max_jobs: the global cutoff must then
+    land on the same job as a serial scan, so shards are cut at numerator-row
+    starts where the number of filtered jobs before the cut is counted exactly.
+    """
+    if n_shards < 1:
+        raise ValueError("n_shards must be >= 1")
+
+    total = ru.job_count(k_num=k_num, k_den=k_den, unordered_if_equal_k=unordered_if_equal_k)
+
+    if max_jobs is None or not disallow_overlap:
+        # Unfiltered positions map 1:1 to jobs, so max_jobs is just an index cutoff.
+        end = total if max_jobs is None else min(total, max_jobs)
+        bounds = np.unique(end * np.arange(n_shards + 1, dtype=np.int64) // n_shards)
+        return [
+            ScanShard(index=s, start=int(a), stop=int(b))
+            for s, (a, b) in enumerate(zip(bounds[:-1], bounds[1:]))
+        ]
+
+    row_starts = np.concatenate(
+        ([0], np.cumsum(ru._row_job_counts(k_num=k_num, k_den=k_den, unordered_if_equal_k=unordered_if_equal_k)))
+    )
+    cum = np.cumsum(
+        ru._row_job_counts(
+            k_num=k_num,
+            k_den=k_den,
+            unordered_if_equal_k=unordered_if_equal_k,
+            disallow_overlap=True,
+        )
+    )
+    kept = min(max_jobs, int(cum[-1]) if cum.size else 0)
+    if kept == 0:
+        return []
+    # row holding the kept-th job is the last one scanned
+    rows_end = int(np.searchsorted(cum, kept, side="left")) + 1
+
+    targets = kept * np.arange(1, n_shards, dtype=np.float64) / n_shards
+    cuts = np.searchsorted(cum[:rows_end], targets, side="left") + 1
+    bounds = np.unique(np.concatenate(([0], np.clip(cuts, 0, rows_end), [rows_end])))
+
+    shards: list[ScanShard] = []
+    for a, b in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        before = int(cum[a - 1]) if a > 0 else 0
+        if int(cum[b - 1]) - before <= 0:
+            continue
+        shards.append(
+            ScanShard(
+                index=len(shards),
+                start=int(row_starts[a]),
+                stop=int(row_starts[b]),
+                max_jobs=kept - before,
+            )
+        )
+    return shards
+
+
+@dataclass(frozen=True)
+class _SharedArray:
+    """Handle to an array in a shared-memory block (picklable, no data)."""
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+    order: str = "C"
+
+
+def _share_array(stack: ExitStack, arr: np.ndarray) -> _SharedArray:
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    stack.callback(shm.unlink)
+    stack.callback(shm.close)
+    order = "F" if (arr.flags.f_contiguous and not arr.flags.c_contiguous) else "C"
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf, order=order)[...] = arr
+    return _SharedArray(name=shm.name, shape=arr.shape, dtype=arr.dtype.str, order=order)
+
+
+def _attach_array(ref: _SharedArray) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    shm = shared_memory.SharedMemory(name=ref.name)
+    return shm, np.ndarray(ref.shape, dtype=np.dtype(ref.dtype), buffer=shm.buf, order=ref.order)
+
+
+@dataclass(frozen=True)
+class _MappedArray:
+    """Handle to a file-backed np.memmap; workers map the same file instead of copying it."""
+    filename: str
+    offset: int
+    shape: tuple[int, ...]
+    dtype: str
+    order: str = "C"
+
+
+def _share_panel(stack: ExitStack, arr: np.ndarray) -> _SharedArray | _MappedArray:
+    # only a whole mapping (base is the mmap itself): views of it do not start at `offset`
+    if isinstance(arr, np.memmap) and isinstance(arr.base, mmap.mmap) and arr.filename is not None:
+        order = "F" if not arr.flags.c_contiguous else "C"
+        return _MappedArray(filename=arr.filename, offset=arr.offset, shape=arr.shape, dtype=arr.dtype.str, order=order)
+    return _share_array(stack, arr)
+
+
+@dataclass(frozen=True)
+class _WorkerSpec:
+    panel: _SharedArray | _MappedArray
+    dates: np.ndarray
+    symbols: list[str]
+    eps: float
+    baskets: Dict[int, np.ndarray]
+    basket_sums: Dict[int, _SharedArray]
+    config: RootConfig
+    k_num: int
+    k_den: int
+    unordered_if_equal_k: bool
+    disallow_overlap: bool
+    top_k: int
+
+
+# Per-process state set up once by _init_worker (the panel is never pickled per task).
+_WORKER: dict[str, Any] = {}
+
+
+def _init_worker(spec: _WorkerSpec) -> None:
+    from mrscore.app.composition_root import build_app
+
+    blocks = []
+    if isinstance(spec.panel, _MappedArray):
+        ref = spec.panel
+        X = np.memmap(ref.filename, dtype=np.dtype(ref.dtype), mode="r", offset=ref.offset, shape=ref.shape, order=ref.order)
+    else:
+        shm, X = _attach_array(spec.panel)
+        blocks.append(shm)
+    ru = RatioUniverse(
+        AlignedPanel(dates=spec.dates, symbols=spec.symbols, values=X),
+        normalize_by_first=False,  # the shared panel is already normalized
+        eps=spec.eps,
+        basket_cache=bool(spec.basket_sums),
+    )
+    for k, baskets in spec.baskets.items():
+        ru._basket_libs[k] = BasketLibrary(k=k, baskets=baskets, n_symbols=len(spec.symbols))
+    for k, ref in spec.basket_sums.items():
+        shm, sums = _attach_array(ref)
+        blocks.append(shm)
+        ru._basket_sums[k] = (ru._basket_libs[k], sums)
+
+    _WORKER.update(shm=blocks, ru=ru, engine=build_app(spec.config).engine, spec=spec)
+
+
+def make_scan_stats(config: RootConfig) -> Optional[ScanStats]:
+    """A fresh ScanStats when config.diagnostics.scan_stats is on, else None."""
+    diagnostics = config.diagnostics
+    return ScanStats(diagnostics.scan_stats_sample_every) if diagnostics.scan_stats else None
+
+
+def make_rankings(config: RootConfig, top_k: int) -> Optional[MultiTopKRanker]:
+    """
+    A fresh MultiTopKRanker for config.ratio_universe.rank_by (rank_top_k
+    items per ranking, default `top_k`), or None when rank_by is empty.
+    """
+    ratio_cfg = config.ratio_universe
+    if not ratio_cfg.rank_by:
+        return None
+    return MultiTopKRanker(ratio_cfg.rank_top_k or top_k, ratio_cfg.rank_by, group_by=ratio_cfg.rank_group_by)
+
+
+def make_prescreen(config: RootConfig) -> Optional[RatioPrescreen]:
+    """The RatioPrescreen for config.ratio_universe.prescreen_fraction, or None when unset."""
+    ratio_cfg = config.ratio_universe
+    if ratio_cfg.prescreen_fraction is None:
+        return None
+    return RatioPrescreen(
+        ratio_cfg.prescreen_fraction,
+        metric=ratio_cfg.prescreen_metric,
+        block=ratio_cfg.prescreen_block,
+    )
+
+
+def _scan_shard(
+    shard: ScanShard,
+) -> tuple[int, TopKRanker, int, PruneStats, Optional[ScanStats], Optional[MultiTopKRanker]]:
+    ru: RatioUniverse = _WORKER["ru"]
+    spec: _WorkerSpec = _WORKER["spec"]
+    config = spec.config
+
+    ranker = TopKRanker(spec.top_k)
+    pruned = PruneStats()
+    stats = make_scan_stats(config)
+    rankings = make_rankings(config, spec.top_k)
+    jobs = ru.iter_ratio_jobs(
+        k_num=spec.k_num,
+        k_den=spec.k_den,
+        unordered_if_equal_k=spec.unordered_if_equal_k,
+        disallow_overlap=spec.disallow_overlap,
+        max_jobs=shard.max_jobs,
+        start=shard.start,
+        stop=shard.stop,
+    )
+    processed = score_ratio_jobs(
+        ru=ru,
+        engine=_WORKER["engine"],
+        jobs=jobs,
+        ranker=ranker,
+        returns_mode=config.data.returns_mode,
+        vol_unit=config.volatility_estimator.params.volatility_unit,
+        batch_size=config.engine.batch_size,
+        prune_stats=pruned,
+        scan_stats=stats,
+        rankings=rankings,
+        prescreen=make_prescreen(config),
+    )
+    return shard.index, ranker, processed, pruned, stats, rankings
+
+
+def scan_top_k_parallel(
+    ru: RatioUniverse,
+    config: RootConfig,
+    *,
+    k_num: int,
+    k_den: int,
+    top_k: int,
+    unordered_if_equal_k: bool = True,
+    disallow_overlap: bool = False,
+    max_jobs: Optional[int] = None,
+    workers: Optional[int] = None,
+    n_shards: Optional[int] = None,
+    mp_context=None,
+) -> ParallelScanResult:
+    """
+    Score the ratio universe across a process pool and return the global top-k.
+
+    - the job sequence is cut into contiguous job-index shards
+    - the normalized panel `ru._X` is placed in shared memory once (a
+      file-backed memmap panel is mapped by each worker instead); workers
+      attach to it and rebuild the engine from `config` in their initializer
+    - with ru.basket_cache_enabled the in-memory basket-sum matrices are shared
+      the same way (mmap-backed ones are not; workers then gather columns)
+    - each worker keeps a local TopKRanker per shard; the shard rankers are
+      merged with global job-order tie-breaks, so the result equals a serial
+      score_ratio_jobs() over the same jobs
+    - with config.diagnostics.scan_stats, per-shard ScanStats are summed into
+      the result's `stats`
+    - with config.ratio_universe.rank_by, per-shard MultiTopKRankers are merged
+      into the result's `rankings`, equal to a serial scan's like `top`
+    - with config.ratio_universe.prescreen_fraction, blocks are pre-screened
+      from each shard's start, so the selection can differ from a serial scan
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    # a few shards per worker smooths out uneven per-row cost
+    shards = plan_scan_shards(
+        ru,
+        k_num=k_num,
+        k_den=k_den,
+        n_shards=n_shards or workers * 4,
+        unordered_if_equal_k=unordered_if_equal_k,
+        disallow_overlap=disallow_overlap,
+        max_jobs=max_jobs,
+    )
+
+    lib_num = ru.get_basket_library(k_num)
+    lib_den = lib_num if k_num == k_den else ru.get_basket_library(k_den)
+    ranker = TopKRanker(top_k)
+
+    logger.info(
+        "Parallel scan: k_num=%d k_den=%d shards=%d workers=%d max_jobs=%s",
+        k_num,
+        k_den,
+        len(shards),
+        workers,
+        max_jobs,
+    )
+    if not shards:
+        return ParallelScanResult(
+            processed_jobs=0,
+            shards=0,
+            top=[],
+            stats=make_scan_stats(config),
+            rankings=make_rankings(config, top_k),
+        )
+
+    processed = 0
+    pruned = PruneStats()
+    stats = make_scan_stats(config)
+    rankings = make_rankings(config, top_k)
+    with ExitStack() as stack:
+        basket_sums: Dict[int, _SharedArray] = {}
+        if ru.basket_cache_enabled:
+            for k in {k_num, k_den}:
+                sums = ru.basket_sums(k)
+                if isinstance(sums, np.memmap):
+                    basket_sums.clear()
+                    break
+                basket_sums[k] = _share_array(stack, sums)
+
+        spec = _WorkerSpec(
+            panel=_share_panel(stack, ru._X),
+            dates=np.asarray(ru.dates),
+            symbols=list(ru.symbols),
+            eps=ru._eps,
+            baskets={lib_num.k: lib_num.baskets, lib_den.k: lib_den.baskets},
+            basket_sums=basket_sums,
+            config=config,
+            k_num=k_num,
+            k_den=k_den,
+            unordered_if_equal_k=unordered_if_equal_k,
+            disallow_overlap=disallow_overlap,
+            top_k=top_k,
+        )
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)),
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(spec,),
+        ) as pool:
+            for index, shard_ranker, shard_processed, shard_pruned, shard_stats, shard_rankings in pool.map(
+                _scan_shard, shards
+            ):
+                ranker.merge(shard_ranker)
+                processed += shard_processed
+                pruned.add(shard_pruned)
+                if stats is not None:
+                    stats.add(shard_stats)
+                if rankings is not None:
+                    rankings.merge(shard_rankings)
+                logger.info("Shard %d/%d done: processed=%d", index + 1, len(shards), shard_processed)
+
+    return ParallelScanResult(
+        processed_jobs=processed,
+        shards=len(shards),
+        top=ranker.items_sorted(descending=True),
+        pruned=pruned,
+        stats=stats,
+        rankings=rankings,
+    )
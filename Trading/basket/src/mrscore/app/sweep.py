@@ -0,0 +1,453 @@
+# mrscore/app/sweep.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+import copy
+import time
+
+import numpy as np
+
+from mrscore.app.composition_root import build_app
+from mrscore.app.scan import compute_returns_inplace
+from mrscore.components.deviation.zscore import ZScoreDeviationDetector
+from mrscore.components.failure.composite import CompositeFailureCriteria
+from mrscore.components.reversion.soft_band import SoftBandReversionCriteria
+from mrscore.config.loader import parse_root_config
+from mrscore.config.models import RootConfig
+from mrscore.core.engine import _tables_by_series
+from mrscore.core.results import Direction, EventStatus
+from mrscore.core.scoring import score_events
+from mrscore.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# Config sections that only act on the z-score series; grid points that differ
+# only here share one mean/volatility pass.
+EVENT_SECTIONS = ("deviation_detector", "reversion_criteria", "failure_criteria", "scoring", "diagnostics")
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """One grid point: the dotted-path overrides and the validated config they produce."""
+    overrides: Dict[str, Any]
+    config: RootConfig
+
+
+@dataclass
+class SweepResult:
+    """
+    Score table of a parameter sweep.
+
+    scores / total_events have shape (len(points), len(jobs)); row i belongs
+    to points[i]. timings holds seconds per stage: "estimators" (mean and
+    volatility passes, driven by the non-event axes), "events" (vectorized
+    evaluation of the event axes), "scoring", and "engine" for points that
+    ran through the engine (freeze settings make mean/vol event-dependent).
+    """
+    points: List[SweepPoint]
+    jobs: List[Any]
+    scores: np.ndarray
+    total_events: np.ndarray
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """One flat dict per (point, job), e.g. for a CSV writer."""
+        out: List[Dict[str, Any]] = []
+        for i, point in enumerate(self.points):
+            for j, job in enumerate(self.jobs):
+                row: Dict[str, Any] = dict(point.overrides)
+                row["job"] = str(job)
+                row["score"] = float(self.scores[i, j])
+                row["total_events"] = int(self.total_events[i, j])
+                out.append(row)
+        return out
+
+
+def expand_grid(base_config: RootConfig, grid: Mapping[str, Sequence[Any]]) -> List[SweepPoint]:
+    """
+    Cartesian product of the grid axes applied to base_config.
+
+    Axes are dotted RootConfig paths, e.g. "deviation_detector.params.threshold"
+    or "mean_estimator.params.span"; points come out in itertools.product order
+    (last axis varies fastest). Every point is re-validated.
+    """
+    paths = list(grid)
+    values = [list(grid[p]) for p in paths]
+    for path, vals in zip(paths, values):
+        if not vals:
+            raise ValueError(f"Grid axis has no values: {path}")
+
+    base = base_config.model_dump()
+    points: List[SweepPoint] = []
+    for combo in product(*values):
+        data = copy.deepcopy(base)
+        for path, value in zip(paths, combo):
+            _set_path(data, path, value)
+        points.append(SweepPoint(overrides=dict(zip(paths, combo)), config=parse_root_config(data)))
+    return points
+
+
+def run_sweep(
+    *,
+    base_config: RootConfig,
+    grid: Mapping[str, Sequence[Any]],
+    prices: np.ndarray,
+    jobs: Optional[Sequence[Any]] = None,
+    block_rows: int = 65_536,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> SweepResult:
+    """
+    Score every grid point on every series of `prices` (B, T).
+
+    Points are grouped by everything outside EVENT_SECTIONS. Each group runs
+    its mean and volatility estimators once over all series (batch API) and
+    caches the z-score series; all detector / reversion / failure / scoring
+    settings of the group are then evaluated together as rows of one array
+    event loop, up to block_rows (points x series) rows at a time. Scores are
+    identical to MeanReversionEngine.run() with the point's config.
+
+    Groups with freeze_mean_on_event / freeze_volatility_on_event (or custom
+    components) have event-dependent estimator paths and go through
+    engine.run_batch per point instead.
+
+    jobs labels the columns (default: range(B)); on_progress(done, total)
+    runs after each evaluated block of points.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.ndim != 2:
+        raise ValueError("prices must be 2D (B, T)")
+    B = int(prices.shape[0])
+    jobs = list(range(B)) if jobs is None else list(jobs)
+    if len(jobs) != B:
+        raise ValueError("jobs must have one entry per prices row")
+    if block_rows < 1:
+        raise ValueError("block_rows must be >= 1")
+
+    points = expand_grid(base_config, grid)
+    event_axes = [p for p in grid if p.split(".", 1)[0] in EVENT_SECTIONS]
+    signal_axes = [p for p in grid if p not in event_axes]
+
+    groups: Dict[tuple, List[int]] = {}
+    for i, point in enumerate(points):
+        key = tuple(repr(point.overrides[p]) for p in signal_axes)
+        groups.setdefault(key, []).append(i)
+
+    scores = np.full((len(points), B), np.nan, dtype=np.float64)
+    total_events = np.zeros((len(points), B), dtype=np.int64)
+    timings = {"estimators": 0.0, "events": 0.0, "scoring": 0.0, "engine": 0.0}
+    done = 0
+
+    logger.info(
+        "Sweep: %d points (%d estimator groups x %d event settings) over %d series; signal axes=%s event axes=%s",
+        len(points),
+        len(groups),
+        len(points) // max(len(groups), 1),
+        B,
+        signal_axes,
+        event_axes,
+    )
+
+    for n_group, idx in enumerate(groups.values(), start=1):
+        first = points[idx[0]]
+        label = {p: first.overrides[p] for p in signal_axes}
+        engine = build_app(first.config).engine
+        returns = _returns_for(first.config, prices)
+
+        if not _supports_shared_signals(engine):
+            t0 = time.perf_counter()
+            for i in idx:
+                eng = build_app(points[i].config).engine
+                results = eng.run_batch(prices=prices, returns=returns)
+                scores[i] = [r.score for r in results]
+                total_events[i] = [r.total_events for r in results]
+                done += 1
+                if on_progress is not None:
+                    on_progress(done, len(points))
+            elapsed = time.perf_counter() - t0
+            timings["engine"] += elapsed
+            logger.info("Sweep group %d/%d %s: %d points via engine in %.2fs", n_group, len(groups), label, len(idx), elapsed)
+            continue
+
+        t0 = time.perf_counter()
+        z, ok, mean, vol = _zscore_series(engine, prices, returns)
+        t_est = time.perf_counter() - t0
+        timings["estimators"] += t_est
+
+        t_ev = t_sc = 0.0
+        chunk = max(1, block_rows // max(B, 1))
+        for c0 in range(0, len(idx), chunk):
+            block = idx[c0 : c0 + chunk]
+            t0 = time.perf_counter()
+            configs = [points[i].config for i in block]
+            closed = _evaluate_events(
+                configs,
+                prices=prices,
+                mean=mean,
+                vol=vol,
+                z=z,
+                ok=ok,
+                allow_overlapping=bool(first.config.engine.allow_overlapping_events),
+                max_active_events=int(first.config.engine.max_active_events),
+            )
+            t1 = time.perf_counter()
+            scores[block], total_events[block] = _score_block(closed, configs, B)
+            t2 = time.perf_counter()
+            t_ev += t1 - t0
+            t_sc += t2 - t1
+            done += len(block)
+            if on_progress is not None:
+                on_progress(done, len(points))
+        timings["events"] += t_ev
+        timings["scoring"] += t_sc
+        logger.info(
+            "Sweep group %d/%d %s: estimators %.2fs, %d event settings %.2fs, scoring %.2fs",
+            n_group,
+            len(groups),
+            label,
+            t_est,
+            len(idx),
+            t_ev,
+            t_sc,
+        )
+
+    return SweepResult(points=points, jobs=jobs, scores=scores, total_events=total_events, timings=timings)
+
+
+def _set_path(data: Dict[str, Any], path: str, value: Any) -> None:
+    keys = path.split(".")
+    node: Any = data
+    for key in keys[:-1]:
+        if not isinstance(node, dict) or not isinstance(node.get(key), dict):
+            raise ValueError(f"Unknown config field: {path}")
+        node = node[key]
+    if not isinstance(node, dict) or keys[-1] not in node:
+        raise ValueError(f"Unknown config field: {path}")
+    node[keys[-1]] = value
+
+
+def _returns_for(config: RootConfig, prices: np.ndarray) -> Optional[np.ndarray]:
+    if config.volatility_estimator.params.volatility_unit != "returns":
+        return None
+    mode = config.data.returns_mode
+    if mode == "none":
+        raise ValueError("volatility_unit is 'returns' but returns_mode is 'none'")
+    B, T = prices.shape
+    out = np.empty((B, max(T - 1, 0)), dtype=np.float64)
+    tmp = np.empty_like(out) if mode == "log" else None
+    return compute_returns_inplace(prices=prices, returns_out=out, tmp_out=tmp, mode=mode)
+
+
+def _supports_shared_signals(engine) -> bool:
+    eng = engine.config.engine
+    return (
+        not eng.freeze_mean_on_event
+        and not eng.freeze_volatility_on_event
+        and hasattr(engine.mean_estimator, "batch")
+        and hasattr(engine.volatility_estimator, "batch")
+        and type(engine.deviation_detector) is ZScoreDeviationDetector
+        and type(engine.reversion_criteria) is SoftBandReversionCriteria
+        and type(engine.failure_criteria) is CompositeFailureCriteria
+    )
+
+
+def _zscore_series(
+    engine, prices: np.ndarray, returns: Optional[np.ndarray]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Unfrozen mean / volatility paths of every series, as the engine sees them.
+
+    Returns z (B, T), ok (B, T) where the engine would act on bar t (warmup
+    done, estimators ready, finite positive volatility, finite z), mean and
+    volatility (B, T).
+    """
+    B, T = prices.shape
+    min_bars_required = int(engine.config.data.min_bars_required)
+    mean_est = engine.mean_estimator.batch(B)
+    vol_est = engine.volatility_estimator.batch(B)
+    mean_est.reset()
+    vol_est.reset()
+
+    mean = np.full((B, T), np.nan, dtype=np.float64)
+    vol = np.full((B, T), np.nan, dtype=np.float64)
+    ready = np.zeros((B, T), dtype=bool)
+    for t in range(T):
+        mean_est.update(prices[:, t], None)
+        if engine.volatility_unit == "price":
+            vol_est.update(prices[:, t], None)
+        elif t >= 1:
+            vol_est.update(returns[:, t - 1], None)
+        if t + 1 < min_bars_required:
+            continue
+        ready[:, t] = mean_est.is_ready() & vol_est.is_ready()
+        mean[:, t] = mean_est.value
+        vol[:, t] = vol_est.value
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (prices - mean) / vol
+    ok = ready & np.isfinite(mean) & np.isfinite(vol) & (vol > 0.0) & np.isfinite(z)
+    return z, ok, mean, vol
+
+
+def _evaluate_events(
+    configs: Sequence[RootConfig],
+    *,
+    prices: np.ndarray,
+    mean: np.ndarray,
+    vol: np.ndarray,
+    z: np.ndarray,
+    ok: np.ndarray,
+    allow_overlapping: bool,
+    max_active_events: int,
+) -> List[tuple]:
+    """
+    Event lifecycles of G configs x B series over cached z-scores.
+
+    State is (G, B, M) event slots, the engine's run_batch() layout with a
+    leading config axis; each config's thresholds broadcast along it. Returns
+    the closure records (see core.engine._tables_by_series) with row g * B + b.
+    """
+    G = len(configs)
+    B, T = prices.shape
+    threshold = np.array([c.deviation_detector.params.threshold for c in configs], dtype=np.float64)[:, None]
+    min_move = np.array([c.deviation_detector.params.min_absolute_move for c in configs], dtype=np.float64)[:, None]
+    z_tol = np.array([c.reversion_criteria.params.z_tolerance for c in configs], dtype=np.float64)[:, None, None]
+    no_limit = np.iinfo(np.int64).max
+    max_dur = np.array(
+        [no_limit if c.failure_criteria.params.max_duration is None else c.failure_criteria.params.max_duration for c in configs],
+        dtype=np.int64,
+    )[:, None, None]
+    max_z = np.array(
+        [np.inf if c.failure_criteria.params.max_zscore is None else c.failure_criteria.params.max_zscore for c in configs],
+        dtype=np.float64,
+    )[:, None, None]
+
+    M = max_active_events if allow_overlapping else 1
+    active = np.zeros((G, B, M), dtype=bool)
+    ev_dir = np.zeros((G, B, M), dtype=np.int8)
+    ev_start = np.zeros((G, B, M), dtype=np.int64)
+    ev_price = np.zeros((G, B, M), dtype=np.float64)
+    ev_mean = np.zeros((G, B, M), dtype=np.float64)
+    ev_vol = np.zeros((G, B, M), dtype=np.float64)
+    ev_z = np.zeros((G, B, M), dtype=np.float64)
+    ev_max = np.zeros((G, B, M), dtype=np.float64)
+    closed: List[tuple] = []
+
+    def _close(mask: np.ndarray, status: EventStatus, t: int, end_prices: np.ndarray, max_abs: np.ndarray) -> None:
+        g, b, m = np.nonzero(mask)
+        closed.append(
+            (
+                g * B + b,
+                status,
+                t,
+                ev_dir[g, b, m],
+                ev_start[g, b, m],
+                ev_price[g, b, m],
+                ev_mean[g, b, m],
+                ev_vol[g, b, m],
+                ev_z[g, b, m],
+                max_abs[g, b, m],
+                end_prices[b],
+            )
+        )
+        active[g, b, m] = False
+
+    for t in np.flatnonzero(ok.any(axis=0)).tolist():
+        valid = ok[:, t]
+        p = prices[:, t]
+        zt = z[:, t]
+        az = np.abs(zt)
+
+        # 1) update active events (revert / fail); reversion beats failure
+        live = active & valid[None, :, None]
+        if live.any():
+            azz = az[None, :, None]
+            max_abs = np.where(live & (azz > ev_max), azz, ev_max)
+            reverted = live & (azz <= z_tol)
+            failed = live & ~reverted & ((t - ev_start >= max_dur) | (azz >= max_z))
+            if reverted.any():
+                _close(reverted, EventStatus.REVERTED, t, p, max_abs)
+            if failed.any():
+                _close(failed, EventStatus.FAILED, t, p, max_abs)
+            ev_max = np.where(live & active, max_abs, ev_max)
+
+        # 2) open new events (ZScoreDeviationDetector.detect_batch with per-config thresholds)
+        n_active = active.sum(axis=2)
+        can_open = valid[None, :] & (n_active < max_active_events)
+        if not allow_overlapping:
+            can_open &= n_active == 0
+        move = p - mean[:, t]
+        hit = can_open & ~(np.abs(move)[None, :] < min_move) & ~(az[None, :] < threshold)
+        g, b = np.nonzero(hit)
+        if g.size == 0:
+            continue
+        slots = np.argmin(active[g, b], axis=1)  # first free slot
+        active[g, b, slots] = True
+        ev_dir[g, b, slots] = np.where(zt[b] > 0.0, Direction.DOWN.sign, Direction.UP.sign)
+        ev_start[g, b, slots] = t
+        ev_price[g, b, slots] = p[b]
+        ev_mean[g, b, slots] = mean[b, t]
+        ev_vol[g, b, slots] = vol[b, t]
+        ev_z[g, b, slots] = zt[b]
+        ev_max[g, b, slots] = az[b]
+
+    if active.any():
+        _close(active.copy(), EventStatus.EXPIRED, T - 1, prices[:, T - 1], ev_max)
+
+    return closed
+
+
+def _score_block(closed: List[tuple], configs: Sequence[RootConfig], B: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (G, B) scores and event counts from the closure records of _evaluate_events().
+
+    reversion_rate and direction scores only need event counts and come
+    straight from the record arrays; other metrics go through score_events()
+    on per-series EventTables, built once per block when first needed.
+    """
+    G = len(configs)
+    R = G * B
+    if closed:
+        rows = np.concatenate([c[0] for c in closed])
+        reverted = np.concatenate([np.full(c[0].size, c[1] == EventStatus.REVERTED) for c in closed])
+        up = np.concatenate([c[3] for c in closed]) == Direction.UP.sign
+    else:
+        rows = np.empty(0, dtype=np.int64)
+        reverted = up = np.empty(0, dtype=bool)
+    total = np.bincount(rows, minlength=R).reshape(G, B)
+    n_rev = np.bincount(rows[reverted], minlength=R).reshape(G, B)
+    up_total = np.bincount(rows[up], minlength=R).reshape(G, B)
+    up_rev = np.bincount(rows[up & reverted], minlength=R).reshape(G, B)
+
+    scores = np.empty((G, B), dtype=np.float64)
+    per_row = None
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for g, cfg in enumerate(configs):
+            scoring = cfg.scoring
+            empty = 0.0 if scoring.record_empty_scores else np.nan
+            if scoring.score_metric == "reversion_rate":
+                scores[g] = np.where(total[g] > 0, n_rev[g] / total[g], empty)
+            elif scoring.score_metric == "direction" and scoring.by_direction:
+                dn_total = total[g] - up_total[g]
+                ratios = np.stack(
+                    [
+                        np.where(up_total[g] > 0, up_rev[g] / up_total[g], empty),
+                        np.where(dn_total > 0, (n_rev[g] - up_rev[g]) / dn_total, empty),
+                    ]
+                )
+                finite = np.isfinite(ratios)
+                score = np.where(finite, ratios, 0.0).sum(axis=0) / finite.sum(axis=0)
+                scores[g] = np.where(total[g] > 0, score, empty)
+            else:
+                if per_row is None:
+                    per_row = _tables_by_series(closed, R)
+                scores[g] = np.array(
+                    [
+                        score_events(events=per_row[g * B + b], scoring=scoring, diagnostics=cfg.diagnostics).score
+                        for b in range(B)
+                    ],
+                    dtype=np.float64,
+                )
+    return scores, total
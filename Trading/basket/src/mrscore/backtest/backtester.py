@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, List, Optional, Sequence
 
 import numpy as np
 
@@ -120,6 +120,14 @@ class RatioMeanReversionBacktester:
         self.freeze_mean_on_event = bool(eng.freeze_mean_on_event)
         self.freeze_volatility_on_event = bool(eng.freeze_volatility_on_event)
 
+    def supports_batch(self) -> bool:
+        """True when the components provide the array API used by run_many()."""
+        return (
+            hasattr(self.mean_estimator, "batch")
+            and hasattr(self.volatility_estimator, "batch")
+            and hasattr(self.deviation_detector, "detect_batch")
+        )
+
     def run_one(
         self,
         *,
@@ -371,3 +379,256 @@ class RatioMeanReversionBacktester:
             trades=trades,
             equity_curve=equity_curve,
         )
+
+    def run_many(
+        self,
+        *,
+        panel: AlignedPanel,
+        ratio_specs: Sequence[RatioSpec],
+        job_ids: Sequence[str],
+    ) -> List[BacktestResult]:
+        """
+        Backtest B ratios in one pass over time; result b matches
+        run_one(ratio_spec=ratio_specs[b]) (equity and trades equal up to float
+        summation order).
+
+        Signals are precomputed as (B, T) arrays, estimators advance through
+        their batch() twins, and cash / holding leg / leg quantities live in
+        (B,) and (B, K) arrays (legs zero-padded to the widest basket). The
+        Python loop runs T times instead of B*T, and Trade objects are only
+        built from the recorded exits at the end.
+
+        Falls back to run_one() per spec when a component has no array API.
+        """
+        bt = self.config.backtest
+        assert bt is not None
+        if bt.strategy.type != "ratio_mean_reversion":
+            raise ValueError(f"Unsupported strategy: {bt.strategy.type}")
+        if len(ratio_specs) != len(job_ids):
+            raise ValueError("ratio_specs and job_ids must have the same length")
+
+        B = len(ratio_specs)
+        X = np.asarray(panel.values, dtype=np.float64)
+        T = int(X.shape[0])
+        if B == 0:
+            return []
+        if T == 0 or not self.supports_batch():
+            return [
+                self.run_one(panel=panel, ratio_spec=spec, job_id=job_id)
+                for spec, job_id in zip(ratio_specs, job_ids)
+            ]
+
+        dates = panel.dates if hasattr(panel, "dates") else (panel.index if hasattr(panel, "index") else None)
+        sig_mode = bt.strategy.params.signal_series
+
+        # Per-series inputs, computed exactly as run_one does
+        num_px = np.empty((B, T), dtype=np.float64)
+        den_px = np.empty((B, T), dtype=np.float64)
+        signal = np.empty((B, T), dtype=np.float64)
+        signal_returns = np.empty((B, max(T - 1, 0)), dtype=np.float64) if self.volatility_unit == "returns" else None
+        for b, spec in enumerate(ratio_specs):
+            num_px[b] = compute_basket_series(panel, spec.numerator)
+            den_px[b] = compute_basket_series(panel, spec.denominator)
+            ratio = compute_ratio_series(panel, spec).astype(np.float64)
+            signal[b] = np.log(np.maximum(ratio, 1e-12)) if sig_mode == "log_ratio" else ratio
+            if signal_returns is not None:
+                if sig_mode == "log_ratio":
+                    np.subtract(signal[b, 1:], signal[b, :-1], out=signal_returns[b])
+                else:
+                    if self.returns_mode not in ("simple", "log"):
+                        raise ValueError(f"Invalid returns_mode: {self.returns_mode}")
+                    signal_returns[b] = _compute_returns_series(series=ratio, mode=self.returns_mode)
+
+        # Leg constituents as (B, K) column indices, zero-padded; +1 = numerator, -1 = denominator
+        k_num = np.array([spec.numerator.indices.size for spec in ratio_specs], dtype=np.int64)
+        k_den = np.array([spec.denominator.indices.size for spec in ratio_specs], dtype=np.int64)
+        K = int(max(k_num.max(), k_den.max()))
+        slots = np.arange(K)
+        num_mask = slots[None, :] < k_num[:, None]
+        den_mask = slots[None, :] < k_den[:, None]
+        num_idx = np.zeros((B, K), dtype=np.int64)
+        den_idx = np.zeros((B, K), dtype=np.int64)
+        for b, spec in enumerate(ratio_specs):
+            num_idx[b, : k_num[b]] = spec.numerator.indices
+            den_idx[b, : k_den[b]] = spec.denominator.indices
+
+        mean_est = self.mean_estimator.batch(B)
+        vol_est = self.volatility_estimator.batch(B)
+        mean_est.reset()
+        vol_est.reset()
+
+        total_bps = float(bt.costs.commission_bps) + float(bt.costs.slippage_bps)
+        bps_rate = total_bps / 10_000.0
+        min_bars_required = int(self.config.data.min_bars_required)
+
+        cash = np.full(B, float(bt.initial_cash), dtype=np.float64)
+        hold = np.zeros(B, dtype=np.int8)
+        qty = np.zeros((B, K), dtype=np.float64)
+        entry_px = np.zeros((B, K), dtype=np.float64)
+        entry_index = np.zeros(B, dtype=np.int64)
+        entry_cost = np.zeros(B, dtype=np.float64)
+        gross_entry = np.zeros(B, dtype=np.float64)
+
+        equity = np.full((B, T), np.nan, dtype=np.float64) if bt.output.store_equity_curve else None
+        marked = np.zeros((B, T), dtype=bool) if equity is not None else None
+        exits: List[tuple] = []
+
+        def leg_prices(t: int) -> tuple[np.ndarray, np.ndarray]:
+            row = X[t]
+            return np.where(num_mask, row[num_idx], 0.0), np.where(den_mask, row[den_idx], 0.0)
+
+        def sell(rows: np.ndarray, t: int, held_px: np.ndarray) -> None:
+            q = qty[rows]
+            px = held_px[rows]
+            value = q * px
+            proceeds = value.sum(axis=1)
+            gross = np.abs(value).sum(axis=1)
+            sell_cost = gross * bps_rate
+            cash[rows] += proceeds - sell_cost
+            pnl = (q * (px - entry_px[rows])).sum(axis=1)
+            exits.append(
+                (rows, t, hold[rows].copy(), entry_index[rows], q, gross_entry[rows], gross, pnl, entry_cost[rows] + sell_cost)
+            )
+            hold[rows] = 0
+            qty[rows] = 0.0
+
+        def buy(rows: np.ndarray, legs: np.ndarray, t: int, num_t: np.ndarray, den_t: np.ndarray) -> None:
+            eq = cash[rows]
+            buy_cost = np.abs(eq) * bps_rate
+            invest = eq - buy_cost
+            is_num = (legs == 1)[:, None]
+            px = np.where(is_num, num_t[rows], den_t[rows])
+            mask = np.where(is_num, num_mask[rows], den_mask[rows])
+            no_cash = invest <= 0.0
+            bad_px = ~no_cash & np.any(mask & (px <= 0.0), axis=1)
+            for b in rows[no_cash].tolist():
+                logger.warning("Skipping buy at t=%d: insufficient equity after costs (equity=%.6f)", t, cash[b])
+            for b, leg in zip(rows[bad_px].tolist(), legs[bad_px].tolist()):
+                logger.warning("Skipping buy at t=%d: non-positive price in leg %s", t, "num" if leg == 1 else "den")
+            ok = ~(no_cash | bad_px)
+            rows, legs, px, mask, invest, buy_cost = rows[ok], legs[ok], px[ok], mask[ok], invest[ok], buy_cost[ok]
+            if rows.size == 0:
+                return
+            per_const = invest / mask.sum(axis=1)
+            q = np.zeros_like(px)
+            np.divide(per_const[:, None], px, out=q, where=mask)
+            qty[rows] = q
+            entry_px[rows] = px
+            cash[rows] = 0.0
+            hold[rows] = legs
+            entry_index[rows] = t
+            entry_cost[rows] = buy_cost
+            gross_entry[rows] = invest
+
+        for t in range(T):
+            s = signal[:, t]
+            flat = np.flatnonzero(hold == 0)
+
+            # Holding a leg counts as an active event for the freeze settings
+            mean_est.update(s, flat if self.freeze_mean_on_event else None)
+            vol_rows = flat if self.freeze_volatility_on_event else None
+            if self.volatility_unit == "price":
+                vol_est.update(s, vol_rows)
+            elif t >= 1:
+                assert signal_returns is not None
+                vol_est.update(signal_returns[:, t - 1], vol_rows)
+
+            if t + 1 < min_bars_required:
+                continue
+            ready = mean_est.is_ready() & vol_est.is_ready()
+            if not ready.any():
+                continue
+
+            num_t, den_t = leg_prices(t)
+            held_px = np.where((hold == 1)[:, None], num_t, den_t)
+            if equity is not None:
+                equity[ready, t] = np.where(hold != 0, cash + (qty * held_px).sum(axis=1), cash)[ready]
+                marked[ready, t] = True
+
+            mean = mean_est.value
+            vol = vol_est.value
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z = (s - mean) / vol
+            valid = ready & np.isfinite(mean) & np.isfinite(vol) & (vol > 0.0) & np.isfinite(z)
+            rows = np.flatnonzero(valid)
+            if rows.size == 0:
+                continue
+
+            # Direction sign doubles as the target leg: UP (+1) -> numerator, DOWN (-1) -> denominator
+            target = np.zeros(B, dtype=np.int8)
+            target[rows] = self.deviation_detector.detect_batch(price=s[rows], mean=mean[rows], volatility=vol[rows])
+
+            opening = valid & (hold == 0)
+            rotating = valid & (hold != 0) & (target != 0) & (target != hold)
+            if rotating.any():
+                sell(np.flatnonzero(rotating), t, held_px)
+            to_buy = np.flatnonzero(opening | rotating)
+            if to_buy.size:
+                legs = np.where(target[to_buy] == 0, np.int8(1), target[to_buy])  # default: numerator
+                buy(to_buy, legs, t, num_t, den_t)
+
+        # End of series: close open holdings at the last bar
+        open_rows = np.flatnonzero(hold != 0)
+        if open_rows.size:
+            num_t, den_t = leg_prices(T - 1)
+            sell(open_rows, T - 1, np.where((hold == 1)[:, None], num_t, den_t))
+            if equity is not None:
+                for b in open_rows.tolist():
+                    last = np.flatnonzero(marked[b])
+                    if last.size:
+                        marked[b, last[-1]] = False
+                    equity[b, T - 1] = cash[b]
+                    marked[b, T - 1] = True
+
+        trades: List[List[Trade]] = [[] for _ in range(B)]
+        if bt.output.store_trades:
+            for rows, t, legs, starts, q, g_entry, g_exit, pnl, costs in exits:
+                for i, b in enumerate(rows.tolist()):
+                    start = int(starts[i])
+                    is_num = legs[i] == 1
+                    leg_q = q[i, : (k_num[b] if is_num else k_den[b])].copy()
+                    trades[b].append(
+                        Trade(
+                            job_id=job_ids[b],
+                            direction=Direction.UP if is_num else Direction.DOWN,
+                            status=EventStatus.EXPIRED,
+                            entry_index=start,
+                            exit_index=t,
+                            duration=t - start,
+                            entry_time=(dates[start] if dates is not None else None),
+                            exit_time=(dates[t] if dates is not None else None),
+                            entry_num=float(num_px[b, start]),
+                            entry_den=float(den_px[b, start]),
+                            exit_num=float(num_px[b, t]),
+                            exit_den=float(den_px[b, t]),
+                            qty_num=leg_q if is_num else np.zeros(k_num[b], dtype=np.float64),
+                            qty_den=np.zeros(k_den[b], dtype=np.float64) if is_num else leg_q,
+                            gross_notional_entry=float(g_entry[i]),
+                            gross_notional_exit=float(g_exit[i]),
+                            pnl=float(pnl[i]),
+                            costs=float(costs[i]),
+                        )
+                    )
+
+        results: List[BacktestResult] = []
+        times = list(dates) if dates is not None else [None] * T  # element scalars, as dates[t] yields
+        for b in range(B):
+            curve = None
+            if equity is not None:
+                idx = np.flatnonzero(marked[b])
+                curve = [
+                    EquityPoint(index=t, time=times[t], equity=e)
+                    for t, e in zip(idx.tolist(), equity[b, idx].tolist())
+                ]
+            final_equity = float(cash[b])
+            results.append(
+                BacktestResult(
+                    job_id=job_ids[b],
+                    initial_cash=float(bt.initial_cash),
+                    final_equity=final_equity,
+                    total_return=float(final_equity / float(bt.initial_cash) - 1.0),
+                    trades=trades[b] if bt.output.store_trades else None,
+                    equity_curve=curve,
+                )
+            )
+        return results
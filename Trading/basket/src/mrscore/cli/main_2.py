@@ -1,24 +1,51 @@
 # main_2.py
 from __future__ import annotations
 
+import argparse
 import csv
+from itertools import islice
 from pathlib import Path
+import signal
+from typing import Callable, Optional, Sequence
 import numpy as np
 
+from mrscore.app.live import LiveRescorer
+from mrscore.app.scan import (
+    PruneStats,
+    ScanCheckpointer,
+    make_prescreen,
+    make_rankings,
+    make_scan_stats,
+    scan_top_k_parallel,
+    score_ratio_jobs,
+    score_ratio_tiles,
+)
 from mrscore.config.loader import load_config
-from mrscore.core.ratio_universe import RatioUniverse, RatioJob
-from mrscore.core.ranking import TopKRanker
+from mrscore.config.models import DiagnosticsConfig
+from mrscore.core.diagnostics import ScanStats
+from mrscore.core.prescreen import RatioPrescreen
+from mrscore.core.ratio_universe import RatioJob, RatioJobTable, RatioUniverse
+from mrscore.core.ranking import MultiTopKRanker, RankedJob, TopKRanker
 from mrscore.io.adapters import AlignedPanel, build_price_panel
 from mrscore.io.cache import (
+    ScanCheckpoint,
+    clear_scan_checkpoint,
     compute_cache_key,
-    load_panel_from_cache,
+    live_snapshot_payload,
+    load_live_snapshot,
     load_ratio_jobs_from_cache,
+    load_scan_checkpoint,
     panel_cache_payload,
+    panel_store_dir,
+    panel_store_payload,
     ratio_jobs_cache_payload,
-    store_panel_to_cache,
+    scan_checkpoint_payload,
+    store_live_snapshot,
     store_ratio_jobs_to_cache,
+    store_scan_checkpoint,
 )
 from mrscore.io.history import OHLC
+from mrscore.io.panel_sync import sync_panel_store
 from mrscore.io.ratio import RatioSpec, build_equal_weight_basket
 from mrscore.io.yfinance_loader import YFinanceLoader, YFinanceLoadRequest
 from mrscore.utils.logging import get_logger
@@ -33,37 +60,6 @@ logger = get_logger(__name__)
 
 
 
-def _compute_returns_inplace(
-    *,
-    prices: np.ndarray,
-    returns_out: np.ndarray,
-    tmp_out: np.ndarray | None,
-    mode: str,
-) -> np.ndarray:
-    """
-    Compute returns from prices into a preallocated output array.
-
-    prices: shape (T,)
-    returns_out: shape (T-1,)
-    tmp_out: shape (T-1,) if mode=="log", else None
-    mode: "log" | "simple"
-    """
-    if mode == "simple":
-        np.divide(prices[1:], prices[:-1], out=returns_out)
-        returns_out -= 1.0
-        return returns_out
-
-    if mode == "log":
-        if tmp_out is None:
-            raise ValueError("tmp_out is required for log returns")
-        np.log(prices[1:], out=returns_out)   # log(p_t)
-        np.log(prices[:-1], out=tmp_out)      # log(p_{t-1})
-        returns_out -= tmp_out
-        return returns_out
-
-    raise ValueError(f"Invalid returns mode: {mode}")
-
-
 def _select_top_k_jobs(
     *,
     ru: RatioUniverse,
@@ -74,7 +70,16 @@ def _select_top_k_jobs(
     k_den: int,
     max_jobs: int | None,
     top_k: int,
-    jobs: list[RatioJob] | None = None,
+    jobs: RatioJobTable | list[RatioJob] | None = None,
+    batch_size: int | None = None,
+    ranker: TopKRanker | None = None,
+    start: int = 0,
+    processed: int = 0,
+    on_progress: Optional[Callable[[int, int], bool]] = None,
+    prune_stats: PruneStats | None = None,
+    scan_stats: ScanStats | None = None,
+    rankings: MultiTopKRanker | None = None,
+    prescreen: RatioPrescreen | None = None,
 ) -> tuple[list[RatioJob], dict[RatioJob, float], int]:
     """
     Streaming top-k selection by REAL engine score.
@@ -82,61 +87,48 @@ def _select_top_k_jobs(
     - avoids storing all scores
     - O(J log K)
     - uses preallocated buffers for ratio + returns
+    - a RatioJobTable is scored from its id arrays; RatioJobs are built only
+      for the jobs that enter the top-k
+    - with batch_size, scores blocks of ratios per engine.run_batch call
+    - resumes from a checkpoint via ranker/start/processed: jobs before `start`
+      are skipped and already reflected in the ranker and `processed`
+    - on_progress(position, processed) sees absolute counts (see score_ratio_jobs)
+    - rankings keeps extra per-metric / per-group top-k rankings (see
+      MultiTopKRanker); a resumed scan only feeds it the remaining jobs
+    - with prescreen, only the best fraction of each block reaches the engine;
+      checkpoints fall on block boundaries, so resuming keeps the selection
     """
-    ranker = TopKRanker(top_k)
-
-    # Reuse a buffer to avoid allocating (T,) arrays for every ratio
-    T = ru._X.shape[0]  # if you prefer, add a public property on RatioUniverse
-    price_buf = np.empty(T, dtype=np.float64)
-
-    # Returns buffers (only if needed)
-    ret_buf = None
-    tmp_buf = None
-    if vol_unit == "returns":
-        if returns_mode == "none":
-            raise ValueError("volatility_unit is 'returns' but returns_mode is 'none'")
-        ret_buf = np.empty(T - 1, dtype=np.float64)
-        if returns_mode == "log":
-            tmp_buf = np.empty(T - 1, dtype=np.float64)
-
-    # Track scores for plotting
-    scores: dict[RatioJob, float] = {}
-
-    processed = 0
+    if ranker is None:
+        ranker = TopKRanker(top_k)
+
     job_iter = jobs if jobs is not None else ru.iter_ratio_jobs(
         k_num=k_num, k_den=k_den, max_jobs=max_jobs
     )
-    for job in job_iter:
-        ru.compute_ratio_series_into(price_buf, job)
-
-        # Prepare returns if required by engine/vol unit
-        returns = None
-        if vol_unit == "returns":
-            assert ret_buf is not None
-            returns = _compute_returns_inplace(
-                prices=price_buf,
-                returns_out=ret_buf,
-                tmp_out=tmp_buf,
-                mode=returns_mode,
-            )
+    if start:
+        job_iter = job_iter[start:] if isinstance(job_iter, RatioJobTable) else islice(job_iter, start, None)
 
-        result = engine.run(prices=price_buf, returns=returns, dates=ru.dates)
-        score = float(result.score)
+    progress = None
+    if on_progress is not None:
+        def progress(consumed: int, scored: int) -> bool:
+            return on_progress(start + consumed, processed + scored)
 
-        # Skip NaN scores (e.g., record_empty_scores=False with 0 events)
-        if not np.isfinite(score):
-            continue
-
-        ranker.consider(job=job, score=score)
-        # store score for this job if it makes it into the heap; to keep it simple, store always
-        scores[job] = score
-        processed += 1
+    processed += score_ratio_jobs(
+        ru=ru,
+        engine=engine,
+        jobs=job_iter,
+        ranker=ranker,
+        returns_mode=returns_mode,
+        vol_unit=vol_unit,
+        batch_size=batch_size,
+        on_progress=progress,
+        prune_stats=prune_stats,
+        scan_stats=scan_stats,
+        rankings=rankings,
+        prescreen=prescreen,
+    )
 
     top = ranker.items_sorted(descending=True)
-
-    if top:
-        logger.info("Top-1 score=%f job=%s", top[0].score, top[0].job)
-        logger.info("Top-%d cutoff score=%f", len(top), top[-1].score)
+    _log_top(top)
 
     jobs = [r.job for r in top]
     # Only return scores for the selected top jobs (keeps plot legend clean)
@@ -144,6 +136,57 @@ def _select_top_k_jobs(
     return jobs, top_scores, processed
 
 
+def _report_scan_stats(stats: ScanStats, diagnostics: DiagnosticsConfig) -> None:
+    counters = stats.counters
+    logger.info(
+        "Scan stats: jobs=%d nan_scores=%d events=%d (reverted=%d failed=%d expired=%d) heap_replacements=%d",
+        counters["jobs"],
+        counters["nan_scores"],
+        counters["events_opened"],
+        counters["events_reverted"],
+        counters["events_failed"],
+        counters["events_expired"],
+        counters["heap_replacements"],
+    )
+    for stage, row in stats.to_dict()["stages"].items():
+        if row["seconds_per_job"] is not None:
+            logger.info(
+                "Scan stage %s: %.1f us/job over %d sampled jobs, ~%.2fs total",
+                stage,
+                row["seconds_per_job"] * 1e6,
+                row["sampled_jobs"],
+                row["estimated_seconds"],
+            )
+    if diagnostics.scan_stats_json:
+        logger.info("Scan stats report: %s", stats.write_json(diagnostics.scan_stats_json))
+    if diagnostics.scan_stats_prometheus:
+        logger.info("Scan stats Prometheus file: %s", stats.write_prometheus(diagnostics.scan_stats_prometheus))
+
+
+def _report_rankings(ru: RatioUniverse, rankings: MultiTopKRanker, path: str = "rankings.csv") -> None:
+    rows: list[dict[str, object]] = []
+    for metric in rankings.metrics:
+        for group, top in rankings.groups(metric).items():
+            if top:
+                label = metric if group is None else f"{metric} {rankings.group_by}={group}"
+                logger.info("Ranking %s: top-1 %s=%f job=%s (%d kept)", label, metric, top[0].score, top[0].job, len(top))
+            for rank, item in enumerate(top, start=1):
+                _, job_id = _job_to_ratio_spec(ru, item.job)
+                rows.append({"metric": metric, "group": group, "rank": rank, "job_id": job_id, "value": item.score})
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["metric", "group", "rank", "job_id", "value"])
+        writer.writeheader()
+        writer.writerows(rows)
+    logger.info("Wrote rankings CSV: %s rows=%d", path, len(rows))
+
+
+def _log_top(top: list[RankedJob]) -> None:
+    if top:
+        logger.info("Top-1 score=%f job=%s", top[0].score, top[0].job)
+        logger.info("Top-%d cutoff score=%f", len(top), top[-1].score)
+
+
 def _job_to_ratio_spec(ru: RatioUniverse, job: RatioJob) -> tuple[RatioSpec, str]:
     lib_num = ru.get_basket_library(job.k_num)
     lib_den = lib_num if job.k_num == job.k_den else ru.get_basket_library(job.k_den)
@@ -274,7 +317,26 @@ def _summarize_trades_for_job(
     return "\n".join(lines), rows
 
 
-def main():
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rank basket ratios by engine score and backtest the top-k.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted scan from its checkpoint in the cache directory",
+    )
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help=(
+            "rescore the previous run's top-k on the bars added since, from its live snapshot in the cache "
+            "directory, instead of rescanning (scans and stores a snapshot when there is none)"
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
     cfg = load_config("config.yaml")  # loader returns RootConfig in your project
     tickers = cfg.data.tickers
     period = cfg.data.period
@@ -282,6 +344,7 @@ def main():
     ending_date = cfg.data.ending_date
     cache_cfg = cfg.data.cache
     cache_root = Path(cache_cfg.path).expanduser() if cache_cfg.enabled else None
+    download_cfg = cfg.data.download
 
     # Build composed application (engine + components)
     app = build_app(cfg)
@@ -304,26 +367,91 @@ def main():
         union_fill="none",
     )
     panel_key = compute_cache_key(panel_payload)
+    ratio_cfg = cfg.ratio_universe
+    top_k = cfg.visualization.top_k or 10
+    ratio_jobs_payload = ratio_jobs_cache_payload(
+        panel_key=panel_key,
+        k_num=ratio_cfg.k_num,
+        k_den=ratio_cfg.k_den,
+        unordered_if_equal_k=ratio_cfg.unordered_if_equal_k,
+        disallow_overlap=ratio_cfg.disallow_overlap,
+        max_jobs=ratio_cfg.max_jobs,
+    )
+    ratio_jobs_key = compute_cache_key(ratio_jobs_payload)
+    # every config section that changes which jobs are scored or their scores
+    scoring_payload = cfg.model_dump(
+        mode="json",
+        include={
+            "engine": True,
+            "data": True,
+            "mean_estimator": True,
+            "volatility_estimator": True,
+            "deviation_detector": True,
+            "reversion_criteria": True,
+            "failure_criteria": True,
+            "scoring": True,
+            # the pre-screen decides which jobs are scored at all
+            "ratio_universe": {"prescreen_fraction", "prescreen_metric", "prescreen_block"},
+        },
+    )
+
+    snapshot = None
+    live_key = None
+    if args.live:
+        if cache_root is None:
+            logger.warning("--live needs data.cache.enabled; scanning without a live snapshot")
+        else:
+            live_key = compute_cache_key(
+                live_snapshot_payload(ratio_jobs_key=ratio_jobs_key, top_k=top_k, scoring=scoring_payload)
+            )
+            snapshot = load_live_snapshot(cache_root, ratio_jobs_key, live_key=live_key)
+            if snapshot is None:
+                logger.info("No live snapshot found; scanning")
 
-    panel_raw = None
+    load_request = YFinanceLoadRequest(
+        tickers=tickers,
+        period=period,
+        interval=interval,
+        auto_adjust=True,
+        ending_date=ending_date,
+        cache_enabled=cache_cfg.enabled,
+        cache_path=cache_cfg.path,
+        max_workers=download_cfg.workers,
+        rate_limit_per_s=download_cfg.rate_limit_per_s,
+        rate_burst=download_cfg.rate_burst,
+        max_retries=download_cfg.max_retries,
+        retry_backoff_s=download_cfg.retry_backoff_s,
+    )
+    loader = YFinanceLoader()
     if cache_root is not None:
-        panel_raw = load_panel_from_cache(cache_root, panel_key)
-        if panel_raw is not None:
-            logger.info("Panel cache hit: %s", panel_key)
-
-    if panel_raw is None:
-        loader = YFinanceLoader()
-        histories = loader.load(
-            YFinanceLoadRequest(
+        # Append-only store: only bars newer than the stored ones are downloaded.
+        store_key = compute_cache_key(
+            panel_store_payload(
                 tickers=tickers,
-                period=period,
                 interval=interval,
-                auto_adjust=True,
-                ending_date=ending_date,
-                cache_enabled=cache_cfg.enabled,
-                cache_path=cache_cfg.path,
+                price_field=cfg.data.price_field,
+                auto_adjust=load_request.auto_adjust,
             )
         )
+        synced = sync_panel_store(
+            panel_store_dir(cache_root, store_key),
+            loader=loader,
+            request=load_request,
+            field=OHLC.CLOSE,
+            # keep the snapshot's first bar: the period window moves with today
+            start=np.datetime64(snapshot["first_date"]) if snapshot and snapshot["first_date"] else None,
+        )
+        panel_raw = synced.panel
+        logger.info(
+            "Panel store %s: rows=%d fetched=%d written=%d rebuilt=%s",
+            store_key,
+            len(panel_raw.dates),
+            synced.fetched_rows,
+            synced.written_rows,
+            synced.rebuilt,
+        )
+    else:
+        histories = loader.load(load_request)
         logger.info("Loaded histories: %d tickers", len(histories))
 
         panel_raw = build_price_panel(
@@ -333,17 +461,22 @@ def main():
             align="intersection",
             normalize_by_first=False,
         )
-        if cache_root is not None:
-            store_panel_to_cache(cache_root, panel_key, panel_raw, panel_payload)
+    # No copy: RatioUniverse never writes to the panel, and a cached panel is a
+    # read-only memmap that RatioUniverse normalizes into its own array.
     panel_for_ru = AlignedPanel(
         dates=panel_raw.dates,
         symbols=panel_raw.symbols,
-        values=panel_raw.values.copy(),
+        values=panel_raw.values,
+    )
+    ru = RatioUniverse(
+        panel=panel_for_ru,
+        normalize_by_first=True,
+        eps=1e-12,
+        basket_cache=ratio_cfg.basket_cache,
+        basket_cache_max_bytes=(
+            int(ratio_cfg.basket_cache_max_mb * 1024 * 1024) if ratio_cfg.basket_cache_max_mb is not None else None
+        ),
     )
-    ru = RatioUniverse(panel=panel_for_ru, normalize_by_first=True, eps=1e-12)
-
-    top_k = cfg.visualization.top_k or 10
-    ratio_cfg = cfg.ratio_universe
 
     logger.info(
         "Ranking top %d ratio jobs by engine score (k_num=%d k_den=%d max_jobs=%s returns_mode=%s vol_unit=%s)",
@@ -355,52 +488,190 @@ def main():
         vol_unit,
     )
 
-    ratio_jobs_payload = ratio_jobs_cache_payload(
-        panel_key=panel_key,
-        k_num=ratio_cfg.k_num,
-        k_den=ratio_cfg.k_den,
-        unordered_if_equal_k=ratio_cfg.unordered_if_equal_k,
-        disallow_overlap=ratio_cfg.disallow_overlap,
-        max_jobs=ratio_cfg.max_jobs,
-    )
-    ratio_jobs_key = compute_cache_key(ratio_jobs_payload)
-
-    ratio_jobs = None
-    if cache_root is not None:
-        ratio_jobs = load_ratio_jobs_from_cache(cache_root, ratio_jobs_key, ru=ru)
-        if ratio_jobs is not None:
-            logger.info("Ratio jobs cache hit: %s (jobs=%d)", ratio_jobs_key, len(ratio_jobs))
+    pruned = PruneStats()
+    scan_stats = make_scan_stats(cfg)
+    rankings = make_rankings(cfg, top_k)
+    prescreen = make_prescreen(cfg)
+
+    live = None
+    if snapshot is not None:
+        if synced.rebuilt:
+            logger.info("Panel store was rebuilt; discarding the live snapshot and scanning")
+        else:
+            live = LiveRescorer.from_dict(engine, snapshot)
+            stepped = live.extend(panel_raw)
+            if stepped is None:
+                logger.info("Panel does not extend the live snapshot's history; scanning")
+                live = None
+            else:
+                logger.info("Live rescoring: %d tracked jobs advanced by %d bars", len(live), stepped)
+
+    if live is not None:
+        top = live.top(top_k)
+        jobs = [r.job for r in top]
+        scores = {r.job: r.score for r in top}
+        processed_jobs = len(top)
+        scan_stats = None
+        if rankings is not None:
+            logger.warning("ratio_universe.rank_by rankings are not kept by --live; rerun without it to rank")
+            rankings = None
+        _log_top(top)
+    elif ratio_cfg.workers is not None and ratio_cfg.workers > 1:
+        # Sharded scan: workers generate their own job ranges, so no job list is materialized.
+        scan = scan_top_k_parallel(
+            ru,
+            cfg,
+            k_num=ratio_cfg.k_num,
+            k_den=ratio_cfg.k_den,
+            top_k=top_k,
+            unordered_if_equal_k=ratio_cfg.unordered_if_equal_k,
+            disallow_overlap=ratio_cfg.disallow_overlap,
+            max_jobs=ratio_cfg.max_jobs,
+            workers=ratio_cfg.workers,
+        )
+        jobs = [r.job for r in scan.top]
+        scores = {r.job: r.score for r in scan.top}
+        processed_jobs = scan.processed_jobs
+        pruned = scan.pruned
+        scan_stats = scan.stats
+        rankings = scan.rankings
+        _log_top(scan.top)
+    elif ratio_cfg.block_size is not None and ratio_cfg.max_jobs is None:
+        # Blocked scan: ratios are computed tile by tile, no job list is materialized.
+        ranker = TopKRanker(top_k)
+        processed_jobs = score_ratio_tiles(
+            ru=ru,
+            engine=engine,
+            tiles=ru.scan_blocks(
+                k_num=ratio_cfg.k_num,
+                k_den=ratio_cfg.k_den,
+                block_num=ratio_cfg.block_size,
+                block_den=ratio_cfg.block_size,
+                unordered_if_equal_k=ratio_cfg.unordered_if_equal_k,
+                disallow_overlap=ratio_cfg.disallow_overlap,
+            ),
+            ranker=ranker,
+            returns_mode=returns_mode,
+            vol_unit=vol_unit,
+            batch_size=cfg.engine.batch_size,
+            prune_stats=pruned,
+            scan_stats=scan_stats,
+            rankings=rankings,
+            prescreen=prescreen,
+        )
+        top = ranker.items_sorted(descending=True)
+        jobs = [r.job for r in top]
+        scores = {r.job: r.score for r in top}
+        _log_top(top)
+    else:
+        ratio_jobs = None
+        if cache_root is not None:
+            ratio_jobs = load_ratio_jobs_from_cache(cache_root, ratio_jobs_key, ru=ru)
+            if ratio_jobs is not None:
+                logger.info("Ratio jobs cache hit: %s (jobs=%d)", ratio_jobs_key, len(ratio_jobs))
 
-    if ratio_jobs is None:
-        ratio_jobs = list(
-            ru.iter_ratio_jobs(
+        if ratio_jobs is None:
+            ratio_jobs = ru.job_table(
                 k_num=ratio_cfg.k_num,
                 k_den=ratio_cfg.k_den,
                 unordered_if_equal_k=ratio_cfg.unordered_if_equal_k,
                 disallow_overlap=ratio_cfg.disallow_overlap,
                 max_jobs=ratio_cfg.max_jobs,
             )
+            if cache_root is not None:
+                store_ratio_jobs_to_cache(
+                    cache_root,
+                    ratio_jobs_key,
+                    ru=ru,
+                    jobs=ratio_jobs,
+                    payload=ratio_jobs_payload,
+                )
+
+        scan_key = compute_cache_key(
+            scan_checkpoint_payload(
+                ratio_jobs_key=ratio_jobs_key,
+                top_k=top_k,
+                panel_end=str(panel_raw.dates[-1]) if len(panel_raw.dates) else None,
+                scoring=scoring_payload,
+            )
         )
-        if cache_root is not None:
-            store_ratio_jobs_to_cache(
-                cache_root,
-                ratio_jobs_key,
+        resume = None
+        if args.resume:
+            if cache_root is None:
+                logger.warning("--resume needs data.cache.enabled; scanning from the start")
+            else:
+                resume = load_scan_checkpoint(cache_root, ratio_jobs_key, scan_key=scan_key)
+                if resume is None:
+                    logger.info("No scan checkpoint found; scanning from the start")
+                else:
+                    logger.info("Resuming scan at job %d of %d", resume.position, len(ratio_jobs))
+                    if rankings is not None:
+                        logger.warning("ratio_universe.rank_by rankings only cover the jobs scored after resuming")
+
+        ranker = TopKRanker(top_k)
+        if resume is not None:
+            for item, order in resume.entries:
+                ranker.consider(job=item.job, score=item.score, order=order)
+
+        checkpointer = None
+        previous_sigterm = None
+        if cache_root is not None and ratio_cfg.checkpoint_interval_s is not None:
+            def save_checkpoint(position: int, processed: int) -> None:
+                store_scan_checkpoint(
+                    cache_root,
+                    ratio_jobs_key,
+                    ScanCheckpoint(scan_key=scan_key, position=position, processed=processed, entries=ranker.entries()),
+                )
+
+            checkpointer = ScanCheckpointer(save_checkpoint, interval_s=ratio_cfg.checkpoint_interval_s)
+            previous_sigterm = signal.signal(signal.SIGTERM, checkpointer.request_stop)
+
+        try:
+            jobs, scores, processed_jobs = _select_top_k_jobs(
                 ru=ru,
+                engine=engine,
+                returns_mode=returns_mode,
+                vol_unit=vol_unit,
+                k_num=ratio_cfg.k_num,
+                k_den=ratio_cfg.k_den,
+                max_jobs=ratio_cfg.max_jobs,
+                top_k=top_k,
                 jobs=ratio_jobs,
-                payload=ratio_jobs_payload,
+                batch_size=cfg.engine.batch_size,
+                ranker=ranker,
+                start=resume.position if resume is not None else 0,
+                processed=resume.processed if resume is not None else 0,
+                on_progress=checkpointer,
+                prune_stats=pruned,
+                scan_stats=scan_stats,
+                rankings=rankings,
+                prescreen=prescreen,
+            )
+        finally:
+            if previous_sigterm is not None:
+                signal.signal(signal.SIGTERM, previous_sigterm)
+
+        if checkpointer is not None:
+            if checkpointer.stop_requested:
+                logger.warning("Scan stopped by SIGTERM; checkpoint saved, rerun with --resume to continue")
+                return 1
+            clear_scan_checkpoint(cache_root, ratio_jobs_key)
+        if ru.basket_cache_enabled:
+            stats = ru.basket_cache_stats()
+            logger.info(
+                "Basket-sum cache: hit_rate=%.3f memory_bytes=%d mapped_bytes=%d ks=%s",
+                stats.hit_rate,
+                stats.memory_bytes,
+                stats.mapped_bytes,
+                stats.ks,
             )
 
-    jobs, scores, processed_jobs = _select_top_k_jobs(
-        ru=ru,
-        engine=engine,
-        returns_mode=returns_mode,
-        vol_unit=vol_unit,
-        k_num=ratio_cfg.k_num,
-        k_den=ratio_cfg.k_den,
-        max_jobs=ratio_cfg.max_jobs,
-        top_k=top_k,
-        jobs=ratio_jobs,
-    )
+    if live_key is not None:
+        if live is None and jobs:
+            live = LiveRescorer.track(ru, engine, jobs, returns_mode=returns_mode, vol_unit=vol_unit)
+        if live is not None:
+            store_live_snapshot(cache_root, ratio_jobs_key, live.to_dict(), live_key=live_key)
+
     total_possible = ru.estimate_ratio_count(
         k_num=ratio_cfg.k_num,
         k_den=ratio_cfg.k_den,
@@ -408,10 +679,29 @@ def main():
         disallow_overlap=ratio_cfg.disallow_overlap,
     )
     logger.info(
-        "Ratio jobs considered: %d of ~%d possible (C(N,k) based upper bound; overlap filter may reduce actual)",
+        "Ratio jobs considered: %d of %d possible",
         processed_jobs,
         total_possible,
     )
+    if cfg.engine.early_abandon:
+        logger.info(
+            "Early abandon: pruned %d of %d jobs, skipped %d of %d bars",
+            pruned.jobs,
+            processed_jobs,
+            pruned.bars,
+            processed_jobs * len(ru.dates),
+        )
+    if prescreen is not None:
+        logger.info(
+            "Pre-screen (%s, fraction=%g): %d jobs dropped before the engine",
+            prescreen.metric,
+            prescreen.fraction,
+            pruned.screened,
+        )
+    if scan_stats is not None:
+        _report_scan_stats(scan_stats, cfg.diagnostics)
+    if rankings is not None:
+        _report_rankings(ru, rankings)
 
     trades_by_job = None
     equity_by_job = None
@@ -420,11 +710,18 @@ def main():
         trades_by_job = {}
         equity_by_job = {}
         trade_rows: list[dict[str, object]] = []
-        for job in jobs:
-            spec, job_id = _job_to_ratio_spec(ru, job)
-            # Use the normalized panel so backtest signals match what the engine scored on.
-            # raw_panel is used only for price reporting in _summarize_trades_for_job.
-            result = app.backtester.run_one(panel=panel_for_ru, ratio_spec=spec, job_id=job_id)
+        specs = [_job_to_ratio_spec(ru, job) for job in jobs]
+        # Use the normalized panel so backtest signals match what the engine scored on.
+        # raw_panel is used only for price reporting in _summarize_trades_for_job.
+        if cfg.backtest.kernel == "batch":
+            results = app.backtester.run_many(
+                panel=panel_for_ru,
+                ratio_specs=[spec for spec, _ in specs],
+                job_ids=[job_id for _, job_id in specs],
+            )
+        else:
+            results = [app.backtester.run_one(panel=panel_for_ru, ratio_spec=spec, job_id=job_id) for spec, job_id in specs]
+        for job, (spec, job_id), result in zip(jobs, specs, results):
             bt_results.append(result)
             trades_by_job[job] = result.trades or []
             equity_by_job[job] = result
@@ -462,7 +759,8 @@ def main():
         equity_by_job=equity_by_job,
         show=True,
     )
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
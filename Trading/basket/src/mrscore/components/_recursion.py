@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from math import log
+
+import numpy as np
+
+
+# Within a chunk of the closed form below the running product of coefficients
+# stays above 2**-40, so b / prod cannot overflow.
+_MAX_LOG_RANGE = 40.0 * log(2.0)
+
+
+def linear_recursion(a, b: np.ndarray, init) -> np.ndarray:
+    """
+    Solve y[..., t] = a[t] * y[..., t-1] + b[..., t] along the last axis,
+    with y[..., -1] = init.
+
+    a: scalar or shape (T,), every entry in [0, 1]; b: shape (..., T);
+    init: scalar or shape b.shape[:-1].
+
+    A constant `a` runs through scipy.signal.lfilter when scipy is installed
+    (the same multiply-add as the streaming update). Otherwise the recursion
+    is evaluated in chunks with cumulative products and sums:
+        y[s+k] = P[k] * (y[s-1] + sum_{j<=k} b[s+j] / P[j]),  P[k] = prod_{j<=k} a[s+j]
+    which agrees with the sequential loop to a few ulps of the inputs' scale.
+    """
+    b = np.asarray(b, dtype=np.float64)
+    T = b.shape[-1]
+    prev = np.array(np.broadcast_to(np.asarray(init, dtype=np.float64), b.shape[:-1]))
+    out = np.empty_like(b)
+    if T == 0:
+        return out
+
+    if np.ndim(a) == 0:
+        lfilter = _lfilter()
+        if lfilter is not None:
+            a = float(a)
+            return lfilter([1.0], [1.0, -a], b, axis=-1, zi=(a * prev)[..., None])[0]
+
+    coef = np.broadcast_to(np.asarray(a, dtype=np.float64), (T,))
+    # Chunks end where the running product would drop below exp(-_MAX_LOG_RANGE);
+    # zero coefficients (the state is forgotten) are single-step chunks.
+    zero = coef <= 0.0
+    with np.errstate(divide="ignore"):
+        decay = np.where(zero, 0.0, -np.log(np.where(zero, 1.0, coef)))
+    cum = np.cumsum(decay)
+    zeros = np.flatnonzero(zero)
+
+    s = 0
+    while s < T:
+        if zero[s]:
+            e = s + 1
+        else:
+            e = int(np.searchsorted(cum, (cum[s - 1] if s else 0.0) + _MAX_LOG_RANGE, side="right"))
+            nxt = int(np.searchsorted(zeros, s))
+            e = min(max(e, s + 1), int(zeros[nxt]) if nxt < zeros.size else T)
+        if e - s == 1:
+            prev = coef[s] * prev + b[..., s]
+            out[..., s] = prev
+        else:
+            prod = np.cumprod(coef[s:e])
+            out[..., s:e] = prod * (prev[..., None] + np.cumsum(b[..., s:e] / prod, axis=-1))
+            prev = out[..., e - 1]
+        s = e
+    return out
+
+
+def window_sums(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing sums over the last `window` entries (fewer during warm-up), along the last axis.
+
+    Cumulative sums restart every `window` entries: a trailing window is the
+    prefix of its block plus the suffix of the previous one, so rounding is
+    bounded by one window's magnitude rather than growing with the series.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    lead, T = x.shape[:-1], x.shape[-1]
+    blocks = -(-T // window)
+    padded = np.zeros(lead + (blocks * window,), dtype=np.float64)
+    padded[..., :T] = x
+    padded = padded.reshape(lead + (blocks, window))
+    out = np.cumsum(padded, axis=-1)
+    # suffix[..., b, j] = sum of block b from entry j on
+    suffix = np.cumsum(padded[..., ::-1], axis=-1)[..., ::-1]
+    out[..., 1:, :-1] += suffix[..., :-1, 1:]
+    out = out.reshape(lead + (blocks * window,))[..., :T]
+    bad = ~np.isfinite(x)
+    if bad.any():
+        # like a streaming running sum, stay NaN once a non-finite entry has left the window
+        seen = np.cumsum(bad, axis=-1)
+        out[..., window:][seen[..., :-window] > 0] = np.nan
+    return out
+
+
+def window_counts(T: int, window: int) -> np.ndarray:
+    """Observations inside the trailing window at each step: 1, 2, ..., window, window, ..."""
+    return np.minimum(np.arange(1, T + 1, dtype=np.int64), window)
+
+
+def _lfilter():
+    try:
+        from scipy.signal import lfilter
+    except Exception:
+        return None
+    return lfilter
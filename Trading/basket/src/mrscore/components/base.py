@@ -0,0 +1,50 @@
+# components/base.py
+from __future__ import annotations
+
+from typing import Any, Protocol
+
+import numpy as np
+
+
+class Estimator(Protocol):
+    """
+    Streaming mean or volatility estimator, as the engine drives it
+    (RollingSMA, EMA, KalmanMean, RollingStd, EWMAVol, GARCH11Vol).
+
+    update(x) consumes one observation (a price, or a return for volatility
+    in returns units) and returns the new value; value may be used once
+    is_ready(). reset() goes back to the state before the first update().
+    is_ready() depends only on the number of update() calls: it holds from
+    the warmup-th one on.
+
+    transform(series) gives the update() values over a whole series at once,
+    as from the reset state, without touching the estimator's state. series
+    has shape (T,) or (B, T), one series per row. Implementations run array
+    recursions, so they equal update() up to rounding.
+
+    batch(size) returns a fresh twin holding array state for `size` series
+    advanced in lockstep: update(x, rows) advances only `rows` (all when
+    None), and value / is_ready() are arrays. Its arithmetic mirrors update()
+    exactly, which run_batch() relies on.
+
+    get_state() returns the streaming state as plain (JSON-safe) Python
+    values; set_state() on an estimator with the same parameters restores it
+    exactly, so later update()s match bit for bit (LiveState snapshots).
+    """
+
+    value: float
+    warmup: int
+
+    def reset(self) -> None: ...
+
+    def update(self, x: float) -> float: ...
+
+    def is_ready(self) -> bool: ...
+
+    def transform(self, series: np.ndarray) -> np.ndarray: ...
+
+    def batch(self, size: int) -> Any: ...
+
+    def get_state(self) -> dict: ...
+
+    def set_state(self, state: dict) -> None: ...
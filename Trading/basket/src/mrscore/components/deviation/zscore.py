@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import numpy as np
+
 from mrscore.core.results import Direction
 
 
@@ -40,3 +42,18 @@ class ZScoreDeviationDetector:
             return None
 
         return Direction.DOWN if z > 0.0 else Direction.UP
+
+    def detect_batch(self, *, price: np.ndarray, mean: np.ndarray, volatility: np.ndarray) -> np.ndarray:
+        """
+        Array form of detect(): returns int8 direction signs (Direction.sign),
+        0 where no event starts.
+        """
+        vol = np.asarray(volatility, dtype=np.float64)
+        move = np.asarray(price, dtype=np.float64) - np.asarray(mean, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = move / vol
+        hit = ~(vol <= 0.0) & ~(np.abs(move) < self.min_absolute_move) & ~(np.abs(z) < self.threshold)
+        out = np.zeros(z.shape, dtype=np.int8)
+        out[hit & (z > 0.0)] = Direction.DOWN.sign
+        out[hit & ~(z > 0.0)] = Direction.UP.sign
+        return out
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import numpy as np
+
 
 class CompositeFailureCriteria:
     def __init__(self, *, max_duration: int | None, max_zscore: float | None) -> None:
@@ -21,3 +23,13 @@ class CompositeFailureCriteria:
         if self.max_zscore is not None and abs(z) >= self.max_zscore:
             return True
         return False
+
+    def is_failed_batch(self, *, duration: np.ndarray, zscore: np.ndarray) -> np.ndarray:
+        d = np.asarray(duration)
+        z = np.asarray(zscore, dtype=np.float64)
+        failed = np.zeros(np.broadcast(d, z).shape, dtype=bool)
+        if self.max_duration is not None:
+            failed |= d >= self.max_duration
+        if self.max_zscore is not None:
+            failed |= np.abs(z) >= self.max_zscore
+        return failed
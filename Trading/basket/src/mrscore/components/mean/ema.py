@@ -1,6 +1,10 @@
 # components/mean/ema.py
 from __future__ import annotations
 
+import numpy as np
+
+from mrscore.components._recursion import linear_recursion
+
 
 class EMA:
     """
@@ -41,6 +45,24 @@ class EMA:
     def is_ready(self) -> bool:
         return self._count >= self._min_periods
 
+    @property
+    def warmup(self) -> int:
+        return self._min_periods
+
+    def get_state(self) -> dict:
+        return {
+            "count": self._count,
+            "running_sum": self._running_sum,
+            "value": self.value,
+            "initialized": self._initialized,
+        }
+
+    def set_state(self, state: dict) -> None:
+        self._count = int(state["count"])
+        self._running_sum = float(state["running_sum"])
+        self.value = float(state["value"])
+        self._initialized = bool(state["initialized"])
+
     def update(self, price: float) -> float:
         x = float(price)
         self._count += 1
@@ -57,3 +79,68 @@ class EMA:
         # EMA recursion
         self.value = self._alpha * x + (1.0 - self._alpha) * self.value
         return self.value
+
+    def transform(self, series: np.ndarray) -> np.ndarray:
+        """
+        Cumulative mean over the warm-up, then the EMA recursion as a linear
+        filter (components._recursion.linear_recursion).
+        """
+        x = np.asarray(series, dtype=np.float64)
+        T = x.shape[-1]
+        out = np.empty_like(x)
+        k = min(self._min_periods, T)
+        if k == 0:
+            return out
+        out[..., :k] = np.cumsum(x[..., :k], axis=-1) / np.arange(1, k + 1)
+        if T > k:
+            out[..., k:] = linear_recursion(1.0 - self._alpha, self._alpha * x[..., k:], out[..., k - 1])
+        return out
+
+    def batch(self, size: int) -> "EMABatch":
+        return EMABatch(span=self._span, min_periods=self._min_periods, size=size)
+
+
+class EMABatch:
+    """
+    EMA over B series at once. update(x, rows) advances only `rows` (all when None);
+    arithmetic mirrors EMA.update exactly, including the running-mean warm-up.
+    """
+
+    def __init__(self, *, span: int, min_periods: int = 1, size: int) -> None:
+        if span < 1:
+            raise ValueError("span must be >= 1")
+        if min_periods < 1:
+            raise ValueError("min_periods must be >= 1")
+        self._alpha = 2.0 / (int(span) + 1.0)
+        self._min_periods = int(min_periods)
+        self._all = np.arange(int(size))
+
+        self._count = np.zeros(int(size), dtype=np.int64)
+        self._running_sum = np.zeros(int(size), dtype=np.float64)
+        self._initialized = np.zeros(int(size), dtype=bool)
+        self.value = np.zeros(int(size), dtype=np.float64)
+
+    def reset(self) -> None:
+        self._count.fill(0)
+        self._running_sum.fill(0.0)
+        self._initialized.fill(False)
+        self.value.fill(0.0)
+
+    def is_ready(self) -> np.ndarray:
+        return self._count >= self._min_periods
+
+    def update(self, x: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        if rows is None:
+            rows = self._all
+        xr = np.asarray(x, dtype=np.float64)[rows]
+        count = self._count[rows] + 1
+        warm = ~self._initialized[rows]
+
+        running = np.where(warm, self._running_sum[rows] + xr, self._running_sum[rows])
+        ema = self._alpha * xr + (1.0 - self._alpha) * self.value[rows]
+
+        self._count[rows] = count
+        self._running_sum[rows] = running
+        self.value[rows] = np.where(warm, running / count, ema)
+        self._initialized[rows] = self._initialized[rows] | (count >= self._min_periods)
+        return self.value
@@ -1,6 +1,10 @@
 # components/mean/kalman_mean.py
 from __future__ import annotations
 
+import numpy as np
+
+from mrscore.components._recursion import linear_recursion
+
 
 class KalmanMean:
     """
@@ -59,11 +63,23 @@ class KalmanMean:
     def is_ready(self) -> bool:
         return self._count >= self._min_periods
 
+    @property
+    def warmup(self) -> int:
+        return self._min_periods
+
     @property
     def variance(self) -> float:
         """Current state variance (uncertainty)."""
         return self._P
 
+    def get_state(self) -> dict:
+        return {"count": self._count, "value": self.value, "P": self._P}
+
+    def set_state(self, state: dict) -> None:
+        self._count = int(state["count"])
+        self.value = float(state["value"])
+        self._P = float(state["P"])
+
     def update(self, price: float) -> float:
         y = float(price)
         self._count += 1
@@ -79,3 +95,94 @@ class KalmanMean:
         self._P = (1.0 - K) * P_pred
 
         return self.value
+
+    def transform(self, series: np.ndarray) -> np.ndarray:
+        """
+        The gains K_t do not depend on the data, so they are computed once
+        (constant after the variance reaches its fixed point); the state then
+        follows the linear recursion x_t = (1 - K_t) x_{t-1} + K_t y_t.
+        """
+        y = np.asarray(series, dtype=np.float64)
+        T = y.shape[-1]
+        gains = np.empty(T, dtype=np.float64)
+        P = self._init_var
+        for t in range(T):
+            P_pred = P + self._q
+            K = P_pred / (P_pred + self._r)
+            gains[t] = K
+            P_next = (1.0 - K) * P_pred
+            if P_next == P:
+                gains[t + 1 :] = K
+                break
+            P = P_next
+        return linear_recursion(1.0 - gains, gains * y, self._init_mean)
+
+    def batch(self, size: int) -> "KalmanMeanBatch":
+        return KalmanMeanBatch(
+            process_var=self._q,
+            obs_var=self._r,
+            init_mean=self._init_mean,
+            init_var=self._init_var,
+            min_periods=self._min_periods,
+            size=size,
+        )
+
+
+class KalmanMeanBatch:
+    """
+    KalmanMean over B series at once. update(x, rows) advances only `rows`
+    (all when None); arithmetic mirrors KalmanMean.update exactly.
+    """
+
+    def __init__(
+        self,
+        *,
+        process_var: float,
+        obs_var: float,
+        init_mean: float = 0.0,
+        init_var: float = 1.0,
+        min_periods: int = 1,
+        size: int,
+    ) -> None:
+        if process_var <= 0:
+            raise ValueError("process_var must be > 0")
+        if obs_var <= 0:
+            raise ValueError("obs_var must be > 0")
+        if init_var <= 0:
+            raise ValueError("init_var must be > 0")
+        if min_periods < 1:
+            raise ValueError("min_periods must be >= 1")
+
+        self._q = float(process_var)
+        self._r = float(obs_var)
+        self._min_periods = int(min_periods)
+        self._init_mean = float(init_mean)
+        self._init_var = float(init_var)
+        self._all = np.arange(int(size))
+
+        self._count = np.zeros(int(size), dtype=np.int64)
+        self.value = np.full(int(size), self._init_mean, dtype=np.float64)
+        self._P = np.full(int(size), self._init_var, dtype=np.float64)
+
+    def reset(self) -> None:
+        self._count.fill(0)
+        self.value.fill(self._init_mean)
+        self._P.fill(self._init_var)
+
+    def is_ready(self) -> np.ndarray:
+        return self._count >= self._min_periods
+
+    def update(self, x: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        if rows is None:
+            rows = self._all
+        y = np.asarray(x, dtype=np.float64)[rows]
+        self._count[rows] += 1
+
+        P_pred = self._P[rows] + self._q
+        x_pred = self.value[rows]
+
+        S = P_pred + self._r
+        K = P_pred / S
+        self.value[rows] = x_pred + K * (y - x_pred)
+        self._P[rows] = (1.0 - K) * P_pred
+        return self.value
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import numpy as np
 
+from mrscore.components._recursion import window_counts, window_sums
+
 
 class RollingSMA:
     """
@@ -34,6 +36,22 @@ class RollingSMA:
     def is_ready(self) -> bool:
         return self._count >= self._window
 
+    @property
+    def warmup(self) -> int:
+        return self._window
+
+    def get_state(self) -> dict:
+        return {"buf": self._buf.tolist(), "idx": self._idx, "count": self._count, "sum": self._sum, "value": self.value}
+
+    def set_state(self, state: dict) -> None:
+        if len(state["buf"]) != self._window:
+            raise ValueError("state buffer length must equal window")
+        self._buf[:] = state["buf"]
+        self._idx = int(state["idx"])
+        self._count = int(state["count"])
+        self._sum = float(state["sum"])
+        self.value = float(state["value"])
+
     def update(self, price: float) -> float:
         x = float(price)
 
@@ -56,3 +74,67 @@ class RollingSMA:
         # compute mean over available samples (warm-up uses count)
         self.value = self._sum / self._count
         return self.value
+
+    def transform(self, series: np.ndarray) -> np.ndarray:
+        """Window means from window_sums (cumulative sums restarted every window)."""
+        x = np.asarray(series, dtype=np.float64)
+        return window_sums(x, self._window) / window_counts(x.shape[-1], self._window)
+
+    def batch(self, size: int) -> "RollingSMABatch":
+        return RollingSMABatch(window=self._window, size=size)
+
+
+class RollingSMABatch:
+    """
+    RollingSMA over B series at once: one ring buffer row per series.
+
+    update(x, rows) advances only `rows` (all series when None), so callers can
+    freeze individual series. Arithmetic mirrors RollingSMA.update exactly.
+    """
+
+    def __init__(self, *, window: int, size: int) -> None:
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        if size < 0:
+            raise ValueError("size must be >= 0")
+        self._window = int(window)
+        self._size = int(size)
+        self._all = np.arange(self._size)
+        self._buf = np.zeros((self._size, self._window), dtype=np.float64)
+        self._idx = np.zeros(self._size, dtype=np.int64)
+        self._count = np.zeros(self._size, dtype=np.int64)
+        self._sum = np.zeros(self._size, dtype=np.float64)
+        self.value = np.zeros(self._size, dtype=np.float64)
+
+    def reset(self) -> None:
+        self._buf.fill(0.0)
+        self._idx.fill(0)
+        self._count.fill(0)
+        self._sum.fill(0.0)
+        self.value.fill(0.0)
+
+    def is_ready(self) -> np.ndarray:
+        return self._count >= self._window
+
+    def update(self, x: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        if rows is None:
+            rows = self._all
+        xr = np.asarray(x, dtype=np.float64)[rows]
+        idx = self._idx[rows]
+        count = self._count[rows]
+
+        full = count >= self._window
+        s = np.where(full, self._sum[rows] - self._buf[rows, idx], self._sum[rows])
+        count = np.where(full, count, count + 1)
+
+        self._buf[rows, idx] = xr
+        s = s + xr
+
+        idx = idx + 1
+        idx[idx == self._window] = 0
+
+        self._idx[rows] = idx
+        self._count[rows] = count
+        self._sum[rows] = s
+        self.value[rows] = s / count
+        return self.value
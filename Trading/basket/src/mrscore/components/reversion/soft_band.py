@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import numpy as np
+
 
 class SoftBandReversionCriteria:
     """Reverted when abs(zscore) <= z_tolerance."""
@@ -11,3 +13,6 @@ class SoftBandReversionCriteria:
 
     def is_reverted(self, *, zscore: float) -> bool:
         return abs(float(zscore)) <= self.z_tolerance
+
+    def is_reverted_batch(self, *, zscore: np.ndarray) -> np.ndarray:
+        return np.abs(np.asarray(zscore, dtype=np.float64)) <= self.z_tolerance
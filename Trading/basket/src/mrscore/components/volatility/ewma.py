@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+from math import sqrt
+
+import numpy as np
+
+from mrscore.components._recursion import linear_recursion
+
 
 class EWMAVol:
     """
@@ -54,6 +60,26 @@ class EWMAVol:
     def is_ready(self) -> bool:
         return self._count >= self._min_periods
 
+    @property
+    def warmup(self) -> int:
+        return self._min_periods
+
+    def get_state(self) -> dict:
+        return {
+            "count": self._count,
+            "running_sumsq": self._running_sumsq,
+            "sigma2": self._sigma2,
+            "initialized": self._initialized,
+            "value": self.value,
+        }
+
+    def set_state(self, state: dict) -> None:
+        self._count = int(state["count"])
+        self._running_sumsq = float(state["running_sumsq"])
+        self._sigma2 = float(state["sigma2"])
+        self._initialized = bool(state["initialized"])
+        self.value = float(state["value"])
+
     def update(self, r: float) -> float:
         x = float(r)
         self._count += 1
@@ -63,7 +89,7 @@ class EWMAVol:
         if not self._initialized:
             self._running_sumsq += x2
             self._sigma2 = self._running_sumsq / self._count
-            self.value = (self._sigma2 ** 0.5)
+            self.value = sqrt(self._sigma2)
             if self._count >= self._min_periods:
                 self._initialized = True
             if self.value < self._min_vol:
@@ -72,6 +98,108 @@ class EWMAVol:
 
         # EWMA recursion
         self._sigma2 = self._lam * self._sigma2 + (1.0 - self._lam) * x2
-        vol = self._sigma2 ** 0.5
+        vol = sqrt(self._sigma2)
         self.value = vol if vol >= self._min_vol else self._min_vol
         return self.value
+
+    def transform(self, series: np.ndarray) -> np.ndarray:
+        """
+        Cumulative mean of r^2 over the warm-up, then the variance recursion
+        as a linear filter (components._recursion.linear_recursion).
+        """
+        x = np.asarray(series, dtype=np.float64)
+        x2 = x * x
+        T = x.shape[-1]
+        sigma2 = np.empty_like(x2)
+        k = min(self._min_periods, T)
+        if k == 0:
+            return sigma2
+        sigma2[..., :k] = np.cumsum(x2[..., :k], axis=-1) / np.arange(1, k + 1)
+        if T > k:
+            sigma2[..., k:] = linear_recursion(self._lam, (1.0 - self._lam) * x2[..., k:], sigma2[..., k - 1])
+
+        vol = np.sqrt(sigma2)
+        # warm-up clamps with `<` (NaN passes through); steady state with `>=` (NaN -> floor)
+        vol[..., :k] = np.where(vol[..., :k] < self._min_vol, self._min_vol, vol[..., :k])
+        vol[..., k:] = np.where(vol[..., k:] >= self._min_vol, vol[..., k:], self._min_vol)
+        return vol
+
+    def batch(self, size: int) -> "EWMAVolBatch":
+        return EWMAVolBatch(
+            span=self._span,
+            min_periods=self._min_periods,
+            min_volatility=self._min_vol,
+            size=size,
+        )
+
+
+class EWMAVolBatch:
+    """
+    EWMAVol over B series at once. update(r, rows) advances only `rows`
+    (all when None); arithmetic mirrors EWMAVol.update exactly.
+    """
+
+    def __init__(
+        self,
+        *,
+        span: int,
+        min_periods: int = 1,
+        min_volatility: float = 0.0,
+        size: int,
+    ) -> None:
+        if span < 1:
+            raise ValueError("span must be >= 1")
+        if min_periods < 1:
+            raise ValueError("min_periods must be >= 1")
+        if min_volatility < 0:
+            raise ValueError("min_volatility must be >= 0")
+
+        self._lam = 1.0 - 2.0 / (int(span) + 1.0)
+        self._min_periods = int(min_periods)
+        self._min_vol = float(min_volatility)
+        self._all = np.arange(int(size))
+
+        self._count = np.zeros(int(size), dtype=np.int64)
+        self._running_sumsq = np.zeros(int(size), dtype=np.float64)
+        self._sigma2 = np.zeros(int(size), dtype=np.float64)
+        self._initialized = np.zeros(int(size), dtype=bool)
+        self.value = np.zeros(int(size), dtype=np.float64)
+
+    def reset(self) -> None:
+        self._count.fill(0)
+        self._running_sumsq.fill(0.0)
+        self._sigma2.fill(0.0)
+        self._initialized.fill(False)
+        self.value.fill(0.0)
+
+    def is_ready(self) -> np.ndarray:
+        return self._count >= self._min_periods
+
+    def update(self, r: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        if rows is None:
+            rows = self._all
+        x = np.asarray(r, dtype=np.float64)[rows]
+        x2 = x * x
+        count = self._count[rows] + 1
+        warm = ~self._initialized[rows]
+
+        running = np.where(warm, self._running_sumsq[rows] + x2, self._running_sumsq[rows])
+        sigma2 = np.where(
+            warm,
+            running / count,
+            self._lam * self._sigma2[rows] + (1.0 - self._lam) * x2,
+        )
+        vol = np.sqrt(sigma2)
+        # warm-up clamps with `<` (NaN passes through); steady state with `>=` (NaN -> floor)
+        value = np.where(
+            warm,
+            np.where(vol < self._min_vol, self._min_vol, vol),
+            np.where(vol >= self._min_vol, vol, self._min_vol),
+        )
+
+        self._count[rows] = count
+        self._running_sumsq[rows] = running
+        self._sigma2[rows] = sigma2
+        self._initialized[rows] = self._initialized[rows] | (count >= self._min_periods)
+        self.value[rows] = value
+        return self.value
@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+from math import sqrt
+
+import numpy as np
+
+from mrscore.components._recursion import linear_recursion
+
 
 class GARCH11Vol:
     """
@@ -64,6 +70,19 @@ class GARCH11Vol:
     def is_ready(self) -> bool:
         return self._count >= self._min_periods
 
+    @property
+    def warmup(self) -> int:
+        return self._min_periods
+
+    def get_state(self) -> dict:
+        return {"count": self._count, "sigma2": self._sigma2, "initialized": self._initialized, "value": self.value}
+
+    def set_state(self, state: dict) -> None:
+        self._count = int(state["count"])
+        self._sigma2 = float(state["sigma2"])
+        self._initialized = bool(state["initialized"])
+        self.value = float(state["value"])
+
     def update(self, r: float) -> float:
         x = float(r)
         x2 = x * x
@@ -79,6 +98,123 @@ class GARCH11Vol:
             if self._sigma2 < min_sigma2:
                 self._sigma2 = min_sigma2
 
-        vol = self._sigma2 ** 0.5
+        vol = sqrt(self._sigma2)
         self.value = vol
         return self.value
+
+    def transform(self, series: np.ndarray) -> np.ndarray:
+        """
+        The first return initializes sigma2, which then follows the linear
+        recursion sigma2_t = beta * sigma2_{t-1} + (omega + alpha * r_t^2);
+        where the min_volatility floor binds, the recursion restarts from the
+        floor at that bar.
+        """
+        x = np.asarray(series, dtype=np.float64)
+        x2 = (x * x).reshape(int(np.prod(x.shape[:-1])), x.shape[-1])
+        T = x2.shape[1]
+        out = np.empty_like(x2)
+        if T == 0:
+            return out.reshape(x.shape)
+        min_sigma2 = self._min_vol * self._min_vol
+        out[:, 0] = np.where(x2[:, 0] > min_sigma2, x2[:, 0], min_sigma2)
+        if T > 1:
+            drive = self._omega + self._alpha * x2[:, 1:]
+            out[:, 1:] = linear_recursion(self._beta, drive, out[:, 0])
+            if min_sigma2 > 0.0:
+                for b in np.flatnonzero((out[:, 1:] < min_sigma2).any(axis=1)).tolist():
+                    out[b, 1:] = self._floored(drive[b], float(out[b, 0]), min_sigma2)
+        return np.sqrt(out).reshape(x.shape)
+
+    def _floored(self, drive: np.ndarray, start: float, min_sigma2: float) -> np.ndarray:
+        out = np.empty_like(drive)
+        pos, prev = 0, start
+        while pos < drive.size:
+            seg = linear_recursion(self._beta, drive[pos:], prev)
+            low = np.flatnonzero(seg < min_sigma2)
+            if low.size == 0:
+                out[pos:] = seg
+                break
+            f = int(low[0])
+            out[pos : pos + f] = seg[:f]
+            out[pos + f] = min_sigma2
+            pos, prev = pos + f + 1, min_sigma2
+        return out
+
+    def batch(self, size: int) -> "GARCH11VolBatch":
+        return GARCH11VolBatch(
+            omega=self._omega,
+            alpha=self._alpha,
+            beta=self._beta,
+            min_volatility=self._min_vol,
+            min_periods=self._min_periods,
+            size=size,
+        )
+
+
+class GARCH11VolBatch:
+    """
+    GARCH11Vol over B series at once, starting from the post-reset() state
+    (the engine always resets before a run). update(r, rows) advances only
+    `rows` (all when None); arithmetic mirrors GARCH11Vol.update exactly.
+    """
+
+    def __init__(
+        self,
+        *,
+        omega: float,
+        alpha: float,
+        beta: float,
+        min_volatility: float = 0.0,
+        min_periods: int = 1,
+        size: int,
+    ) -> None:
+        if omega <= 0:
+            raise ValueError("omega must be > 0")
+        if alpha < 0 or beta < 0:
+            raise ValueError("alpha and beta must be >= 0")
+        if min_periods < 1:
+            raise ValueError("min_periods must be >= 1")
+        if min_volatility < 0:
+            raise ValueError("min_volatility must be >= 0")
+
+        self._omega = float(omega)
+        self._alpha = float(alpha)
+        self._beta = float(beta)
+        self._min_vol = float(min_volatility)
+        self._min_periods = int(min_periods)
+        self._all = np.arange(int(size))
+
+        self._count = np.zeros(int(size), dtype=np.int64)
+        self._sigma2 = np.zeros(int(size), dtype=np.float64)
+        self._initialized = np.zeros(int(size), dtype=bool)
+        self.value = np.zeros(int(size), dtype=np.float64)
+
+    def reset(self) -> None:
+        self._count.fill(0)
+        self._sigma2.fill(0.0)
+        self._initialized.fill(False)
+        self.value.fill(0.0)
+
+    def is_ready(self) -> np.ndarray:
+        return self._count >= self._min_periods
+
+    def update(self, r: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        if rows is None:
+            rows = self._all
+        x = np.asarray(r, dtype=np.float64)[rows]
+        x2 = x * x
+        min_sigma2 = self._min_vol * self._min_vol
+
+        first = ~self._initialized[rows]
+        recursed = self._omega + self._alpha * x2 + self._beta * self._sigma2[rows]
+        sigma2 = np.where(
+            first,
+            np.where(x2 > min_sigma2, x2, min_sigma2),
+            np.where(recursed < min_sigma2, min_sigma2, recursed),
+        )
+
+        self._count[rows] += 1
+        self._sigma2[rows] = sigma2
+        self._initialized[rows] = True
+        self.value[rows] = np.sqrt(sigma2)
+        return self.value
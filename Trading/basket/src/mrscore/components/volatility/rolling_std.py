@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from math import sqrt
+
 import numpy as np
 
+from mrscore.components._recursion import window_counts, window_sums
+
 
 class RollingStd:
     """
@@ -53,6 +57,30 @@ class RollingStd:
     def is_ready(self) -> bool:
         return self._count >= self._min_periods
 
+    @property
+    def warmup(self) -> int:
+        return self._min_periods
+
+    def get_state(self) -> dict:
+        return {
+            "buf": self._buf.tolist(),
+            "idx": self._idx,
+            "count": self._count,
+            "sum": self._sum,
+            "sumsq": self._sumsq,
+            "value": self.value,
+        }
+
+    def set_state(self, state: dict) -> None:
+        if len(state["buf"]) != self._window:
+            raise ValueError("state buffer length must equal window")
+        self._buf[:] = state["buf"]
+        self._idx = int(state["idx"])
+        self._count = int(state["count"])
+        self._sum = float(state["sum"])
+        self._sumsq = float(state["sumsq"])
+        self.value = float(state["value"])
+
     def update(self, r: float) -> float:
         x = float(r)
 
@@ -82,6 +110,122 @@ class RollingStd:
         if var < 0.0:
             var = 0.0
 
-        vol = var ** 0.5
+        vol = sqrt(var)
         self.value = vol if vol >= self._min_vol else self._min_vol
         return self.value
+
+    def transform(self, series: np.ndarray) -> np.ndarray:
+        """
+        window_sums of r and r^2 (cumulative sums restarted every window), so
+        the rounding stays bounded on long series.
+        """
+        x = np.asarray(series, dtype=np.float64)
+        n = window_counts(x.shape[-1], self._window)
+        s = window_sums(x, self._window)
+        sq = window_sums(x * x, self._window)
+
+        denom = n - self._ddof
+        ok = denom > 0
+        mean = s / n
+        var = (sq - n * mean * mean) / np.where(ok, denom, 1)
+        var = np.where(var < 0.0, 0.0, var)
+        vol = np.sqrt(var)
+        vol = np.where(vol >= self._min_vol, vol, self._min_vol)
+        return np.where(ok, vol, max(self._min_vol, 0.0))
+
+    def batch(self, size: int) -> "RollingStdBatch":
+        return RollingStdBatch(
+            window=self._window,
+            min_periods=self._min_periods,
+            ddof=self._ddof,
+            min_volatility=self._min_vol,
+            size=size,
+        )
+
+
+class RollingStdBatch:
+    """
+    RollingStd over B series at once: one ring buffer row per series.
+    update(r, rows) advances only `rows` (all when None); arithmetic mirrors
+    RollingStd.update exactly.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: int,
+        min_periods: int = 1,
+        ddof: int = 0,
+        min_volatility: float = 0.0,
+        size: int,
+    ) -> None:
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        if min_periods < 1:
+            raise ValueError("min_periods must be >= 1")
+        if min_periods > window:
+            raise ValueError("min_periods must be <= window")
+        if ddof not in (0, 1):
+            raise ValueError("ddof must be 0 or 1")
+        if min_volatility < 0:
+            raise ValueError("min_volatility must be >= 0")
+
+        self._window = int(window)
+        self._min_periods = int(min_periods)
+        self._ddof = int(ddof)
+        self._min_vol = float(min_volatility)
+        self._all = np.arange(int(size))
+
+        self._buf = np.zeros((int(size), self._window), dtype=np.float64)
+        self._idx = np.zeros(int(size), dtype=np.int64)
+        self._count = np.zeros(int(size), dtype=np.int64)
+        self._sum = np.zeros(int(size), dtype=np.float64)
+        self._sumsq = np.zeros(int(size), dtype=np.float64)
+        self.value = np.zeros(int(size), dtype=np.float64)
+
+    def reset(self) -> None:
+        self._buf.fill(0.0)
+        self._idx.fill(0)
+        self._count.fill(0)
+        self._sum.fill(0.0)
+        self._sumsq.fill(0.0)
+        self.value.fill(0.0)
+
+    def is_ready(self) -> np.ndarray:
+        return self._count >= self._min_periods
+
+    def update(self, r: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        if rows is None:
+            rows = self._all
+        x = np.asarray(r, dtype=np.float64)[rows]
+        idx = self._idx[rows]
+        n = self._count[rows]
+
+        full = n >= self._window
+        outgoing = self._buf[rows, idx]
+        s = np.where(full, self._sum[rows] - outgoing, self._sum[rows])
+        sq = np.where(full, self._sumsq[rows] - outgoing * outgoing, self._sumsq[rows])
+        n = np.where(full, n, n + 1)
+
+        self._buf[rows, idx] = x
+        s = s + x
+        sq = sq + x * x
+
+        idx = idx + 1
+        idx[idx == self._window] = 0
+
+        denom = n - self._ddof
+        ok = denom > 0
+        safe_denom = np.where(ok, denom, 1)
+        mean = s / n
+        var = (sq - n * mean * mean) / safe_denom
+        var = np.where(var < 0.0, 0.0, var)
+        vol = np.sqrt(var)
+        vol = np.where(vol >= self._min_vol, vol, self._min_vol)
+
+        self._idx[rows] = idx
+        self._count[rows] = n
+        self._sum[rows] = s
+        self._sumsq[rows] = sq
+        self.value[rows] = np.where(ok, vol, max(self._min_vol, 0.0))
+        return self.value
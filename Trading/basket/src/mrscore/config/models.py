@@ -18,6 +18,12 @@ class EngineConfig(StrictBaseModel):
     freeze_mean_on_event: bool
     freeze_volatility_on_event: bool
     max_active_events: int = Field(..., ge=1)
+    # Score this many ratio series per MeanReversionEngine.run_batch call (None = one at a time)
+    batch_size: Optional[int] = Field(default=None, ge=1)
+    # Universe scans: stop scoring a ratio once it provably cannot enter the top-k
+    early_abandon: bool = False
+    # Score each series with MeanReversionEngine.run_event_driven (jumps between threshold crossings)
+    event_driven: bool = False
 
 
 class DataCacheConfig(StrictBaseModel):
@@ -31,6 +37,14 @@ class DataCacheConfig(StrictBaseModel):
         return self
 
 
+class DataDownloadConfig(StrictBaseModel):
+    workers: int = Field(1, ge=1)
+    rate_limit_per_s: Optional[float] = Field(default=None, gt=0)
+    rate_burst: int = Field(1, ge=1)
+    max_retries: int = Field(2, ge=0)
+    retry_backoff_s: float = Field(1.0, ge=0)
+
+
 class DataConfig(StrictBaseModel):
     price_field: str
     returns_mode: Literal["log", "simple", "none"]
@@ -40,6 +54,7 @@ class DataConfig(StrictBaseModel):
     interval: str
     ending_date: Optional[date] = None
     cache: DataCacheConfig = Field(default_factory=DataCacheConfig)
+    download: DataDownloadConfig = Field(default_factory=DataDownloadConfig)
 
 
 # ---------------------------
@@ -228,6 +243,18 @@ class DiagnosticsConfig(StrictBaseModel):
     record_max_excursion: bool = False
     record_time_to_resolution: bool = False
 
+    # Scan instrumentation: counters plus stage timers sampled every N jobs (core.diagnostics.ScanStats)
+    scan_stats: bool = False
+    scan_stats_sample_every: int = Field(default=64, ge=1)
+    scan_stats_json: Optional[str] = None
+    scan_stats_prometheus: Optional[str] = None
+
+    @model_validator(mode="after")
+    def validate_config(self):
+        if (self.scan_stats_json or self.scan_stats_prometheus) and not self.scan_stats:
+            raise ValueError("diagnostics.scan_stats_json/scan_stats_prometheus require diagnostics.scan_stats=true")
+        return self
+
 
 # ---------------------------
 # Visualization
@@ -251,6 +278,39 @@ class RatioUniverseConfig(StrictBaseModel):
     disallow_overlap: bool = True
     unordered_if_equal_k: bool = True
     max_jobs: Optional[int] = Field(default=None, ge=1)
+    # Score the universe in this many processes (None or 1 = serial scan in-process)
+    workers: Optional[int] = Field(default=None, ge=1)
+    # Serial scans without max_jobs: score ratio tiles of block_size x block_size baskets
+    block_size: Optional[int] = Field(default=None, ge=1)
+    # Precompute every basket's summed series once per k (T x C(N,k) floats)
+    basket_cache: bool = False
+    # Above this size the basket-sum matrix is backed by a temporary mmap file
+    basket_cache_max_mb: Optional[float] = Field(default=None, gt=0)
+    # Serial job-list scans checkpoint to the cache dir this often and save a final
+    # checkpoint on SIGTERM (None = never, SIGTERM keeps its default handling)
+    checkpoint_interval_s: Optional[float] = Field(default=None, gt=0)
+    # Extra top-k rankings kept during the scan (core.ranking.MultiTopKRanker), one per
+    # metric and, with rank_group_by, per numerator / denominator basket
+    rank_by: List[Literal["score", "sharpe", "total_events", "reverted_events", "failed_events", "expired_events"]] = (
+        Field(default_factory=list)
+    )
+    rank_group_by: Optional[Literal["num_id", "den_id"]] = None
+    # Size of each extra ranking (None = the scan top_k)
+    rank_top_k: Optional[int] = Field(default=None, ge=1)
+    # Two-stage scan: only the best prescreen_fraction of each block of prescreen_block
+    # jobs (or of each tile) by a cheap statistic reaches the engine (core.prescreen).
+    # prescreen_block None = sized so the survivors fill whole engine batches
+    prescreen_fraction: Optional[float] = Field(default=None, gt=0, le=1)
+    prescreen_metric: Literal["autocorr", "half_life", "hurst", "zero_crossings", "composite"] = "composite"
+    prescreen_block: Optional[int] = Field(default=None, ge=1)
+
+    @model_validator(mode="after")
+    def validate_config(self):
+        if len(set(self.rank_by)) != len(self.rank_by):
+            raise ValueError("ratio_universe.rank_by must not repeat a metric")
+        if (self.rank_group_by is not None or self.rank_top_k is not None) and not self.rank_by:
+            raise ValueError("ratio_universe.rank_group_by/rank_top_k require ratio_universe.rank_by")
+        return self
 
 # ---------------------------
 # Backtest
@@ -325,6 +385,9 @@ class BacktestConfig(StrictBaseModel):
     max_concurrent_positions: int = Field(1, ge=1)
     allow_overlapping_positions: bool = False
 
+    # "batch" backtests all selected ratios in one pass over time (run_many); "loop" runs them one by one
+    kernel: Literal["loop", "batch"] = "loop"
+
     execution: BacktestExecutionConfig = BacktestExecutionConfig()
     costs: BacktestCostsConfig = BacktestCostsConfig()
     sizing: BacktestSizingConfig
@@ -355,3 +418,16 @@ class RootConfig(StrictBaseModel):
     ratio_universe: RatioUniverseConfig
 
     backtest: Optional[BacktestConfig] = None
+
+    @model_validator(mode="after")
+    def validate_early_abandon(self):
+        if self.engine.early_abandon and self.scoring.score_metric != "reversion_rate":
+            raise ValueError("engine.early_abandon requires scoring.score_metric='reversion_rate'")
+        if self.engine.early_abandon and self.engine.event_driven:
+            raise ValueError("engine.early_abandon cannot be combined with engine.event_driven")
+        if self.engine.early_abandon and self.ratio_universe.rank_by:
+            # abandoned jobs have no final metrics to rank
+            raise ValueError("engine.early_abandon cannot be combined with ratio_universe.rank_by")
+        if "sharpe" in self.ratio_universe.rank_by and not self.scoring.compute_sharpe:
+            raise ValueError("ratio_universe.rank_by 'sharpe' requires scoring.compute_sharpe=true")
+        return self
@@ -1,8 +1,121 @@
 from __future__ import annotations
 
-from typing import Protocol
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Protocol
 
 
 class DiagnosticsCollector(Protocol):
     def record(self, *args, **kwargs):
         raise NotImplementedError
+
+
+# Scan stages, in pipeline order:
+#   ratio   - compute_ratio_series_into / compute_ratio_block_into
+#   returns - compute_returns_inplace
+#   engine  - engine.run / run_batch / run_event_driven, excluding score_events
+#   scoring - score_events
+#   ranker  - NaN filtering, ranker.admits / consider, on_score
+SCAN_STAGES = ("ratio", "returns", "engine", "scoring", "ranker")
+
+SCAN_COUNTERS = (
+    "jobs",
+    "nan_scores",
+    "abandoned",
+    "events_opened",
+    "events_reverted",
+    "events_failed",
+    "events_expired",
+    "heap_inserts",
+    "heap_replacements",
+    "heap_rejections",
+    "screened_out",
+)
+
+
+class ScanStats:
+    """
+    Counters and sampled stage timers for a ratio scan.
+
+    Counters are exact. Stage timers only run on every `sample_every`-th job
+    (the whole engine block holding it, under batch_size), so the
+    perf_counter() calls stay off most of the hot loop; per-stage totals are
+    estimated as mean time per sampled job times the jobs seen by that stage.
+
+    Stats of scan shards combine with add(). Jobs dropped by the ratio
+    pre-screen count in `screened_out` only: they never reach the engine.
+    """
+
+    def __init__(self, sample_every: int = 64) -> None:
+        if sample_every < 1:
+            raise ValueError("sample_every must be >= 1")
+        self.sample_every = int(sample_every)
+        self.counters: Dict[str, int] = dict.fromkeys(SCAN_COUNTERS, 0)
+        self.stage_seconds: Dict[str, float] = dict.fromkeys(SCAN_STAGES, 0.0)
+        self.stage_sampled: Dict[str, int] = dict.fromkeys(SCAN_STAGES, 0)
+        # jobs seen per sampling clock ("ratio" runs ahead of the engine block)
+        self._clock: Dict[str, int] = {"ratio": 0, "engine": 0}
+
+    def due(self, clock: str, jobs: int = 1) -> bool:
+        """Advance `clock` by `jobs`; True when those jobs contain a sampled one."""
+        start = self._clock[clock]
+        self._clock[clock] = start + jobs
+        return -(-start // self.sample_every) * self.sample_every < start + jobs
+
+    def time(self, stage: str, seconds: float, jobs: int = 1) -> None:
+        self.stage_seconds[stage] += seconds
+        self.stage_sampled[stage] += jobs
+
+    def add(self, other: "ScanStats") -> None:
+        for name, value in other.counters.items():
+            self.counters[name] += value
+        for stage in SCAN_STAGES:
+            self.stage_seconds[stage] += other.stage_seconds[stage]
+            self.stage_sampled[stage] += other.stage_sampled[stage]
+        for clock, value in other._clock.items():
+            self._clock[clock] += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        stages: Dict[str, Any] = {}
+        for stage in SCAN_STAGES:
+            sampled = self.stage_sampled[stage]
+            seen = self._clock["ratio" if stage == "ratio" else "engine"]
+            per_job = self.stage_seconds[stage] / sampled if sampled else None
+            stages[stage] = {
+                "sampled_jobs": sampled,
+                "sampled_seconds": self.stage_seconds[stage],
+                "seconds_per_job": per_job,
+                "estimated_seconds": per_job * seen if per_job is not None else None,
+            }
+        return {"sample_every": self.sample_every, "counters": dict(self.counters), "stages": stages}
+
+    def write_json(self, path: str | os.PathLike) -> Path:
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+        return out
+
+    def prometheus_text(self, prefix: str = "mrscore_scan") -> str:
+        """Prometheus text exposition format (for node_exporter's textfile collector)."""
+        lines = []
+        for name, value in self.counters.items():
+            metric = f"{prefix}_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        report = self.to_dict()["stages"]
+        for key, kind in (("sampled_jobs", "counter"), ("sampled_seconds", "counter"), ("seconds_per_job", "gauge")):
+            metric = f"{prefix}_stage_{key}" + ("_total" if kind == "counter" else "")
+            lines.append(f"# TYPE {metric} {kind}")
+            for stage in SCAN_STAGES:
+                value = report[stage][key]
+                lines.append(f'{metric}{{stage="{stage}"}} {"NaN" if value is None else repr(value)}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | os.PathLike) -> Path:
+        # write then rename: the textfile collector must never read a partial file
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(out.name + ".tmp")
+        tmp.write_text(self.prometheus_text())
+        os.replace(tmp, out)
+        return out
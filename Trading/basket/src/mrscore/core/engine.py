@@ -1,21 +1,23 @@
 from __future__ import annotations
 
+from bisect import bisect_left
+from copy import deepcopy
 from dataclasses import dataclass
-from math import isnan
-from typing import Any, List, Optional
+from math import isfinite, isnan
+from time import perf_counter
+from typing import Any, Callable, List, Optional
 
 import numpy as np
 
 from mrscore.config.models import RootConfig
-from mrscore.core.results import Direction, EventStatus, EventSummary, ScoreResult
+from mrscore.core.results import EventStatus, EventTable, ScoreResult
 from mrscore.core.scoring import score_events
 
 
-@dataclass
+@dataclass(slots=True)
 class _ActiveEvent:
-    direction: Direction
+    direction: int  # Direction.sign of the deviation
     start_index: int
-    start_time: Optional[Any]
 
     start_price: float
     start_mean: float
@@ -25,6 +27,127 @@ class _ActiveEvent:
     max_abs_zscore: float
 
 
+# One closed event per record; field names match the EventTable columns.
+_EVENT_DTYPE = np.dtype(
+    [
+        ("direction", np.int8),
+        ("status", np.int8),
+        ("start_index", np.int64),
+        ("end_index", np.int64),
+        ("start_price", np.float64),
+        ("start_mean", np.float64),
+        ("start_volatility", np.float64),
+        ("start_zscore", np.float64),
+        ("max_abs_zscore", np.float64),
+        ("end_price", np.float64),
+    ]
+)
+
+
+class _EventLog:
+    """
+    Closed events of one run() in a structured buffer that the engine reuses
+    across runs (doubling when full), so a run holds no per-event objects.
+    table() copies the logged rows out.
+    """
+
+    __slots__ = ("buf", "n")
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.buf = np.empty(capacity, dtype=_EVENT_DTYPE)
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def clear(self) -> None:
+        self.n = 0
+
+    def append(self, ev: _ActiveEvent, status: int, t: int, max_abs: float, end_price: float) -> None:
+        n = self.n
+        if n == self.buf.shape[0]:
+            grown = np.empty(2 * n, dtype=_EVENT_DTYPE)
+            grown[:n] = self.buf
+            self.buf = grown
+        self.buf[n] = (
+            ev.direction,
+            status,
+            ev.start_index,
+            t,
+            ev.start_price,
+            ev.start_mean,
+            ev.start_volatility,
+            ev.start_zscore,
+            max_abs,
+            end_price,
+        )
+        self.n = n + 1
+
+    def table(self) -> EventTable:
+        rows = self.buf[: self.n]
+        return EventTable(**{name: rows[name].copy() for name in _EVENT_DTYPE.names})
+
+    def copy(self, extra: int = 0) -> "_EventLog":
+        out = _EventLog(max(self.n + extra, 1))
+        out.buf[: self.n] = self.buf[: self.n]
+        out.n = self.n
+        return out
+
+
+@dataclass(slots=True)
+class LiveState:
+    """
+    Everything run() carries from one bar of a series to the next, so the
+    series can be advanced one bar at a time (MeanReversionEngine.step).
+
+    Holds its own estimator instances; closed events sit in an event log,
+    whose statuses are the running reverted / failed counts. to_dict() gives
+    a JSON-safe snapshot (MeanReversionEngine.live_state_from_dict reads it).
+    """
+    t: int  # bars consumed
+    last_price: float
+    mean_estimator: Any
+    volatility_estimator: Any
+    active: List[_ActiveEvent]
+    log: _EventLog
+
+    def to_dict(self) -> dict:
+        rows = self.log.buf[: self.log.n]
+        return {
+            "t": self.t,
+            "last_price": self.last_price,
+            "mean": self.mean_estimator.get_state(),
+            "volatility": self.volatility_estimator.get_state(),
+            "active": _active_rows(self.active),
+            "closed": {name: rows[name].tolist() for name in _EVENT_DTYPE.names},
+        }
+
+    def mark(self) -> dict:
+        """
+        JSON-safe point that rewind() returns this state to. Closed events are
+        only ever appended, so it holds their count rather than the events.
+        """
+        return {
+            "t": self.t,
+            "last_price": self.last_price,
+            "mean": self.mean_estimator.get_state(),
+            "volatility": self.volatility_estimator.get_state(),
+            "active": _active_rows(self.active),
+            "closed": self.log.n,
+        }
+
+    def rewind(self, mark: dict) -> None:
+        """Undo every step() since mark() returned `mark`."""
+        if int(mark["closed"]) > self.log.n:
+            raise ValueError("mark is newer than this state")
+        self.t = int(mark["t"])
+        self.last_price = float(mark["last_price"])
+        self.mean_estimator.set_state(mark["mean"])
+        self.volatility_estimator.set_state(mark["volatility"])
+        self.active = _active_events(mark["active"])
+        self.log.n = int(mark["closed"])
+
+
 class MeanReversionEngine:
     """
     Streams a single time series (prices + optional returns) and scores how often
@@ -60,28 +183,50 @@ class MeanReversionEngine:
             raise ValueError("volatility_unit must be 'returns' or 'price'")
         self.volatility_unit = volatility_unit
 
+        # Optional hook: receives the seconds spent in score_events() per series (scan instrumentation).
+        self.scoring_timer: Optional[Callable[[float], None]] = None
+        # run()'s closed-event buffer, reused across calls
+        self._event_log = _EventLog()
+
+    def _score(self, events: EventTable, dates: Optional[np.ndarray]) -> ScoreResult:
+        timer = self.scoring_timer
+        if timer is None:
+            return score_events(
+                events=events, scoring=self.config.scoring, diagnostics=self.config.diagnostics, dates=dates
+            )
+        t0 = perf_counter()
+        result = score_events(events=events, scoring=self.config.scoring, diagnostics=self.config.diagnostics, dates=dates)
+        timer(perf_counter() - t0)
+        return result
+
+    def supports_early_abandon(self) -> bool:
+        """True when a mid-series upper bound on the final score is available (reversion_rate)."""
+        return self.config.scoring.score_metric == "reversion_rate"
+
     def run(
         self,
         *,
         prices: np.ndarray,
         returns: Optional[np.ndarray],
         dates: Optional[np.ndarray] = None,
+        abandon_below: Optional[float] = None,
     ) -> ScoreResult:
+        """
+        Score one series.
+
+        With abandon_below, the run stops as soon as the best reversion rate
+        still reachable is below it: every active event reverts and a new event
+        opens and reverts on each remaining bar but the last. The result then
+        has score NaN and abandoned_at set (see ScoreResult).
+        """
         prices = np.asarray(prices, dtype=np.float64)
         if prices.ndim != 1:
             raise ValueError("prices must be 1D")
+        if abandon_below is not None and not self.supports_early_abandon():
+            raise ValueError("early abandon requires scoring.score_metric='reversion_rate'")
         T = int(prices.shape[0])
         if T == 0:
-            return ScoreResult(
-                score=float("nan"),
-                total_events=0,
-                reverted_events=0,
-                failed_events=0,
-                expired_events=0,
-                by_direction=None,
-                by_volatility_bucket=None,
-                events=[],
-            )
+            return _empty_result()
 
         if dates is not None:
             if len(dates) != T:
@@ -98,156 +243,778 @@ class MeanReversionEngine:
         self.mean_estimator.reset()
         self.volatility_estimator.reset()
 
+        rules = self._bar_rules()
+        use_returns = self.volatility_unit == "returns"
+        active: List[_ActiveEvent] = []
+        log = self._event_log
+        log.clear()
+        n_reverted = 0
+
+        # main loop
+        for t in range(T):
+            if abandon_below is not None and t > 0:
+                # upper bound on the final score given bars [0, t)
+                x = T - 1 - t
+                n = log.n + len(active) + x
+                if n > 0 and (n_reverted + len(active) + x) / n < abandon_below:
+                    return _abandoned_result(log.table(), t)
+
+            n_closed = log.n
+            ret = float(returns[t - 1]) if use_returns and t >= 1 else None
+            active = self._bar(
+                t, float(prices[t]), ret, active, log, self.mean_estimator, self.volatility_estimator, rules
+            )
+            if abandon_below is not None and log.n > n_closed:
+                n_reverted += int(np.count_nonzero(log.buf["status"][n_closed : log.n] == _REVERTED))
+
+        # expire remaining actives
+        if active:
+            end_p = float(prices[T - 1])
+            for ev in active:
+                log.append(ev, _EXPIRED, T - 1, ev.max_abs_zscore, end_p)
+
+        return self._score(log.table(), dates)
+
+    # ----------------------------
+    # Live mode: one bar at a time
+    # ----------------------------
+    def live_state(self) -> LiveState:
+        """State of a series before its first bar; advance it with step()."""
+        mean_estimator = deepcopy(self.mean_estimator)
+        volatility_estimator = deepcopy(self.volatility_estimator)
+        mean_estimator.reset()
+        volatility_estimator.reset()
+        return LiveState(
+            t=0,
+            last_price=float("nan"),
+            mean_estimator=mean_estimator,
+            volatility_estimator=volatility_estimator,
+            active=[],
+            log=_EventLog(16),
+        )
+
+    def live_state_from_dict(self, data: dict) -> LiveState:
+        """Rebuild a LiveState.to_dict() snapshot; the estimators must match this engine's config."""
+        state = self.live_state()
+        state.t = int(data["t"])
+        state.last_price = float(data["last_price"])
+        state.mean_estimator.set_state(data["mean"])
+        state.volatility_estimator.set_state(data["volatility"])
+        state.active = _active_events(data["active"])
+        closed = data["closed"]
+        n = len(closed["status"])
+        state.log = _EventLog(max(n, 16))
+        for name in _EVENT_DTYPE.names:
+            state.log.buf[name][:n] = closed[name]
+        state.log.n = n
+        return state
+
+    def step(self, state: LiveState, price: float, ret: Optional[float] = None) -> None:
+        """
+        Advance `state` by one bar: `price`, and with volatility_unit='returns'
+        the return from the previous bar (ignored on the first bar).
+
+        Runs the same per-bar code as run()'s loop, so stepping a fresh state
+        through prices[0:T] leaves live_result() equal to run() on them.
+        """
+        t = state.t
+        p = float(price)
+        state.t = t + 1
+        state.last_price = p
+        state.active = self._bar(
+            t, p, ret, state.active, state.log, state.mean_estimator, state.volatility_estimator, self._bar_rules()
+        )
+
+    def _bar_rules(self) -> tuple:
+        """Engine settings _bar() reads on every bar, looked up once per series."""
         eng_cfg = self.config.engine
-        data_cfg = self.config.data
-        scoring_cfg = self.config.scoring
+        return (
+            bool(eng_cfg.freeze_mean_on_event),
+            bool(eng_cfg.freeze_volatility_on_event),
+            int(self.config.data.min_bars_required),
+            int(eng_cfg.max_active_events),
+            bool(eng_cfg.allow_overlapping_events),
+        )
 
+    def _bar(
+        self,
+        t: int,
+        p: float,
+        ret: Optional[float],
+        active: List[_ActiveEvent],
+        log: _EventLog,
+        mean_estimator: Any,
+        volatility_estimator: Any,
+        rules: tuple,
+    ) -> List[_ActiveEvent]:
+        """
+        Bar t of a series, shared by run() and step(): update the estimators,
+        close the active events that revert or fail into `log`, open a new one.
+        `ret` is the return into bar t (volatility_unit='returns', t >= 1).
+        Returns the events still active.
+        """
+        freeze_mean_on_event, freeze_vol_on_event, min_bars_required, max_active_events, allow_overlapping = rules
+
+        # update mean unless frozen by active event(s)
+        if not (freeze_mean_on_event and active):
+            mean_estimator.update(p)
+
+        # update volatility (price or returns) unless frozen by active event(s)
+        if self.volatility_unit == "price":
+            if not (freeze_vol_on_event and active):
+                volatility_estimator.update(p)
+        elif t >= 1 and not (freeze_vol_on_event and active):
+            # returns-based vol: update from t=1 onward
+            if ret is None:
+                raise ValueError("ret must be provided when volatility_unit='returns'")
+            volatility_estimator.update(ret)
+
+        # enforce warmup / readiness
+        if t + 1 < min_bars_required:
+            return active
+        if not mean_estimator.is_ready() or not volatility_estimator.is_ready():
+            return active
+
+        mean = float(mean_estimator.value)
+        vol = float(volatility_estimator.value)
+        if not np.isfinite(mean) or not np.isfinite(vol) or vol <= 0.0:
+            return active
+
+        z = (p - mean) / vol
+        if not np.isfinite(z):
+            return active
+
+        # 1) update active events (revert / fail)
+        if active:
+            still_active: List[_ActiveEvent] = []
+            for ev in active:
+                max_abs = ev.max_abs_zscore
+                az = abs(z)
+                if az > max_abs:
+                    max_abs = az
+
+                # reversion beats failure if both happen same bar
+                if self.reversion_criteria.is_reverted(zscore=z):
+                    log.append(ev, _REVERTED, t, max_abs, p)
+                    continue
+
+                if self.failure_criteria.is_failed(duration=t - ev.start_index, zscore=z):
+                    log.append(ev, _FAILED, t, max_abs, p)
+                    continue
+
+                ev.max_abs_zscore = max_abs
+                still_active.append(ev)
+
+            active = still_active
+
+        # 2) open new event(s) if allowed
+        if len(active) < max_active_events and (allow_overlapping or not active):
+            direction = self.deviation_detector.detect(price=p, mean=mean, volatility=vol)
+            if direction is not None:
+                active.append(
+                    _ActiveEvent(
+                        direction=direction.sign,
+                        start_index=t,
+                        start_price=p,
+                        start_mean=mean,
+                        start_volatility=vol,
+                        start_zscore=z,
+                        max_abs_zscore=abs(z),
+                    )
+                )
+        return active
+
+    def live_result(self, state: LiveState, dates: Optional[np.ndarray] = None) -> ScoreResult:
+        """Score of the bars stepped so far, as run() would return it (active events expire on the last bar)."""
+        if state.t == 0:
+            return _empty_result()
+        if dates is not None and len(dates) != state.t:
+            raise ValueError("dates length must match the bars stepped")
+        log = state.log
+        if state.active:
+            log = log.copy(extra=len(state.active))
+            for ev in state.active:
+                log.append(ev, _EXPIRED, state.t - 1, ev.max_abs_zscore, state.last_price)
+        return self._score(log.table(), dates)
+
+    # ----------------------------
+    # Event-driven mode
+    # ----------------------------
+    def supports_event_driven(self) -> bool:
+        """True when the detector and criteria provide the array API used by run_event_driven()."""
+        return (
+            hasattr(self.deviation_detector, "detect_batch")
+            and hasattr(self.reversion_criteria, "is_reverted_batch")
+            and hasattr(self.failure_criteria, "is_failed_batch")
+        )
+
+    def run_event_driven(
+        self,
+        *,
+        prices: np.ndarray,
+        returns: Optional[np.ndarray],
+        dates: Optional[np.ndarray] = None,
+    ) -> ScoreResult:
+        """
+        Score one series like run(), jumping between the bars where events open and end.
+
+        An estimator that is never frozen is read as one transform() over the
+        series, giving mean / volatility / z-score arrays; readiness follows
+        from the update count. Candidate opens are the bars where
+        the detector fires; each candidate's end is the first later bar where
+        the reversion or failure criteria hold (argmax over the criteria masks,
+        all candidates at once). Picking the events run() would open is then a
+        walk over candidate indices with searchsorted jumps past bars where
+        max_active_events are in flight; bars inside the band are never visited.
+
+        With freeze_*_on_event the frozen estimator's path depends on the
+        events: between events it is stepped bar by bar as in run(), and it is
+        held while any event is active, so each stretch of active events is
+        again one array computation.
+
+        Events and counts are those of run(); estimator-derived floats
+        (start_mean, start_zscore, ...) agree with run() up to the rounding of
+        transform(). Falls back to run() when a component has no array API.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim != 1:
+            raise ValueError("prices must be 1D")
+        T = int(prices.shape[0])
+        if T == 0 or not self.supports_event_driven():
+            return self.run(prices=prices, returns=returns, dates=dates)
+
+        if dates is not None:
+            if len(dates) != T:
+                raise ValueError("dates length must match prices length")
+        if self.volatility_unit == "returns":
+            if returns is None:
+                raise ValueError("returns must be provided when volatility_unit='returns'")
+            returns = np.asarray(returns, dtype=np.float64)
+            if returns.ndim != 1 or len(returns) != T - 1:
+                raise ValueError("returns must be 1D of length T-1")
+
+        eng_cfg = self.config.engine
+        freeze_mean = bool(eng_cfg.freeze_mean_on_event)
+        freeze_vol = bool(eng_cfg.freeze_volatility_on_event)
+        max_active = int(eng_cfg.max_active_events) if eng_cfg.allow_overlapping_events else 1
+        min_bars_required = int(self.config.data.min_bars_required)
+
+        mean_est = self.mean_estimator
+        vol_est = self.volatility_estimator
+        vol_inputs, vol_offset = (prices, 0) if self.volatility_unit == "price" else (returns, 1)
+
+        # Estimators that are never frozen follow one path regardless of events.
+        if not freeze_mean:
+            mean_path, mean_ready = _estimator_path(mean_est, prices, 0, T)
+        if not freeze_vol:
+            vol_path, vol_ready = _estimator_path(vol_est, vol_inputs, vol_offset, T)
+        mean_est.reset()
+        vol_est.reset()
+
+        warm = np.arange(1, T + 1) >= min_bars_required
+        records: List[tuple] = []
+
+        def stretch(lo: int, hi: int, held_mean: float, held_vol: float, idle_stop: bool) -> int:
+            """
+            Events opened within bars [lo, hi), frozen estimators held at the
+            given values, appended to records. With idle_stop, stops once no
+            event is active (end of a frozen stretch). Returns the last end bar,
+            or -1 when an event outlives the window and hi < T.
+            """
+            p = prices[lo:hi]
+            ok = warm[lo:hi].copy()
+            if freeze_mean:
+                mean = np.full(hi - lo, held_mean)
+            else:
+                mean = mean_path[lo:hi]
+                ok &= mean_ready[lo:hi]
+            if freeze_vol:
+                vol = np.full(hi - lo, held_vol)
+            else:
+                vol = vol_path[lo:hi]
+                ok &= vol_ready[lo:hi]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z = (p - mean) / vol
+                signs = self.deviation_detector.detect_batch(price=p, mean=mean, volatility=vol)
+            ok &= np.isfinite(mean) & np.isfinite(vol) & (vol > 0.0) & np.isfinite(z)
+
+            candidates = np.flatnonzero(ok & (signs != 0))
+            reverted = self.reversion_criteria.is_reverted_batch(zscore=z)
+
+            all_ends = _first_close(candidates, z, ok & reverted, ok, self.failure_criteria)
+            picked, ends = _walk_events(candidates.tolist(), all_ends.tolist(), max_active, idle_stop)
+
+            n = hi - lo
+            starts = candidates[picked]
+            ends = np.array(ends, dtype=np.int64)
+            if hi < T and (ends >= n).any():
+                return -1
+            last = np.minimum(ends, n - 1)
+            # max |z| over the scored bars (start, end]: pairwise reduceat, with a
+            # -inf sentinel standing in for the empty range of an event opened on the last bar
+            abs_z = np.append(np.where(ok, np.abs(z), -np.inf), -np.inf)
+            bounds = np.empty(2 * starts.size, dtype=np.int64)
+            bounds[0::2] = starts + 1
+            bounds[1::2] = last + 1
+            path_max = np.maximum.reduceat(abs_z, bounds)[0::2] if starts.size else abs_z[:0]
+            status = np.where(ends >= n, 2, np.where(reverted[last], 0, 1))
+            records.append(
+                (
+                    starts + lo,
+                    last + lo,
+                    status,
+                    signs[starts],
+                    mean[starts],
+                    vol[starts],
+                    z[starts],
+                    np.maximum(np.abs(z[starts]), path_max),
+                )
+            )
+            return int(last.max()) + lo if starts.size else hi - 1
+
+        if not (freeze_mean or freeze_vol):
+            stretch(0, T, 0.0, 0.0, False)
+        else:
+            t = 0
+            while t < T:
+                # step the frozen estimator(s) through idle bars until an event opens
+                s = -1
+                for t in range(t, T):
+                    p = float(prices[t])
+                    if freeze_mean:
+                        mean_est.update(p)
+                    if freeze_vol and t >= vol_offset:
+                        vol_est.update(float(vol_inputs[t - vol_offset]))
+                    if t + 1 < min_bars_required:
+                        continue
+                    if not (mean_est.is_ready() if freeze_mean else mean_ready[t]):
+                        continue
+                    if not (vol_est.is_ready() if freeze_vol else vol_ready[t]):
+                        continue
+                    mean = float(mean_est.value) if freeze_mean else float(mean_path[t])
+                    vol = float(vol_est.value) if freeze_vol else float(vol_path[t])
+                    if not isfinite(mean) or not isfinite(vol) or vol <= 0.0:
+                        continue
+                    if not isfinite((p - mean) / vol):
+                        continue
+                    if self.deviation_detector.detect(price=p, mean=mean, volatility=vol) is not None:
+                        s = t
+                        break
+                if s < 0:
+                    break
+                width = 64
+                while True:
+                    end = stretch(s, min(T, s + width), mean, vol, True)
+                    if end >= 0:
+                        break
+                    width *= 4
+                t = end + 1
+
+        return self._score(_table_from_records(records, prices), dates)
+
+    # ----------------------------
+    # Batch mode
+    # ----------------------------
+    def supports_batch(self) -> bool:
+        """True when every component provides the array API used by run_batch()."""
+        return (
+            hasattr(self.mean_estimator, "batch")
+            and hasattr(self.volatility_estimator, "batch")
+            and hasattr(self.deviation_detector, "detect_batch")
+            and hasattr(self.reversion_criteria, "is_reverted_batch")
+            and hasattr(self.failure_criteria, "is_failed_batch")
+        )
+
+    def run_batch(
+        self,
+        *,
+        prices: np.ndarray,
+        returns: Optional[np.ndarray],
+        dates: Optional[np.ndarray] = None,
+        abandon_below: Optional[np.ndarray | float] = None,
+    ) -> List[ScoreResult]:
+        """
+        Score B series of equal length in one pass over time.
+
+        prices: shape (B, T); returns: shape (B, T-1) when volatility_unit='returns'.
+        Estimator state lives in (B,) arrays and events in (B, max_active_events)
+        slots, so the Python loop runs T times instead of B*T. Results are
+        identical to calling run() on each row.
+
+        abandon_below: scalar or (B,) per-row thresholds, as in run(). Abandoned
+        rows drop out of all further updates; the loop ends once every row has.
+
+        Falls back to per-row run() when a component has no array API.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim != 2:
+            raise ValueError("prices must be 2D (B, T)")
+        B, T = (int(n) for n in prices.shape)
+
+        if dates is not None and len(dates) != T:
+            raise ValueError("dates length must match prices length")
+        if self.volatility_unit == "returns":
+            if returns is None:
+                raise ValueError("returns must be provided when volatility_unit='returns'")
+            returns = np.asarray(returns, dtype=np.float64)
+            if returns.shape != (B, max(T - 1, 0)):
+                raise ValueError("returns must be 2D of shape (B, T-1)")
+
+        floors = None
+        if abandon_below is not None:
+            if not self.supports_early_abandon():
+                raise ValueError("early abandon requires scoring.score_metric='reversion_rate'")
+            floors = np.broadcast_to(np.asarray(abandon_below, dtype=np.float64), (B,))
+
+        if B == 0:
+            return []
+        if T == 0 or not self.supports_batch():
+            return [
+                self.run(
+                    prices=prices[b],
+                    returns=(returns[b] if returns is not None else None),
+                    dates=dates,
+                    abandon_below=(float(floors[b]) if floors is not None else None),
+                )
+                for b in range(B)
+            ]
+
+        eng_cfg = self.config.engine
         allow_overlapping = bool(eng_cfg.allow_overlapping_events)
         freeze_mean_on_event = bool(eng_cfg.freeze_mean_on_event)
         freeze_vol_on_event = bool(eng_cfg.freeze_volatility_on_event)
         max_active_events = int(eng_cfg.max_active_events)
+        min_bars_required = int(self.config.data.min_bars_required)
+
+        mean_est = self.mean_estimator.batch(B)
+        vol_est = self.volatility_estimator.batch(B)
+        mean_est.reset()
+        vol_est.reset()
+
+        # Event slots: one row per series, one column per concurrently active event.
+        M = max_active_events if allow_overlapping else 1
+        active = np.zeros((B, M), dtype=bool)
+        ev_dir = np.zeros((B, M), dtype=np.int8)
+        ev_start = np.zeros((B, M), dtype=np.int64)
+        ev_price = np.zeros((B, M), dtype=np.float64)
+        ev_mean = np.zeros((B, M), dtype=np.float64)
+        ev_vol = np.zeros((B, M), dtype=np.float64)
+        ev_z = np.zeros((B, M), dtype=np.float64)
+        ev_max = np.zeros((B, M), dtype=np.float64)
+
+        closed: List[tuple] = []
+
+        # early abandon: closed / reverted event counts per series, and the rows still scanned
+        n_closed = np.zeros(B, dtype=np.int64)
+        n_reverted = np.zeros(B, dtype=np.int64)
+        alive = np.ones(B, dtype=bool)
+        abandoned_at = np.full(B, -1, dtype=np.int64)
+        live_rows = None  # None while every row is alive
+
+        def _close(mask: np.ndarray, status: EventStatus, t: int, end_prices: np.ndarray, max_abs: np.ndarray) -> None:
+            rows, slots = np.nonzero(mask)
+            if floors is not None:
+                counts = np.bincount(rows, minlength=B)
+                np.add(n_closed, counts, out=n_closed)
+                if status == EventStatus.REVERTED:
+                    np.add(n_reverted, counts, out=n_reverted)
+            closed.append(
+                (
+                    rows,
+                    status,
+                    t,
+                    ev_dir[rows, slots],
+                    ev_start[rows, slots],
+                    ev_price[rows, slots],
+                    ev_mean[rows, slots],
+                    ev_vol[rows, slots],
+                    ev_z[rows, slots],
+                    max_abs[rows, slots],
+                    end_prices[rows],
+                )
+            )
+            active[rows, slots] = False
 
-        min_bars_required = int(data_cfg.min_bars_required)
-
-        active: List[_ActiveEvent] = []
-        summaries: List[EventSummary] = []
-
-        # main loop
         for t in range(T):
-            p = float(prices[t])
-            now = dates[t] if dates is not None else None
-
-            # update mean unless frozen by active event(s)
-            if not (freeze_mean_on_event and active):
-                self.mean_estimator.update(p)
-
-            # update volatility (price or returns) unless frozen by active event(s)
+            if floors is not None and t > 0:
+                x = T - 1 - t
+                n_act = active.sum(axis=1)
+                n = n_closed + n_act + x
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    bound = (n_reverted + n_act + x) / n
+                prune = alive & (n > 0) & (bound < floors)
+                if prune.any():
+                    alive &= ~prune
+                    abandoned_at[prune] = t
+                    live_rows = np.flatnonzero(alive)
+                    if live_rows.size == 0:
+                        break
+
+            p = prices[:, t]
+            any_active = active.any(axis=1)
+
+            # update estimators unless frozen by active event(s), per series
+            mean_rows = np.flatnonzero(~any_active & alive) if freeze_mean_on_event else live_rows
+            vol_rows = np.flatnonzero(~any_active & alive) if freeze_vol_on_event else live_rows
+            mean_est.update(p, mean_rows)
             if self.volatility_unit == "price":
-                if not (freeze_vol_on_event and active):
-                    self.volatility_estimator.update(p)
-            else:
-                # returns-based vol: update from t=1 onward
-                if t >= 1 and not (freeze_vol_on_event and active):
-                    self.volatility_estimator.update(float(returns[t - 1]))
+                vol_est.update(p, vol_rows)
+            elif t >= 1:
+                vol_est.update(returns[:, t - 1], vol_rows)
 
-            # enforce warmup / readiness
             if t + 1 < min_bars_required:
                 continue
-            if not self.mean_estimator.is_ready():
-                continue
-            if not self.volatility_estimator.is_ready():
-                continue
 
-            mean = float(self.mean_estimator.value)
-            vol = float(self.volatility_estimator.value)
-            if not np.isfinite(mean) or not np.isfinite(vol) or vol <= 0.0:
+            mean = mean_est.value
+            vol = vol_est.value
+            valid = mean_est.is_ready() & vol_est.is_ready() & np.isfinite(mean) & np.isfinite(vol) & (vol > 0.0)
+            if live_rows is not None:
+                valid &= alive
+            if not valid.any():
                 continue
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z = (p - mean) / vol
+            valid &= np.isfinite(z)
+
+            # 1) update active events (revert / fail); reversion beats failure
+            live = active & valid[:, None]
+            if live.any():
+                zz = np.broadcast_to(z[:, None], live.shape)
+                max_abs = np.where(live & (np.abs(zz) > ev_max), np.abs(zz), ev_max)
+                reverted = live & self.reversion_criteria.is_reverted_batch(zscore=zz)
+                failed = live & ~reverted & self.failure_criteria.is_failed_batch(duration=t - ev_start, zscore=zz)
+                if reverted.any():
+                    _close(reverted, EventStatus.REVERTED, t, p, max_abs)
+                if failed.any():
+                    _close(failed, EventStatus.FAILED, t, p, max_abs)
+                ev_max = np.where(live & active, max_abs, ev_max)
 
-            z = (p - mean) / vol
-            if not np.isfinite(z):
+            # 2) open new event(s) if allowed
+            n_active = active.sum(axis=1)
+            can_open = valid & (n_active < max_active_events)
+            if not allow_overlapping:
+                can_open &= n_active == 0
+            rows = np.flatnonzero(can_open)
+            if rows.size == 0:
                 continue
+            signs = self.deviation_detector.detect_batch(price=p[rows], mean=mean[rows], volatility=vol[rows])
+            hit = signs != 0
+            if not hit.any():
+                continue
+            rows = rows[hit]
+            slots = np.argmin(active[rows], axis=1)  # first free slot
+            active[rows, slots] = True
+            ev_dir[rows, slots] = signs[hit]
+            ev_start[rows, slots] = t
+            ev_price[rows, slots] = p[rows]
+            ev_mean[rows, slots] = mean[rows]
+            ev_vol[rows, slots] = vol[rows]
+            ev_z[rows, slots] = z[rows]
+            ev_max[rows, slots] = np.abs(z[rows])
 
-            # 1) update active events (revert / fail)
-            if active:
-                still_active: List[_ActiveEvent] = []
-                for ev in active:
-                    dur = t - ev.start_index
-                    max_abs = ev.max_abs_zscore
-                    az = abs(z)
-                    if az > max_abs:
-                        max_abs = az
-
-                    # reversion beats failure if both happen same bar
-                    if self.reversion_criteria.is_reverted(zscore=z):
-                        summaries.append(
-                            EventSummary(
-                                direction=ev.direction,
-                                status=EventStatus.REVERTED,
-                                start_index=ev.start_index,
-                                end_index=t,
-                                duration=dur,
-                                start_price=ev.start_price,
-                                start_mean=ev.start_mean,
-                                start_volatility=ev.start_volatility,
-                                start_zscore=ev.start_zscore,
-                                max_abs_zscore=max_abs,
-                                end_price=p,
-                                start_time=ev.start_time,
-                                end_time=now,
-                            )
-                        )
-                        continue
-
-                    if self.failure_criteria.is_failed(duration=dur, zscore=z):
-                        summaries.append(
-                            EventSummary(
-                                direction=ev.direction,
-                                status=EventStatus.FAILED,
-                                start_index=ev.start_index,
-                                end_index=t,
-                                duration=dur,
-                                start_price=ev.start_price,
-                                start_mean=ev.start_mean,
-                                start_volatility=ev.start_volatility,
-                                start_zscore=ev.start_zscore,
-                                max_abs_zscore=max_abs,
-                                end_price=p,
-                                start_time=ev.start_time,
-                                end_time=now,
-                            )
-                        )
-                        continue
+        # expire remaining actives
+        expiring = active & alive[:, None]
+        if expiring.any():
+            _close(expiring, EventStatus.EXPIRED, T - 1, prices[:, T - 1], ev_max)
+
+        per_series = _tables_by_series(closed, B)
+
+        return [
+            self._score(events, dates)
+            if abandoned_at[b] < 0
+            else _abandoned_result(events, int(abandoned_at[b]))
+            for b, events in enumerate(per_series)
+        ]
+
+
+_REVERTED = EventStatus.REVERTED.code
+_FAILED = EventStatus.FAILED.code
+_EXPIRED = EventStatus.EXPIRED.code
+
+
+def _empty_result() -> ScoreResult:
+    return ScoreResult(
+        score=float("nan"),
+        total_events=0,
+        reverted_events=0,
+        failed_events=0,
+        expired_events=0,
+        by_direction=None,
+        by_volatility_bucket=None,
+        events=[],
+    )
+
+
+def _abandoned_result(events: EventTable, t: int) -> ScoreResult:
+    reverted = int(np.count_nonzero(events.status == _REVERTED))
+    return ScoreResult(
+        score=float("nan"),
+        total_events=len(events),
+        reverted_events=reverted,
+        failed_events=len(events) - reverted,
+        expired_events=0,
+        events=None,
+        abandoned_at=t,
+    )
+
+
+def _active_rows(active: List[_ActiveEvent]) -> List[list]:
+    return [
+        [ev.direction, ev.start_index, ev.start_price, ev.start_mean, ev.start_volatility, ev.start_zscore, ev.max_abs_zscore]
+        for ev in active
+    ]
+
+
+def _active_events(rows: List[list]) -> List[_ActiveEvent]:
+    return [
+        _ActiveEvent(
+            direction=int(d),
+            start_index=int(i),
+            start_price=float(p),
+            start_mean=float(m),
+            start_volatility=float(v),
+            start_zscore=float(z),
+            max_abs_zscore=float(a),
+        )
+        for d, i, p, m, v, z, a in rows
+    ]
 
-                    ev.max_abs_zscore = max_abs
-                    still_active.append(ev)
 
-                active = still_active
+def _estimator_path(estimator: Any, values: np.ndarray, offset: int, T: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    value and is_ready() after each of T bars for a reset estimator fed
+    values[t - offset] at bars t >= offset (the update() sequence of run()).
+    One transform() when the estimator has one (readiness then follows from
+    the update count), else update() bar by bar.
+    """
+    estimator.reset()
+    head = min(offset, T)
+    if hasattr(estimator, "transform") and hasattr(estimator, "warmup"):
+        path = np.empty(T, dtype=np.float64)
+        path[:head] = float(estimator.value)
+        path[head:] = estimator.transform(np.asarray(values, dtype=np.float64)[: T - head])
+        updates = np.maximum(np.arange(1 - offset, T + 1 - offset), 0)
+        return path, updates >= int(estimator.warmup)
+    path: List[float] = [float(estimator.value)] * head
+    ready: List[bool] = [bool(estimator.is_ready())] * head
+    for x in np.asarray(values, dtype=np.float64)[: T - head].tolist():
+        estimator.update(x)
+        path.append(float(estimator.value))
+        ready.append(bool(estimator.is_ready()))
+    return np.array(path, dtype=np.float64), np.array(ready, dtype=bool)
+
+
+def _first_close(
+    starts: np.ndarray, z: np.ndarray, reverted: np.ndarray, ok: np.ndarray, failure_criteria: Any
+) -> np.ndarray:
+    """
+    For events opened at each of `starts`, the first later bar where the event
+    closes: reverted, or ok and failed at that bar's duration. len(z) when it
+    never closes. Lookahead windows double until every start is resolved.
+    """
+    n = int(z.shape[0])
+    ends = np.full(starts.shape[0], n, dtype=np.int64)
+    todo = np.arange(starts.shape[0])
+    k, width = 1, 16
+    while todo.size:
+        offsets = np.arange(k, k + width)
+        bars = starts[todo, None] + offsets
+        inside = bars < n
+        bars = np.minimum(bars, n - 1)
+        hit = inside & (
+            reverted[bars] | (ok[bars] & failure_criteria.is_failed_batch(duration=offsets, zscore=z[bars]))
+        )
+        found = hit.any(axis=1)
+        ends[todo[found]] = bars[found, np.argmax(hit[found], axis=1)]
+        todo = todo[~found & inside[:, -1]]
+        k += width
+        width *= 2
+    return ends
 
-            # 2) open new event(s) if allowed
-            can_open = (len(active) < max_active_events) and (allow_overlapping or not active)
-            if can_open:
-                direction = self.deviation_detector.detect(price=p, mean=mean, volatility=vol)
-                if direction is not None:
-                    active.append(
-                        _ActiveEvent(
-                            direction=direction,
-                            start_index=t,
-                            start_time=now,
-                            start_price=p,
-                            start_mean=mean,
-                            start_volatility=vol,
-                            start_zscore=z,
-                            max_abs_zscore=abs(z),
-                        )
-                    )
 
-        # expire remaining actives
+def _walk_events(candidates: List[int], ends: List[int], max_active: int, idle_stop: bool) -> tuple[List[int], List[int]]:
+    """
+    Indices of the candidate bars where run() opens an event, and those
+    events' end bars, given each candidate's end bar. An event ending at bar
+    c frees its slot before c's open; while max_active events are in flight
+    the walk jumps to the first candidate at or after the earliest end. With
+    idle_stop, the walk stops at the first candidate after every opened event
+    has ended.
+    """
+    picked: List[int] = []
+    active: List[int] = []
+    i = 0
+    while i < len(candidates):
+        c = candidates[i]
         if active:
-            t_end = T - 1
-            end_time = dates[t_end] if dates is not None else None
-            end_p = float(prices[t_end])
-            for ev in active:
-                dur = t_end - ev.start_index
-                summaries.append(
-                    EventSummary(
-                        direction=ev.direction,
-                        status=EventStatus.EXPIRED,
-                        start_index=ev.start_index,
-                        end_index=t_end,
-                        duration=dur,
-                        start_price=ev.start_price,
-                        start_mean=ev.start_mean,
-                        start_volatility=ev.start_volatility,
-                        start_zscore=ev.start_zscore,
-                        max_abs_zscore=ev.max_abs_zscore,
-                        end_price=end_p,
-                        start_time=ev.start_time,
-                        end_time=end_time,
-                    )
-                )
+            if idle_stop and max(active) < c:
+                break
+            active = [e for e in active if e > c]
+        if len(active) >= max_active:
+            i = bisect_left(candidates, min(active), i + 1)
+            continue
+        picked.append(i)
+        active.append(ends[i])
+        i += 1
+    return picked, [ends[i] for i in picked]
+
+
+def _table_from_records(records: List[tuple], prices: np.ndarray) -> EventTable:
+    """
+    EventTable from run_event_driven() records: (start bars, end bars,
+    status codes, direction signs, start means, start vols, start zscores,
+    max |z|). Ordered as run() emits events: by end bar, then opening order;
+    expiries last.
+    """
+    if not records:
+        return EventTable.empty()
+    cols = [np.concatenate([r[k] for r in records]) for k in range(8)]
+    start, end, status = cols[0], cols[1], cols[2]
+    order = np.lexsort((start, end, status == _EXPIRED))
+    start, end = start[order], end[order]
+    return EventTable(
+        direction=cols[3][order].astype(np.int8),
+        status=status[order].astype(np.int8),
+        start_index=start,
+        end_index=end,
+        start_price=prices[start],
+        start_mean=cols[4][order],
+        start_volatility=cols[5][order],
+        start_zscore=cols[6][order],
+        max_abs_zscore=cols[7][order],
+        end_price=prices[end],
+    )
+
+
+def _tables_by_series(closed: List[tuple], B: int) -> List[EventTable]:
+    """
+    EventTable per series from the closure records of an array event loop.
 
-        return score_events(
-            events=summaries,
-            scoring=scoring_cfg,
-            diagnostics=self.config.diagnostics,
-        )
+    Each record is (rows, status, end_index, direction signs, start indices,
+    start prices, start means, start vols, start zscores, max |z|, end prices),
+    one array entry per closed event. Events come out in scalar run() order:
+    by bar, then opening order; expiries last. The tables are slices of one
+    sorted table.
+    """
+    if not closed:
+        return [EventTable.empty()] * B
+    rows = np.concatenate([c[0] for c in closed])
+    status = np.concatenate([np.full(c[0].size, c[1].code, dtype=np.int8) for c in closed])
+    end = np.concatenate([np.full(c[0].size, c[2], dtype=np.int64) for c in closed])
+    cols = [np.concatenate([c[k] for c in closed]) for k in range(3, 11)]
+    order = np.lexsort((cols[1], end, status == _EXPIRED, rows))
+
+    table = EventTable(
+        direction=cols[0][order].astype(np.int8),
+        status=status[order],
+        start_index=cols[1][order].astype(np.int64),
+        end_index=end[order],
+        start_price=cols[2][order],
+        start_mean=cols[3][order],
+        start_volatility=cols[4][order],
+        start_zscore=cols[5][order],
+        max_abs_zscore=cols[6][order],
+        end_price=cols[7][order],
+    )
+    bounds = np.searchsorted(rows[order], np.arange(B + 1)).tolist()
+    return [table.take(slice(a, b)) for a, b in zip(bounds[:-1], bounds[1:])]
@@ -0,0 +1,145 @@
+# mrscore/core/prescreen.py
+from __future__ import annotations
+
+from math import ceil, log
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# Cheap mean-reversion statistics of log ratio series, and the sign that makes
+# "higher = more mean-reverting" for each:
+#   autocorr       - lag-1 autocorrelation of the demeaned series (lower reverts)
+#   half_life      - -ln 2 / ln(1 + beta), beta the OLS slope of dy_t on y_{t-1} (shorter reverts)
+#   hurst          - slope of log rms(y_{t+l} - y_t) on log l (below 0.5 reverts; the rms,
+#                    unlike the std, keeps a steady drift at H ~ 1)
+#   zero_crossings - crossings of the demeaned series per bar (more reverts)
+#   composite      - mean of the four per-block ranks
+PRESCREEN_METRICS = ("autocorr", "half_life", "hurst", "zero_crossings", "composite")
+_SIGNS = {"autocorr": -1.0, "half_life": -1.0, "hurst": -1.0, "zero_crossings": 1.0}
+
+_HURST_LAGS = (2, 4, 8, 16, 32, 64)
+
+# default blocks hold at least this many jobs, so the per-block ranking is meaningful
+_MIN_BLOCK = 1024
+
+
+def ratio_statistics(prices: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Per-row statistics of a (B, T) block of positive price series, computed on
+    log prices with a handful of whole-block numpy passes.
+
+    Rows holding a non-finite or non-positive price, too short to estimate
+    (T < 3), or constant get NaN.
+    """
+    x = np.asarray(prices, dtype=np.float64)
+    if x.ndim != 2:
+        raise ValueError("prices must be a 2D (B, T) array")
+    B, T = x.shape
+    out = {name: np.full(B, np.nan) for name in _SIGNS}
+    if T < 3 or B == 0:
+        return out
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = np.log(x)
+        valid = np.isfinite(y).all(axis=1)
+        y = np.where(valid[:, None], y, 0.0)
+
+        z = y - y.mean(axis=1, keepdims=True)
+        ss = np.einsum("bt,bt->b", z, z)
+        out["autocorr"] = np.einsum("bt,bt->b", z[:, 1:], z[:, :-1]) / ss
+
+        # OLS with intercept: beta = cov(dy, y_lag) / var(y_lag)
+        lag = y[:, :-1] - y[:, :-1].mean(axis=1, keepdims=True)
+        dy = np.diff(y, axis=1)
+        beta = np.einsum("bt,bt->b", dy, lag) / np.einsum("bt,bt->b", lag, lag)
+        half_life = np.where(beta < 0.0, -log(2.0) / np.log1p(np.maximum(beta, -1.0)), np.inf)
+        out["half_life"] = np.where(np.isnan(beta), np.nan, half_life)
+
+        lags = [lag_ for lag_ in _HURST_LAGS if lag_ < T // 2] or [1, 2]
+        log_rms = np.stack([0.5 * np.log(np.mean(np.square(y[:, l:] - y[:, :-l]), axis=1)) for l in lags], axis=1)
+        log_lag = np.log(np.asarray(lags, dtype=np.float64))
+        log_lag -= log_lag.mean()
+        out["hurst"] = (log_rms - log_rms.mean(axis=1, keepdims=True)) @ log_lag / (log_lag @ log_lag)
+
+        sign = np.signbit(z)
+        out["zero_crossings"] = np.count_nonzero(sign[:, 1:] != sign[:, :-1], axis=1) / (T - 1)
+        out["zero_crossings"][ss == 0.0] = np.nan
+
+    for name, values in out.items():
+        values[~valid] = np.nan
+        if name != "half_life":  # +inf half-life: no reversion at all
+            values[~np.isfinite(values)] = np.nan
+    return out
+
+
+def _rank(values: np.ndarray) -> np.ndarray:
+    """0-based ascending ranks, NaN lowest; among equal values the earlier row ranks higher."""
+    n = values.shape[0]
+    key = np.where(np.isnan(values), -np.inf, values)
+    ranks = np.empty(n, dtype=np.float64)
+    ranks[np.lexsort((-np.arange(n), key))] = np.arange(n)
+    return ranks
+
+
+def prescreen_scores(prices: np.ndarray, metric: str = "composite") -> np.ndarray:
+    """Per-row pre-screen score of a (B, T) block: higher = more mean-reverting, NaN = unknown."""
+    if metric not in PRESCREEN_METRICS:
+        raise ValueError(f"unknown prescreen metric: {metric!r}")
+    stats = ratio_statistics(prices)
+    if metric != "composite":
+        return _SIGNS[metric] * stats[metric]
+    ranks = [_rank(_SIGNS[name] * values) for name, values in stats.items()]
+    score = np.mean(ranks, axis=0)
+    score[np.isnan(stats["autocorr"])] = np.nan
+    return score
+
+
+class RatioPrescreen:
+    """
+    Stage one of a two-stage scan: keep the best `fraction` of each block of
+    ratio series by a cheap statistic, so only those reach the engine.
+
+    The selection is per block (`block` jobs in scan order, or one tile), so
+    it streams with the scan and is deterministic for fixed block boundaries.
+    Ties keep the earlier row; NaN statistics rank last.
+
+    block=None sizes blocks with block_for(): the survivors of a block then
+    fill whole engine batches, since run_batch costs about the same for a few
+    rows as for a full batch.
+    """
+
+    def __init__(self, fraction: float, *, metric: str = "composite", block: Optional[int] = None) -> None:
+        if not 0.0 < fraction <= 1.0:
+            raise ValueError("fraction must be in (0, 1]")
+        if block is not None and block < 1:
+            raise ValueError("block must be >= 1")
+        if metric not in PRESCREEN_METRICS:
+            raise ValueError(f"unknown prescreen metric: {metric!r}")
+        self.fraction = float(fraction)
+        self.metric = metric
+        self.block = int(block) if block is not None else None
+
+    def block_for(self, rows: int) -> int:
+        """Jobs per block for an engine scoring `rows` series per call."""
+        if self.block is not None:
+            return self.block
+        # the smallest multiple of `rows` survivors whose block reaches _MIN_BLOCK jobs
+        batches = max(1, ceil(_MIN_BLOCK * self.fraction / rows))
+        return max(1, int(batches * rows / self.fraction))
+
+    def keep_count(self, n: int) -> int:
+        return min(n, ceil(self.fraction * n))
+
+    def select(self, prices: np.ndarray) -> np.ndarray:
+        """Ascending row indices of the kept series of a (B, T) block."""
+        n = prices.shape[0]
+        keep = self.keep_count(n)
+        if keep == n:
+            return np.arange(n)
+        score = prescreen_scores(prices, self.metric)
+        key = np.where(np.isnan(score), -np.inf, score)
+        # stable sort of -key: best first, earlier rows first among ties
+        best = np.argsort(-key, kind="stable")[:keep]
+        best.sort()
+        return best
@@ -3,9 +3,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import heapq
-from typing import Any, Optional
+from math import isfinite
+from typing import Any, Dict, Hashable, Optional, Sequence
 
 from mrscore.core.ratio_universe import RatioJob
+from mrscore.core.results import ScoreResult
 
 
 @dataclass(frozen=True)
@@ -21,15 +23,23 @@ class TopKRanker:
 
     - consider(): O(log k)
     - items_sorted(): O(k log k)
+    - merge(): O(k log k), for combining rankers built over disjoint shards
     - Does not allocate per item beyond heap nodes.
+
+    Items are totally ordered by (score desc, order asc): on equal scores the
+    item with the lower `order` ranks higher. `order` defaults to arrival order,
+    so a serial scan keeps the earliest job among ties. Sharded scans pass the
+    global job index instead, which makes the merged top-k independent of how
+    the job space was split.
     """
 
     def __init__(self, k: int) -> None:
         if k < 1:
             raise ValueError("k must be >= 1")
         self._k = int(k)
+        # nodes are (score, -order, item): the heap root is the worst kept item
         self._heap: list[tuple[float, int, RankedJob]] = []
-        self._tie = 0  # deterministic tie-breaker
+        self._tie = 0  # deterministic tie-breaker when no explicit order is given
 
     @property
     def k(self) -> int:
@@ -38,27 +48,146 @@ class TopKRanker:
     def __len__(self) -> int:
         return len(self._heap)
 
-    def consider(self, *, job: RatioJob, score: float, meta: Optional[dict[str, Any]] = None) -> None:
+    def consider(
+        self,
+        *,
+        job: RatioJob,
+        score: float,
+        meta: Optional[dict[str, Any]] = None,
+        order: Optional[int] = None,
+    ) -> None:
         s = float(score)
-        item = RankedJob(job=job, score=s, meta=meta)
+        if order is None:
+            order = self._tie
+            self._tie += 1
+        self._push(s, -int(order), job, meta)
+
+    def merge(self, other: "TopKRanker") -> None:
+        """
+        Fold another ranker's items into this one.
 
-        # Push until full; then replace smallest if better
+        Merging is order-independent as long as every item carries a distinct
+        `order`; merging per-shard rankers reproduces the serial top-k exactly.
+        """
+        for s, neg_order, item in other._heap:
+            self._push(s, neg_order, item.job, item.meta, item=item)
+
+    def cutoff(self) -> Optional[tuple[float, int]]:
+        """
+        (score, order) of the worst kept item once k items are held, else None.
+
+        A new item is rejected iff score < cutoff score, or the scores are equal
+        and its order is greater.
+        """
         if len(self._heap) < self._k:
-            heapq.heappush(self._heap, (s, self._tie, item))
-            self._tie += 1
+            return None
+        worst = self._heap[0]
+        return worst[0], -worst[1]
+
+    def admits(self, score: float, order: int) -> bool:
+        """True iff consider(score=score, order=order) would keep the item; lets callers build it lazily."""
+        if len(self._heap) < self._k:
+            return True
+        worst = self._heap[0]
+        return (float(score), -int(order)) > (worst[0], worst[1])
+
+    def entries(self) -> list[tuple[RankedJob, int]]:
+        """(item, order) pairs; consider(order=...) on them rebuilds an equal ranker."""
+        return [(node[2], -node[1]) for node in self._heap]
+
+    def _push(
+        self,
+        s: float,
+        neg_order: int,
+        job: RatioJob,
+        meta: Optional[dict[str, Any]],
+        *,
+        item: Optional[RankedJob] = None,
+    ) -> None:
+        # Push until full; then replace the worst if better
+        if len(self._heap) < self._k:
+            heapq.heappush(self._heap, (s, neg_order, item or RankedJob(job=job, score=s, meta=meta)))
             return
 
         # If not better than current worst, skip
-        if s <= self._heap[0][0]:
+        worst = self._heap[0]
+        if (s, neg_order) <= (worst[0], worst[1]):
             return
 
-        heapq.heapreplace(self._heap, (s, self._tie, item))
-        self._tie += 1
+        heapq.heapreplace(self._heap, (s, neg_order, item or RankedJob(job=job, score=s, meta=meta)))
 
     def items_sorted(self, *, descending: bool = True) -> list[RankedJob]:
-        items = [node[2] for node in self._heap]
-        items.sort(key=lambda x: x.score, reverse=descending)
-        return items
+        nodes = sorted(self._heap, key=lambda node: (node[0], node[1]), reverse=descending)
+        return [node[2] for node in nodes]
 
     def jobs_sorted(self, *, descending: bool = True) -> list[RatioJob]:
         return [r.job for r in self.items_sorted(descending=descending)]
+
+
+class MultiTopKRanker:
+    """
+    Several top-k rankings over one job stream: by more than one ScoreResult
+    metric ("score", "sharpe", "total_events", ...) and, with group_by, per
+    group of jobs (a RatioJob field such as "num_id", one ranking per
+    numerator basket to diversify the selection).
+
+    - one TopKRanker per (metric, group): O(k) memory per ranking, whatever
+      the number of jobs considered (groups are bounded by the basket count)
+    - None / non-finite metric values are skipped for that metric only
+    - ties break on the job order like TopKRanker, so merging rankers built
+      over disjoint shards reproduces the serial rankings
+    """
+
+    def __init__(self, k: int, metrics: Sequence[str], *, group_by: Optional[str] = None) -> None:
+        if k < 1:
+            raise ValueError("k must be >= 1")
+        if not metrics:
+            raise ValueError("metrics must not be empty")
+        self._k = int(k)
+        self.metrics = tuple(metrics)
+        self.group_by = group_by
+        self._rankers: Dict[str, Dict[Hashable, TopKRanker]] = {metric: {} for metric in self.metrics}
+
+    @property
+    def k(self) -> int:
+        return self._k
+
+    def __len__(self) -> int:
+        return sum(len(r) for groups in self._rankers.values() for r in groups.values())
+
+    def consider(self, *, job: RatioJob, result: ScoreResult, order: int) -> None:
+        group = getattr(job, self.group_by) if self.group_by is not None else None
+        for metric, groups in self._rankers.items():
+            value = getattr(result, metric)
+            if value is None or not isfinite(value):
+                continue
+            ranker = groups.get(group)
+            if ranker is None:
+                ranker = groups[group] = TopKRanker(self._k)
+            ranker.consider(job=job, score=float(value), order=order)
+
+    def merge(self, other: "MultiTopKRanker") -> None:
+        """Fold in the rankings of another MultiTopKRanker with the same k, metrics and group_by."""
+        if (other.k, other.metrics, other.group_by) != (self._k, self.metrics, self.group_by):
+            raise ValueError("can only merge rankers with the same k, metrics and group_by")
+        for metric, groups in other._rankers.items():
+            mine = self._rankers[metric]
+            for group, ranker in groups.items():
+                if group not in mine:
+                    mine[group] = TopKRanker(self._k)
+                mine[group].merge(ranker)
+
+    def top(self, metric: str, group: Hashable = None) -> list[RankedJob]:
+        """Best-first items of one ranking (group None without group_by)."""
+        ranker = self._rankers[metric].get(group)
+        return ranker.items_sorted(descending=True) if ranker is not None else []
+
+    def groups(self, metric: str) -> Dict[Hashable, list[RankedJob]]:
+        """Best-first items of every group's ranking for `metric`, by group key."""
+        groups = self._rankers[metric]
+        return {group: groups[group].items_sorted(descending=True) for group in sorted(groups, key=_group_key)}
+
+
+def _group_key(group: Hashable) -> tuple:
+    # None (no group_by) sorts first; ids sort numerically
+    return (group is not None, group)
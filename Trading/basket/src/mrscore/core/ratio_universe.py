@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from itertools import combinations
-from math import comb
+from math import comb, isqrt
 from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import tempfile
 
 import numpy as np
 
@@ -31,10 +32,14 @@ class AlignedPanel:
 class BasketLibrary:
     k: int
     baskets: np.ndarray  # shape (B, k), dtype int32/int64
+    n_symbols: Optional[int] = None  # bitmask width in symbols; defaults to max index + 1
+    # shape (B, ceil(n_symbols/64)) uint64: bit s of basket b is set iff symbol s is in it
+    masks: np.ndarray = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.baskets.ndim != 2 or self.baskets.shape[1] != self.k:
             raise ValueError("baskets must be shaped (B, k)")
+        object.__setattr__(self, "masks", _basket_masks(self.baskets, self.n_symbols))
 
     @property
     def size(self) -> int:
@@ -54,6 +59,105 @@ class RatioJob:
     den_id: int
 
 
+@dataclass(frozen=True, eq=False)
+class RatioJobTable:
+    """
+    Columnar job list: job m is basket(num_ids[m]) / basket(den_ids[m]).
+
+    Holds two integer arrays instead of one RatioJob per job, so tens of
+    millions of jobs stay a few hundred MB and can be memory-mapped from the
+    cache. Indexing with an int builds the RatioJob on demand; slicing returns
+    a table view. Iterating yields RatioJobs lazily.
+    """
+    k_num: int
+    k_den: int
+    num_ids: np.ndarray  # shape (J,), int32 (int64 for libraries beyond 2**31 baskets)
+    den_ids: np.ndarray  # shape (J,)
+
+    def __post_init__(self) -> None:
+        if self.num_ids.ndim != 1 or self.num_ids.shape != self.den_ids.shape:
+            raise ValueError("num_ids and den_ids must be 1D arrays of equal length")
+
+    def __len__(self) -> int:
+        return int(self.num_ids.shape[0])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return RatioJobTable(self.k_num, self.k_den, self.num_ids[index], self.den_ids[index])
+        return RatioJob(k_num=self.k_num, k_den=self.k_den, num_id=int(self.num_ids[index]), den_id=int(self.den_ids[index]))
+
+    def take(self, index: np.ndarray) -> "RatioJobTable":
+        """Table of the jobs at integer positions `index` (copies the selected ids)."""
+        return RatioJobTable(self.k_num, self.k_den, self.num_ids[index], self.den_ids[index])
+
+    def __iter__(self) -> Iterator[RatioJob]:
+        for b0 in range(0, len(self), 4096):
+            for i, j in zip(self.num_ids[b0 : b0 + 4096].tolist(), self.den_ids[b0 : b0 + 4096].tolist()):
+                yield RatioJob(k_num=self.k_num, k_den=self.k_den, num_id=i, den_id=j)
+
+    def orders(self, den_library_size: int) -> np.ndarray:
+        """Global tie-break keys (num_id * C(N,k_den) + den_id, see app.scan.job_order), int64."""
+        return self.num_ids.astype(np.int64) * int(den_library_size) + self.den_ids
+
+    @classmethod
+    def from_jobs(cls, jobs: Sequence[RatioJob]) -> "RatioJobTable":
+        if not jobs:
+            raise ValueError("jobs must be non-empty")
+        first = jobs[0]
+        if any(j.k_num != first.k_num or j.k_den != first.k_den for j in jobs):
+            raise ValueError("all jobs must share k_num and k_den")
+        return cls(
+            first.k_num,
+            first.k_den,
+            np.fromiter((j.num_id for j in jobs), dtype=np.int32, count=len(jobs)),
+            np.fromiter((j.den_id for j in jobs), dtype=np.int32, count=len(jobs)),
+        )
+
+
+@dataclass(frozen=True)
+class RatioTile:
+    """
+    Ratio series for the valid (numerator, denominator) pairs of one block pair.
+
+    values[:, m] = basket(num_ids[m]) / (basket(den_ids[m]) + eps), columns in
+    row-major (num, den) order. `values` may be a view into a buffer reused by
+    the next tile; copy it to keep it.
+    """
+    k_num: int
+    k_den: int
+    num_ids: np.ndarray  # shape (M,), int64
+    den_ids: np.ndarray  # shape (M,), int64
+    values: np.ndarray   # shape (T, M)
+
+    @property
+    def size(self) -> int:
+        return int(self.num_ids.shape[0])
+
+    def jobs(self) -> RatioJobTable:
+        return RatioJobTable(self.k_num, self.k_den, self.num_ids, self.den_ids)
+
+
+@dataclass(frozen=True)
+class BasketCacheStats:
+    """
+    Snapshot of the basket-sum cache.
+
+    hits/misses count basket-sum lookups: a hit reads a precomputed column, a
+    miss gathers and sums panel columns (cache disabled for that call).
+    """
+    enabled: bool
+    hits: int
+    misses: int
+    memory_bytes: int   # in-RAM basket-sum matrices
+    mapped_bytes: int   # mmap-backed basket-sum matrices (over budget)
+    ks: Tuple[int, ...]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else float("nan")
+
+
 # -----------------------------------------------------------------------------
 # RatioUniverse
 # -----------------------------------------------------------------------------
@@ -63,7 +167,22 @@ class RatioUniverse:
 
     Key performance principle:
     - We may cache basket combinations (C(N,k) items).
+    - We may cache basket sums (T * C(N,k) floats), see basket_sums().
     - We must not cache ratios (O(C(N,k)^2) items).
+
+    basket_cache:
+        serve ratio series from precomputed basket sums (one divide per job)
+        instead of gathering and summing panel columns per job. Matrices larger
+        than basket_cache_max_bytes are backed by a temporary file in
+        basket_cache_dir (system temp dir if None).
+
+    panel.values may be C- or F-ordered and np.memmap-backed (io.panel_store);
+    it is used as-is unless a dtype conversion is needed. Normalizing a
+    memmap panel writes the normalized copy to a temporary file in
+    basket_cache_dir rather than to RAM.
+
+    normalization_base holds the first-row prices the panel was divided by
+    (None without normalize_by_first), so later bars can be normalized alike.
     """
 
     def __init__(
@@ -73,6 +192,9 @@ class RatioUniverse:
         normalize_by_first: bool = True,
         eps: float = 1e-12,
         dtype: np.dtype = np.float64,
+        basket_cache: bool = False,
+        basket_cache_max_bytes: Optional[int] = None,
+        basket_cache_dir: Optional[str] = None,
     ) -> None:
         if panel.values.ndim != 2:
             raise ValueError("panel.values must be 2D (T, N)")
@@ -94,17 +216,25 @@ class RatioUniverse:
         self.symbols = panel.symbols
         self._eps = float(eps)
 
-        # Ensure float64 contiguous matrix for downstream speed.
-        X = np.asarray(panel.values, dtype=dtype, order="C")
+        # Keep the caller's layout and mmap backing; copy only to change dtype.
+        X = panel.values
+        if not isinstance(X, np.ndarray) or X.dtype != dtype:
+            X = np.asarray(X, dtype=dtype)
+        self._panel_file = None
+        self.normalization_base: Optional[np.ndarray] = None
 
         # Optional: normalize each symbol by first value (vectorized).
         if normalize_by_first:
-            base = X[0, :]
+            base = np.array(X[0, :])
             bad = np.where((base == 0.0) | ~np.isfinite(base))[0]
             if bad.size > 0:
                 bad_syms = [panel.symbols[i] for i in bad]
                 raise ValueError(f"Cannot normalize: zero or non-finite first price for symbols: {bad_syms}")
-            X = X / base
+            if isinstance(X, np.memmap):
+                X = self._normalize_to_file(X, base, basket_cache_dir)
+            else:
+                X = X / base
+            self.normalization_base = base
             logger.info("Normalized panel by first value (vectorized)")
 
         self._X = X  # shape (T, N)
@@ -113,12 +243,38 @@ class RatioUniverse:
         # Basket libraries keyed by k
         self._basket_libs: Dict[int, BasketLibrary] = {}
 
+        # Basket-sum matrices keyed by k, tagged with the library they were built from
+        self.basket_cache_enabled = bool(basket_cache)
+        self._basket_cache_max_bytes = basket_cache_max_bytes
+        self._basket_cache_dir = basket_cache_dir
+        self._basket_sums: Dict[int, Tuple[BasketLibrary, np.ndarray]] = {}
+        self._basket_cache_hits = 0
+        self._basket_cache_misses = 0
+
         # Map symbol -> column index (useful if you later accept symbol specs)
         self._sym2idx = {s: i for i, s in enumerate(self.symbols)}
 
+    def _normalize_to_file(self, X: np.ndarray, base: np.ndarray, directory: Optional[str]) -> np.memmap:
+        """X / base into a named temporary mmap (same layout), a column chunk at a time."""
+        self._panel_file = tempfile.NamedTemporaryFile(dir=directory, prefix="mrscore-panel-", suffix=".bin")
+        order = "F" if (X.flags.f_contiguous and not X.flags.c_contiguous) else "C"
+        out = np.memmap(self._panel_file, dtype=X.dtype, mode="w+", shape=X.shape, order=order)
+        step = max(1, (1 << 26) // max(1, X.shape[0] * X.dtype.itemsize))
+        for c0 in range(0, X.shape[1], step):
+            np.divide(X[:, c0 : c0 + step], base[c0 : c0 + step], out=out[:, c0 : c0 + step])
+        return out
+
     # ----------------------------
     # Public helpers
     # ----------------------------
+    @property
+    def eps(self) -> float:
+        return self._eps
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._X.dtype
+
     def symbol_to_index(self, symbol: str) -> int:
         return self._sym2idx[symbol]
 
@@ -128,17 +284,18 @@ class RatioUniverse:
         k_num: int,
         k_den: int,
         unordered_if_equal_k: bool = True,
-        disallow_overlap: bool = False,  # overlap filtering makes exact counting harder
+        disallow_overlap: bool = False,
     ) -> int:
         """
-        Estimate number of ratio jobs.
+        Number of ratio jobs.
 
         - If k_num == k_den and unordered_if_equal_k=True:
             count = C(C(N,k), 2)   (matches legacy 'combinations of combinations' semantics)
         - Else:
             count = C(N,k_num) * C(N,k_den)  (ordered pairs)
 
-        If disallow_overlap=True, this is an upper bound (we do not compute exact count).
+        If disallow_overlap=True, the count is exact: overlapping pairs are
+        removed by testing basket bitmasks, which builds the basket libraries.
         """
         N = self._N
         if k_num < 1 or k_den < 1:
@@ -146,6 +303,16 @@ class RatioUniverse:
         if k_num > N or k_den > N:
             return 0
 
+        if disallow_overlap:
+            return int(
+                self._row_job_counts(
+                    k_num=k_num,
+                    k_den=k_den,
+                    unordered_if_equal_k=unordered_if_equal_k,
+                    disallow_overlap=True,
+                ).sum()
+            )
+
         b_num = comb(N, k_num)
         b_den = comb(N, k_den)
 
@@ -155,7 +322,6 @@ class RatioUniverse:
         else:
             total = b_num * b_den
 
-        # Overlap filtering reduces count; return upper bound
         return int(total)
 
     # ----------------------------
@@ -175,7 +341,7 @@ class RatioUniverse:
         # Generate all k-combinations of indices 0..N-1
         # This materializes C(N,k) baskets (acceptable); DO NOT materialize ratios.
         baskets = np.array(list(combinations(range(self._N), k)), dtype=np.int32)
-        lib = BasketLibrary(k=k, baskets=baskets)
+        lib = BasketLibrary(k=k, baskets=baskets, n_symbols=self._N)
         self._basket_libs[k] = lib
         logger.info("Built basket library for k=%d size=%d", k, lib.size)
         return lib
@@ -191,6 +357,8 @@ class RatioUniverse:
         unordered_if_equal_k: bool = True,
         disallow_overlap: bool = False,
         max_jobs: Optional[int] = None,
+        start: int = 0,
+        stop: Optional[int] = None,
     ) -> Iterator[RatioJob]:
         """
         Generate RatioJob objects without materializing all ratios.
@@ -202,9 +370,18 @@ class RatioUniverse:
 
         disallow_overlap:
             skips jobs where numerator and denominator baskets share any symbol.
+
+        start / stop:
+            restrict iteration to job indices in [start, stop) (see job_at()).
+            Indices address the unfiltered layout; overlap filtering and max_jobs
+            apply within the range. Iteration begins at `start` in O(1).
         """
         if max_jobs is not None and max_jobs < 0:
             raise ValueError("max_jobs must be >= 0")
+        if start < 0:
+            raise ValueError("start must be >= 0")
+        if stop is not None and stop < start:
+            raise ValueError("stop must be >= start")
 
         lib_num = self.get_basket_library(k_num)
         lib_den = lib_num if (k_num == k_den) else self.get_basket_library(k_den)
@@ -218,74 +395,322 @@ class RatioUniverse:
             max_jobs,
         )
 
+        total = self.job_count(k_num=k_num, k_den=k_den, unordered_if_equal_k=unordered_if_equal_k)
+        stop = total if stop is None else min(stop, total)
+        if start >= stop:
+            return
+        unordered = k_num == k_den and unordered_if_equal_k
+
+        # Position of `start` in the layout; each row then runs to its end or until `stop`.
+        first = self.job_at(start, k_num=k_num, k_den=k_den, unordered_if_equal_k=unordered_if_equal_k)
+        remaining = stop - start
         produced = 0
 
+        i = first.num_id
+        j_begin = first.den_id
+        while remaining > 0:
+            # Unordered pairs of baskets: i < j; ordered pairs span the whole den library
+            j_end = min(lib_den.size, j_begin + remaining)
+            remaining -= j_end - j_begin
+            if disallow_overlap:
+                # One bitmask AND over the row segment instead of a pairwise check per job
+                row = (
+                    j_begin + np.flatnonzero(_masks_disjoint(lib_num.masks[i], lib_den.masks[j_begin:j_end]))
+                ).tolist()
+            else:
+                row = range(j_begin, j_end)
+            for j in row:
+                yield RatioJob(k_num=k_num, k_den=k_den, num_id=i, den_id=j)
+                produced += 1
+                if max_jobs is not None and produced >= max_jobs:
+                    return
+            i += 1
+            j_begin = i + 1 if unordered else 0
+
+    def job_table(
+        self,
+        *,
+        k_num: int,
+        k_den: int,
+        unordered_if_equal_k: bool = True,
+        disallow_overlap: bool = False,
+        max_jobs: Optional[int] = None,
+    ) -> RatioJobTable:
+        """
+        The jobs of iter_ratio_jobs() (same arguments, same order) as a
+        RatioJobTable, built row by row with array ops and no RatioJob objects.
+        """
+        if max_jobs is not None and max_jobs < 0:
+            raise ValueError("max_jobs must be >= 0")
+        lib_num = self.get_basket_library(k_num)
+        lib_den = lib_num if (k_num == k_den) else self.get_basket_library(k_den)
+        unordered = k_num == k_den and unordered_if_equal_k
+
+        counts = self._row_job_counts(
+            k_num=k_num, k_den=k_den, unordered_if_equal_k=unordered_if_equal_k, disallow_overlap=disallow_overlap
+        )
+        total = int(counts.sum())
+        if max_jobs is not None:
+            total = min(total, max_jobs)
+        dtype = np.int32 if max(lib_num.size, lib_den.size) <= np.iinfo(np.int32).max else np.int64
+        num_ids = np.empty(total, dtype=dtype)
+        den_ids = np.empty(total, dtype=dtype)
+
+        pos = 0
+        for i in range(lib_num.size):
+            if pos >= total:
+                break
+            n = min(int(counts[i]), total - pos)
+            if n == 0:
+                continue
+            j_begin = i + 1 if unordered else 0
+            if disallow_overlap:
+                row = j_begin + np.flatnonzero(_masks_disjoint(lib_num.masks[i], lib_den.masks[j_begin:]))
+                den_ids[pos : pos + n] = row[:n]
+            else:
+                den_ids[pos : pos + n] = np.arange(j_begin, j_begin + n)
+            num_ids[pos : pos + n] = i
+            pos += n
+
+        logger.info(
+            "Built ratio job table: k_num=%d k_den=%d jobs=%d disallow_overlap=%s", k_num, k_den, total, disallow_overlap
+        )
+        return RatioJobTable(k_num, k_den, num_ids, den_ids)
+
+    # ----------------------------
+    # Closed-form job indexing
+    # ----------------------------
+    def job_count(self, *, k_num: int, k_den: int, unordered_if_equal_k: bool = True) -> int:
+        """
+        Number of job indices in the (unfiltered) layout; equals estimate_ratio_count()
+        without overlap filtering.
+        """
+        return self.estimate_ratio_count(k_num=k_num, k_den=k_den, unordered_if_equal_k=unordered_if_equal_k)
+
+    def job_at(
+        self,
+        index: int,
+        *,
+        k_num: int,
+        k_den: int,
+        unordered_if_equal_k: bool = True,
+    ) -> RatioJob:
+        """
+        Return the job at position `index` of the unfiltered iteration order in O(1).
+
+        - unordered layout (k_num == k_den, unordered_if_equal_k=True):
+            row i holds the n-1-i pairs (i, i+1..n-1); the row is recovered by
+            inverting the triangular row offset with an integer square root.
+        - ordered layout:
+            index = num_id * C(N,k_den) + den_id.
+        """
+        n_num = comb(self._N, k_num) if 1 <= k_num <= self._N else 0
+        total = self.job_count(k_num=k_num, k_den=k_den, unordered_if_equal_k=unordered_if_equal_k)
+        index = int(index)
+        if not 0 <= index < total:
+            raise ValueError(f"index must be in [0, {total}), got {index}")
+
         if k_num == k_den and unordered_if_equal_k:
-            # Unordered pairs of baskets: i < j
-            for i in range(lib_num.size - 1):
-                bi = lib_num.baskets[i]
-                for j in range(i + 1, lib_num.size):
-                    bj = lib_num.baskets[j]
-                    if disallow_overlap and _has_overlap_sorted_ints(bi, bj):
-                        continue
-
-                    yield RatioJob(k_num=k_num, k_den=k_den, num_id=i, den_id=j)
-                    produced += 1
-                    if max_jobs is not None and produced >= max_jobs:
-                        return
-        else:
-            # Ordered pairs across potentially different libs
-            for i in range(lib_num.size):
-                bi = lib_num.baskets[i]
-                for j in range(lib_den.size):
-                    bj = lib_den.baskets[j]
-                    if disallow_overlap and _has_overlap_sorted_ints(bi, bj):
-                        continue
-
-                    yield RatioJob(k_num=k_num, k_den=k_den, num_id=i, den_id=j)
-                    produced += 1
-                    if max_jobs is not None and produced >= max_jobs:
-                        return
+            n = n_num
+            # Largest i with _pair_row_offset(n, i) <= index
+            i = n - 2 - (isqrt(4 * n * (n - 1) - 8 * index - 7) - 1) // 2
+            # Guard the float-free estimate against off-by-one at row boundaries
+            while i > 0 and _pair_row_offset(n, i) > index:
+                i -= 1
+            while _pair_row_offset(n, i + 1) <= index:
+                i += 1
+            j = i + 1 + index - _pair_row_offset(n, i)
+            return RatioJob(k_num=k_num, k_den=k_den, num_id=i, den_id=j)
+
+        n_den = comb(self._N, k_den)
+        i, j = divmod(index, n_den)
+        return RatioJob(k_num=k_num, k_den=k_den, num_id=i, den_id=j)
+
+    def index_of(self, job: RatioJob, *, unordered_if_equal_k: bool = True) -> int:
+        """
+        Inverse of job_at(): position of `job` in the unfiltered iteration order.
+        """
+        n_num = comb(self._N, job.k_num) if 1 <= job.k_num <= self._N else 0
+        n_den = comb(self._N, job.k_den) if 1 <= job.k_den <= self._N else 0
+        if not (0 <= job.num_id < n_num and 0 <= job.den_id < n_den):
+            raise ValueError(f"job ids out of range for N={self._N}: {job}")
+
+        if job.k_num == job.k_den and unordered_if_equal_k:
+            if job.num_id >= job.den_id:
+                raise ValueError(f"unordered layout requires num_id < den_id: {job}")
+            return _pair_row_offset(n_num, job.num_id) + (job.den_id - job.num_id - 1)
+
+        return job.num_id * n_den + job.den_id
+
+    def _row_job_counts(
+        self,
+        *,
+        k_num: int,
+        k_den: int,
+        unordered_if_equal_k: bool = True,
+        disallow_overlap: bool = False,
+    ) -> np.ndarray:
+        """
+        Number of jobs each numerator id (outer loop row) yields, shape (C(N,k_num),).
+
+        Closed form without overlap filtering; with it, bitmask ANDs over
+        chunks of rows of the pair matrix.
+        """
+        lib_num = self.get_basket_library(k_num)
+        lib_den = lib_num if (k_num == k_den) else self.get_basket_library(k_den)
+        unordered = k_num == k_den and unordered_if_equal_k
+        n = lib_num.size
+
+        if not disallow_overlap:
+            if unordered:
+                return np.arange(n - 1, -1, -1, dtype=np.int64)
+            return np.full(n, lib_den.size, dtype=np.int64)
+
+        counts = np.zeros(n, dtype=np.int64)
+        # Bound the (rows, den, words) temporary to a few MB
+        step = max(1, (1 << 19) // max(1, lib_den.size * lib_den.masks.shape[1]))
+        cols = np.arange(lib_den.size)
+        for r0 in range(0, n, step):
+            r1 = min(r0 + step, n)
+            ok = _masks_disjoint(lib_num.masks[r0:r1, None, :], lib_den.masks[None, :, :])
+            if unordered:
+                ok &= cols[None, :] > np.arange(r0, r1)[:, None]
+            counts[r0:r1] = np.count_nonzero(ok, axis=1)
+        return counts
 
     # ----------------------------
     # Compute series for a job
     # ----------------------------
-    def compute_ratio_series(self, job: RatioJob) -> np.ndarray:
+    def compute_ratio_series(self, job: RatioJob, *, use_cache: Optional[bool] = None) -> np.ndarray:
         """
         Compute ratio series y_t for a RatioJob:
             y_t = sum(X[t, num_idx]) / (sum(X[t, den_idx]) + eps)
 
         Returns a new float64 array of shape (T,).
         """
-        lib_num = self.get_basket_library(job.k_num)
-        lib_den = lib_num if job.k_num == job.k_den else self.get_basket_library(job.k_den)
+        out = np.empty(self._X.shape[0], dtype=self._X.dtype)
+        self.compute_ratio_series_into(out, job, use_cache=use_cache)
+        return out
 
-        num_idx = lib_num.baskets[job.num_id]
-        den_idx = lib_den.baskets[job.den_id]
-
-        num = self._X[:, num_idx].sum(axis=1)
-        den = self._X[:, den_idx].sum(axis=1)
-        return num / (den + self._eps)
-
-    def compute_ratio_series_into(self, out: np.ndarray, job: RatioJob) -> None:
+    def compute_ratio_series_into(
+        self,
+        out: np.ndarray,
+        job: RatioJob,
+        *,
+        use_cache: Optional[bool] = None,
+    ) -> None:
         """
         Compute ratio series into a preallocated array `out` of shape (T,).
 
-        This reduces allocations when scanning many ratios.
+        This reduces allocations when scanning many ratios. With the basket-sum
+        cache (use_cache, default basket_cache_enabled) the job is one add and
+        one divide over two precomputed columns; results are identical.
         """
         if out.shape != (self._X.shape[0],):
             raise ValueError(f"out must have shape ({self._X.shape[0]},)")
+        self._ratio_into(out, job.k_num, job.k_den, job.num_id, job.den_id, use_cache)
 
-        lib_num = self.get_basket_library(job.k_num)
-        lib_den = lib_num if job.k_num == job.k_den else self.get_basket_library(job.k_den)
+    def _ratio_into(
+        self,
+        out: np.ndarray,
+        k_num: int,
+        k_den: int,
+        num_id: int,
+        den_id: int,
+        use_cache: Optional[bool],
+    ) -> None:
+        if self.basket_cache_enabled if use_cache is None else use_cache:
+            num = self.basket_sums(k_num)[:, num_id]
+            den = self.basket_sums(k_den)[:, den_id]
+            self._basket_cache_hits += 2
+            np.add(den, self._eps, out=out)
+            np.divide(num, out, out=out)
+            return
 
-        num_idx = lib_num.baskets[job.num_id]
-        den_idx = lib_den.baskets[job.den_id]
+        lib_num = self.get_basket_library(k_num)
+        lib_den = lib_num if k_num == k_den else self.get_basket_library(k_den)
 
+        num_idx = lib_num.baskets[num_id]
+        den_idx = lib_den.baskets[den_id]
+
+        self._basket_cache_misses += 2
         np.sum(self._X[:, num_idx], axis=1, out=out)
         den = self._X[:, den_idx].sum(axis=1)
         out /= (den + self._eps)
 
+    def compute_ratio_block_into(
+        self,
+        out: np.ndarray,
+        table: RatioJobTable,
+        *,
+        use_cache: Optional[bool] = None,
+    ) -> None:
+        """
+        Ratio series of every job in `table` into rows of `out`, shape (len(table), T),
+        without creating RatioJob objects. Row m equals compute_ratio_series(table[m]).
+        """
+        n = len(table)
+        if out.shape != (n, self._X.shape[0]):
+            raise ValueError(f"out must have shape ({n}, {self._X.shape[0]})")
+        for m, (i, j) in enumerate(zip(table.num_ids.tolist(), table.den_ids.tolist())):
+            self._ratio_into(out[m], table.k_num, table.k_den, i, j, use_cache)
+
+    # ----------------------------
+    # Basket-sum cache
+    # ----------------------------
+    def basket_sums(self, k: int) -> np.ndarray:
+        """
+        (T, C(N,k)) matrix whose column b is sum(X[:, baskets[b]], axis=1).
+
+        Built once per k, column-major so each basket's series is contiguous.
+        Falls back to a temporary mmap when it exceeds basket_cache_max_bytes.
+        """
+        lib = self.get_basket_library(k)
+        cached = self._basket_sums.get(k)
+        if cached is not None and cached[0] is lib:
+            return cached[1]
+
+        T = self._X.shape[0]
+        nbytes = T * lib.size * self._X.dtype.itemsize
+        if self._basket_cache_max_bytes is not None and nbytes > self._basket_cache_max_bytes:
+            sums = np.memmap(
+                tempfile.TemporaryFile(dir=self._basket_cache_dir),
+                dtype=self._X.dtype,
+                mode="w+",
+                shape=(T, lib.size),
+                order="F",
+            )
+            backing = "mmap"
+        else:
+            sums = np.empty((T, lib.size), dtype=self._X.dtype, order="F")
+            backing = "memory"
+
+        # Gather in chunks of baskets to bound the (T, chunk, k) temporary.
+        step = max(1, (1 << 22) // max(1, T * k))
+        for b0 in range(0, lib.size, step):
+            sums[:, b0 : b0 + step] = self._X[:, lib.baskets[b0 : b0 + step]].sum(axis=2)
+
+        self._basket_sums[k] = (lib, sums)
+        logger.info("Built basket-sum cache for k=%d shape=%s bytes=%d backing=%s", k, sums.shape, nbytes, backing)
+        return sums
+
+    def basket_cache_stats(self) -> BasketCacheStats:
+        memory_bytes = 0
+        mapped_bytes = 0
+        for _, sums in self._basket_sums.values():
+            if isinstance(sums, np.memmap):
+                mapped_bytes += sums.nbytes
+            else:
+                memory_bytes += sums.nbytes
+        return BasketCacheStats(
+            enabled=self.basket_cache_enabled,
+            hits=self._basket_cache_hits,
+            misses=self._basket_cache_misses,
+            memory_bytes=memory_bytes,
+            mapped_bytes=mapped_bytes,
+            ks=tuple(sorted(self._basket_sums)),
+        )
+
     # ----------------------------
     # Scan interface (replaces legacy RatioGenerator pattern)
     # ----------------------------
@@ -299,6 +724,7 @@ class RatioUniverse:
         disallow_overlap: bool = False,
         max_jobs: Optional[int] = None,
         reuse_buffer: bool = True,
+        basket_cache: Optional[bool] = None,
     ) -> int:
         """
         Iterate ratio jobs; compute each ratio series; call `process(job, series)`.
@@ -307,6 +733,8 @@ class RatioUniverse:
           - True  -> keep going
           - False -> stop early (useful for debugging / sampling)
 
+        basket_cache overrides basket_cache_enabled for this scan.
+
         Returns number of processed jobs.
         """
         processed = 0
@@ -334,9 +762,9 @@ class RatioUniverse:
             max_jobs=max_jobs,
         ):
             if buf is None:
-                series = self.compute_ratio_series(job)
+                series = self.compute_ratio_series(job, use_cache=basket_cache)
             else:
-                self.compute_ratio_series_into(buf, job)
+                self.compute_ratio_series_into(buf, job, use_cache=basket_cache)
                 series = buf
 
             processed += 1
@@ -346,6 +774,93 @@ class RatioUniverse:
         logger.info("Completed scan: processed_jobs=%d (estimated_total=%d)", processed, est_total)
         return processed
 
+    # ----------------------------
+    # Blocked scan: ratio tiles instead of one series per callback
+    # ----------------------------
+    def scan_blocks(
+        self,
+        *,
+        k_num: int,
+        k_den: int,
+        block_num: int = 16,
+        block_den: int = 16,
+        unordered_if_equal_k: bool = True,
+        disallow_overlap: bool = False,
+        use_cache: Optional[bool] = None,
+    ) -> Iterator[RatioTile]:
+        """
+        Yield RatioTile objects covering every job once, block pair by block pair.
+
+        For numerator ids [i0, i0+block_num) against denominator ids
+        [j0, j0+block_den), the block's ratios are computed with one broadcast
+        divide, then the i < j triangle (unordered layout) and the overlap
+        filter (basket bitmasks) are applied as one boolean mask that packs the
+        surviving columns.
+        Keep block_num * block_den * T * 8 bytes within cache (the 16 x 16
+        default is ~2.5 MB for T=1250).
+
+        Tiles cover the same jobs as iter_ratio_jobs() with identical values,
+        but in block order; max_jobs is not supported here.
+        """
+        if block_num < 1 or block_den < 1:
+            raise ValueError("block_num and block_den must be >= 1")
+
+        lib_num = self.get_basket_library(k_num)
+        lib_den = lib_num if (k_num == k_den) else self.get_basket_library(k_den)
+        unordered = k_num == k_den and unordered_if_equal_k
+        use_cache = self.basket_cache_enabled if use_cache is None else use_cache
+
+        logger.info(
+            "Scanning ratio tiles: k_num=%d k_den=%d block=%dx%d unordered=%s disallow_overlap=%s",
+            k_num,
+            k_den,
+            block_num,
+            block_den,
+            unordered,
+            disallow_overlap,
+        )
+
+        # Work series-major: basket sums as (b, T) rows and tile rows as (bn*bd, T), so
+        # the divide broadcasts over contiguous rows; tiles expose the (T, M) transpose.
+        T = self._X.shape[0]
+        full = np.empty((block_num, block_den, T), dtype=self._X.dtype)
+        packed = np.empty((block_num * block_den, T), dtype=self._X.dtype)
+
+        for i0 in range(0, lib_num.size, block_num):
+            i1 = min(i0 + block_num, lib_num.size)
+            num_rows = self._block_sum_rows(lib_num, i0, i1, use_cache)
+            # Unordered layout: blocks entirely on or below the diagonal hold no i < j pair.
+            for j0 in range(i0 + 1 if unordered else 0, lib_den.size, block_den):
+                j1 = min(j0 + block_den, lib_den.size)
+                bn, bd = i1 - i0, j1 - j0
+
+                mask = np.ones((bn, bd), dtype=bool)
+                if unordered:
+                    mask &= np.arange(j0, j1)[None, :] > np.arange(i0, i1)[:, None]
+                if disallow_overlap:
+                    mask &= _masks_disjoint(lib_num.masks[i0:i1, None, :], lib_den.masks[None, j0:j1, :])
+                ii, jj = np.nonzero(mask)
+                M = ii.size
+                if M == 0:
+                    continue
+
+                den_rows = self._block_sum_rows(lib_den, j0, j1, use_cache) + self._eps
+                tile = full[:bn, :bd]
+                np.divide(num_rows[:, None, :], den_rows[None, :, :], out=tile)
+                if M == bn * bd:
+                    values = tile.reshape(M, T)
+                else:
+                    values = np.take(tile.reshape(bn * bd, T), ii * bd + jj, axis=0, out=packed[:M])
+                yield RatioTile(k_num=k_num, k_den=k_den, num_ids=ii + i0, den_ids=jj + j0, values=values.T)
+
+    def _block_sum_rows(self, lib: BasketLibrary, b0: int, b1: int, use_cache: bool) -> np.ndarray:
+        """(b1-b0, T) basket sums for ids [b0, b1) as contiguous rows, from the cache or one gather."""
+        if use_cache:
+            self._basket_cache_hits += b1 - b0
+            return self.basket_sums(lib.k).T[b0:b1]
+        self._basket_cache_misses += b1 - b0
+        return np.ascontiguousarray(self._X[:, lib.baskets[b0:b1]].sum(axis=2).T)
+
     # ----------------------------
     # Optional: convenience to decode job -> symbols
     # ----------------------------
@@ -362,24 +877,40 @@ class RatioUniverse:
 
 
 # -----------------------------------------------------------------------------
-# Internal: fast overlap check for two sorted small integer arrays
+# Internal: first index of row i in the unordered (i < j) pair layout over n items
+# -----------------------------------------------------------------------------
+def _pair_row_offset(n: int, i: int) -> int:
+    return i * (2 * n - i - 1) // 2
+
+
+# -----------------------------------------------------------------------------
+# Internal: basket symbol bitmasks
 # -----------------------------------------------------------------------------
-def _has_overlap_sorted_ints(a: np.ndarray, b: np.ndarray) -> bool:
+def _basket_masks(baskets: np.ndarray, n_symbols: Optional[int]) -> np.ndarray:
     """
-    a and b are sorted 1D integer arrays (from combinations()).
-    Two-pointer intersection in O(k).
+    (B, k) basket index rows -> (B, W) uint64 bitmasks, W = ceil(n_symbols / 64)
+    (multi-word for N > 64).
     """
-    i = 0
-    j = 0
-    na = a.size
-    nb = b.size
-    while i < na and j < nb:
-        ai = int(a[i])
-        bj = int(b[j])
-        if ai == bj:
-            return True
-        if ai < bj:
-            i += 1
-        else:
-            j += 1
-    return False
+    idx = np.asarray(baskets, dtype=np.int64)
+    if idx.size and int(idx.min()) < 0:
+        raise ValueError("basket indices must be >= 0")
+    n = int(idx.max()) + 1 if idx.size else 0
+    if n_symbols is not None:
+        if n > n_symbols:
+            raise ValueError(f"basket index {n - 1} exceeds n_symbols={n_symbols}")
+        n = n_symbols
+    masks = np.zeros((idx.shape[0], max(1, -(-n // 64))), dtype=np.uint64)
+    rows = np.arange(idx.shape[0])
+    for c in range(idx.shape[1]):
+        masks[rows, idx[:, c] >> 6] |= np.left_shift(np.uint64(1), (idx[:, c] & 63).astype(np.uint64))
+    return masks
+
+
+def _masks_disjoint(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    True where broadcast bitmasks a and b share no symbol: (a & b) == 0 over all
+    words. Words past the narrower mask hold no bits of it, so only the common
+    width is compared.
+    """
+    w = min(a.shape[-1], b.shape[-1])
+    return ~((a[..., :w] & b[..., :w]) != 0).any(axis=-1)
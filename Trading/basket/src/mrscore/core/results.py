@@ -2,19 +2,43 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
 
 
 class Direction(str, Enum):
     UP = "up"
     DOWN = "down"
 
+    @property
+    def sign(self) -> int:
+        """Integer code used by array-backed paths: UP=+1, DOWN=-1 (0 means no direction)."""
+        return 1 if self is Direction.UP else -1
+
+    @classmethod
+    def from_sign(cls, sign: int) -> "Direction":
+        return cls.UP if sign > 0 else cls.DOWN
+
 
 class EventStatus(str, Enum):
     REVERTED = "reverted"
     FAILED = "failed"
     EXPIRED = "expired"
 
+    @property
+    def code(self) -> int:
+        """Integer code used by array-backed paths: REVERTED=0, FAILED=1, EXPIRED=2."""
+        return _STATUS_CODES[self]
+
+    @classmethod
+    def from_code(cls, code: int) -> "EventStatus":
+        return _STATUSES[code]
+
+
+_STATUSES = (EventStatus.REVERTED, EventStatus.FAILED, EventStatus.EXPIRED)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+
 
 @dataclass(frozen=True)
 class EventSummary:
@@ -42,6 +66,116 @@ class EventSummary:
     end_time: Optional[Any] = None
 
 
+@dataclass(frozen=True)
+class EventTable:
+    """
+    The events of one series as parallel arrays, one entry per event, in the
+    order run() emits EventSummary objects.
+
+    direction: int8 signs (Direction.sign); status: int8 codes (EventStatus.code);
+    start_index / end_index: int64; the price and z-score columns: float64.
+    """
+    direction: np.ndarray
+    status: np.ndarray
+    start_index: np.ndarray
+    end_index: np.ndarray
+    start_price: np.ndarray
+    start_mean: np.ndarray
+    start_volatility: np.ndarray
+    start_zscore: np.ndarray
+    max_abs_zscore: np.ndarray
+    end_price: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.status.shape[0])
+
+    @property
+    def duration(self) -> np.ndarray:
+        return self.end_index - self.start_index
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple]) -> "EventTable":
+        """From (direction sign, status code, start, end, start price, start mean, start vol, start z, max |z|, end price) rows."""
+        if not rows:
+            return cls.empty()
+        cols = list(zip(*rows))
+        return cls(
+            np.array(cols[0], dtype=np.int8),
+            np.array(cols[1], dtype=np.int8),
+            *(np.array(col, dtype=np.int64) for col in cols[2:4]),
+            *(np.array(col, dtype=np.float64) for col in cols[4:]),
+        )
+
+    @classmethod
+    def from_summaries(cls, events: Iterable[EventSummary]) -> "EventTable":
+        return cls.from_rows(
+            [
+                (
+                    e.direction.sign,
+                    e.status.code,
+                    e.start_index,
+                    e.end_index,
+                    e.start_price,
+                    e.start_mean,
+                    e.start_volatility,
+                    e.start_zscore,
+                    e.max_abs_zscore,
+                    e.end_price,
+                )
+                for e in events
+            ]
+        )
+
+    @classmethod
+    def empty(cls) -> "EventTable":
+        ints = np.empty(0, dtype=np.int64)
+        floats = np.empty(0, dtype=np.float64)
+        codes = np.empty(0, dtype=np.int8)
+        return cls(codes, codes, ints, ints, floats, floats, floats, floats, floats, floats)
+
+    def take(self, index: np.ndarray | slice) -> "EventTable":
+        """Rows `index` of every column (a slice gives views)."""
+        return EventTable(*(getattr(self, name)[index] for name in _TABLE_COLUMNS))
+
+    def summaries(self, dates: Optional[np.ndarray] = None) -> List[EventSummary]:
+        """EventSummary objects, with start/end times from `dates` when given."""
+        directions = {d.sign: d for d in Direction}
+        return [
+            EventSummary(
+                direction=directions[d],
+                status=_STATUSES[sc],
+                start_index=s,
+                end_index=e,
+                duration=e - s,
+                start_price=sp,
+                start_mean=sm,
+                start_volatility=sv,
+                start_zscore=sz,
+                max_abs_zscore=mx,
+                end_price=ep,
+                start_time=(dates[s] if dates is not None else None),
+                end_time=(dates[e] if dates is not None else None),
+            )
+            for d, sc, s, e, sp, sm, sv, sz, mx, ep in zip(
+                *(getattr(self, name).tolist() for name in _TABLE_COLUMNS)
+            )
+        ]
+
+
+_TABLE_COLUMNS = (
+    "direction",
+    "status",
+    "start_index",
+    "end_index",
+    "start_price",
+    "start_mean",
+    "start_volatility",
+    "start_zscore",
+    "max_abs_zscore",
+    "end_price",
+)
+
+
 @dataclass(frozen=True)
 class ScoreResult:
     score: float  # reverted / total_events (NaN if total_events==0 and record_empty_scores==False)
@@ -59,3 +193,6 @@ class ScoreResult:
 
     # optional raw event list (toggle in config later if you want)
     events: Optional[List[EventSummary]] = None
+
+    # early abandon: first bar not processed; score is NaN and counts cover bars [0, abandoned_at)
+    abandoned_at: Optional[int] = None
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Dict, Iterable, Optional, Protocol
 
 import numpy as np
 
 from mrscore.config.models import DiagnosticsConfig, ScoringConfig
-from mrscore.core.results import Direction, EventStatus, EventSummary, ScoreResult
+from mrscore.core.results import Direction, EventStatus, EventSummary, EventTable, ScoreResult
 
 
 class Scorer(Protocol):
@@ -18,34 +19,53 @@ def _mean_finite(values: Iterable[float]) -> float:
     return float(np.mean(finite)) if finite else float("nan")
 
 
+@lru_cache(maxsize=None)
+def _bucket_levels(k: int) -> np.ndarray:
+    # k buckets => k-1 quantile cut points
+    levels = np.linspace(0.0, 1.0, num=k + 1)[1:-1]
+    levels.flags.writeable = False
+    return levels
+
+
 def score_events(
     *,
-    events: Iterable[EventSummary],
+    events: EventTable | Iterable[EventSummary],
     scoring: ScoringConfig,
     diagnostics: DiagnosticsConfig,
+    dates: Optional[np.ndarray] = None,
 ) -> ScoreResult:
-    summaries = list(events)
-
-    total = len(summaries)
-    reverted = sum(1 for e in summaries if e.status == EventStatus.REVERTED)
-    failed = sum(1 for e in summaries if e.status == EventStatus.FAILED)
-    expired = sum(1 for e in summaries if e.status == EventStatus.EXPIRED)
+    """
+    Score one series' events, given as an EventTable (the engine's columnar
+    output) or as EventSummary objects.
+
+    Counts and breakdowns are whole-array operations on the table. With
+    diagnostics.enabled the result carries EventSummary objects, built from a
+    table here (start/end times from `dates`); otherwise none are created.
+    """
+    if isinstance(events, EventTable):
+        table = events
+        summaries = None
+    else:
+        summaries = list(events)
+        table = EventTable.from_summaries(summaries)
+
+    total = len(table)
+    reverted, failed, expired = np.bincount(table.status, minlength=3).tolist()
+    is_reverted = table.status == EventStatus.REVERTED.code
+
+    def _ratio(a: int, b: int) -> float:
+        if b == 0:
+            return float("nan") if not scoring.record_empty_scores else 0.0
+        return a / b
 
     by_dir: Optional[Dict[str, float]] = None
     if scoring.by_direction:
-        up_total = sum(1 for e in summaries if e.direction == Direction.UP)
-        dn_total = total - up_total
-        up_rev = sum(1 for e in summaries if e.direction == Direction.UP and e.status == EventStatus.REVERTED)
-        dn_rev = sum(1 for e in summaries if e.direction == Direction.DOWN and e.status == EventStatus.REVERTED)
-
-        def _ratio(a: int, b: int) -> float:
-            if b == 0:
-                return float("nan") if not scoring.record_empty_scores else 0.0
-            return a / b
-
+        up = table.direction == Direction.UP.sign
+        up_total = int(np.count_nonzero(up))
+        up_rev = int(np.count_nonzero(up & is_reverted))
         by_dir = {
             Direction.UP.value: _ratio(up_rev, up_total),
-            Direction.DOWN.value: _ratio(dn_rev, dn_total),
+            Direction.DOWN.value: _ratio(reverted - up_rev, total - up_total),
         }
 
     by_vol: Optional[Dict[str, float]] = None
@@ -54,50 +74,24 @@ def score_events(
         if k <= 0:
             raise ValueError("volatility_buckets must be set when by_volatility_bucket is true")
 
-        vols = np.array([e.start_volatility for e in summaries], dtype=np.float64)
-        vols = vols[np.isfinite(vols)]
+        finite = np.isfinite(table.start_volatility)
+        vols = table.start_volatility[finite]
         if vols.size == 0:
             by_vol = {f"bucket_{i}": (0.0 if scoring.record_empty_scores else float("nan")) for i in range(k)}
         else:
-            # k buckets => k-1 quantile cut points
-            qs = np.linspace(0.0, 1.0, num=k + 1)[1:-1]
+            qs = _bucket_levels(k)
             cuts = np.quantile(vols, qs) if qs.size > 0 else np.array([], dtype=np.float64)
 
-            # bucket counts
-            bucket_tot = np.zeros(k, dtype=np.int64)
-            bucket_rev = np.zeros(k, dtype=np.int64)
-
-            for e in summaries:
-                v = e.start_volatility
-                if not np.isfinite(v):
-                    continue
-                b = int(np.searchsorted(cuts, v, side="right"))
-                if b < 0:
-                    b = 0
-                elif b >= k:
-                    b = k - 1
-                bucket_tot[b] += 1
-                if e.status == EventStatus.REVERTED:
-                    bucket_rev[b] += 1
-
-            by_vol = {}
-            for i in range(k):
-                if bucket_tot[i] == 0:
-                    by_vol[f"bucket_{i}"] = (0.0 if scoring.record_empty_scores else float("nan"))
-                else:
-                    by_vol[f"bucket_{i}"] = float(bucket_rev[i] / bucket_tot[i])
+            buckets = np.searchsorted(cuts, vols, side="right")
+            bucket_tot = np.bincount(buckets, minlength=k).tolist()
+            bucket_rev = np.bincount(buckets[is_reverted[finite]], minlength=k).tolist()
+            by_vol = {f"bucket_{i}": _ratio(bucket_rev[i], bucket_tot[i]) for i in range(k)}
 
     sharpe: Optional[float] = None
     if scoring.compute_sharpe:
-        sign = {Direction.UP: 1.0, Direction.DOWN: -1.0}
-        returns = np.array(
-            [
-                sign[e.direction] * (e.end_price - e.start_price) / e.start_price
-                for e in summaries
-                if e.start_price != 0.0 and np.isfinite(e.end_price) and np.isfinite(e.start_price)
-            ],
-            dtype=np.float64,
-        )
+        sp, ep = table.start_price, table.end_price
+        valid = (sp != 0.0) & np.isfinite(ep) & np.isfinite(sp)
+        returns = table.direction[valid] * (ep[valid] - sp[valid]) / sp[valid]
         if returns.size >= 2:
             std = float(np.std(returns, ddof=1))
             sharpe = float(np.mean(returns) / std) if std > 0.0 else float("nan")
@@ -126,6 +120,9 @@ def score_events(
             components.append(sharpe)
         score = _mean_finite(components)
 
+    if diagnostics.enabled and summaries is None:
+        summaries = table.summaries(dates)
+
     return ScoreResult(
         score=float(score),
         total_events=total,
@@ -42,6 +42,109 @@ def _as_float64_c_contig(x: np.ndarray) -> np.ndarray:
     return np.asarray(x, dtype=np.float64, order="C")
 
 
+# -----------------------------------------------------------------------------
+# Alignment engine (shared by intersection and union)
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class _MergedDates:
+    """
+    All symbols' observations concatenated and located on the merged calendar.
+
+    dates: sorted unique dates over all symbols, shape (U,)
+    row:   calendar index of each observation, shape (L,)
+    col:   symbol index of each observation, shape (L,)
+    x:     observed field values, shape (L,)
+    first/last: masks selecting the first/last observation of a date that a
+           symbol reports more than once (both all-True without duplicates)
+    """
+    dates: np.ndarray
+    row: np.ndarray
+    col: np.ndarray
+    x: np.ndarray
+    first: np.ndarray
+    last: np.ndarray
+
+
+def _merge_dates(
+    histories: Dict[str, History],
+    *,
+    symbols: Sequence[str],
+    field: OHLC,
+) -> _MergedDates:
+    if not symbols:
+        raise ValueError("symbols must be non-empty")
+
+    dates_list = []
+    x_list = []
+    for s in symbols:
+        if s not in histories:
+            raise KeyError(f"Missing history for symbol '{s}'")
+        h = histories[s]
+        _ensure_sorted_dates(h.dates, symbol=s)
+        x = np.asarray(h.field(field), dtype=np.float64)
+        if x.shape != h.dates.shape:
+            raise ValueError(f"{field.value} length must match dates length for symbol {s}")
+        dates_list.append(h.dates)
+        x_list.append(x)
+
+    lengths = np.fromiter((d.size for d in dates_list), dtype=np.int64, count=len(dates_list))
+    col = np.repeat(np.arange(len(symbols), dtype=np.int64), lengths)
+    dates, row = _unique_dates(np.concatenate(dates_list))
+
+    # Each symbol's block is sorted, so repeats of a date are adjacent within a block.
+    same_as_next = (row[1:] == row[:-1]) & (col[1:] == col[:-1])
+    first = np.concatenate(([True], ~same_as_next))
+    last = np.concatenate((~same_as_next, [True]))
+    return _MergedDates(dates=dates, row=row, col=col, x=np.concatenate(x_list), first=first, last=last)
+
+
+def _unique_dates(all_dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sorted unique dates and each input's index into them (np.unique with
+    return_inverse). Calendars spanning at most a few ticks per observation,
+    such as daily bars, are merged by marking a dense tick range instead of
+    sorting all observations.
+    """
+    if all_dates.dtype.kind == "M" and all_dates.size:
+        ticks = all_dates.view(np.int64)
+        lo, hi = int(ticks.min()), int(ticks.max())
+        span = hi - lo + 1
+        if lo != np.iinfo(np.int64).min and span <= 4 * ticks.size + 1024:  # min int64 is NaT
+            offset = ticks - lo
+            present = np.zeros(span, dtype=bool)
+            present[offset] = True
+            rank = np.cumsum(present, dtype=np.int64) - 1
+            dates = (np.flatnonzero(present) + lo).view(all_dates.dtype)
+            return dates, rank[offset]
+    return np.unique(all_dates, return_inverse=True)
+
+
+def _fill_inplace(mat: np.ndarray, fill: Literal["none", "ffill", "bfill"]) -> None:
+    """
+    Fill NaNs down each column of a (T, N) matrix without a per-row loop:
+    ffill carries the last observation forward (leading NaNs stay NaN), bfill
+    carries the next observation back (trailing NaNs stay NaN).
+    """
+    if fill == "none":
+        return
+    T = mat.shape[0]
+    missing = np.isnan(mat)
+    if not missing.any():
+        return
+    t = np.arange(T, dtype=np.int64)[:, None]
+    if fill == "ffill":
+        # index of the latest observed row at or before each t
+        src = np.where(missing, 0, t)
+        np.maximum.accumulate(src, axis=0, out=src)
+    elif fill == "bfill":
+        # index of the earliest observed row at or after each t
+        src = np.where(missing, T - 1, t)
+        src = np.minimum.accumulate(src[::-1], axis=0)[::-1]
+    else:
+        raise ValueError(f"Invalid fill mode: {fill}")
+    mat[...] = np.take_along_axis(mat, src, axis=0)
+
+
 # -----------------------------------------------------------------------------
 # Alignment: intersection (strict)
 # -----------------------------------------------------------------------------
@@ -55,39 +158,26 @@ def align_histories_intersection(
     Align histories by the intersection of dates across all symbols.
     Produces a dense (T, N) float64 matrix for downstream ratio/basket ops.
 
+    Dates are merged with one np.unique over all symbols; a date is common
+    when every symbol reports it. A symbol reporting a date twice contributes
+    its first value.
+
     This is preprocessing: it may allocate; it must not run inside the hot loop.
     """
-    if not symbols:
-        raise ValueError("symbols must be non-empty")
-
-    # Validate presence + sorted dates
-    for s in symbols:
-        if s not in histories:
-            raise KeyError(f"Missing history for symbol '{s}'")
-        _ensure_sorted_dates(histories[s].dates, symbol=s)
-
-    # Start with dates from first symbol, intersect sequentially
-    common = histories[symbols[0]].dates
-    for s in symbols[1:]:
-        common = np.intersect1d(common, histories[s].dates, assume_unique=False)
+    m = _merge_dates(histories, symbols=symbols, field=field)
+    N = len(symbols)
 
+    counts = np.bincount(m.row[m.first], minlength=m.dates.size)
+    is_common = counts == N
+    common = m.dates[is_common]
     if common.size == 0:
         raise ValueError("No intersecting dates across symbols")
 
-    T = common.size
-    N = len(symbols)
-    mat = np.empty((T, N), dtype=np.float64)
-
-    for j, s in enumerate(symbols):
-        h = histories[s]
-        x = h.field(field)
-        idx = np.searchsorted(h.dates, common)
-        # Verify exact matches
-        if idx.size != common.size or np.any(idx < 0) or np.any(idx >= h.dates.size):
-            raise ValueError(f"Failed to align dates for symbol {s}")
-        if not np.array_equal(h.dates[idx], common):
-            raise ValueError(f"Dates do not align exactly for symbol {s}")
-        mat[:, j] = x[idx]
+    # merged-calendar index -> intersection row
+    out_row = np.cumsum(is_common) - 1
+    keep = m.first & is_common[m.row]
+    mat = np.empty((common.size, N), dtype=np.float64)
+    mat[out_row[m.row[keep]], m.col[keep]] = m.x[keep]
 
     return AlignedPanel(dates=common, symbols=list(symbols), values=_as_float64_c_contig(mat))
 
@@ -100,58 +190,32 @@ def align_histories_union(
     *,
     symbols: Sequence[str],
     field: OHLC,
-    fill: Literal["none", "ffill"] = "none",
+    fill: Literal["none", "ffill", "bfill"] = "none",
 ) -> AlignedPanel:
     """
     Align histories by the union of dates across all symbols.
-    Missing values are NaN unless fill="ffill" is chosen.
+    Missing values are NaN unless fill="ffill" (carry the last value forward)
+    or fill="bfill" (carry the next value back) is chosen.
+
+    Values are scattered into one preallocated (T, N) matrix by merged-calendar
+    index, and fills run over all columns at once. A symbol reporting a date
+    twice contributes its last value.
 
     Use this only if you explicitly decide to tolerate missing dates.
     For strict statistical comparability, intersection is usually preferred.
     """
-    if not symbols:
-        raise ValueError("symbols must be non-empty")
-
-    for s in symbols:
-        if s not in histories:
-            raise KeyError(f"Missing history for symbol '{s}'")
-        _ensure_sorted_dates(histories[s].dates, symbol=s)
-
-    # Union of all dates
-    all_dates = histories[symbols[0]].dates
-    for s in symbols[1:]:
-        all_dates = np.union1d(all_dates, histories[s].dates)
+    m = _merge_dates(histories, symbols=symbols, field=field)
+    T, N = m.dates.size, len(symbols)
 
-    T = all_dates.size
-    N = len(symbols)
     mat = np.full((T, N), np.nan, dtype=np.float64)
+    mat[m.row[m.last], m.col[m.last]] = m.x[m.last]
+    _fill_inplace(mat, fill)
 
-    for j, s in enumerate(symbols):
-        h = histories[s]
-        x = _as_float64_c_contig(h.field(field))
-        idx = np.searchsorted(all_dates, h.dates)
-        mat[idx, j] = x
-
-        if fill == "ffill":
-            _forward_fill_inplace(mat[:, j])
-            if np.all(np.isnan(mat[:, j])):
-                logger.warning("Symbol '%s' has no data in the union date range — column is all-NaN", s)
-
-    return AlignedPanel(dates=all_dates, symbols=list(symbols), values=_as_float64_c_contig(mat))
+    if fill != "none":
+        for j in np.flatnonzero(np.isnan(mat).all(axis=0)):
+            logger.warning("Symbol '%s' has no data in the union date range — column is all-NaN", symbols[j])
 
-
-def _forward_fill_inplace(col: np.ndarray) -> None:
-    """
-    Forward-fill NaNs in-place in a 1D float array.
-    Leading NaNs remain NaN.
-    """
-    last = np.nan
-    for i in range(col.size):
-        v = col[i]
-        if np.isnan(v):
-            col[i] = last
-        else:
-            last = v
+    return AlignedPanel(dates=m.dates, symbols=list(symbols), values=_as_float64_c_contig(mat))
 
 
 # -----------------------------------------------------------------------------
@@ -236,7 +300,7 @@ def build_price_panel(
     field: OHLC,
     align: Literal["intersection", "union"] = "intersection",
     normalize_by_first: bool = True,
-    union_fill: Literal["none", "ffill"] = "none",
+    union_fill: Literal["none", "ffill", "bfill"] = "none",
 ) -> AlignedPanel:
     """
     One-stop helper:
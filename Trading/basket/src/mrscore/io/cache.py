@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import date, datetime
 from pathlib import Path
 from typing import Any, Mapping, Optional, Sequence
@@ -9,8 +10,8 @@ import os
 
 import numpy as np
 
-from mrscore.core.ratio_universe import BasketLibrary, RatioJob, RatioUniverse
-from mrscore.io.adapters import AlignedPanel
+from mrscore.core.ranking import RankedJob
+from mrscore.core.ratio_universe import BasketLibrary, RatioJob, RatioJobTable, RatioUniverse
 from mrscore.utils.logging import get_logger
 
 
@@ -41,6 +42,23 @@ def panel_cache_payload(
     }
 
 
+def panel_store_payload(
+    *,
+    tickers: Sequence[str],
+    interval: str,
+    price_field: str,
+    auto_adjust: bool,
+) -> dict[str, Any]:
+    # no period / ending_date: one store per universe grows across runs (io.panel_sync)
+    return {
+        "v": 1,
+        "tickers": list(tickers),
+        "interval": interval,
+        "price_field": price_field,
+        "auto_adjust": auto_adjust,
+    }
+
+
 def ratio_jobs_cache_payload(
     *,
     panel_key: str,
@@ -61,47 +79,57 @@ def ratio_jobs_cache_payload(
     }
 
 
-def compute_cache_key(payload: Mapping[str, Any]) -> str:
-    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_json_default)
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+def scan_checkpoint_payload(
+    *,
+    ratio_jobs_key: str,
+    top_k: int,
+    scoring: Mapping[str, Any],
+    panel_end: Optional[str] = None,
+) -> dict[str, Any]:
+    # scoring: every config section that changes a job's score (engine + components)
+    # panel_end: last panel date, since the panel store grows under a fixed panel_key
+    return {
+        "v": 1,
+        "ratio_jobs_key": ratio_jobs_key,
+        "top_k": top_k,
+        "panel_end": panel_end,
+        "scoring": dict(scoring),
+    }
 
 
-def load_panel_from_cache(cache_root: Path, key: str) -> Optional[AlignedPanel]:
-    path = _panel_dir(cache_root, key) / "panel.npz"
-    if not path.exists():
-        return None
-    try:
-        with np.load(path, allow_pickle=False) as data:
-            dates = np.asarray(data["dates"], dtype="datetime64[D]")
-            symbols = [_as_text(s) for s in data["symbols"]]
-            values = np.asarray(data["values"], dtype=np.float64)
-            return AlignedPanel(dates=dates, symbols=symbols, values=values)
-    except Exception:
-        logger.warning("Failed to read panel cache: %s", path, exc_info=True)
-        return None
+def live_snapshot_payload(
+    *,
+    ratio_jobs_key: str,
+    top_k: int,
+    scoring: Mapping[str, Any],
+) -> dict[str, Any]:
+    # no panel_end: a live snapshot is meant to be extended by newer bars
+    return {
+        "v": 2,
+        "ratio_jobs_key": ratio_jobs_key,
+        "top_k": top_k,
+        "scoring": dict(scoring),
+    }
 
 
-def store_panel_to_cache(
-    cache_root: Path,
-    key: str,
-    panel: AlignedPanel,
-    payload: Mapping[str, Any],
-) -> None:
-    cache_dir = _panel_dir(cache_root, key)
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    tmp_path = cache_dir / "panel.tmp.npz"
-    final_path = cache_dir / "panel.npz"
-    try:
-        np.savez_compressed(
-            tmp_path,
-            dates=np.asarray(panel.dates, dtype="datetime64[D]"),
-            symbols=np.asarray(panel.symbols),
-            values=np.asarray(panel.values, dtype=np.float64),
-        )
-        os.replace(tmp_path, final_path)
-        _write_manifest(cache_dir, payload)
-    except Exception:
-        logger.warning("Failed to write panel cache: %s", final_path, exc_info=True)
+@dataclass(frozen=True)
+class ScanCheckpoint:
+    """
+    State of a serial scan over a fixed job sequence.
+
+    Jobs [0, position) are scored; `entries` are the ranker's (item, order)
+    pairs and `processed` counts the jobs that had a finite score.
+    """
+
+    scan_key: str
+    position: int
+    processed: int
+    entries: list[tuple[RankedJob, int]]
+
+
+def compute_cache_key(payload: Mapping[str, Any]) -> str:
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
 
 
 def load_ratio_jobs_from_cache(
@@ -109,8 +137,13 @@ def load_ratio_jobs_from_cache(
     key: str,
     *,
     ru: RatioUniverse,
-) -> Optional[list[RatioJob]]:
-    path = _ratio_dir(cache_root, key) / "ratiojobs.npz"
+) -> Optional[RatioJobTable]:
+    """
+    Job table stored by store_ratio_jobs_to_cache, with its id arrays
+    memory-mapped (zero-copy). Installs the cached basket libraries into `ru`.
+    """
+    cache_dir = _ratio_dir(cache_root, key)
+    path = cache_dir / "ratiojobs.npz"
     if not path.exists():
         return None
     try:
@@ -119,8 +152,13 @@ def load_ratio_jobs_from_cache(
             k_den = int(data["k_den"][0])
             baskets_num = np.asarray(data["baskets_num"], dtype=np.int32)
             baskets_den = np.asarray(data["baskets_den"], dtype=np.int32)
-            num_ids = np.asarray(data["num_ids"], dtype=np.int32)
-            den_ids = np.asarray(data["den_ids"], dtype=np.int32)
+            if "num_ids" in data:
+                # older caches kept the ids inside the compressed archive
+                num_ids = np.asarray(data["num_ids"], dtype=np.int32)
+                den_ids = np.asarray(data["den_ids"], dtype=np.int32)
+            else:
+                num_ids = np.load(cache_dir / "num_ids.npy", mmap_mode="r")
+                den_ids = np.load(cache_dir / "den_ids.npy", mmap_mode="r")
 
         _set_basket_library(ru, k_num, baskets_num)
         if k_den != k_num:
@@ -128,11 +166,7 @@ def load_ratio_jobs_from_cache(
         else:
             _set_basket_library(ru, k_den, baskets_num)
 
-        jobs = [
-            RatioJob(k_num=k_num, k_den=k_den, num_id=int(n), den_id=int(d))
-            for n, d in zip(num_ids, den_ids)
-        ]
-        return jobs
+        return RatioJobTable(k_num, k_den, num_ids, den_ids)
     except Exception:
         logger.warning("Failed to read ratiojobs cache: %s", path, exc_info=True)
         return None
@@ -143,29 +177,36 @@ def store_ratio_jobs_to_cache(
     key: str,
     *,
     ru: RatioUniverse,
-    jobs: Sequence[RatioJob],
+    jobs: RatioJobTable | Sequence[RatioJob],
     payload: Mapping[str, Any],
 ) -> None:
-    if not jobs:
+    """
+    Persist a job table: num_ids.npy / den_ids.npy (uncompressed, mmap-able)
+    plus ratiojobs.npz with k and the basket libraries, written last so its
+    presence marks a complete entry.
+    """
+    if not len(jobs):
         return
-    k_num = jobs[0].k_num
-    k_den = jobs[0].k_den
-    lib_num = ru.get_basket_library(k_num)
-    lib_den = lib_num if k_num == k_den else ru.get_basket_library(k_den)
+    table = jobs if isinstance(jobs, RatioJobTable) else RatioJobTable.from_jobs(jobs)
+    lib_num = ru.get_basket_library(table.k_num)
+    lib_den = lib_num if table.k_num == table.k_den else ru.get_basket_library(table.k_den)
 
     cache_dir = _ratio_dir(cache_root, key)
     cache_dir.mkdir(parents=True, exist_ok=True)
     tmp_path = cache_dir / "ratiojobs.tmp.npz"
     final_path = cache_dir / "ratiojobs.npz"
     try:
+        final_path.unlink(missing_ok=True)
+        for name, ids in (("num_ids", table.num_ids), ("den_ids", table.den_ids)):
+            ids_tmp = cache_dir / f"{name}.tmp.npy"
+            np.save(ids_tmp, np.asarray(ids, dtype=np.int32 if ids.dtype.itemsize <= 4 else ids.dtype))
+            os.replace(ids_tmp, cache_dir / f"{name}.npy")
         np.savez_compressed(
             tmp_path,
-            k_num=np.array([k_num], dtype=np.int32),
-            k_den=np.array([k_den], dtype=np.int32),
+            k_num=np.array([table.k_num], dtype=np.int32),
+            k_den=np.array([table.k_den], dtype=np.int32),
             baskets_num=np.asarray(lib_num.baskets, dtype=np.int32),
             baskets_den=np.asarray(lib_den.baskets, dtype=np.int32),
-            num_ids=np.asarray([j.num_id for j in jobs], dtype=np.int32),
-            den_ids=np.asarray([j.den_id for j in jobs], dtype=np.int32),
         )
         os.replace(tmp_path, final_path)
         _write_manifest(cache_dir, payload)
@@ -173,8 +214,104 @@ def store_ratio_jobs_to_cache(
         logger.warning("Failed to write ratiojobs cache: %s", final_path, exc_info=True)
 
 
-def _panel_dir(cache_root: Path, key: str) -> Path:
-    return cache_root / "panels" / key
+def load_scan_checkpoint(cache_root: Path, key: str, *, scan_key: str) -> Optional[ScanCheckpoint]:
+    path = _ratio_dir(cache_root, key) / "checkpoint.npz"
+    if not path.exists():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            stored_key = _as_text(data["scan_key"][0])
+            if stored_key != scan_key:
+                logger.warning("Ignoring scan checkpoint for a different configuration: %s", path)
+                return None
+            k_num = int(data["k_num"][0])
+            k_den = int(data["k_den"][0])
+            entries = [
+                (
+                    RankedJob(
+                        score=float(score),
+                        job=RatioJob(k_num=k_num, k_den=k_den, num_id=int(n), den_id=int(d)),
+                    ),
+                    int(order),
+                )
+                for score, order, n, d in zip(data["scores"], data["orders"], data["num_ids"], data["den_ids"])
+            ]
+            return ScanCheckpoint(
+                scan_key=stored_key,
+                position=int(data["position"][0]),
+                processed=int(data["processed"][0]),
+                entries=entries,
+            )
+    except Exception:
+        logger.warning("Failed to read scan checkpoint: %s", path, exc_info=True)
+        return None
+
+
+def store_scan_checkpoint(cache_root: Path, key: str, checkpoint: ScanCheckpoint) -> None:
+    cache_dir = _ratio_dir(cache_root, key)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_dir / "checkpoint.tmp.npz"
+    final_path = cache_dir / "checkpoint.npz"
+    jobs = [item.job for item, _ in checkpoint.entries]
+    try:
+        np.savez(
+            tmp_path,
+            scan_key=np.asarray([checkpoint.scan_key]),
+            position=np.array([checkpoint.position], dtype=np.int64),
+            processed=np.array([checkpoint.processed], dtype=np.int64),
+            k_num=np.array([jobs[0].k_num if jobs else 0], dtype=np.int32),
+            k_den=np.array([jobs[0].k_den if jobs else 0], dtype=np.int32),
+            scores=np.asarray([item.score for item, _ in checkpoint.entries], dtype=np.float64),
+            orders=np.asarray([order for _, order in checkpoint.entries], dtype=np.int64),
+            num_ids=np.asarray([j.num_id for j in jobs], dtype=np.int32),
+            den_ids=np.asarray([j.den_id for j in jobs], dtype=np.int32),
+        )
+        os.replace(tmp_path, final_path)
+    except Exception:
+        logger.warning("Failed to write scan checkpoint: %s", final_path, exc_info=True)
+
+
+def clear_scan_checkpoint(cache_root: Path, key: str) -> None:
+    path = _ratio_dir(cache_root, key) / "checkpoint.npz"
+    try:
+        path.unlink(missing_ok=True)
+    except Exception:
+        logger.warning("Failed to remove scan checkpoint: %s", path, exc_info=True)
+
+
+def load_live_snapshot(cache_root: Path, key: str, *, live_key: str) -> Optional[dict]:
+    """LiveRescorer.to_dict() stored under `key`, or None if missing, unreadable or for another live_key."""
+    path = _ratio_dir(cache_root, key) / "live.json"
+    if not path.exists():
+        return None
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("live_key") != live_key:
+            logger.warning("Ignoring live snapshot for a different configuration: %s", path)
+            return None
+        return data["rescorer"]
+    except Exception:
+        logger.warning("Failed to read live snapshot: %s", path, exc_info=True)
+        return None
+
+
+def store_live_snapshot(cache_root: Path, key: str, snapshot: Mapping[str, Any], *, live_key: str) -> None:
+    cache_dir = _ratio_dir(cache_root, key)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_dir / "live.tmp.json"
+    final_path = cache_dir / "live.json"
+    try:
+        with tmp_path.open("w", encoding="utf-8") as fh:
+            # NaN / inf survive (Python's JSON extension), floats round-trip exactly
+            json.dump({"live_key": live_key, "rescorer": snapshot}, fh, separators=(",", ":"))
+        os.replace(tmp_path, final_path)
+    except Exception:
+        logger.warning("Failed to write live snapshot: %s", final_path, exc_info=True)
+
+
+def panel_store_dir(cache_root: Path, key: str) -> Path:
+    return cache_root / "panel_store" / key
 
 
 def _ratio_dir(cache_root: Path, key: str) -> Path:
@@ -182,7 +319,7 @@ def _ratio_dir(cache_root: Path, key: str) -> Path:
 
 
 def _set_basket_library(ru: RatioUniverse, k: int, baskets: np.ndarray) -> None:
-    lib = BasketLibrary(k=k, baskets=np.asarray(baskets, dtype=np.int32))
+    lib = BasketLibrary(k=k, baskets=np.asarray(baskets, dtype=np.int32), n_symbols=len(ru.symbols))
     ru._basket_libs[k] = lib
 
 
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+import json
+import mmap
+import os
+import shutil
+import struct
+
+import numpy as np
+
+from mrscore.io.history import History
+from mrscore.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+_MAGIC = b"MRSHIST1"
+_FOOTER = struct.Struct("<Q8s")  # index length, magic
+_FIELDS = ("open", "high", "low", "close")
+_ALIGN = 8
+# put_many rewrites the live entries into a fresh file once superseded blocks reach this share of the blocks
+_DEAD_SHARE = 0.5
+
+
+class HistoryStore:
+    """
+    Single-file columnar store of many Histories, read through one mmap.
+
+    Layout:
+
+        MAGIC | block | block | ... | index (JSON) | index length (u64) | MAGIC
+
+    Each block holds one entry: dates as int64 (datetime64 unit in the index)
+    followed by its present OHLC fields as contiguous float64 rows. The index
+    maps entry keys to (offset, rows, unit, fields, symbol). Reads are
+    zero-copy np.frombuffer views of the mapped file; nothing is decompressed.
+
+    put_many appends by copying the file, adding blocks and a new index, and
+    renaming over the original, so readers never see a partial file. Replaced
+    entries leave dead blocks behind; once they reach half of the block bytes
+    (or on compact()), only the live blocks are copied, so the file stays
+    below about twice the size of its live entries.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, History]:
+        """Entries present in the store; missing keys are left out."""
+        keys = list(keys)
+        if not keys or not self.path.exists():
+            return {}
+        try:
+            with self.path.open("rb") as fh:
+                buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            index, _ = _read_index(buf)
+        except Exception:
+            logger.warning("Failed to read history store: %s", self.path, exc_info=True)
+            return {}
+
+        out: dict[str, History] = {}
+        for key in keys:
+            entry = index.get(key)
+            if entry is not None:
+                out[key] = _entry_history(buf, entry)
+        return out
+
+    def put_many(self, histories: Mapping[str, History]) -> None:
+        """Add (or replace) entries in one rewrite of the file."""
+        if histories:
+            self._write(histories, compact=False)
+
+    def compact(self) -> None:
+        """Rewrite the file with only its live entries, dropping replaced blocks."""
+        if self.path.exists():
+            self._write({}, compact=True)
+
+    def _write(self, histories: Mapping[str, History], *, compact: bool) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        buf = None
+        try:
+            index: dict[str, dict] = {}
+            end = len(_MAGIC)
+            if self.path.exists():
+                with self.path.open("rb") as fh:
+                    buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                index, end = _read_index(buf)
+
+            kept = {key: entry for key, entry in index.items() if key not in histories}
+            blocks = end - len(_MAGIC)
+            dead = blocks - sum(_block_bytes(entry) for entry in kept.values())
+            if buf is not None and not compact and dead < _DEAD_SHARE * blocks:
+                buf.close()
+                buf = None
+                shutil.copyfile(self.path, tmp_path)
+            else:
+                # copy only the live blocks into a fresh file
+                with tmp_path.open("wb") as fh:
+                    fh.write(_MAGIC)
+                    for key, entry in kept.items():
+                        offset, size = int(entry["offset"]), _block_bytes(entry)
+                        _pad(fh)
+                        index[key] = {**entry, "offset": fh.tell()}
+                        fh.write(buf[offset : offset + size])
+                end = tmp_path.stat().st_size
+                if dead:
+                    logger.info("Compacted history store %s: dropped %d bytes", self.path, dead)
+
+            with tmp_path.open("r+b") as fh:
+                fh.seek(end)
+                fh.truncate()  # drop the old index and footer
+                for key, history in histories.items():
+                    index[key] = _write_block(fh, history)
+                payload = json.dumps(index, separators=(",", ":")).encode("utf-8")
+                fh.write(payload)
+                fh.write(_FOOTER.pack(len(payload), _MAGIC))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception:
+            logger.warning("Failed to write history store: %s", self.path, exc_info=True)
+            tmp_path.unlink(missing_ok=True)
+        finally:
+            if buf is not None:
+                buf.close()
+
+
+def _read_index(buf) -> tuple[dict[str, dict], int]:
+    """Index dict and the byte offset where blocks end."""
+    size = len(buf)
+    if size < len(_MAGIC) + _FOOTER.size or buf[: len(_MAGIC)] != _MAGIC:
+        raise ValueError("not a history store")
+    index_len, magic = _FOOTER.unpack(buf[size - _FOOTER.size :])
+    if magic != _MAGIC:
+        raise ValueError("history store footer is missing (truncated write?)")
+    start = size - _FOOTER.size - index_len
+    return json.loads(bytes(buf[start : size - _FOOTER.size])), start
+
+
+def _block_bytes(entry: Mapping) -> int:
+    return 8 * int(entry["rows"]) * (1 + len(entry["fields"]))
+
+
+def _pad(fh) -> None:
+    pad = -fh.tell() % _ALIGN
+    if pad:
+        fh.write(b"\0" * pad)
+
+
+def _write_block(fh, history: History) -> dict:
+    _pad(fh)
+    offset = fh.tell()
+    dates = np.asarray(history.dates)
+    if dates.dtype.kind != "M":
+        dates = dates.astype("datetime64[D]")
+    unit = np.datetime_data(dates.dtype)[0]
+    fields = [name for name in _FIELDS if getattr(history, name) is not None]
+
+    fh.write(np.ascontiguousarray(dates.view(np.int64)).tobytes())
+    for name in fields:
+        fh.write(np.ascontiguousarray(getattr(history, name), dtype=np.float64).tobytes())
+    return {"offset": offset, "rows": len(dates), "unit": unit, "fields": fields, "symbol": history.symbol}
+
+
+def _entry_history(buf, entry: Mapping) -> History:
+    offset, n = int(entry["offset"]), int(entry["rows"])
+    dates = np.frombuffer(buf, dtype=np.int64, count=n, offset=offset).view(f"datetime64[{entry['unit']}]")
+    fields: dict[str, Optional[np.ndarray]] = dict.fromkeys(_FIELDS)
+    pos = offset + 8 * n
+    for name in entry["fields"]:
+        fields[name] = np.frombuffer(buf, dtype=np.float64, count=n, offset=pos)
+        pos += 8 * n
+    return History(symbol=str(entry["symbol"]), dates=dates, **fields)
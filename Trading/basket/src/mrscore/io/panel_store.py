@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Optional
+import json
+import os
+
+import numpy as np
+
+from mrscore.io.adapters import AlignedPanel
+from mrscore.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+PANEL_FORMAT = "mrscore-panel"
+PANEL_FORMAT_VERSION = 1
+
+# Columns copied per chunk while writing, so the source is never duplicated in RAM.
+_WRITE_CHUNK_BYTES = 1 << 26
+
+
+def write_mmap_panel(directory: Path, panel: AlignedPanel, *, capacity: Optional[int] = None) -> None:
+    """
+    Write `panel` as an uncompressed, memory-mappable panel directory:
+
+    - values.npy: (capacity, N) float64 in Fortran order, so each symbol's
+      series is one contiguous chunk of the file
+    - dates.npy: (capacity,) dates in their original datetime64 unit
+    - panel.json: symbols, shape (rows in use), capacity, dtype and version
+
+    capacity >= T reserves rows for append_mmap_panel (default: exactly T).
+    Files are written under temporary names and renamed; panel.json goes last,
+    so a directory without it is never read as a panel.
+    """
+    values = panel.values
+    if values.ndim != 2:
+        raise ValueError("panel.values must be 2D (T, N)")
+    T, N = (int(n) for n in values.shape)
+    if N != len(panel.symbols):
+        raise ValueError("panel.values columns must match len(panel.symbols)")
+    if T != len(panel.dates):
+        raise ValueError("panel.values rows must match len(panel.dates)")
+    capacity = T if capacity is None else int(capacity)
+    if capacity < T:
+        raise ValueError("capacity must be >= number of rows")
+
+    directory.mkdir(parents=True, exist_ok=True)
+    _write_files(directory, dates=np.asarray(panel.dates), values=values, capacity=capacity)
+    _write_meta(directory, symbols=list(panel.symbols), rows=T, capacity=capacity)
+
+
+def append_mmap_panel(directory: Path, rows: AlignedPanel, *, at: Optional[int] = None) -> None:
+    """
+    Write `rows` into a panel directory in place, starting at row `at`
+    (default: after the last row), and make at + len(rows) the new row count.
+
+    Rows before `at` are kept; `at` < current rows overwrites the tail. Dates
+    must stay strictly increasing across the join. Without enough reserved
+    capacity the files are first regrown to max(2 * capacity, needed rows),
+    copying the old rows a column chunk at a time.
+
+    Values and dates are flushed before panel.json is updated, so readers and
+    interrupted writers only ever see the old or the new row count.
+    """
+    meta = _read_meta(directory)
+    n_rows, capacity = int(meta["shape"][0]), int(meta.get("capacity", meta["shape"][0]))
+    at = n_rows if at is None else int(at)
+    if not 0 <= at <= n_rows:
+        raise ValueError(f"at must be in [0, {n_rows}]")
+    if list(rows.symbols) != list(meta["symbols"]):
+        raise ValueError("rows.symbols must match the stored panel symbols")
+    values = np.asarray(rows.values, dtype=np.float64)
+    dates = np.asarray(rows.dates)
+    n = int(values.shape[0])
+    if values.ndim != 2 or values.shape[1] != len(rows.symbols) or len(dates) != n:
+        raise ValueError("rows must be an aligned (T, N) panel")
+    if n == 0:
+        return
+    if np.any(dates[1:] <= dates[:-1]):
+        raise ValueError("rows.dates must be strictly increasing")
+
+    stored_dates = np.load(directory / "dates.npy", mmap_mode="r")
+    if at > 0 and not dates[0] > stored_dates[at - 1]:
+        raise ValueError(f"rows start at {dates[0]}, not after stored row {at - 1} ({stored_dates[at - 1]})")
+    del stored_dates
+
+    if at + n > capacity:
+        capacity = max(2 * capacity, at + n)
+        old = open_mmap_panel(directory)
+        _write_files(directory, dates=np.asarray(old.dates[:at]), values=old.values[:at], capacity=capacity)
+        del old
+        _write_meta(directory, symbols=list(meta["symbols"]), rows=at, capacity=capacity)
+
+    out = np.load(directory / "values.npy", mmap_mode="r+")
+    out[at : at + n] = values
+    out.flush()
+    del out
+    out_dates = np.load(directory / "dates.npy", mmap_mode="r+")
+    out_dates[at : at + n] = dates.astype(out_dates.dtype)
+    out_dates.flush()
+    del out_dates
+    _write_meta(directory, symbols=list(meta["symbols"]), rows=at + n, capacity=capacity)
+
+
+def open_mmap_panel(directory: Path, *, mode: str = "r") -> AlignedPanel:
+    """
+    Open a panel written by write_mmap_panel without reading it into RAM.
+
+    `values` is an np.memmap over values.npy (zero-copy); pages are loaded on
+    first access. mode is passed to np.load(mmap_mode=...): "r" (default),
+    "r+" to edit in place or "c" for copy-on-write.
+    """
+    meta = _read_meta(directory)
+    values = np.load(directory / "values.npy", mmap_mode=mode)
+    dates = np.load(directory / "dates.npy", allow_pickle=False)
+    symbols = [str(s) for s in meta["symbols"]]
+    rows, n_cols = (int(n) for n in meta["shape"])
+    capacity = int(meta.get("capacity", rows))
+    if values.shape != (capacity, n_cols) or values.dtype.str != meta["dtype"]:
+        raise ValueError(f"values.npy does not match panel.json in {directory}")
+    if len(dates) != capacity or len(symbols) != n_cols:
+        raise ValueError(f"dates/symbols do not match values.npy in {directory}")
+    if rows < capacity:
+        # reserved rows past the end are not part of the panel
+        values, dates = values[:rows], dates[:rows]
+    return AlignedPanel(dates=dates, symbols=symbols, values=values)
+
+
+def has_mmap_panel(directory: Path) -> bool:
+    return (directory / "panel.json").exists()
+
+
+def _read_meta(directory: Path) -> dict[str, Any]:
+    with (directory / "panel.json").open("r", encoding="utf-8") as fh:
+        meta = json.load(fh)
+    if meta.get("format") != PANEL_FORMAT or meta.get("version") != PANEL_FORMAT_VERSION:
+        raise ValueError(f"Unsupported panel format in {directory}: {meta.get('format')} v{meta.get('version')}")
+    return meta
+
+
+def _write_files(directory: Path, *, dates: np.ndarray, values: np.ndarray, capacity: int) -> None:
+    T, N = (int(n) for n in values.shape)
+    values_tmp = directory / "values.tmp.npy"
+    dates_tmp = directory / "dates.tmp.npy"
+
+    out = np.lib.format.open_memmap(values_tmp, mode="w+", dtype=np.float64, shape=(capacity, N), fortran_order=True)
+    step = max(1, _WRITE_CHUNK_BYTES // max(1, T * out.dtype.itemsize))
+    for c0 in range(0, N, step):
+        out[:T, c0 : c0 + step] = values[:, c0 : c0 + step]
+    out.flush()
+    del out
+
+    out_dates = np.empty(capacity, dtype=dates.dtype if dates.dtype.kind == "M" else "datetime64[D]")
+    out_dates[:T] = dates
+    out_dates[T:] = np.datetime64("NaT")
+    np.save(dates_tmp, out_dates)
+
+    os.replace(values_tmp, directory / "values.npy")
+    os.replace(dates_tmp, directory / "dates.npy")
+
+
+def _write_meta(directory: Path, *, symbols: list[str], rows: int, capacity: int) -> None:
+    meta: dict[str, Any] = {
+        "format": PANEL_FORMAT,
+        "version": PANEL_FORMAT_VERSION,
+        "symbols": symbols,
+        "shape": [rows, len(symbols)],
+        "capacity": capacity,
+        "dtype": np.dtype(np.float64).str,
+        "order": "F",
+    }
+    meta_tmp = directory / "panel.tmp.json"
+    with meta_tmp.open("w", encoding="utf-8") as fh:
+        json.dump(meta, fh, indent=2)
+    os.replace(meta_tmp, directory / "panel.json")
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+import calendar
+import json
+import os
+import re
+
+import numpy as np
+
+from mrscore.io.adapters import AlignedPanel, build_price_panel
+from mrscore.io.history import OHLC
+from mrscore.io.panel_store import append_mmap_panel, has_mmap_panel, open_mmap_panel, write_mmap_panel
+from mrscore.io.yfinance_loader import YFinanceLoadRequest
+from mrscore.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# Overlapping bars must match the stored ones this closely, else history was revised.
+OVERLAP_RTOL = 1e-6
+
+
+@dataclass(frozen=True)
+class PanelSyncResult:
+    panel: AlignedPanel  # requested window, a view of the memory-mapped store
+    fetched_rows: int    # aligned rows received from the loader
+    written_rows: int    # rows appended or overwritten in the store
+    rebuilt: bool        # store was (re)written from a full download
+
+
+def sync_panel_store(
+    directory: Path,
+    *,
+    loader,  # YFinanceLoader or anything with .load(YFinanceLoadRequest)
+    request: YFinanceLoadRequest,
+    field: OHLC,
+    today: Optional[date] = None,
+    start: Optional[np.datetime64] = None,
+) -> PanelSyncResult:
+    """
+    Bring an append-only panel store up to date and return the requested window.
+
+    The store holds one growing intersection-aligned panel per (tickers,
+    interval, price field) in the io.panel_store format. Once it covers the
+    start of `request.period`, only bars from the second-to-last stored bar
+    onwards are downloaded:
+
+    - bars before the last stored one must match the store (OVERLAP_RTOL),
+      otherwise history was revised (e.g. a new dividend adjustment) and the
+      store is rebuilt from a full download
+    - the last stored bar is overwritten, since it may have been provisional
+    - later bars are appended in place
+
+    An unreadable store or one for other tickers is rebuilt too; loader
+    errors propagate and leave the store as it was.
+
+    The returned panel covers [period start, ending_date or today]. `start`
+    replaces the period start unless the store was rebuilt: a live snapshot
+    pins it to its first bar, so later windows still extend the tracked history.
+    """
+    end = request.ending_date or today or date.today()
+    window_start = _period_start(request.period, end)
+
+    result = None
+    if _covers(directory, window_start):
+        result = _sync_incremental(directory, loader=loader, request=request, field=field, end=end)
+    if result is None:
+        result = _rebuild(directory, loader=loader, request=request, field=field, window_start=window_start)
+
+    stored = open_mmap_panel(directory)
+    if start is not None and not result.rebuilt:
+        i0 = int(np.searchsorted(stored.dates, np.datetime64(start), side="left"))
+    elif window_start is not None:
+        i0 = int(np.searchsorted(stored.dates, np.datetime64(window_start, "D"), side="left"))
+    else:
+        i0 = 0
+    i1 = int(np.searchsorted(stored.dates, np.datetime64(end, "D"), side="right"))
+    window = AlignedPanel(dates=stored.dates[i0:i1], symbols=stored.symbols, values=stored.values[i0:i1])
+    return replace(result, panel=window)
+
+
+def _sync_incremental(
+    directory: Path,
+    *,
+    loader,
+    request: YFinanceLoadRequest,
+    field: OHLC,
+    end: date,
+) -> Optional[PanelSyncResult]:
+    try:
+        stored = open_mmap_panel(directory)
+    except ValueError:
+        logger.warning("Panel store is unreadable, rebuilding: %s", directory, exc_info=True)
+        return None
+    n_rows = len(stored.dates)
+    if n_rows == 0 or stored.symbols != list(request.tickers):
+        return None
+    last = stored.dates[-1]
+    if np.datetime64(end, "D") <= last:
+        logger.info("Panel store is current through %s", last)
+        return PanelSyncResult(panel=stored, fetched_rows=0, written_rows=0, rebuilt=False)
+
+    fetch_from = stored.dates[-2] if n_rows >= 2 else last
+    histories = loader.load(
+        replace(request, start_date=fetch_from.astype("datetime64[D]").item(), cache_enabled=False)
+    )
+    delta = build_price_panel(
+        histories=histories,
+        symbols=list(request.tickers),
+        field=field,
+        align="intersection",
+        normalize_by_first=False,
+    )
+
+    before = delta.dates < last
+    pos = np.searchsorted(stored.dates, delta.dates[before])
+    known = (pos < n_rows) & (stored.dates[np.minimum(pos, n_rows - 1)] == delta.dates[before])
+    if not known.all() or not np.allclose(
+        delta.values[before], stored.values[np.minimum(pos, n_rows - 1)], rtol=OVERLAP_RTOL, atol=0.0, equal_nan=True
+    ):
+        logger.warning("Downloaded bars do not match the panel store; history was revised")
+        return None
+
+    new = ~before
+    at = n_rows - 1 if new.any() and delta.dates[new][0] == last else n_rows
+    rows = AlignedPanel(dates=delta.dates[new], symbols=delta.symbols, values=delta.values[new])
+    append_mmap_panel(directory, rows, at=at)
+    logger.info(
+        "Panel store updated: fetched=%d written=%d rows=%d last=%s",
+        len(delta.dates),
+        len(rows.dates),
+        at + len(rows.dates),
+        rows.dates[-1] if len(rows.dates) else last,
+    )
+    return PanelSyncResult(panel=stored, fetched_rows=len(delta.dates), written_rows=len(rows.dates), rebuilt=False)
+
+
+def _rebuild(
+    directory: Path,
+    *,
+    loader,
+    request: YFinanceLoadRequest,
+    field: OHLC,
+    window_start: Optional[date],
+) -> PanelSyncResult:
+    # A fixed ending_date names a past window, which the history cache keeps as is
+    # (and shares across ticker sets); an open-ended one must be downloaded fresh.
+    histories = loader.load(
+        replace(request, start_date=None, cache_enabled=request.cache_enabled and request.ending_date is not None)
+    )
+    panel = build_price_panel(
+        histories=histories,
+        symbols=list(request.tickers),
+        field=field,
+        align="intersection",
+        normalize_by_first=False,
+    )
+    T = len(panel.dates)
+    # room for about a year of daily appends before the files are regrown
+    capacity = T + max(256, T // 4)
+    write_mmap_panel(directory, panel, capacity=capacity)
+    _write_store_meta(directory, window_start)
+    logger.info("Panel store rebuilt: rows=%d capacity=%d", T, capacity)
+    return PanelSyncResult(panel=panel, fetched_rows=T, written_rows=T, rebuilt=True)
+
+
+def _covers(directory: Path, window_start: Optional[date]) -> bool:
+    """True when the store was built from a download starting no later than window_start."""
+    if not has_mmap_panel(directory):
+        return False
+    try:
+        with (directory / "store.json").open("r", encoding="utf-8") as fh:
+            requested_start = json.load(fh)["requested_start"]
+    except Exception:
+        return False
+    if requested_start is None:  # built from period="max"
+        return True
+    return window_start is not None and date.fromisoformat(requested_start) <= window_start
+
+
+def _write_store_meta(directory: Path, requested_start: Optional[date]) -> None:
+    tmp_path = directory / "store.tmp.json"
+    with tmp_path.open("w", encoding="utf-8") as fh:
+        json.dump({"requested_start": requested_start.isoformat() if requested_start else None}, fh)
+    os.replace(tmp_path, directory / "store.json")
+
+
+def _period_start(period: str, end: date) -> Optional[date]:
+    """First date of a yfinance period ending at `end` (None for "max"); calendar months like pandas DateOffset."""
+    p = period.strip().lower()
+    if p == "max":
+        return None
+    if p == "ytd":
+        return date(end.year, 1, 1)
+    m = re.match(r"^(\d+)(mo|wk|d|y)$", p)
+    if not m:
+        raise ValueError(f"Unsupported period for the panel store: {period}")
+    n, unit = int(m.group(1)), m.group(2)
+    if unit == "d":
+        return end - timedelta(days=n)
+    if unit == "wk":
+        return end - timedelta(weeks=n)
+    months = n * 12 if unit == "y" else n
+    year, month0 = divmod(end.year * 12 + end.month - 1 - months, 12)
+    day = min(end.day, calendar.monthrange(year, month0 + 1)[1])
+    return date(year, month0 + 1, day)
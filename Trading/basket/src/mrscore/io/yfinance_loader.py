@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Dict, Literal, Optional, Sequence
 
 import hashlib
 import json
 import re
+import threading
+import time
 
 import numpy as np
 
 from mrscore.io.history import History
+from mrscore.io.history_store import HistoryStore
 from mrscore.utils.logging import get_logger
 
 
@@ -28,8 +32,14 @@ class YFinanceLoadRequest:
     threads: bool = True
     progress: bool = False
     ending_date: Optional[date] = None  # if set, download period ending at this date
+    start_date: Optional[date] = None   # if set, download from this date (inclusive) instead of `period`
     cache_enabled: bool = False
     cache_path: Optional[str] = None
+    max_workers: int = 1                       # concurrent ticker downloads (1 = sequential)
+    rate_limit_per_s: Optional[float] = None   # token bucket: download attempts per second, shared by all workers
+    rate_burst: int = 1                        # token bucket capacity
+    max_retries: int = 0                       # extra attempts per ticker after a failed download
+    retry_backoff_s: float = 1.0               # sleep before retry i is retry_backoff_s * 2**i
 
 
 class YFinanceLoader:
@@ -66,39 +76,80 @@ class YFinanceLoader:
         if cache_dir is not None:
             logger.info("Cache enabled at: %s", cache_dir)
 
+        if req.max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if req.max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
+
         out: Dict[str, History] = {}
+        pending: list[str] = []
+        keys: Dict[str, str] = {}
+        legacy: Dict[str, History] = {}
+        store = None
 
-        for t in req.tickers:
-            logger.info("Requesting ticker history: %s", t)
-            cache_path = None
-            if cache_dir is not None:
-                cache_path = _cache_file_path(cache_dir, t, req, end_date)
-                cached = _load_cached_history(cache_path)
+        # Cache hits are served here with one open of the store; only misses go to the download pool.
+        if cache_dir is not None:
+            store = HistoryStore(_history_store_path(cache_dir, req))
+            keys = {t: _cache_entry_key(t, req, end_date) for t in req.tickers}
+            stored = store.get_many(keys.values())
+            for t in req.tickers:
+                cached = stored.get(keys[t])
+                if cached is None:
+                    # per-ticker npz files written by older versions
+                    cached = _load_cached_history(cache_dir / f"{keys[t]}.npz")
+                    if cached is not None:
+                        legacy[keys[t]] = cached
                 if cached is not None:
-                    logger.info("Cache hit: %s", cache_path)
                     out[t] = cached
-                    continue
-
-            try:
-                df = _download_history(
-                    yf=yf,
-                    ticker=t,
-                    req=req,
-                    end_date=end_date,
-                )
-            except Exception as exc:
-                logger.exception("Failed to download ticker history: %s", t)
-                raise RuntimeError(f"Failed to load ticker history for {t}") from exc
+                else:
+                    pending.append(t)
+            logger.info("History store %s: hits=%d misses=%d", store.path, len(out), len(pending))
+        else:
+            pending = list(req.tickers)
 
-            if df is None or df.empty:
-                logger.error("Ticker returned empty dataframe: %s", t)
-                raise RuntimeError(f"Ticker {t} returned empty dataframe")
+        bucket = _TokenBucket(req.rate_limit_per_s, req.rate_burst) if req.rate_limit_per_s else None
 
+        def fetch(t: str) -> History:
+            logger.info("Requesting ticker history: %s", t)
+            df = _download_with_retry(yf=yf, ticker=t, req=req, end_date=end_date, bucket=bucket)
             dates = df.index.to_numpy(dtype="datetime64[D]")
             logger.info("Parsing ticker dataframe: %s rows=%d", t, len(dates))
-            out[t] = _history_from_single_df(t, dates, df)
-            if cache_path is not None:
-                _store_cached_history(cache_path, out[t])
+            return _history_from_single_df(t, dates, df)
+
+        # A failed ticker stops the downloads not yet started; every finished
+        # download is cached before the failure is re-raised.
+        fetched: Dict[str, History] = {}
+        failure: Optional[BaseException] = None
+        workers = min(req.max_workers, len(pending))
+        if workers > 1:
+            logger.info("Downloading %d tickers with %d workers", len(pending), workers)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yfinance") as pool:
+                futures = {pool.submit(fetch, t): t for t in pending}
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    try:
+                        fetched[futures[future]] = future.result()
+                    except Exception as exc:
+                        if failure is None:
+                            failure = exc
+                            for other in futures:
+                                other.cancel()
+        else:
+            for t in pending:
+                try:
+                    fetched[t] = fetch(t)
+                except Exception as exc:
+                    failure = exc
+                    break
+        out.update(fetched)
+        if store is not None:
+            # one rewrite of the store per load: migrated legacy entries plus new downloads
+            store.put_many({**legacy, **{keys[t]: history for t, history in fetched.items()}})
+        if failure is not None:
+            raise failure
+        # deterministic order regardless of cache hits and completion order
+        out = {t: out[t] for t in req.tickers if t in out}
 
         if not out:
             logger.error("No ticker histories could be constructed from yfinance output")
@@ -112,7 +163,78 @@ class YFinanceLoader:
         return out
 
 
+class _TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `burst` stored."""
+
+    def __init__(self, rate: float, burst: int, *, clock=time.monotonic, sleep=time.sleep) -> None:
+        if rate <= 0:
+            raise ValueError("rate_limit_per_s must be > 0")
+        if burst < 1:
+            raise ValueError("rate_burst must be >= 1")
+        self._rate = float(rate)
+        self._burst = float(burst)
+        self._tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self._rate
+            self._sleep(wait)
+
+
+def _download_with_retry(
+    *,
+    yf,
+    ticker: str,
+    req: YFinanceLoadRequest,
+    end_date: Optional[date],
+    bucket: Optional[_TokenBucket],
+):
+    for attempt in range(req.max_retries + 1):
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            df = _download_history(yf=yf, ticker=ticker, req=req, end_date=end_date)
+            # an empty frame is how yfinance usually reports a failed download
+            if df is None or df.empty:
+                raise RuntimeError(f"Ticker {ticker} returned empty dataframe")
+            return df
+        except Exception as exc:
+            if attempt == req.max_retries:
+                logger.exception("Failed to download ticker history: %s", ticker)
+                raise RuntimeError(f"Failed to load ticker history for {ticker}") from exc
+            delay = req.retry_backoff_s * (2**attempt)
+            logger.warning(
+                "Download failed for %s (attempt %d/%d), retrying in %.2fs: %s",
+                ticker,
+                attempt + 1,
+                req.max_retries + 1,
+                delay,
+                exc,
+            )
+            time.sleep(delay)
+
+
 def _download_history(*, yf, ticker: str, req: YFinanceLoadRequest, end_date: Optional[date]):
+    if req.start_date is not None:
+        # yfinance's `end` is exclusive
+        return yf.Ticker(ticker).history(
+            start=req.start_date.isoformat(),
+            end=(end_date + timedelta(days=1)).isoformat() if end_date is not None else None,
+            interval=req.interval,
+            auto_adjust=req.auto_adjust,
+        )
+
     if end_date is None:
         return yf.Ticker(ticker).history(
             period=req.period,
@@ -213,12 +335,16 @@ def _prepare_cache_dir(path: Optional[str]) -> Path:
     return cache_dir
 
 
-def _cache_file_path(
-    cache_dir: Path,
+def _history_store_path(cache_dir: Path, req: YFinanceLoadRequest) -> Path:
+    # one store per interval; every ticker and period variant is an entry in it
+    return cache_dir / f"histories__{_slugify(req.interval)}.mrsh"
+
+
+def _cache_entry_key(
     ticker: str,
     req: YFinanceLoadRequest,
     end_date: Optional[date],
-) -> Path:
+) -> str:
     payload = {
         "v": 1,
         "ticker": ticker,
@@ -227,10 +353,12 @@ def _cache_file_path(
         "auto_adjust": req.auto_adjust,
         "ending_date": end_date.isoformat() if end_date else None,
     }
+    if req.start_date is not None:
+        payload["start_date"] = req.start_date.isoformat()
     key = json.dumps(payload, sort_keys=True)
     digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
     slug = _slugify(ticker)
-    return cache_dir / f"{slug}__{digest}.npz"
+    return f"{slug}__{digest}"
 
 
 def _slugify(value: str) -> str:
@@ -273,31 +401,6 @@ def _maybe_field(data, name: str) -> Optional[np.ndarray]:
     return np.asarray(arr, dtype=np.float64)
 
 
-def _store_cached_history(path: Path, history: History) -> None:
-    try:
-        np.savez_compressed(
-            path,
-            symbol=np.array([history.symbol]),
-            dates=np.asarray(history.dates, dtype="datetime64[D]"),
-            open=_field_or_empty(history.open),
-            high=_field_or_empty(history.high),
-            low=_field_or_empty(history.low),
-            close=_field_or_empty(history.close),
-            has_open=np.array([history.open is not None], dtype=bool),
-            has_high=np.array([history.high is not None], dtype=bool),
-            has_low=np.array([history.low is not None], dtype=bool),
-            has_close=np.array([history.close is not None], dtype=bool),
-        )
-    except Exception:
-        logger.warning("Failed to write cache file: %s", path, exc_info=True)
-
-
-def _field_or_empty(arr: Optional[np.ndarray]) -> np.ndarray:
-    if arr is None:
-        return np.asarray([], dtype=np.float64)
-    return np.asarray(arr, dtype=np.float64)
-
-
 def _history_from_single_df(ticker: str, dates: np.ndarray, df) -> History:
     """
     df columns are expected to include Open/High/Low/Close (case-insensitive).
@@ -11,6 +11,7 @@ from mrscore.core.results import Direction
 from mrscore.backtest.types import BacktestResult, Trade
 from mrscore.components.mean.rolling_sma import RollingSMA
 from mrscore.components.mean.ema import EMA
+from mrscore.components.mean.kalman_mean import KalmanMean
 from mrscore.utils.logging import get_logger
 
 
@@ -75,14 +76,20 @@ def _compute_mean_series(
         estimator = RollingSMA(window=mean_cfg.params.window)
     elif mean_cfg.type == "ema":
         estimator = EMA(span=mean_cfg.params.span, min_periods=mean_cfg.params.min_periods)
+    elif mean_cfg.type == "kalman_mean":
+        p = mean_cfg.params
+        estimator = KalmanMean(
+            process_var=p.process_var,
+            obs_var=p.obs_var,
+            init_mean=p.init_mean,
+            init_var=p.init_var,
+            min_periods=p.min_periods,
+        )
     else:
         logger.warning("Mean estimator not supported for plotting: %s", mean_cfg.type)
         return None
 
-    out = np.empty_like(series)
-    for i, x in enumerate(series):
-        out[i] = estimator.update(float(x))
-    return out
+    return estimator.transform(series)
 
 
 def build_ratio_plots(
@@ -0,0 +1,209 @@
+"""Config templates, synthetic data and result comparisons shared by the engine and scan tests."""
+import math
+
+import numpy as np
+
+from mrscore.config.models import DiagnosticsConfig, EngineConfig, RatioUniverseConfig, RootConfig, ScoringConfig
+from mrscore.core.ratio_universe import AlignedPanel, RatioUniverse
+from mrscore.core.results import ScoreResult
+
+
+MEAN_CONFIGS = {
+    "rolling_sma": {"type": "rolling_sma", "params": {"window": 20}},
+    "ema": {"type": "ema", "params": {"span": 15, "min_periods": 5}},
+    "kalman_mean": {
+        "type": "kalman_mean",
+        "params": {"process_var": 0.001, "obs_var": 0.05, "init_mean": 1.0, "init_var": 1.0, "min_periods": 5},
+    },
+}
+
+VOL_CONFIGS = {
+    "rolling_std": {
+        "type": "rolling_std",
+        "params": {"window": 20, "min_periods": 5, "ddof": 1, "min_volatility": 0.0005},
+    },
+    "ewma": {"type": "ewma", "params": {"span": 20, "min_periods": 5, "min_volatility": 0.0005}},
+    "garch11": {
+        "type": "garch11",
+        "params": {"omega": 1.0e-6, "alpha": 0.08, "beta": 0.9, "min_volatility": 0.0005, "min_periods": 5},
+    },
+}
+
+
+def config_dict(
+    *,
+    mean: str = "rolling_sma",
+    vol: str = "rolling_std",
+    volatility_unit: str = "returns",
+    returns_mode: str = "log",
+    max_duration=15,
+    max_zscore=4.0,
+    vol_params=None,
+    scoring=None,
+    diagnostics=None,
+    ratio_universe=None,
+    **engine,
+) -> dict:
+    """
+    RootConfig dict over MEAN_CONFIGS / VOL_CONFIGS with every scoring output
+    and diagnostics on. vol_params / scoring / diagnostics / ratio_universe
+    entries override those sections, **engine the engine one.
+    """
+    vol_cfg = {"type": VOL_CONFIGS[vol]["type"], "params": dict(VOL_CONFIGS[vol]["params"])}
+    vol_cfg["params"]["volatility_unit"] = volatility_unit
+    vol_cfg["params"].update(vol_params or {})
+    return {
+        "config_version": 1,
+        "engine": {
+            "allow_overlapping_events": False,
+            "freeze_mean_on_event": False,
+            "freeze_volatility_on_event": False,
+            "max_active_events": 1,
+            **engine,
+        },
+        "data": {
+            "price_field": "close",
+            "returns_mode": returns_mode,
+            "min_bars_required": 25,
+            "tickers": ["TEST"],
+            "period": "1y",
+            "interval": "1d",
+        },
+        "mean_estimator": MEAN_CONFIGS[mean],
+        "volatility_estimator": vol_cfg,
+        "deviation_detector": {"type": "zscore", "params": {"threshold": 1.5, "min_absolute_move": 0.0}},
+        "reversion_criteria": {"type": "soft_band", "params": {"z_tolerance": 0.4}},
+        "failure_criteria": {"type": "composite", "params": {"max_duration": max_duration, "max_zscore": max_zscore}},
+        "scoring": {
+            "by_direction": True,
+            "by_volatility_bucket": True,
+            "volatility_buckets": 3,
+            "record_empty_scores": False,
+            "compute_sharpe": True,
+            "score_metric": "reversion_rate",
+            **(scoring or {}),
+        },
+        "diagnostics": {"enabled": True, **(diagnostics or {})},
+        "visualization": {"top_k": 5},
+        "ratio_universe": {"k_num": 1, "k_den": 1, **(ratio_universe or {})},
+    }
+
+
+def build_config(**kwargs) -> RootConfig:
+    return RootConfig.model_validate(config_dict(**kwargs))
+
+
+_SCAN_SECTIONS = {
+    "engine": EngineConfig,
+    "ratio_universe": RatioUniverseConfig,
+    "diagnostics": DiagnosticsConfig,
+    "scoring": ScoringConfig,
+}
+
+
+def scan_config_dict(**fields) -> dict:
+    """
+    config_dict() as the ratio-scan tests use it: rolling_sma / rolling_std
+    without a volatility floor, plain reversion-rate scores, diagnostics off,
+    k_num = k_den = 1. Each keyword goes to the section that declares it, e.g.
+    scan_config_dict(batch_size=4, k_num=2, k_den=2, rank_by=["score"], scan_stats=True).
+    """
+    sections = {name: {} for name in _SCAN_SECTIONS}
+    for key, value in fields.items():
+        section = next((name for name, model in _SCAN_SECTIONS.items() if key in model.model_fields), None)
+        if section is None:
+            raise TypeError(f"unknown config field: {key}")
+        sections[section][key] = value
+    return config_dict(
+        vol_params={"min_volatility": 0.0},
+        scoring={"by_direction": False, "by_volatility_bucket": False, "compute_sharpe": False, **sections["scoring"]},
+        diagnostics={"enabled": False, **sections["diagnostics"]},
+        ratio_universe=sections["ratio_universe"],
+        **sections["engine"],
+    )
+
+
+def build_scan_config(**fields) -> RootConfig:
+    return RootConfig.model_validate(scan_config_dict(**fields))
+
+
+def make_panel(N: int = 8, T: int = 160, seed: int = 0, *, constant=None) -> AlignedPanel:
+    """Independent log-normal random walks; `constant` maps columns to fixed prices."""
+    rng = np.random.default_rng(seed)
+    values = np.exp(np.cumsum(rng.normal(0.0, 0.02, size=(T, N)), axis=0))
+    for column, price in (constant or {}).items():
+        values[:, column] = price
+    dates = np.arange(T).astype("datetime64[D]")
+    return AlignedPanel(dates=dates, symbols=[f"S{i}" for i in range(N)], values=values)
+
+
+def make_universe(N: int = 8, T: int = 160, seed: int = 0, *, constant=None, **kwargs) -> RatioUniverse:
+    return RatioUniverse(make_panel(N, T, seed, constant=constant), **kwargs)
+
+
+def ratio_like_series(B: int, T: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    # mean-reverting AR(1) in logs so events open, revert and fail
+    x = np.zeros((B, T))
+    for t in range(1, T):
+        x[:, t] = 0.9 * x[:, t - 1] + rng.normal(0.0, 0.02, size=B)
+    return np.exp(x)
+
+
+def log_returns(prices: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        return np.log(prices[:, 1:]) - np.log(prices[:, :-1])
+
+
+def same_float(a, b) -> bool:
+    if a is None or b is None:
+        return a is b
+    return (math.isnan(a) and math.isnan(b)) or a == b
+
+
+def assert_same_result(got: ScoreResult, ref: ScoreResult) -> None:
+    """Field-by-field equality of two results (NaN equals NaN)."""
+    assert same_float(got.score, ref.score)
+    assert same_float(got.sharpe, ref.sharpe)
+    assert got.total_events == ref.total_events
+    assert got.reverted_events == ref.reverted_events
+    assert got.failed_events == ref.failed_events
+    assert got.expired_events == ref.expired_events
+    for name in ("by_direction", "by_volatility_bucket"):
+        a, b = getattr(got, name), getattr(ref, name)
+        assert a.keys() == b.keys()
+        assert all(same_float(a[k], b[k]) for k in a)
+    assert got.events == ref.events
+
+
+def close_float(a, b, rel: float = 1e-9) -> bool:
+    if a is None or b is None:
+        return a is b
+    return same_float(a, b) or math.isclose(a, b, rel_tol=rel)
+
+
+def assert_close_result(got: ScoreResult, ref: ScoreResult, rel: float = 1e-9) -> None:
+    """The same events as assert_same_result, but floats from estimator paths only up to rounding."""
+    assert close_float(got.score, ref.score, rel)
+    assert close_float(got.sharpe, ref.sharpe, rel)
+    assert got.total_events == ref.total_events
+    assert got.reverted_events == ref.reverted_events
+    assert got.failed_events == ref.failed_events
+    assert got.expired_events == ref.expired_events
+    for name in ("by_direction", "by_volatility_bucket"):
+        a, b = getattr(got, name), getattr(ref, name)
+        assert a.keys() == b.keys()
+        assert all(close_float(a[k], b[k], rel) for k in a)
+    assert len(got.events) == len(ref.events)
+    for a, b in zip(got.events, ref.events):
+        assert (a.direction, a.status, a.start_index, a.end_index, a.start_time, a.end_time) == (
+            b.direction,
+            b.status,
+            b.start_index,
+            b.end_index,
+            b.start_time,
+            b.end_time,
+        )
+        assert a.start_price == b.start_price and same_float(a.end_price, b.end_price)
+        for field in ("start_mean", "start_volatility", "start_zscore", "max_abs_zscore"):
+            assert close_float(getattr(a, field), getattr(b, field), rel)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from mrscore.io.adapters import align_histories_intersection, align_histories_union, build_price_panel
+from mrscore.io.history import OHLC, History
+
+
+def _ragged(N: int, T: int, *, unit: str, step: int, seed: int = 7) -> dict:
+    rng = np.random.default_rng(seed)
+    calendar = np.datetime64("2020-01-01", unit) + (np.arange(T) * step).astype(f"timedelta64[{unit}]")
+    out = {}
+    for i in range(N):
+        dates = calendar[rng.integers(0, 4) :]
+        dates = dates[rng.random(dates.size) >= 0.15]
+        out[f"S{i}"] = History(symbol=f"S{i}", dates=dates, close=rng.normal(100.0, 1.0, size=dates.size))
+    return out
+
+
+def _reference(histories, symbols, *, how, fill="none"):
+    # straightforward per-symbol alignment
+    all_dates = histories[symbols[0]].dates
+    for s in symbols[1:]:
+        merge = np.intersect1d if how == "intersection" else np.union1d
+        all_dates = merge(all_dates, histories[s].dates)
+    mat = np.full((all_dates.size, len(symbols)), np.nan)
+    for j, s in enumerate(symbols):
+        h = histories[s]
+        if how == "intersection":
+            mat[:, j] = h.close[np.searchsorted(h.dates, all_dates)]
+            continue
+        mat[np.searchsorted(all_dates, h.dates), j] = h.close
+        col = mat[:, j] if fill != "bfill" else mat[::-1, j]
+        if fill != "none":
+            last = np.nan
+            for i in range(col.size):
+                if np.isnan(col[i]):
+                    col[i] = last
+                else:
+                    last = col[i]
+    return all_dates, mat
+
+
+@pytest.mark.parametrize("unit,step", [("D", 1), ("ns", 3_600_000_000_000 * 7)])
+@pytest.mark.parametrize("fill", ["none", "ffill", "bfill"])
+def test_union_matches_reference(unit, step, fill):
+    histories = _ragged(9, 60, unit=unit, step=step)
+    symbols = list(histories)
+    dates, expected = _reference(histories, symbols, how="union", fill=fill)
+
+    panel = align_histories_union(histories, symbols=symbols, field=OHLC.CLOSE, fill=fill)
+
+    assert np.array_equal(panel.dates, dates)
+    assert np.array_equal(panel.values, expected, equal_nan=True)
+    assert panel.values.flags.c_contiguous
+
+
+@pytest.mark.parametrize("unit,step", [("D", 1), ("ns", 3_600_000_000_000 * 7)])
+def test_intersection_matches_reference(unit, step):
+    histories = _ragged(4, 80, unit=unit, step=step)
+    symbols = list(histories)[::-1]
+    dates, expected = _reference(histories, symbols, how="intersection")
+
+    panel = align_histories_intersection(histories, symbols=symbols, field=OHLC.CLOSE)
+
+    assert dates.size > 0
+    assert np.array_equal(panel.dates, dates)
+    assert np.array_equal(panel.values, expected)
+
+
+def test_repeated_dates_use_first_for_intersection_and_last_for_union():
+    d = np.array(["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03"], dtype="datetime64[D]")
+    histories = {
+        "A": History(symbol="A", dates=d, close=np.array([1.0, 2.0, 3.0, 4.0])),
+        "B": History(symbol="B", dates=d[[0, 1, 3]], close=np.array([10.0, 20.0, 40.0])),
+    }
+    inter = align_histories_intersection(histories, symbols=["A", "B"], field=OHLC.CLOSE)
+    union = align_histories_union(histories, symbols=["A", "B"], field=OHLC.CLOSE)
+
+    assert inter.values[:, 0].tolist() == [1.0, 2.0, 4.0]
+    assert union.values[:, 0].tolist() == [1.0, 3.0, 4.0]
+
+
+def test_ffill_leaves_leading_gap_and_intersection_needs_overlap():
+    d = np.array(["2024-01-01", "2024-01-02", "2024-01-03"], dtype="datetime64[D]")
+    histories = {
+        "A": History(symbol="A", dates=d, close=np.array([1.0, np.nan, 3.0])),
+        "B": History(symbol="B", dates=d[2:], close=np.array([5.0])),
+    }
+    panel = build_price_panel(
+        histories, symbols=["A", "B"], field=OHLC.CLOSE, align="union", normalize_by_first=False, union_fill="ffill"
+    )
+    assert np.array_equal(panel.values, np.array([[1.0, np.nan], [1.0, np.nan], [3.0, 5.0]]), equal_nan=True)
+
+    with pytest.raises(ValueError, match="No intersecting dates"):
+        align_histories_intersection(
+            {"A": histories["A"], "C": History(symbol="C", dates=np.array(["2023-01-01"], dtype="datetime64[D]"), close=np.ones(1))},
+            symbols=["A", "C"],
+            field=OHLC.CLOSE,
+        )
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from _helpers import config_dict
+from mrscore.app.composition_root import build_app
+from mrscore.backtest.types import BacktestResult
+from mrscore.config.models import RootConfig
+from mrscore.io.adapters import AlignedPanel
+from mrscore.io.ratio import RatioSpec, build_equal_weight_basket
+
+
+def build_config(
+    *,
+    vol: str = "ewma",
+    volatility_unit: str = "returns",
+    signal_series: str = "log_ratio",
+    returns_mode: str = "log",
+    freeze_mean_on_event: bool = False,
+    freeze_volatility_on_event: bool = False,
+    commission_bps: float = 0.5,
+    slippage_bps: float = 1.0,
+    store_equity_curve: bool = True,
+) -> RootConfig:
+    raw = config_dict(
+        vol=vol,
+        volatility_unit=volatility_unit,
+        returns_mode=returns_mode,
+        scoring={"by_volatility_bucket": False, "compute_sharpe": False},
+        diagnostics={"enabled": False},
+        ratio_universe={"k_num": 2, "k_den": 2},
+        freeze_mean_on_event=freeze_mean_on_event,
+        freeze_volatility_on_event=freeze_volatility_on_event,
+    )
+    raw["deviation_detector"]["params"]["threshold"] = 1.0
+    raw["backtest"] = {
+        "enabled": True,
+        "sizing": {"notional_per_trade": 10_000},
+        "costs": {"commission_bps": commission_bps, "slippage_bps": slippage_bps},
+        "strategy": {"type": "ratio_mean_reversion", "params": {"signal_series": signal_series}},
+        "output": {"store_equity_curve": store_equity_curve, "store_trades": True},
+    }
+    return RootConfig.model_validate(raw)
+
+
+def _panel(T: int = 300, N: int = 6, seed: int = 3) -> AlignedPanel:
+    rng = np.random.default_rng(seed)
+    common = np.cumsum(rng.normal(0.0, 0.01, size=T))
+    x = np.zeros((T, N))
+    for t in range(1, T):
+        x[t] = 0.92 * x[t - 1] + rng.normal(0.0, 0.02, size=N)
+    values = 50.0 * np.exp(common[:, None] + x)
+    dates = np.datetime64("2020-01-01") + np.arange(T).astype("timedelta64[D]")
+    return AlignedPanel(dates=dates, symbols=[f"S{i}" for i in range(N)], values=values)
+
+
+def _specs() -> list[RatioSpec]:
+    legs = [([0], [1]), ([0, 2], [3]), ([4], [1, 5]), ([2, 3], [4, 5]), ([1], [0])]
+    return [RatioSpec(build_equal_weight_basket(n), build_equal_weight_basket(d)) for n, d in legs]
+
+
+def _assert_close(batch: BacktestResult, ref: BacktestResult) -> None:
+    assert batch.job_id == ref.job_id
+    assert batch.final_equity == pytest.approx(ref.final_equity, rel=1e-9)
+    assert batch.total_return == pytest.approx(ref.total_return, rel=1e-9, abs=1e-12)
+
+    assert (batch.equity_curve is None) == (ref.equity_curve is None)
+    if ref.equity_curve is not None:
+        assert [p.index for p in batch.equity_curve] == [p.index for p in ref.equity_curve]
+        assert [p.time for p in batch.equity_curve] == [p.time for p in ref.equity_curve]
+        assert np.allclose([p.equity for p in batch.equity_curve], [p.equity for p in ref.equity_curve], rtol=1e-9)
+
+    assert len(batch.trades) == len(ref.trades)
+    for a, b in zip(batch.trades, ref.trades):
+        assert (a.direction, a.status, a.entry_index, a.exit_index, a.duration) == (
+            b.direction,
+            b.status,
+            b.entry_index,
+            b.exit_index,
+            b.duration,
+        )
+        assert (a.entry_time, a.exit_time) == (b.entry_time, b.exit_time)
+        for name in ("entry_num", "entry_den", "exit_num", "exit_den", "gross_notional_entry", "gross_notional_exit"):
+            assert getattr(a, name) == pytest.approx(getattr(b, name), rel=1e-9), name
+        assert a.pnl == pytest.approx(b.pnl, rel=1e-9, abs=1e-6)
+        assert a.costs == pytest.approx(b.costs, rel=1e-9)
+        assert a.qty_num.shape == b.qty_num.shape and np.allclose(a.qty_num, b.qty_num, rtol=1e-9)
+        assert a.qty_den.shape == b.qty_den.shape and np.allclose(a.qty_den, b.qty_den, rtol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"volatility_unit": "price", "vol": "rolling_std"},
+        {"signal_series": "ratio", "returns_mode": "simple"},
+        {"freeze_mean_on_event": True},
+        {"freeze_mean_on_event": True, "freeze_volatility_on_event": True, "vol": "rolling_std"},
+        {"commission_bps": 0.0, "slippage_bps": 0.0, "store_equity_curve": False},
+    ],
+)
+def test_run_many_matches_run_one(kwargs):
+    backtester = build_app(build_config(**kwargs)).backtester
+    panel = _panel()
+    specs = _specs()
+    job_ids = [f"job{i}" for i in range(len(specs))]
+
+    batch = backtester.run_many(panel=panel, ratio_specs=specs, job_ids=job_ids)
+
+    assert len(batch) == len(specs)
+    assert sum(len(r.trades) for r in batch) > len(specs)
+    for spec, job_id, result in zip(specs, job_ids, batch):
+        _assert_close(result, backtester.run_one(panel=panel, ratio_spec=spec, job_id=job_id))
+
+
+def test_run_many_skips_buys_on_non_positive_prices():
+    backtester = build_app(build_config()).backtester
+    panel = _panel()
+    panel.values[40:, 3] = -1.0  # the denominator of spec 1 becomes unbuyable
+    specs = _specs()[:2]
+
+    batch = backtester.run_many(panel=panel, ratio_specs=specs, job_ids=["a", "b"])
+
+    for spec, job_id, result in zip(specs, ["a", "b"], batch):
+        _assert_close(result, backtester.run_one(panel=panel, ratio_spec=spec, job_id=job_id))
+
+
+def test_run_many_validates_inputs():
+    backtester = build_app(build_config()).backtester
+    assert backtester.run_many(panel=_panel(), ratio_specs=[], job_ids=[]) == []
+    with pytest.raises(ValueError, match="same length"):
+        backtester.run_many(panel=_panel(), ratio_specs=_specs(), job_ids=["a"])
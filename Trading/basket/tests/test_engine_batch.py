@@ -0,0 +1,119 @@
+import math
+
+import numpy as np
+import pytest
+
+from _helpers import MEAN_CONFIGS, VOL_CONFIGS, assert_same_result, config_dict, log_returns, ratio_like_series
+from mrscore.app.composition_root import build_app
+from mrscore.config.models import RootConfig
+
+
+def build_config(**kwargs) -> RootConfig:
+    # scalar-vs-batch comparisons default to an EWMA volatility on prices
+    kwargs.setdefault("vol", "ewma")
+    kwargs.setdefault("volatility_unit", "price")
+    return RootConfig.model_validate(config_dict(**kwargs))
+
+
+@pytest.mark.parametrize("mean", sorted(MEAN_CONFIGS))
+@pytest.mark.parametrize("vol", sorted(VOL_CONFIGS))
+@pytest.mark.parametrize("volatility_unit", ["price", "returns"])
+def test_run_batch_matches_scalar_for_all_components(mean: str, vol: str, volatility_unit: str):
+    engine = build_app(build_config(mean=mean, vol=vol, volatility_unit=volatility_unit)).engine
+    prices = ratio_like_series(8, 250)
+    returns = log_returns(prices)
+
+    batch = engine.run_batch(prices=prices, returns=returns)
+
+    assert len(batch) == prices.shape[0]
+    if volatility_unit == "returns" or vol == "rolling_std":
+        assert sum(r.total_events for r in batch) > 0
+    for b in range(prices.shape[0]):
+        assert_same_result(batch[b], engine.run(prices=prices[b], returns=returns[b]))
+
+
+@pytest.mark.parametrize(
+    "engine_kwargs",
+    [
+        {"allow_overlapping_events": True, "max_active_events": 3},
+        {"freeze_mean_on_event": True},
+        {"freeze_volatility_on_event": True},
+        {"freeze_mean_on_event": True, "freeze_volatility_on_event": True},
+        {"allow_overlapping_events": True, "max_active_events": 2, "freeze_mean_on_event": True},
+    ],
+)
+def test_run_batch_matches_scalar_for_engine_options(engine_kwargs):
+    engine = build_app(build_config(mean="ema", vol="rolling_std", volatility_unit="returns", **engine_kwargs)).engine
+    prices = ratio_like_series(10, 300, seed=11)
+    returns = log_returns(prices)
+    dates = np.arange(prices.shape[1]).astype("datetime64[D]")
+
+    batch = engine.run_batch(prices=prices, returns=returns, dates=dates)
+
+    for b in range(prices.shape[0]):
+        assert_same_result(batch[b], engine.run(prices=prices[b], returns=returns[b], dates=dates))
+
+
+def test_run_batch_falls_back_without_array_api():
+    engine = build_app(build_config()).engine
+
+    class ScalarOnly:
+        def __init__(self, inner) -> None:
+            self._inner = inner
+
+        def is_reverted(self, *, zscore: float) -> bool:
+            return self._inner.is_reverted(zscore=zscore)
+
+    engine.reversion_criteria = ScalarOnly(engine.reversion_criteria)
+    assert not engine.supports_batch()
+
+    prices = ratio_like_series(3, 120, seed=3)
+    batch = engine.run_batch(prices=prices, returns=None)
+    for b in range(prices.shape[0]):
+        assert_same_result(batch[b], engine.run(prices=prices[b], returns=None))
+
+
+def test_run_batch_validates_shapes():
+    engine = build_app(build_config(volatility_unit="returns")).engine
+    prices = ratio_like_series(2, 50)
+    with pytest.raises(ValueError, match="returns must be provided"):
+        engine.run_batch(prices=prices, returns=None)
+    with pytest.raises(ValueError, match="shape"):
+        engine.run_batch(prices=prices, returns=log_returns(prices)[:, 1:])
+    with pytest.raises(ValueError, match="2D"):
+        engine.run_batch(prices=prices[0], returns=None)
+
+
+@pytest.mark.parametrize(
+    "engine_kwargs",
+    [{}, {"allow_overlapping_events": True, "max_active_events": 3}, {"freeze_mean_on_event": True}],
+)
+def test_early_abandon_only_drops_series_below_threshold(engine_kwargs):
+    engine = build_app(build_config(mean="ema", vol="rolling_std", volatility_unit="returns", **engine_kwargs)).engine
+    prices = ratio_like_series(12, 300, seed=5)
+    returns = log_returns(prices)
+    full = engine.run_batch(prices=prices, returns=returns)
+    floors = np.linspace(0.2, 0.9, prices.shape[0])
+
+    batch = engine.run_batch(prices=prices, returns=returns, abandon_below=floors)
+
+    assert any(r.abandoned_at is not None for r in batch)
+    for b, result in enumerate(batch):
+        scalar = engine.run(prices=prices[b], returns=returns[b], abandon_below=floors[b])
+        assert result.abandoned_at == scalar.abandoned_at
+        if result.abandoned_at is None:
+            assert_same_result(result, full[b])
+        else:
+            assert full[b].score < floors[b]
+            assert math.isnan(result.score) and math.isnan(scalar.score)
+            assert 0 < result.abandoned_at < prices.shape[1]
+            assert result.total_events == scalar.total_events <= full[b].total_events
+
+
+def test_early_abandon_requires_reversion_rate():
+    engine = build_app(build_config(scoring={"score_metric": "direction"})).engine
+    prices = ratio_like_series(2, 50)
+    with pytest.raises(ValueError, match="reversion_rate"):
+        engine.run(prices=prices[0], returns=None, abandon_below=0.5)
+    with pytest.raises(ValueError, match="reversion_rate"):
+        engine.run_batch(prices=prices, returns=None, abandon_below=0.5)
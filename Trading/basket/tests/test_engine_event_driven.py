@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+from _helpers import (
+    MEAN_CONFIGS,
+    VOL_CONFIGS,
+    assert_close_result,
+    config_dict,
+    log_returns,
+    ratio_like_series,
+)
+from mrscore.app.composition_root import build_app
+from mrscore.config.loader import parse_root_config
+from mrscore.config.models import RootConfig
+from mrscore.utils.errors import ConfigValidationError
+
+
+def build_config(**kwargs) -> RootConfig:
+    # event-driven comparisons default to an EMA mean
+    kwargs.setdefault("mean", "ema")
+    return RootConfig.model_validate(config_dict(**kwargs))
+
+
+def _assert_matches_run(engine, prices: np.ndarray, dates=None) -> int:
+    returns = log_returns(prices)
+    total = 0
+    for b in range(prices.shape[0]):
+        ref = engine.run(prices=prices[b], returns=returns[b], dates=dates)
+        assert_close_result(engine.run_event_driven(prices=prices[b], returns=returns[b], dates=dates), ref)
+        total += ref.total_events
+    return total
+
+
+@pytest.mark.parametrize("mean", sorted(MEAN_CONFIGS))
+@pytest.mark.parametrize("vol", sorted(VOL_CONFIGS))
+@pytest.mark.parametrize("volatility_unit", ["price", "returns"])
+def test_event_driven_matches_run_for_all_components(mean: str, vol: str, volatility_unit: str):
+    engine = build_app(build_config(mean=mean, vol=vol, volatility_unit=volatility_unit)).engine
+    total = _assert_matches_run(engine, ratio_like_series(4, 250))
+    if volatility_unit == "returns":
+        assert total > 0
+
+
+ENGINE_OPTIONS = [
+    {},
+    {"allow_overlapping_events": True, "max_active_events": 3},
+    {"freeze_mean_on_event": True},
+    {"freeze_volatility_on_event": True},
+    {"freeze_mean_on_event": True, "freeze_volatility_on_event": True},
+    {"allow_overlapping_events": True, "max_active_events": 2, "freeze_mean_on_event": True},
+    {"allow_overlapping_events": True, "max_active_events": 4, "freeze_volatility_on_event": True},
+]
+
+
+@pytest.mark.parametrize("engine_kwargs", ENGINE_OPTIONS)
+@pytest.mark.parametrize("volatility_unit", ["price", "returns"])
+def test_event_driven_matches_run_for_engine_options(engine_kwargs, volatility_unit):
+    engine = build_app(build_config(volatility_unit=volatility_unit, **engine_kwargs)).engine
+    prices = ratio_like_series(6, 400, seed=11)
+    dates = np.arange(prices.shape[1]).astype("datetime64[D]")
+
+    assert _assert_matches_run(engine, prices, dates) > 0
+
+
+@pytest.mark.parametrize("engine_kwargs", ENGINE_OPTIONS)
+def test_event_driven_matches_run_for_long_and_expiring_events(engine_kwargs):
+    # no duration limit: events outlast the first lookahead windows and some are still open at the end
+    engine = build_app(build_config(max_duration=None, max_zscore=8.0, **engine_kwargs)).engine
+    rng = np.random.default_rng(2)
+    prices = np.exp(np.cumsum(rng.normal(0.0, 0.02, size=(5, 900)), axis=1))
+    returns = log_returns(prices)
+
+    results = [engine.run(prices=prices[b], returns=returns[b]) for b in range(5)]
+    assert max(e.duration for r in results for e in r.events) > 40
+    assert sum(r.expired_events for r in results) > 0
+    _assert_matches_run(engine, prices)
+
+
+@pytest.mark.parametrize("engine_kwargs", ENGINE_OPTIONS[:3])
+@pytest.mark.parametrize("T", [1, 2, 24, 25, 26, 80])
+def test_event_driven_matches_run_on_short_and_gappy_series(engine_kwargs, T):
+    engine = build_app(build_config(mean="rolling_sma", vol="garch11", **engine_kwargs)).engine
+    prices = ratio_like_series(3, T, seed=T)
+    if T > 40:
+        prices[0, 30] = np.nan
+        prices[1, 35:38] = np.inf
+    _assert_matches_run(engine, prices)
+
+
+def test_event_driven_reads_unfrozen_estimators_with_transform(monkeypatch):
+    engine = build_app(build_config(volatility_unit="returns")).engine
+    prices = ratio_like_series(1, 300, seed=5)[0]
+    returns = log_returns(prices[None, :])[0]
+    ref = engine.run(prices=prices, returns=returns)
+
+    def no_update(x):
+        raise AssertionError("update() called on an unfrozen estimator")
+
+    monkeypatch.setattr(engine.mean_estimator, "update", no_update)
+    monkeypatch.setattr(engine.volatility_estimator, "update", no_update)
+    got = engine.run_event_driven(prices=prices, returns=returns)
+    assert ref.total_events > 0
+    assert_close_result(got, ref)
+
+
+def test_event_driven_falls_back_without_array_api():
+    engine = build_app(build_config()).engine
+
+    class ScalarOnly:
+        def __init__(self, inner) -> None:
+            self._inner = inner
+
+        def is_failed(self, *, duration: int, zscore: float) -> bool:
+            return self._inner.is_failed(duration=duration, zscore=zscore)
+
+    engine.failure_criteria = ScalarOnly(engine.failure_criteria)
+    assert not engine.supports_event_driven()
+    assert _assert_matches_run(engine, ratio_like_series(2, 150, seed=3)) > 0
+
+
+def test_event_driven_validates_inputs():
+    engine = build_app(build_config()).engine
+    prices = ratio_like_series(1, 50)[0]
+    with pytest.raises(ValueError, match="returns must be provided"):
+        engine.run_event_driven(prices=prices, returns=None)
+    with pytest.raises(ValueError, match="length T-1"):
+        engine.run_event_driven(prices=prices, returns=np.zeros(10))
+    with pytest.raises(ValueError, match="dates length"):
+        engine.run_event_driven(prices=prices, returns=np.zeros(49), dates=np.arange(3))
+    with pytest.raises(ValueError, match="1D"):
+        engine.run_event_driven(prices=prices[None, :], returns=None)
+
+
+def test_event_driven_rejects_early_abandon():
+    raw = config_dict(mean="ema", event_driven=True, early_abandon=True)
+    with pytest.raises(ConfigValidationError, match="event_driven"):
+        parse_root_config(raw)
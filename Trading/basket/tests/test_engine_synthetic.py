@@ -240,3 +240,30 @@ def test_freeze_updates_on_active_event():
     assert mean_estimator.update_calls == 1
     assert vol_estimator.update_calls == 1
     assert result.expired_events == 1
+
+
+def test_event_log_grows_and_is_reused_across_runs():
+    def make_engine():
+        return MeanReversionEngine(
+            config=build_config(),
+            mean_estimator=ConstantEstimator(0.0),
+            volatility_estimator=ConstantEstimator(1.0),
+            deviation_detector=ZScoreDeviationDetector(threshold=1.0, min_absolute_move=0.0),
+            reversion_criteria=SoftBandReversionCriteria(z_tolerance=0.5),
+            failure_criteria=CompositeFailureCriteria(max_duration=10, max_zscore=5.0),
+            volatility_unit="price",
+        )
+
+    engine = make_engine()
+    # every 2.0 opens a DOWN event that the next bar's 0.1 reverts: 300 events, past the initial buffer
+    long_prices = np.tile([2.0, 0.1], 300)
+    long_result = engine.run(prices=long_prices, returns=None)
+    assert long_result.total_events == long_result.reverted_events == 300
+    assert [e.start_index for e in long_result.events] == list(range(0, 600, 2))
+    assert all(e.end_index == e.start_index + 1 and e.end_price == 0.1 for e in long_result.events)
+
+    short_prices = np.array([0.0, -2.0, 0.3, 2.0, 2.0, 2.0])
+    again = engine.run(prices=short_prices, returns=None)
+    fresh = make_engine().run(prices=short_prices, returns=None)
+    assert again == fresh
+    assert [e.status for e in again.events] == [EventStatus.REVERTED, EventStatus.EXPIRED]
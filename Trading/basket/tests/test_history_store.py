@@ -0,0 +1,129 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from mrscore.io.history import History
+from mrscore.io.history_store import HistoryStore
+from mrscore.io.yfinance_loader import (
+    YFinanceLoadRequest,
+    YFinanceLoader,
+    _cache_entry_key,
+    _history_store_path,
+)
+
+
+def _history(symbol: str, n: int, *, unit: str = "D", with_open: bool = True) -> History:
+    rng = np.random.default_rng(len(symbol) + n)
+    close = rng.uniform(10.0, 20.0, size=n)
+    return History(
+        symbol=symbol,
+        dates=np.arange(n).astype(f"datetime64[{unit}]"),
+        open=close * 0.99 if with_open else None,
+        high=close * 1.01,
+        low=close * 0.98,
+        close=close,
+    )
+
+
+def _assert_same(test: unittest.TestCase, a: History, b: History) -> None:
+    test.assertEqual(a.symbol, b.symbol)
+    test.assertEqual(a.dates.dtype, b.dates.dtype)
+    test.assertTrue(np.array_equal(a.dates, b.dates))
+    for name in ("open", "high", "low", "close"):
+        x, y = getattr(a, name), getattr(b, name)
+        test.assertEqual(x is None, y is None, name)
+        if x is not None:
+            test.assertTrue(np.array_equal(x, y), name)
+
+
+class TestHistoryStore(unittest.TestCase):
+    def test_round_trip_and_append(self) -> None:
+        first = {"a": _history("AAA", 7), "b": _history("BB", 0), "c": _history("C", 5, unit="m", with_open=False)}
+        second = {"d": _history("DDD", 11), "a": _history("AAA", 9)}
+        with TemporaryDirectory() as tmp_dir:
+            store = HistoryStore(Path(tmp_dir) / "store.mrsh")
+            self.assertEqual(store.get_many(["a"]), {})
+
+            store.put_many(first)
+            store.put_many(second)
+            loaded = store.get_many(["a", "b", "c", "d", "missing"])
+
+            self.assertEqual(sorted(loaded), ["a", "b", "c", "d"])
+            _assert_same(self, loaded["a"], second["a"])  # replaced entry
+            for key in ("b", "c"):
+                _assert_same(self, loaded[key], first[key])
+            _assert_same(self, loaded["d"], second["d"])
+            self.assertFalse(loaded["d"].close.flags.writeable)  # a view of the mapped file
+            self.assertEqual(list(Path(tmp_dir).iterdir()), [store.path])
+
+    def test_replaced_blocks_are_reclaimed(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = HistoryStore(Path(tmp_dir) / "store.mrsh")
+            store.put_many({"keep": _history("K", 50), "s": _history("S", 10), "a": _history("AAA", 100)})
+            live_size = store.path.stat().st_size
+            for n in range(101, 121):
+                store.put_many({"a": _history("AAA", n)})
+                # dead blocks never exceed the live ones (plus the growth of "a" and the index)
+                self.assertLess(store.path.stat().st_size, 2 * live_size + 5 * 8 * 20)
+
+            store.compact()
+            compacted = store.path.stat().st_size
+            store.put_many({"s": _history("S", 10)})  # one small dead block, below the automatic threshold
+            self.assertGreater(store.path.stat().st_size, compacted)
+            store.compact()
+            self.assertEqual(store.path.stat().st_size, compacted)
+            loaded = store.get_many(["keep", "a"])
+            _assert_same(self, loaded["keep"], _history("K", 50))
+            _assert_same(self, loaded["a"], _history("AAA", 120))
+
+            store.compact()  # nothing dead: same contents
+            _assert_same(self, store.get_many(["a"])["a"], _history("AAA", 120))
+            self.assertEqual(list(Path(tmp_dir).iterdir()), [store.path])
+
+    def test_truncated_store_reads_as_empty(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = HistoryStore(Path(tmp_dir) / "store.mrsh")
+            store.put_many({"a": _history("AAA", 7)})
+            store.path.write_bytes(store.path.read_bytes()[:-3])
+
+            with self.assertLogs("mrscore.io.history_store", level="WARNING"):
+                self.assertEqual(store.get_many(["a"]), {})
+
+
+class TestLoaderHistoryStore(unittest.TestCase):
+    def test_legacy_npz_entries_are_served_and_migrated(self) -> None:
+        req_kwargs = dict(tickers=["AAA", "BBB"], period="1y", cache_enabled=True)
+        with TemporaryDirectory() as tmp_dir:
+            req = YFinanceLoadRequest(cache_path=tmp_dir, **req_kwargs)
+            for t in req.tickers:
+                h = _history(t, 6)
+                np.savez_compressed(
+                    Path(tmp_dir) / f"{_cache_entry_key(t, req, None)}.npz",
+                    symbol=np.array([t]),
+                    dates=h.dates,
+                    open=h.open,
+                    high=h.high,
+                    low=h.low,
+                    close=h.close,
+                )
+
+            fake_yf = mock.Mock()
+            with mock.patch.dict("sys.modules", {"yfinance": fake_yf}):
+                with mock.patch.object(HistoryStore, "put_many", autospec=True, side_effect=HistoryStore.put_many) as put:
+                    out = YFinanceLoader().load(req)
+
+            fake_yf.Ticker.assert_not_called()
+            self.assertEqual(put.call_count, 1)
+            self.assertEqual(list(out), ["AAA", "BBB"])
+            migrated = HistoryStore(_history_store_path(Path(tmp_dir), req)).get_many(
+                _cache_entry_key(t, req, None) for t in req.tickers
+            )
+            for t in req.tickers:
+                _assert_same(self, migrated[_cache_entry_key(t, req, None)], out[t])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+from datetime import date, timedelta
+import json
+
+import numpy as np
+import pytest
+
+from _helpers import MEAN_CONFIGS, VOL_CONFIGS, assert_same_result, config_dict, make_panel
+from mrscore.app.composition_root import build_app
+from mrscore.app.live import LiveRescorer
+from mrscore.app.scan import compute_returns_inplace
+from mrscore.components.mean.ema import EMA
+from mrscore.components.mean.kalman_mean import KalmanMean
+from mrscore.components.mean.rolling_sma import RollingSMA
+from mrscore.components.volatility.ewma import EWMAVol
+from mrscore.components.volatility.garch11 import GARCH11Vol
+from mrscore.components.volatility.rolling_std import RollingStd
+from mrscore.config.models import RootConfig
+from mrscore.core.ratio_universe import AlignedPanel, RatioUniverse
+from mrscore.io.cache import load_live_snapshot, store_live_snapshot
+from mrscore.io.history import OHLC
+from mrscore.io.panel_sync import sync_panel_store
+from mrscore.io.yfinance_loader import YFinanceLoadRequest
+from test_panel_sync import FakeLoader
+
+
+def build_config(**kwargs) -> RootConfig:
+    return RootConfig.model_validate(config_dict(ratio_universe={"k_num": 2, "k_den": 1}, **kwargs))
+
+
+def _panel() -> AlignedPanel:
+    return make_panel(N=6, T=240, seed=3)
+
+
+def _head(panel: AlignedPanel, T: int) -> AlignedPanel:
+    return AlignedPanel(dates=panel.dates[:T], symbols=panel.symbols, values=panel.values[:T])
+
+
+def _full_results(ru, engine, jobs, returns_mode, vol_unit):
+    out = []
+    for job in jobs:
+        prices = ru.compute_ratio_series(job)
+        returns = None
+        if vol_unit == "returns":
+            returns = np.empty(len(prices) - 1)
+            compute_returns_inplace(prices=prices, returns_out=returns, tmp_out=np.empty_like(returns), mode=returns_mode)
+        out.append(engine.run(prices=prices, returns=returns))
+    return out
+
+
+def _track_and_step(panel, config, T0, *, returns_mode="log", vol_unit="returns", ru_kwargs=None):
+    engine = build_app(config).engine
+    head = RatioUniverse(_head(panel, T0), **(ru_kwargs or {}))
+    jobs = list(head.iter_ratio_jobs(k_num=2, k_den=1))[::4]
+    live = LiveRescorer.track(head, engine, jobs, returns_mode=returns_mode, vol_unit=vol_unit)
+    assert live.extend(panel) == len(panel.dates) - T0
+    full = RatioUniverse(panel, **(ru_kwargs or {}))
+    return live, _full_results(full, engine, jobs, returns_mode, vol_unit), engine
+
+
+@pytest.mark.parametrize("mean", sorted(MEAN_CONFIGS))
+@pytest.mark.parametrize("vol", sorted(VOL_CONFIGS))
+def test_stepping_matches_full_run(mean, vol):
+    live, expected, _ = _track_and_step(_panel(), build_config(mean=mean, vol=vol), 150)
+    assert live.t == 240
+    assert sum(r.total_events for r in expected) > 0
+    for got, want in zip(live.results(), expected):
+        assert_same_result(got, want)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"freeze_mean_on_event": True, "freeze_volatility_on_event": True},
+        {"allow_overlapping_events": True, "max_active_events": 3},
+        {"vol_unit": "price", "returns_mode": "none"},
+        {"returns_mode": "simple"},
+    ],
+)
+@pytest.mark.parametrize("T0", [1, 10, 239])
+def test_stepping_matches_full_run_across_options(options, T0):
+    options = dict(options)
+    returns_mode = options.pop("returns_mode", "log")
+    vol_unit = options.pop("vol_unit", "returns")
+    config = build_config(returns_mode=returns_mode, volatility_unit=vol_unit, **options)
+    live, expected, _ = _track_and_step(_panel(), config, T0, returns_mode=returns_mode, vol_unit=vol_unit)
+    for got, want in zip(live.results(), expected):
+        assert_same_result(got, want)
+
+
+def test_stepping_matches_float32_universe():
+    ru_kwargs = {"dtype": np.float32, "basket_cache": True}
+    live, expected, _ = _track_and_step(_panel(), build_config(), 120, ru_kwargs=ru_kwargs)
+    for got, want in zip(live.results(), expected):
+        assert_same_result(got, want)
+
+
+def test_snapshot_round_trips_through_json(tmp_path):
+    panel = _panel()
+    config = build_config(allow_overlapping_events=True, max_active_events=2)
+    engine = build_app(config).engine
+    head = RatioUniverse(_head(panel, 200))
+    jobs = list(head.iter_ratio_jobs(k_num=2, k_den=1))[:12]
+    live = LiveRescorer.track(head, engine, jobs, returns_mode="log", vol_unit="returns")
+    assert any(state.active for state in live.states)
+
+    store_live_snapshot(tmp_path, "key", live.to_dict(), live_key="a")
+    assert load_live_snapshot(tmp_path, "key", live_key="b") is None
+    restored = LiveRescorer.from_dict(engine, load_live_snapshot(tmp_path, "key", live_key="a"))
+    assert json.dumps(restored.to_dict()) == json.dumps(live.to_dict())
+
+    assert live.extend(panel) == restored.extend(panel) == 40
+    for got, want in zip(restored.results(), live.results()):
+        assert_same_result(got, want)
+    assert [(r.job, r.score) for r in restored.top(5)] == [(r.job, r.score) for r in live.top(5)]
+
+
+def test_snapshot_extends_across_daily_store_syncs(tmp_path):
+    tickers = ["AAA", "BBB", "CCC", "DDD"]
+    loader = FakeLoader(tickers, date(2023, 1, 1), 800)
+    engine = build_app(build_config()).engine
+
+    def sync(day, start=None):
+        request = YFinanceLoadRequest(tickers=tickers, period="6mo", ending_date=day)
+        return sync_panel_store(tmp_path / "store", loader=loader, request=request, field=OHLC.CLOSE, start=start)
+
+    day = date(2024, 3, 1)
+    ru = RatioUniverse(sync(day).panel)
+    jobs = list(ru.iter_ratio_jobs(k_num=2, k_den=1))
+    live = LiveRescorer.track(ru, engine, jobs, returns_mode="log", vol_unit="returns")
+    store_live_snapshot(tmp_path, "key", live.to_dict(), live_key="a")
+
+    for _ in range(2):
+        day += timedelta(days=1)
+        snapshot = load_live_snapshot(tmp_path, "key", live_key="a")
+        live = LiveRescorer.from_dict(engine, snapshot)
+        # the period window starts a day later each day; pinned to the snapshot it still extends it
+        assert live.extend(sync(day).panel) is None
+        synced = sync(day, start=np.datetime64(snapshot["first_date"]))
+        assert not synced.rebuilt
+        assert str(synced.panel.dates[0]) == snapshot["first_date"] == "2023-09-01"
+        assert live.extend(synced.panel) == 1
+        expected = _full_results(RatioUniverse(synced.panel), engine, jobs, "log", "returns")
+        for got, want in zip(live.results(), expected):
+            assert_same_result(got, want)
+        store_live_snapshot(tmp_path, "key", live.to_dict(), live_key="a")
+
+
+def test_revised_last_bar_is_stepped_again(tmp_path):
+    tickers = ["AAA", "BBB", "CCC", "DDD"]
+    loader = FakeLoader(tickers, date(2023, 1, 1), 800)
+    engine = build_app(build_config()).engine
+    day = date(2024, 3, 1)
+
+    def sync(end, start=None):
+        request = YFinanceLoadRequest(tickers=tickers, period="6mo", ending_date=end)
+        return sync_panel_store(tmp_path / "store", loader=loader, request=request, field=OHLC.CLOSE, start=start)
+
+    ru = RatioUniverse(sync(day).panel)
+    jobs = list(ru.iter_ratio_jobs(k_num=2, k_den=1))
+    live = LiveRescorer.track(ru, engine, jobs, returns_mode="log", vol_unit="returns")
+    snapshot = json.loads(json.dumps(live.to_dict()))
+    provisional = [ru.compute_ratio_series(job)[-1] for job in jobs]
+
+    # the stored close of `day` was provisional; the next sync overwrites it
+    loader.closes["BBB"][int(np.searchsorted(loader.dates, np.datetime64(day, "D")))] *= 1.03
+    synced = sync(day + timedelta(days=1), start=np.datetime64(snapshot["first_date"]))
+    assert not synced.rebuilt and synced.written_rows == 2
+    full = RatioUniverse(synced.panel)
+    assert [full.compute_ratio_series(job)[-2] for job in jobs] != provisional
+    expected = _full_results(full, engine, jobs, "log", "returns")
+
+    for rescorer in (live, LiveRescorer.from_dict(engine, snapshot)):
+        assert rescorer.extend(synced.panel) == 1
+        assert rescorer.t == len(synced.panel.dates)
+        for got, want in zip(rescorer.results(), expected):
+            assert_same_result(got, want)
+
+
+def test_extend_rejects_other_histories():
+    panel = _panel()
+    head = RatioUniverse(_head(panel, 100))
+    live = LiveRescorer.track(
+        head, build_app(build_config()).engine, list(head.iter_ratio_jobs(k_num=2, k_den=1))[:3], returns_mode="log", vol_unit="returns"
+    )
+    shifted = AlignedPanel(dates=panel.dates[1:], symbols=panel.symbols, values=panel.values[1:])
+    renamed = AlignedPanel(dates=panel.dates, symbols=panel.symbols[::-1], values=panel.values)
+    assert live.extend(shifted) is None
+    assert live.extend(renamed) is None
+    assert live.extend(_head(panel, 50)) is None
+    assert live.extend(_head(panel, 100)) == 0
+    assert live.t == 100
+
+    with pytest.raises(ValueError, match="returns_mode"):
+        LiveRescorer.track(head, build_app(build_config()).engine, live.jobs, returns_mode="none", vol_unit="returns")
+    with pytest.raises(ValueError, match="empty"):
+        LiveRescorer.track(head, build_app(build_config()).engine, [], returns_mode="log", vol_unit="returns")
+
+
+@pytest.mark.parametrize(
+    "make,values",
+    [
+        (lambda: RollingSMA(window=5), [1.0, 2.0, 3.0]),
+        (lambda: EMA(span=5, min_periods=2), [1.0, 2.0, 3.0]),
+        (lambda: KalmanMean(process_var=1e-3, obs_var=1e-1), [1.0, 2.0, 3.0]),
+        (lambda: RollingStd(window=5, min_periods=2, ddof=1), [0.01, -0.02, 0.03]),
+        (lambda: EWMAVol(span=5, min_periods=2), [0.01, -0.02, 0.03]),
+        (lambda: GARCH11Vol(omega=1e-6, alpha=0.1, beta=0.85, min_periods=2), [0.01, -0.02, 0.03]),
+    ],
+)
+def test_estimator_state_round_trips(make, values):
+    estimator, clone = make(), make()
+    for v in values:
+        estimator.update(v)
+    clone.set_state(json.loads(json.dumps(estimator.get_state())))
+    for v in (0.5, -0.01, 2.0):
+        estimator.update(v)
+        clone.update(v)
+        assert clone.get_state() == estimator.get_state()
+        assert clone.is_ready() == estimator.is_ready()
@@ -0,0 +1,169 @@
+import math
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from _helpers import make_universe, scan_config_dict
+from mrscore.app.composition_root import build_app
+from mrscore.app.scan import make_rankings, scan_top_k_parallel, score_ratio_jobs, score_ratio_tiles
+from mrscore.config.loader import parse_root_config
+from mrscore.config.models import RootConfig
+from mrscore.core.ranking import MultiTopKRanker, TopKRanker
+from mrscore.core.ratio_universe import RatioJob, RatioUniverse
+from mrscore.core.results import ScoreResult
+from mrscore.utils.errors import ConfigValidationError
+
+
+METRICS = ["score", "sharpe", "total_events"]
+
+
+def _config_dict(**fields) -> dict:
+    fields.setdefault("compute_sharpe", True)
+    return scan_config_dict(**fields)
+
+
+def build_config(**fields) -> RootConfig:
+    return RootConfig.model_validate(_config_dict(**fields))
+
+
+def _universe() -> RatioUniverse:
+    return make_universe(seed=9)
+
+
+def _reference(ru, config, k, metric, group_by=None) -> dict:
+    """Brute force: every job's metric, sorted by (value desc, job order asc), cut per group."""
+    engine = build_app(config).engine
+    rows = {}
+    for order, job in enumerate(ru.iter_ratio_jobs(k_num=1, k_den=1)):
+        prices = ru.compute_ratio_series(job)
+        result = engine.run(prices=prices, returns=np.diff(np.log(prices)))
+        value = getattr(result, metric)
+        if not math.isfinite(result.score) or value is None or not math.isfinite(value):
+            continue
+        group = getattr(job, group_by) if group_by is not None else None
+        rows.setdefault(group, []).append((-value, order, job))
+    return {group: [(job, -v) for v, _, job in sorted(items)[:k]] for group, items in sorted(rows.items())}
+
+
+def _as_pairs(rankings: MultiTopKRanker, metric: str) -> dict:
+    return {group: [(r.job, r.score) for r in items] for group, items in rankings.groups(metric).items()}
+
+
+def _scan(ru, config, rankings, *, tiles=False, top_k=5):
+    engine = build_app(config).engine
+    common = dict(
+        ru=ru,
+        engine=engine,
+        ranker=TopKRanker(top_k),
+        returns_mode="log",
+        vol_unit="returns",
+        batch_size=config.engine.batch_size,
+        rankings=rankings,
+    )
+    if tiles:
+        return score_ratio_tiles(tiles=ru.scan_blocks(k_num=1, k_den=1, block_num=3, block_den=4), **common)
+    return score_ratio_jobs(jobs=ru.iter_ratio_jobs(k_num=1, k_den=1), **common)
+
+
+def test_multi_ranker_keeps_k_per_metric_and_group():
+    ranker = MultiTopKRanker(2, ["score", "sharpe"], group_by="num_id")
+    for order in range(12):
+        job = RatioJob(k_num=1, k_den=1, num_id=order % 3, den_id=order)
+        sharpe = None if order == 4 else (math.nan if order == 5 else float(order))
+        result = ScoreResult(score=1.0, total_events=1, reverted_events=1, failed_events=0, expired_events=0, sharpe=sharpe)
+        ranker.consider(job=job, result=result, order=order)
+
+    assert len(ranker) == 2 * 3 * 2
+    # equal scores: the lowest orders win
+    assert [r.job.den_id for r in ranker.top("score", 1)] == [1, 4]
+    # None / NaN sharpe values are skipped for sharpe only
+    assert [(r.job.den_id, r.score) for r in ranker.top("sharpe", 1)] == [(10, 10.0), (7, 7.0)]
+    assert [r.job.den_id for r in ranker.top("sharpe", 2)] == [11, 8]
+    assert list(ranker.groups("score")) == [0, 1, 2]
+    assert ranker.top("score", 99) == []
+
+
+def test_multi_ranker_merge_validates_shape():
+    ranker = MultiTopKRanker(3, ["score"])
+    with pytest.raises(ValueError, match="same k"):
+        ranker.merge(MultiTopKRanker(4, ["score"]))
+    with pytest.raises(ValueError, match="same k"):
+        ranker.merge(MultiTopKRanker(3, ["score"], group_by="den_id"))
+    with pytest.raises(ValueError, match="metrics"):
+        MultiTopKRanker(3, [])
+    with pytest.raises(ValueError, match="k must be"):
+        MultiTopKRanker(0, ["score"])
+
+
+@pytest.mark.parametrize("group_by", [None, "num_id"])
+@pytest.mark.parametrize("batch_size,tiles", [(None, False), (4, False), (None, True)])
+def test_scan_rankings_match_brute_force(group_by, batch_size, tiles):
+    ru = _universe()
+    config = build_config(batch_size=batch_size)
+    rankings = MultiTopKRanker(3, METRICS, group_by=group_by)
+    _scan(ru, config, rankings, tiles=tiles)
+
+    for metric in METRICS:
+        assert _as_pairs(rankings, metric) == _reference(ru, config, 3, metric, group_by)
+    if group_by is not None:
+        assert len(rankings.groups("score")) > 1
+
+
+def test_scan_rankings_merge_across_splits():
+    ru = _universe()
+    config = build_config()
+    jobs = list(ru.iter_ratio_jobs(k_num=1, k_den=1))
+    engine = build_app(config).engine
+    common = dict(ru=ru, engine=engine, returns_mode="log", vol_unit="returns")
+
+    whole = MultiTopKRanker(3, METRICS, group_by="den_id")
+    score_ratio_jobs(jobs=jobs, ranker=TopKRanker(5), rankings=whole, **common)
+    merged = MultiTopKRanker(3, METRICS, group_by="den_id")
+    for part in (jobs[30:], jobs[:11], jobs[11:30]):
+        shard = MultiTopKRanker(3, METRICS, group_by="den_id")
+        # job_order() tie-breaks make the split and merge order irrelevant
+        score_ratio_jobs(jobs=part, ranker=TopKRanker(5), rankings=shard, **common)
+        merged.merge(shard)
+
+    for metric in METRICS:
+        assert _as_pairs(merged, metric) == _as_pairs(whole, metric)
+
+
+def test_parallel_scan_merges_shard_rankings():
+    ru = _universe()
+    config = build_config(rank_by=METRICS, rank_group_by="num_id", rank_top_k=2)
+    result = scan_top_k_parallel(
+        ru,
+        config,
+        k_num=1,
+        k_den=1,
+        top_k=5,
+        workers=2,
+        n_shards=3,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    assert result.rankings is not None and result.rankings.k == 2
+    for metric in METRICS:
+        assert _as_pairs(result.rankings, metric) == _reference(ru, config, 2, metric, "num_id")
+
+    assert scan_top_k_parallel(ru, build_config(), k_num=1, k_den=1, top_k=5, workers=1).rankings is None
+
+
+def test_rankings_config():
+    assert make_rankings(build_config(), 5) is None
+    rankings = make_rankings(build_config(rank_by=["score", "total_events"]), 7)
+    assert rankings is not None and rankings.k == 7 and rankings.metrics == ("score", "total_events")
+    assert rankings.group_by is None
+    assert make_rankings(build_config(rank_by=["score"], rank_top_k=2, rank_group_by="den_id"), 7).k == 2
+
+    with pytest.raises(ConfigValidationError, match="rank_by"):
+        parse_root_config(_config_dict(rank_group_by="num_id"))
+    with pytest.raises(ConfigValidationError, match="repeat"):
+        parse_root_config(_config_dict(rank_by=["score", "score"]))
+    with pytest.raises(ConfigValidationError, match="compute_sharpe"):
+        parse_root_config(_config_dict(rank_by=["sharpe"], compute_sharpe=False))
+    with pytest.raises(ConfigValidationError, match="early_abandon"):
+        parse_root_config(_config_dict(rank_by=["score"], early_abandon=True))
+    with pytest.raises(ConfigValidationError):
+        parse_root_config(_config_dict(rank_by=["volatility"]))
@@ -0,0 +1,68 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+from mrscore.app.scan import _MappedArray, _share_panel
+from mrscore.core.ratio_universe import RatioJob, RatioUniverse
+from mrscore.io.adapters import AlignedPanel
+from mrscore.io.panel_store import open_mmap_panel, write_mmap_panel
+
+
+def _panel(T: int = 60, N: int = 6, seed: int = 3) -> AlignedPanel:
+    rng = np.random.default_rng(seed)
+    values = np.exp(np.cumsum(rng.normal(0.0, 0.02, size=(T, N)), axis=0)) * rng.uniform(5.0, 50.0, size=N)
+    dates = np.arange(T).astype("datetime64[h]")  # intraday unit is kept
+    return AlignedPanel(dates=dates, symbols=[f"S{i}" for i in range(N)], values=values)
+
+
+class TestMmapPanel(unittest.TestCase):
+    def test_round_trip_is_memory_mapped_and_column_major(self) -> None:
+        panel = _panel()
+        with TemporaryDirectory() as tmp_dir:
+            write_mmap_panel(Path(tmp_dir), panel)
+            loaded = open_mmap_panel(Path(tmp_dir))
+
+            self.assertIsInstance(loaded.values, np.memmap)
+            self.assertTrue(loaded.values.flags.f_contiguous)
+            self.assertFalse(loaded.values.flags.writeable)
+            self.assertTrue(np.array_equal(loaded.values, panel.values))
+            self.assertTrue(np.array_equal(loaded.dates, panel.dates))
+            self.assertEqual(loaded.dates.dtype, panel.dates.dtype)
+            self.assertEqual(loaded.symbols, panel.symbols)
+
+    def test_open_rejects_mismatched_metadata(self) -> None:
+        panel = _panel()
+        with TemporaryDirectory() as tmp_dir:
+            directory = Path(tmp_dir)
+            write_mmap_panel(directory, panel)
+            np.save(directory / "dates.npy", panel.dates[:-1])
+            with self.assertRaisesRegex(ValueError, "do not match"):
+                open_mmap_panel(directory)
+
+
+class TestRatioUniverseOnMmapPanel(unittest.TestCase):
+    def test_ratio_universe_wraps_mmap_panel_without_copy(self) -> None:
+        panel = _panel()
+        with TemporaryDirectory() as tmp_dir:
+            write_mmap_panel(Path(tmp_dir), panel)
+            mapped = open_mmap_panel(Path(tmp_dir))
+
+            raw = RatioUniverse(mapped, normalize_by_first=False)
+            self.assertIs(raw._X, mapped.values)
+            self.assertIsInstance(_share_panel(None, raw._X), _MappedArray)
+
+            normalized = RatioUniverse(mapped, normalize_by_first=True)
+            reference = RatioUniverse(panel, normalize_by_first=True)
+            self.assertIsInstance(normalized._X, np.memmap)
+            self.assertTrue(np.array_equal(normalized._X, reference._X))
+
+            job = RatioJob(k_num=2, k_den=2, num_id=1, den_id=9)
+            self.assertTrue(
+                np.array_equal(normalized.compute_ratio_series(job), reference.compute_ratio_series(job))
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
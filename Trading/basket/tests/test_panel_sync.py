@@ -0,0 +1,175 @@
+from dataclasses import replace
+from datetime import date, timedelta
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+import numpy as np
+
+from mrscore.io.adapters import AlignedPanel
+from mrscore.io.history import OHLC, History
+from mrscore.io.panel_store import append_mmap_panel, open_mmap_panel, write_mmap_panel
+from mrscore.io.panel_sync import _period_start, sync_panel_store
+from mrscore.io.yfinance_loader import YFinanceLoadRequest
+
+
+class FakeLoader:
+    """Serves a fixed daily close series per ticker, cut at the request's start/end."""
+
+    def __init__(self, tickers, first: date, n_days: int, seed: int = 1) -> None:
+        rng = np.random.default_rng(seed)
+        self.dates = np.arange(np.datetime64(first, "D"), np.datetime64(first + timedelta(days=n_days), "D"))
+        self.closes = {
+            t: np.exp(np.cumsum(rng.normal(0.0, 0.01, size=n_days))) * (10.0 + i) for i, t in enumerate(tickers)
+        }
+        self.requests = []
+
+    def load(self, req: YFinanceLoadRequest):
+        self.requests.append(req)
+        end = np.datetime64(req.ending_date, "D") if req.ending_date else self.dates[-1]
+        start = np.datetime64(req.start_date, "D") if req.start_date else end - np.timedelta64(366, "D")
+        keep = (self.dates >= start) & (self.dates <= end)
+        return {
+            t: History(symbol=t, dates=self.dates[keep], close=self.closes[t][keep].copy()) for t in req.tickers
+        }
+
+
+def _request(tickers, end: date) -> YFinanceLoadRequest:
+    return YFinanceLoadRequest(tickers=tickers, period="6mo", ending_date=end)
+
+
+class TestPanelSync(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tickers = ["AAA", "BBB", "CCC"]
+        self.loader = FakeLoader(self.tickers, date(2023, 1, 1), 800)
+
+    def test_second_run_fetches_only_new_bars(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = Path(tmp_dir)
+            first = sync_panel_store(store, loader=self.loader, request=_request(self.tickers, date(2024, 3, 1)), field=OHLC.CLOSE)
+            self.assertTrue(first.rebuilt)
+
+            later = date(2024, 3, 11)
+            second = sync_panel_store(store, loader=self.loader, request=_request(self.tickers, later), field=OHLC.CLOSE)
+
+            self.assertFalse(second.rebuilt)
+            self.assertEqual(self.loader.requests[-1].start_date, date(2024, 2, 29))
+            self.assertEqual(second.fetched_rows, 12)  # overlap bar + last stored bar + 10 new bars
+            self.assertEqual(second.written_rows, 11)
+            self.assertIsInstance(second.panel.values, np.memmap)
+
+            with TemporaryDirectory() as fresh_dir:
+                full = sync_panel_store(
+                    Path(fresh_dir), loader=self.loader, request=_request(self.tickers, later), field=OHLC.CLOSE
+                )
+                self.assertTrue(np.array_equal(second.panel.dates, full.panel.dates))
+                self.assertTrue(np.array_equal(second.panel.values, full.panel.values))
+            self.assertEqual(second.panel.dates[0], np.datetime64(date(2023, 9, 11), "D"))
+            self.assertEqual(second.panel.dates[-1], np.datetime64(later, "D"))
+
+    def test_rebuild_reads_history_cache_only_for_a_fixed_end(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            fixed = replace(_request(self.tickers, date(2024, 3, 1)), cache_enabled=True, cache_path=tmp_dir)
+            sync_panel_store(Path(tmp_dir) / "fixed", loader=self.loader, request=fixed, field=OHLC.CLOSE)
+            self.assertTrue(self.loader.requests[-1].cache_enabled)
+
+            open_ended = replace(fixed, ending_date=None)
+            today = date(2025, 3, 1)
+            sync_panel_store(Path(tmp_dir) / "open", loader=self.loader, request=open_ended, field=OHLC.CLOSE, today=today)
+            self.assertFalse(self.loader.requests[-1].cache_enabled)
+
+    def test_store_current_through_end_downloads_nothing(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = Path(tmp_dir)
+            sync_panel_store(store, loader=self.loader, request=_request(self.tickers, date(2024, 3, 1)), field=OHLC.CLOSE)
+            earlier = YFinanceLoadRequest(tickers=self.tickers, period="3mo", ending_date=date(2024, 2, 20))
+            result = sync_panel_store(store, loader=self.loader, request=earlier, field=OHLC.CLOSE)
+
+            self.assertEqual(len(self.loader.requests), 1)
+            self.assertEqual((result.fetched_rows, result.written_rows, result.rebuilt), (0, 0, False))
+            self.assertEqual(result.panel.dates[-1], np.datetime64("2024-02-20"))
+
+    def test_revised_history_triggers_rebuild(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = Path(tmp_dir)
+            sync_panel_store(store, loader=self.loader, request=_request(self.tickers, date(2024, 3, 1)), field=OHLC.CLOSE)
+            for closes in self.loader.closes.values():
+                closes *= 0.98  # e.g. a dividend re-adjusts the whole series
+
+            result = sync_panel_store(store, loader=self.loader, request=_request(self.tickers, date(2024, 3, 5)), field=OHLC.CLOSE)
+
+            self.assertTrue(result.rebuilt)
+            self.assertIsNone(self.loader.requests[-1].start_date)
+            last = np.flatnonzero(self.loader.dates == np.datetime64("2024-03-05"))[0]
+            self.assertEqual(result.panel.values[-1, 0], self.loader.closes["AAA"][last])
+
+    def test_loader_error_propagates_without_rebuilding(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = Path(tmp_dir)
+            sync_panel_store(store, loader=self.loader, request=_request(self.tickers, date(2024, 3, 1)), field=OHLC.CLOSE)
+            before = open_mmap_panel(store).dates.copy()
+
+            class FailingLoader:
+                def load(self, req):
+                    raise ConnectionError("download failed")
+
+            with self.assertRaises(ConnectionError):
+                sync_panel_store(store, loader=FailingLoader(), request=_request(self.tickers, date(2024, 3, 5)), field=OHLC.CLOSE)
+            self.assertTrue(np.array_equal(open_mmap_panel(store).dates, before))
+
+    def test_unreadable_store_is_rebuilt(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = Path(tmp_dir)
+            sync_panel_store(store, loader=self.loader, request=_request(self.tickers, date(2024, 3, 1)), field=OHLC.CLOSE)
+            meta = json.loads((store / "panel.json").read_text())
+            meta["version"] = -1
+            (store / "panel.json").write_text(json.dumps(meta))
+
+            result = sync_panel_store(store, loader=self.loader, request=_request(self.tickers, date(2024, 3, 5)), field=OHLC.CLOSE)
+            self.assertTrue(result.rebuilt)
+            self.assertEqual(result.panel.dates[-1], np.datetime64("2024-03-05"))
+
+    def test_longer_period_than_stored_rebuilds(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = Path(tmp_dir)
+            sync_panel_store(store, loader=self.loader, request=_request(self.tickers, date(2024, 3, 1)), field=OHLC.CLOSE)
+            longer = YFinanceLoadRequest(tickers=self.tickers, period="1y", ending_date=date(2024, 3, 1))
+
+            self.assertTrue(sync_panel_store(store, loader=self.loader, request=longer, field=OHLC.CLOSE).rebuilt)
+
+
+class TestAppendMmapPanel(unittest.TestCase):
+    def test_append_regrows_capacity_and_overwrites_tail(self) -> None:
+        dates = np.arange(10).astype("datetime64[D]")
+        values = np.arange(30, dtype=np.float64).reshape(10, 3)
+        symbols = ["A", "B", "C"]
+        with TemporaryDirectory() as tmp_dir:
+            directory = Path(tmp_dir)
+            write_mmap_panel(directory, AlignedPanel(dates=dates[:6], symbols=symbols, values=values[:6]), capacity=7)
+
+            # overwrite row 5 and append 4 more rows: 10 > capacity 7, so files regrow
+            append_mmap_panel(directory, AlignedPanel(dates=dates[5:], symbols=symbols, values=values[5:]), at=5)
+            loaded = open_mmap_panel(directory)
+            self.assertTrue(np.array_equal(loaded.values, values))
+            self.assertTrue(np.array_equal(loaded.dates, dates))
+            self.assertEqual(json.loads((directory / "panel.json").read_text())["capacity"], 14)
+
+            with self.assertRaisesRegex(ValueError, "not after stored row"):
+                append_mmap_panel(directory, AlignedPanel(dates=dates[9:], symbols=symbols, values=values[9:]))
+            with self.assertRaisesRegex(ValueError, "symbols"):
+                append_mmap_panel(directory, AlignedPanel(dates=dates[:1] + 20, symbols=["A", "B", "X"], values=values[:1]))
+
+
+def test_period_start_uses_calendar_offsets():
+    end = date(2024, 3, 31)
+    assert _period_start("max", end) is None
+    assert _period_start("ytd", end) == date(2024, 1, 1)
+    assert _period_start("5d", end) == date(2024, 3, 26)
+    assert _period_start("2wk", end) == date(2024, 3, 17)
+    assert _period_start("1mo", end) == date(2024, 2, 29)
+    assert _period_start("2y", end) == date(2022, 3, 31)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,299 @@
+import multiprocessing
+
+import pytest
+
+from _helpers import build_scan_config, make_universe
+from mrscore.app.composition_root import build_app
+from mrscore.app.scan import (
+    PruneStats,
+    ScanCheckpointer,
+    plan_scan_shards,
+    scan_top_k_parallel,
+    score_ratio_jobs,
+    score_ratio_tiles,
+)
+from mrscore.cli.main_2 import _select_top_k_jobs
+from mrscore.config.models import RootConfig
+from mrscore.core.ranking import TopKRanker
+from mrscore.core.ratio_universe import AlignedPanel, RatioJob, RatioJobTable, RatioUniverse
+from mrscore.io.cache import ScanCheckpoint, load_scan_checkpoint, store_scan_checkpoint
+from mrscore.io.panel_store import open_mmap_panel, write_mmap_panel
+
+
+def build_config(**fields) -> RootConfig:
+    fields.setdefault("k_num", 2)
+    fields.setdefault("k_den", 2)
+    return build_scan_config(**fields)
+
+
+def _universe(N: int = 7, **kwargs) -> RatioUniverse:
+    return make_universe(N, seed=5, normalize_by_first=True, **kwargs)
+
+
+def _serial_top(ru, config, *, k_num, k_den, top_k, **job_kwargs):
+    ranker = TopKRanker(top_k)
+    processed = score_ratio_jobs(
+        ru=ru,
+        engine=build_app(config).engine,
+        jobs=ru.iter_ratio_jobs(k_num=k_num, k_den=k_den, **job_kwargs),
+        ranker=ranker,
+        returns_mode=config.data.returns_mode,
+        vol_unit=config.volatility_estimator.params.volatility_unit,
+        batch_size=config.engine.batch_size,
+    )
+    return ranker.items_sorted(), processed
+
+
+def test_ranker_merge_matches_single_ranker_with_ties():
+    scores = [1.0, 0.5, 1.0, 0.25, 1.0, 0.5, 0.75, 1.0, 0.5]
+    jobs = [RatioJob(k_num=1, k_den=1, num_id=i, den_id=i + 1) for i in range(len(scores))]
+
+    serial = TopKRanker(4)
+    for i, (job, score) in enumerate(zip(jobs, scores)):
+        serial.consider(job=job, score=score, order=i)
+
+    left, right = TopKRanker(4), TopKRanker(4)
+    for i, (job, score) in enumerate(zip(jobs, scores)):
+        (left if i % 2 else right).consider(job=job, score=score, order=i)
+    merged = TopKRanker(4)
+    merged.merge(left)
+    merged.merge(right)
+
+    assert merged.items_sorted() == serial.items_sorted()
+    # earliest jobs win among equal scores
+    assert [r.job.num_id for r in serial.items_sorted()] == [0, 2, 4, 7]
+
+
+@pytest.mark.parametrize(
+    "job_kwargs",
+    [
+        {"unordered_if_equal_k": True, "disallow_overlap": False},
+        {"unordered_if_equal_k": True, "disallow_overlap": True, "max_jobs": 97},
+        {"unordered_if_equal_k": False, "disallow_overlap": True},
+    ],
+)
+def test_plan_scan_shards_covers_serial_job_sequence(job_kwargs):
+    ru = _universe()
+    serial = list(ru.iter_ratio_jobs(k_num=2, k_den=2, **job_kwargs))
+
+    shards = plan_scan_shards(ru, k_num=2, k_den=2, n_shards=6, **job_kwargs)
+    sharded = []
+    for shard in shards:
+        sharded.extend(
+            ru.iter_ratio_jobs(
+                k_num=2,
+                k_den=2,
+                unordered_if_equal_k=job_kwargs["unordered_if_equal_k"],
+                disallow_overlap=job_kwargs["disallow_overlap"],
+                max_jobs=shard.max_jobs,
+                start=shard.start,
+                stop=shard.stop,
+            )
+        )
+
+    assert len(shards) > 1
+    assert sharded == serial
+
+
+@pytest.mark.parametrize("batch_size,basket_cache", [(None, False), (16, True)])
+def test_parallel_scan_matches_serial_top_k(batch_size, basket_cache):
+    ru = _universe(basket_cache=basket_cache)
+    config = build_config(batch_size=batch_size)
+    job_kwargs = {"unordered_if_equal_k": True, "disallow_overlap": True, "max_jobs": 150}
+
+    serial_top, serial_processed = _serial_top(ru, config, k_num=2, k_den=2, top_k=7, **job_kwargs)
+    result = scan_top_k_parallel(
+        ru,
+        config,
+        k_num=2,
+        k_den=2,
+        top_k=7,
+        workers=2,
+        n_shards=5,
+        mp_context=multiprocessing.get_context("spawn"),
+        **job_kwargs,
+    )
+
+    assert result.shards > 1
+    assert result.processed_jobs == serial_processed
+    assert result.top == serial_top
+
+
+@pytest.mark.parametrize("batch_size", [None, 16])
+def test_tile_scan_matches_serial_top_k(batch_size):
+    ru = _universe()
+    config = build_config(batch_size=batch_size)
+    serial_top, serial_processed = _serial_top(ru, config, k_num=2, k_den=2, top_k=7, disallow_overlap=True)
+
+    ranker = TopKRanker(7)
+    processed = score_ratio_tiles(
+        ru=ru,
+        engine=build_app(config).engine,
+        tiles=ru.scan_blocks(k_num=2, k_den=2, block_num=4, block_den=6, disallow_overlap=True),
+        ranker=ranker,
+        returns_mode=config.data.returns_mode,
+        vol_unit=config.volatility_estimator.params.volatility_unit,
+        batch_size=config.engine.batch_size,
+    )
+
+    assert processed == serial_processed
+    assert ranker.items_sorted() == serial_top
+
+
+def _select(ru, config, jobs, **kwargs):
+    return _select_top_k_jobs(
+        ru=ru,
+        engine=build_app(config).engine,
+        returns_mode=config.data.returns_mode,
+        vol_unit=config.volatility_estimator.params.volatility_unit,
+        k_num=2,
+        k_den=2,
+        max_jobs=None,
+        top_k=6,
+        jobs=jobs,
+        batch_size=config.engine.batch_size,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("batch_size", [None, 16])
+def test_resumed_scan_matches_uninterrupted_scan(tmp_path, batch_size):
+    ru = _universe()
+    config = build_config(batch_size=batch_size)
+    jobs = list(ru.iter_ratio_jobs(k_num=2, k_den=2, disallow_overlap=True))
+    expected = _select(ru, config, jobs)
+
+    # first run: checkpoint every block, "SIGTERM" once 40 jobs are done
+    ranker = TopKRanker(6)
+
+    def save(position, processed):
+        checkpoint = ScanCheckpoint(scan_key="k", position=position, processed=processed, entries=ranker.entries())
+        store_scan_checkpoint(tmp_path, "jobs", checkpoint)
+
+    checkpointer = ScanCheckpointer(save, interval_s=1.0, clock=iter(range(0, 10_000, 2)).__next__)
+
+    def on_progress(position, processed):
+        if position >= 40:
+            checkpointer.request_stop()
+        return checkpointer(position, processed)
+
+    _select(ru, config, jobs, ranker=ranker, on_progress=on_progress)
+    assert checkpointer.stop_requested
+
+    resume = load_scan_checkpoint(tmp_path, "jobs", scan_key="k")
+    assert resume is not None
+    assert 40 <= resume.position < len(jobs)
+
+    ranker = TopKRanker(6)
+    for item, order in resume.entries:
+        ranker.consider(job=item.job, score=item.score, order=order)
+    resumed = _select(ru, config, jobs, ranker=ranker, start=resume.position, processed=resume.processed)
+
+    assert resumed == expected
+
+
+@pytest.mark.parametrize("batch_size", [None, 16])
+def test_job_table_scan_matches_job_list(batch_size, monkeypatch):
+    ru = _universe()
+    config = build_config(batch_size=batch_size)
+    jobs = list(ru.iter_ratio_jobs(k_num=2, k_den=2, disallow_overlap=True))
+    expected = _select(ru, config, jobs)
+
+    table = ru.job_table(k_num=2, k_den=2, disallow_overlap=True)
+    built = []
+    monkeypatch.setattr(RatioJobTable, "__getitem__", _record_jobs(RatioJobTable.__getitem__, built))
+    assert _select(ru, config, table) == expected
+    # only jobs that entered the heap became RatioJob objects
+    assert 0 < len(built) < len(table) // 2
+    assert _select(ru, config, table, ranker=TopKRanker(6), start=30) == _select(ru, config, jobs[30:])
+
+
+def _record_jobs(getitem, built):
+    def wrapper(self, index):
+        item = getitem(self, index)
+        if isinstance(item, RatioJob):
+            built.append(item)
+        return item
+
+    return wrapper
+
+
+def test_scan_checkpoint_ignored_for_other_scan_key(tmp_path):
+    job = RatioJob(k_num=2, k_den=2, num_id=3, den_id=9)
+    ranker = TopKRanker(2)
+    ranker.consider(job=job, score=0.5, order=17)
+    store_scan_checkpoint(tmp_path, "jobs", ScanCheckpoint(scan_key="a", position=18, processed=12, entries=ranker.entries()))
+
+    assert load_scan_checkpoint(tmp_path, "jobs", scan_key="b") is None
+    loaded = load_scan_checkpoint(tmp_path, "jobs", scan_key="a")
+    assert (loaded.position, loaded.processed) == (18, 12)
+    assert [(item.job, item.score, order) for item, order in loaded.entries] == [(job, 0.5, 17)]
+
+
+def test_scan_checkpointer_saves_on_interval_and_stop():
+    saved = []
+    now = [0.0]
+    checkpointer = ScanCheckpointer(lambda *state: saved.append(state), interval_s=10.0, clock=lambda: now[0])
+
+    assert checkpointer(5, 4)
+    now[0] = 12.0
+    assert checkpointer(9, 7)
+    now[0] = 13.0
+    checkpointer.request_stop()
+    assert not checkpointer(11, 8)
+    assert saved == [(9, 7), (11, 8)]
+
+
+def test_scan_checkpoints_are_off_by_default():
+    assert build_config().ratio_universe.checkpoint_interval_s is None
+
+
+@pytest.mark.parametrize("batch_size", [None, 16])
+def test_early_abandon_keeps_serial_top_k(batch_size):
+    ru = _universe(N=8)
+    serial_top, serial_processed = _serial_top(ru, build_config(batch_size=batch_size), k_num=2, k_den=2, top_k=5)
+
+    config = build_config(batch_size=batch_size, early_abandon=True)
+    jobs_kwargs = dict(k_num=2, k_den=2, block_num=5, block_den=3)
+    for tiles in (False, True):
+        ranker, pruned = TopKRanker(5), PruneStats()
+        common = dict(
+            ru=ru,
+            engine=build_app(config).engine,
+            ranker=ranker,
+            returns_mode=config.data.returns_mode,
+            vol_unit=config.volatility_estimator.params.volatility_unit,
+            batch_size=batch_size,
+            prune_stats=pruned,
+        )
+        if tiles:
+            processed = score_ratio_tiles(tiles=ru.scan_blocks(**jobs_kwargs), **common)
+        else:
+            processed = score_ratio_jobs(jobs=ru.iter_ratio_jobs(k_num=2, k_den=2), **common)
+
+        assert processed == serial_processed
+        assert ranker.items_sorted() == serial_top
+        assert pruned.jobs > 0 and pruned.bars > 0
+
+
+@pytest.mark.parametrize("batch_size", [None, 16])
+def test_event_driven_scan_matches_serial_top_k(batch_size):
+    ru = _universe(N=8)
+    serial = _serial_top(ru, build_config(), k_num=2, k_den=2, top_k=5)
+
+    assert _serial_top(ru, build_config(batch_size=batch_size, event_driven=True), k_num=2, k_den=2, top_k=5) == serial
+
+
+def test_parallel_scan_maps_memmap_panel(tmp_path):
+    panel = _universe()
+    write_mmap_panel(tmp_path, AlignedPanel(dates=panel.dates, symbols=panel.symbols, values=panel._X))
+    ru = RatioUniverse(open_mmap_panel(tmp_path), normalize_by_first=False)
+    config = build_config(batch_size=8)
+
+    serial_top, serial_processed = _serial_top(ru, config, k_num=2, k_den=2, top_k=7)
+    result = scan_top_k_parallel(
+        ru, config, k_num=2, k_den=2, top_k=7, workers=2, n_shards=3, mp_context=multiprocessing.get_context("spawn")
+    )
+
+    assert result.processed_jobs == serial_processed
+    assert result.top == serial_top
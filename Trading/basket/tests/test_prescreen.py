@@ -0,0 +1,172 @@
+import numpy as np
+import pytest
+
+from _helpers import build_scan_config, make_universe, scan_config_dict
+from mrscore.app.composition_root import build_app
+from mrscore.app.scan import PruneStats, job_order, make_prescreen, score_ratio_jobs, score_ratio_tiles
+from mrscore.config.loader import parse_root_config
+from mrscore.core.diagnostics import ScanStats
+from mrscore.core.prescreen import PRESCREEN_METRICS, RatioPrescreen, prescreen_scores, ratio_statistics
+from mrscore.core.ranking import TopKRanker
+from mrscore.core.ratio_universe import RatioUniverse
+from mrscore.utils.errors import ConfigValidationError
+
+
+def _series(T: int = 400, seed: int = 0) -> np.ndarray:
+    """Rows: random walk, AR(1) with phi=0.8, linear trend with a little noise."""
+    rng = np.random.default_rng(seed)
+    walk = np.cumsum(rng.normal(0.0, 0.01, size=T))
+    ar = np.zeros(T)
+    for t in range(1, T):
+        ar[t] = 0.8 * ar[t - 1] + rng.normal(0.0, 0.01)
+    trend = np.linspace(0.0, 1.0, T) + rng.normal(0.0, 0.001, size=T)
+    return np.exp(np.vstack([walk, ar, trend]))
+
+
+def _universe() -> RatioUniverse:
+    return make_universe(seed=4)
+
+
+def test_statistics_separate_reverting_from_trending_series():
+    stats = ratio_statistics(_series())
+    walk, ar, trend = 0, 1, 2
+    assert stats["autocorr"][ar] < 0.9 < min(stats["autocorr"][walk], stats["autocorr"][trend])
+    assert stats["half_life"][ar] < 10.0 < stats["half_life"][walk]
+    assert stats["hurst"][ar] < 0.3 < stats["hurst"][walk]
+    assert stats["zero_crossings"][ar] > 3 * max(stats["zero_crossings"][walk], stats["zero_crossings"][trend])
+    for metric in PRESCREEN_METRICS:
+        scores = prescreen_scores(_series(), metric)
+        assert scores[ar] == scores.max()
+
+
+def test_statistics_mark_unusable_rows_nan():
+    prices = np.vstack([_series()[:2], np.ones(400)])
+    prices[0, 50] = np.nan
+    stats = ratio_statistics(prices)
+    for values in stats.values():
+        assert np.isnan(values[0]) and np.isnan(values[2]) and np.isfinite(values[1])
+    assert np.isnan(prescreen_scores(prices)[[0, 2]]).all()
+    assert all(np.isnan(v).all() for v in ratio_statistics(_series()[:, :2]).values())
+    with pytest.raises(ValueError, match="2D"):
+        ratio_statistics(np.ones(10))
+
+
+def test_select_keeps_best_fraction_in_row_order():
+    prices = np.vstack([_series(seed=s) for s in range(4)])  # 12 rows, every third one reverting
+    prices[4, 10] = np.nan
+    # ceil(0.25 * 12) = 3 rows: the reverting ones, except row 4 whose NaN statistics rank last
+    assert RatioPrescreen(0.25, metric="half_life").select(prices).tolist() == [1, 7, 10]
+
+    # equal statistics keep the earlier rows
+    same = np.repeat(_series()[1:2], 5, axis=0)
+    assert RatioPrescreen(0.4).select(same).tolist() == [0, 1]
+    assert RatioPrescreen(1.0).select(prices).tolist() == list(range(12))
+    assert RatioPrescreen(0.01).keep_count(12) == 1
+
+    # default blocks: at least 1024 jobs whose survivors fill whole engine batches
+    for fraction in (0.5, 0.3, 0.1, 0.07):
+        for rows in (1, 8, 256):
+            block = RatioPrescreen(fraction).block_for(rows)
+            assert block >= 1000 and RatioPrescreen(fraction).keep_count(block) % rows == 0
+    assert RatioPrescreen(0.1, block=50).block_for(256) == 50
+
+    for kwargs in ({"fraction": 0.0}, {"fraction": 1.5}, {"fraction": 0.5, "block": 0}, {"fraction": 0.5, "metric": "adf"}):
+        with pytest.raises(ValueError):
+            RatioPrescreen(**kwargs)
+
+
+def _reference(ru, config, prescreen, blocks, top_k=5):
+    """Engine top-k over the jobs each block's prescreen keeps."""
+    engine = build_app(config).engine
+    ranker = TopKRanker(top_k)
+    kept = 0
+    for jobs in blocks:
+        prices = np.vstack([ru.compute_ratio_series(job) for job in jobs])
+        for m in prescreen.select(prices):
+            kept += 1
+            result = engine.run(prices=prices[m], returns=np.diff(np.log(prices[m])))
+            if np.isfinite(result.score):
+                ranker.consider(job=jobs[m], score=result.score, order=job_order(ru, jobs[m]))
+    return [(r.job, r.score) for r in ranker.items_sorted()], kept
+
+
+def _scan(ru, config, prescreen, *, jobs=None, tiles=None, pruned=None, stats=None, on_progress=None):
+    ranker = TopKRanker(5)
+    common = dict(
+        ru=ru,
+        engine=build_app(config).engine,
+        ranker=ranker,
+        returns_mode="log",
+        vol_unit="returns",
+        batch_size=config.engine.batch_size,
+        prescreen=prescreen,
+        prune_stats=pruned,
+        scan_stats=stats,
+    )
+    if tiles is not None:
+        score_ratio_tiles(tiles=tiles, **common)
+    else:
+        score_ratio_jobs(jobs=jobs, on_progress=on_progress, **common)
+    return [(r.job, r.score) for r in ranker.items_sorted()]
+
+
+@pytest.mark.parametrize("batch_size", [None, 4])
+@pytest.mark.parametrize("table", [False, True])
+def test_job_scan_scores_only_screened_jobs(batch_size, table):
+    ru = _universe()
+    config = build_scan_config(batch_size=batch_size)
+    prescreen = RatioPrescreen(0.3, metric="composite", block=10)
+    jobs = list(ru.iter_ratio_jobs(k_num=1, k_den=1))
+    pruned, stats = PruneStats(), ScanStats()
+    positions = []
+
+    def progress(consumed, processed):
+        positions.append(consumed)
+        return True
+
+    top = _scan(
+        ru,
+        config,
+        prescreen,
+        jobs=ru.job_table(k_num=1, k_den=1) if table else iter(jobs),
+        pruned=pruned,
+        stats=stats,
+        on_progress=progress,
+    )
+    expected, kept = _reference(ru, config, prescreen, [jobs[b : b + 10] for b in range(0, len(jobs), 10)])
+    assert top == expected
+    assert pruned.screened == len(jobs) - kept > 0
+    assert stats.counters["screened_out"] == pruned.screened
+    assert stats.counters["jobs"] == kept
+    assert positions == [min(b + 10, len(jobs)) for b in range(0, len(jobs), 10)]
+
+
+def test_tile_scan_screens_each_tile():
+    ru = _universe()
+    config = build_scan_config(batch_size=4)
+    prescreen = RatioPrescreen(0.5, metric="hurst")
+    blocks = [list(tile.jobs()) for tile in ru.scan_blocks(k_num=1, k_den=1, block_num=3, block_den=4)]
+    pruned = PruneStats()
+
+    top = _scan(ru, config, prescreen, tiles=ru.scan_blocks(k_num=1, k_den=1, block_num=3, block_den=4), pruned=pruned)
+    expected, kept = _reference(ru, config, prescreen, blocks)
+    assert top == expected
+    assert pruned.screened == sum(map(len, blocks)) - kept > 0
+
+
+def test_full_fraction_matches_unscreened_scan():
+    ru = _universe()
+    config = build_scan_config(batch_size=4)
+    jobs = list(ru.iter_ratio_jobs(k_num=1, k_den=1))
+    assert _scan(ru, config, RatioPrescreen(1.0, block=7), jobs=jobs) == _scan(ru, config, None, jobs=jobs)
+
+
+def test_prescreen_config():
+    assert make_prescreen(build_scan_config()) is None
+    prescreen = make_prescreen(build_scan_config(prescreen_fraction=0.1, prescreen_metric="hurst", prescreen_block=256))
+    assert (prescreen.fraction, prescreen.metric, prescreen.block) == (0.1, "hurst", 256)
+    assert make_prescreen(build_scan_config(prescreen_fraction=0.2)).metric == "composite"
+
+    for bad in ({"prescreen_fraction": 0.0}, {"prescreen_fraction": 1.1}, {"prescreen_block": 0}, {"prescreen_metric": "adf"}):
+        with pytest.raises(ConfigValidationError):
+            parse_root_config(scan_config_dict(**bad))
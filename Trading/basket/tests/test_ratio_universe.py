@@ -0,0 +1,215 @@
+import numpy as np
+import pytest
+
+from mrscore.core.ratio_universe import AlignedPanel, RatioJob, RatioJobTable, RatioUniverse
+
+
+def _random_universe(N: int = 8, T: int = 120, **kwargs) -> RatioUniverse:
+    rng = np.random.default_rng(3)
+    values = np.exp(np.cumsum(rng.normal(0.0, 0.02, size=(T, N)), axis=0))
+    dates = np.arange(T).astype("datetime64[D]")
+    return RatioUniverse(AlignedPanel(dates=dates, symbols=[f"S{i}" for i in range(N)], values=values), **kwargs)
+
+
+def _universe(N: int) -> RatioUniverse:
+    dates = np.arange(3).astype("datetime64[D]")
+    return RatioUniverse(
+        AlignedPanel(dates=dates, symbols=[f"S{i}" for i in range(N)], values=np.ones((3, N))),
+        normalize_by_first=False,
+    )
+
+
+@pytest.mark.parametrize(
+    "k_num,k_den,unordered_if_equal_k",
+    [(1, 1, True), (2, 2, True), (3, 3, True), (2, 2, False), (1, 2, True), (3, 1, False)],
+)
+def test_job_at_and_index_of_match_iteration_order(k_num, k_den, unordered_if_equal_k):
+    ru = _universe(7)
+    jobs = list(ru.iter_ratio_jobs(k_num=k_num, k_den=k_den, unordered_if_equal_k=unordered_if_equal_k))
+
+    assert len(jobs) == ru.job_count(k_num=k_num, k_den=k_den, unordered_if_equal_k=unordered_if_equal_k)
+    for index, job in enumerate(jobs):
+        assert ru.job_at(index, k_num=k_num, k_den=k_den, unordered_if_equal_k=unordered_if_equal_k) == job
+        assert ru.index_of(job, unordered_if_equal_k=unordered_if_equal_k) == index
+
+
+def test_job_at_round_trips_on_large_unordered_layout():
+    ru = _universe(40)
+    total = ru.job_count(k_num=3, k_den=3)
+    assert total == 48_802_260
+
+    rng = np.random.default_rng(0)
+    for index in [0, 1, total - 2, total - 1, *rng.integers(0, total, size=2000).tolist()]:
+        job = ru.job_at(index, k_num=3, k_den=3)
+        assert job.num_id < job.den_id
+        assert ru.index_of(job) == index
+
+
+@pytest.mark.parametrize("disallow_overlap", [False, True])
+def test_iter_ratio_jobs_start_stop_slices_sequence(disallow_overlap):
+    ru = _universe(6)
+    full = list(ru.iter_ratio_jobs(k_num=2, k_den=2, disallow_overlap=disallow_overlap))
+    positions = [ru.index_of(job) for job in full]
+
+    for start, stop in [(0, 0), (0, 7), (13, 14), (13, 60), (40, 105), (104, 200)]:
+        sliced = list(
+            ru.iter_ratio_jobs(k_num=2, k_den=2, disallow_overlap=disallow_overlap, start=start, stop=stop)
+        )
+        assert sliced == [job for job, pos in zip(full, positions) if start <= pos < stop]
+
+
+def test_job_index_validation():
+    ru = _universe(5)
+    total = ru.job_count(k_num=2, k_den=2)
+    with pytest.raises(ValueError, match="index must be in"):
+        ru.job_at(total, k_num=2, k_den=2)
+    with pytest.raises(ValueError, match="num_id < den_id"):
+        ru.index_of(RatioJob(k_num=2, k_den=2, num_id=3, den_id=1))
+    with pytest.raises(ValueError, match="out of range"):
+        ru.index_of(RatioJob(k_num=2, k_den=2, num_id=0, den_id=total))
+
+
+@pytest.mark.parametrize("max_bytes", [None, 1024])
+@pytest.mark.parametrize("k_num,k_den", [(3, 3), (2, 3)])
+def test_basket_cache_matches_column_gather(k_num, k_den, max_bytes):
+    ru = _random_universe(basket_cache=True, basket_cache_max_bytes=max_bytes)
+    gathered = np.empty(ru._X.shape[0])
+    cached = np.empty(ru._X.shape[0])
+
+    for job in ru.iter_ratio_jobs(k_num=k_num, k_den=k_den, max_jobs=500):
+        ru.compute_ratio_series_into(gathered, job, use_cache=False)
+        ru.compute_ratio_series_into(cached, job)
+        assert np.array_equal(gathered, cached)
+
+    stats = ru.basket_cache_stats()
+    assert stats.hits == stats.misses == 1000
+    assert stats.hit_rate == 0.5
+    assert stats.ks == tuple(sorted({k_num, k_den}))
+    nbytes = sum(ru.basket_sums(k).nbytes for k in stats.ks)
+    if max_bytes is None:
+        assert (stats.memory_bytes, stats.mapped_bytes) == (nbytes, 0)
+    else:
+        assert (stats.memory_bytes, stats.mapped_bytes) == (0, nbytes)
+
+
+def test_basket_cache_switchable_per_scan():
+    ru = _random_universe()
+    seen = []
+
+    def process(job, series) -> bool:
+        seen.append(series.copy())
+        return True
+
+    ru.scan(k_num=2, k_den=2, process=process, max_jobs=20, basket_cache=True)
+    ru.scan(k_num=2, k_den=2, process=process, max_jobs=20)
+
+    stats = ru.basket_cache_stats()
+    assert not stats.enabled
+    assert (stats.hits, stats.misses) == (40, 40)
+    assert all(np.array_equal(a, b) for a, b in zip(seen[:20], seen[20:]))
+
+
+@pytest.mark.parametrize(
+    "k_num,k_den,unordered_if_equal_k,disallow_overlap",
+    [(2, 2, True, False), (2, 2, True, True), (2, 2, False, True), (1, 3, True, True)],
+)
+@pytest.mark.parametrize("block_num,block_den,use_cache", [(5, 7, False), (64, 64, True)])
+def test_scan_blocks_covers_jobs_with_identical_series(
+    k_num, k_den, unordered_if_equal_k, disallow_overlap, block_num, block_den, use_cache
+):
+    ru = _random_universe()
+    kwargs = {"unordered_if_equal_k": unordered_if_equal_k, "disallow_overlap": disallow_overlap}
+    expected = {
+        (job.num_id, job.den_id): ru.compute_ratio_series(job)
+        for job in ru.iter_ratio_jobs(k_num=k_num, k_den=k_den, **kwargs)
+    }
+
+    seen = {}
+    for tile in ru.scan_blocks(
+        k_num=k_num, k_den=k_den, block_num=block_num, block_den=block_den, use_cache=use_cache, **kwargs
+    ):
+        assert tile.values.shape == (ru._X.shape[0], tile.size)
+        for m, job in enumerate(tile.jobs()):
+            assert (job.num_id, job.den_id) not in seen
+            seen[(job.num_id, job.den_id)] = tile.values[:, m].copy()
+
+    assert seen.keys() == expected.keys()
+    assert all(np.array_equal(seen[key], expected[key]) for key in expected)
+
+
+def _brute_force_disjoint_pairs(N, k_num, k_den, unordered):
+    from itertools import combinations
+
+    num = [set(c) for c in combinations(range(N), k_num)]
+    den = [set(c) for c in combinations(range(N), k_den)]
+    return [
+        (i, j)
+        for i in range(len(num))
+        for j in range(i + 1 if unordered else 0, len(den))
+        if not num[i] & den[j]
+    ]
+
+
+def test_basket_masks_encode_symbols():
+    ru = _universe(70)
+    lib = ru.get_basket_library(2)
+
+    assert lib.masks.shape == (lib.size, 2)
+    b = int(np.flatnonzero((lib.baskets[:, 0] == 3) & (lib.baskets[:, 1] == 66))[0])
+    assert lib.masks[b].tolist() == [1 << 3, 1 << 2]
+
+
+@pytest.mark.parametrize(
+    "N,k_num,k_den,unordered_if_equal_k",
+    [(7, 2, 2, True), (7, 2, 2, False), (7, 1, 3, True), (70, 1, 2, True), (130, 2, 1, False)],
+)
+def test_overlap_filter_and_exact_count(N, k_num, k_den, unordered_if_equal_k):
+    ru = _universe(N)
+    expected = _brute_force_disjoint_pairs(N, k_num, k_den, k_num == k_den and unordered_if_equal_k)
+    kwargs = {"unordered_if_equal_k": unordered_if_equal_k, "disallow_overlap": True}
+
+    jobs = [(j.num_id, j.den_id) for j in ru.iter_ratio_jobs(k_num=k_num, k_den=k_den, **kwargs)]
+
+    assert jobs == expected
+    assert ru.estimate_ratio_count(k_num=k_num, k_den=k_den, **kwargs) == len(expected)
+
+
+@pytest.mark.parametrize(
+    "k_num,k_den,unordered_if_equal_k,disallow_overlap,max_jobs",
+    [
+        (2, 2, True, False, None),
+        (2, 2, True, True, None),
+        (2, 2, False, True, 37),
+        (1, 3, True, True, None),
+        (3, 1, False, False, 500),
+    ],
+)
+def test_job_table_matches_iteration(k_num, k_den, unordered_if_equal_k, disallow_overlap, max_jobs):
+    ru = _universe(7)
+    kwargs = dict(
+        k_num=k_num,
+        k_den=k_den,
+        unordered_if_equal_k=unordered_if_equal_k,
+        disallow_overlap=disallow_overlap,
+        max_jobs=max_jobs,
+    )
+    table = ru.job_table(**kwargs)
+
+    assert table.num_ids.dtype == np.int32
+    assert list(table) == list(ru.iter_ratio_jobs(**kwargs))
+    assert list(table[5:9]) == list(table)[5:9]
+    lib_den = ru.get_basket_library(k_den)
+    assert table.orders(lib_den.size).tolist() == [j.num_id * lib_den.size + j.den_id for j in table]
+
+
+def test_compute_ratio_block_matches_per_job_series():
+    ru = _random_universe(basket_cache=True)
+    table = ru.job_table(k_num=2, k_den=1, max_jobs=40)[10:30]
+    for use_cache in (False, True):
+        out = np.empty((len(table), ru._X.shape[0]))
+        ru.compute_ratio_block_into(out, table, use_cache=use_cache)
+        expected = np.stack([ru.compute_ratio_series(job, use_cache=use_cache) for job in table])
+        assert np.array_equal(out, expected)
+
+    with pytest.raises(ValueError, match="share k_num"):
+        RatioJobTable.from_jobs([RatioJob(1, 1, 0, 1), RatioJob(2, 1, 0, 1)])
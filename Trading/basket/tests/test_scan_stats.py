@@ -0,0 +1,168 @@
+import json
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from _helpers import make_universe, scan_config_dict
+from mrscore.app.composition_root import build_app
+from mrscore.app.scan import make_scan_stats, scan_top_k_parallel, score_ratio_jobs, score_ratio_tiles
+from mrscore.config.loader import parse_root_config
+from mrscore.config.models import RootConfig
+from mrscore.core.diagnostics import SCAN_STAGES, ScanStats
+from mrscore.core.ranking import TopKRanker
+from mrscore.core.ratio_universe import RatioUniverse
+from mrscore.utils.errors import ConfigValidationError
+
+
+def _config_dict(**fields) -> dict:
+    fields.setdefault("k_num", 2)
+    fields.setdefault("k_den", 2)
+    return scan_config_dict(**fields)
+
+
+def build_config(**fields) -> RootConfig:
+    return RootConfig.model_validate(_config_dict(**fields))
+
+
+def _universe() -> RatioUniverse:
+    # two constant symbols: their ratio is flat, has no events and scores NaN
+    return make_universe(7, seed=5, constant={1: 1.0, 2: 2.0})
+
+
+def _scan(ru, config, *, stats=None, tiles=False, top_k=5):
+    ranker = TopKRanker(top_k)
+    engine = build_app(config).engine
+    common = dict(
+        ru=ru,
+        engine=engine,
+        ranker=ranker,
+        returns_mode=config.data.returns_mode,
+        vol_unit=config.volatility_estimator.params.volatility_unit,
+        batch_size=config.engine.batch_size,
+        scan_stats=stats,
+    )
+    if tiles:
+        processed = score_ratio_tiles(tiles=ru.scan_blocks(k_num=1, k_den=1, block_num=3, block_den=4), **common)
+    else:
+        processed = score_ratio_jobs(jobs=ru.iter_ratio_jobs(k_num=1, k_den=1), **common)
+    assert engine.scoring_timer is None
+    return ranker.items_sorted(), processed
+
+
+def _reference_counts(ru, config) -> dict:
+    engine = build_app(config).engine
+    counts = dict.fromkeys(("jobs", "nan_scores", "events_opened", "events_reverted", "events_failed", "events_expired"), 0)
+    for job in ru.iter_ratio_jobs(k_num=1, k_den=1):
+        prices = ru.compute_ratio_series(job)
+        result = engine.run(prices=prices, returns=np.diff(np.log(prices)))
+        counts["jobs"] += 1
+        counts["nan_scores"] += not np.isfinite(result.score)
+        counts["events_opened"] += result.total_events
+        counts["events_reverted"] += result.reverted_events
+        counts["events_failed"] += result.failed_events
+        counts["events_expired"] += result.expired_events
+    return counts
+
+
+@pytest.mark.parametrize(
+    "engine_kwargs,tiles",
+    [({}, False), ({"batch_size": 8}, False), ({"event_driven": True}, False), ({}, True), ({"batch_size": 8}, True)],
+)
+def test_scan_stats_counts_without_changing_the_scan(engine_kwargs, tiles):
+    ru = _universe()
+    config = build_config(**engine_kwargs)
+    stats = ScanStats(sample_every=4)
+
+    assert _scan(ru, config, stats=stats, tiles=tiles) == _scan(ru, config, tiles=tiles)
+
+    counters = stats.counters
+    expected = _reference_counts(ru, config)
+    assert {name: counters[name] for name in expected} == expected
+    assert counters["nan_scores"] > 0
+    assert counters["events_opened"] == (
+        counters["events_reverted"] + counters["events_failed"] + counters["events_expired"]
+    )
+    finite = counters["jobs"] - counters["nan_scores"]
+    assert counters["heap_inserts"] == 5
+    assert counters["heap_inserts"] + counters["heap_replacements"] + counters["heap_rejections"] == finite
+    assert counters["heap_replacements"] > 0
+
+    report = stats.to_dict()
+    for stage in SCAN_STAGES:
+        row = report["stages"][stage]
+        assert row["sampled_jobs"] > 0
+        assert row["seconds_per_job"] >= 0.0
+        assert row["estimated_seconds"] >= 0.0
+    if not tiles:
+        # one sampled job in every four; under batch_size the whole 8-job block holding it
+        assert report["stages"]["ratio"]["sampled_jobs"] == -(-counters["jobs"] // 4)
+        if config.engine.batch_size is None:
+            assert report["stages"]["engine"]["sampled_jobs"] == -(-counters["jobs"] // 4)
+
+
+def test_due_samples_one_job_in_every_n():
+    stats = ScanStats(sample_every=10)
+    assert [stats.due("engine") for _ in range(25)].count(True) == 3
+    blocks = ScanStats(sample_every=10)
+    assert [blocks.due("engine", 4) for _ in range(6)] == [True, False, True, False, False, True]
+    with pytest.raises(ValueError, match="sample_every"):
+        ScanStats(sample_every=0)
+
+
+def test_scan_stats_add_and_reports(tmp_path):
+    ru = _universe()
+    config = build_config()
+    left, right, total = ScanStats(2), ScanStats(2), ScanStats(2)
+    jobs = list(ru.iter_ratio_jobs(k_num=1, k_den=1))
+    engine = build_app(config).engine
+    common = dict(ru=ru, engine=engine, returns_mode="log", vol_unit="returns")
+    score_ratio_jobs(jobs=jobs[:9], ranker=TopKRanker(5), scan_stats=left, **common)
+    score_ratio_jobs(jobs=jobs[9:], ranker=TopKRanker(5), scan_stats=right, **common)
+    score_ratio_jobs(jobs=jobs, ranker=TopKRanker(5), scan_stats=total, **common)
+    left.add(right)
+    for name in ("jobs", "nan_scores", "events_opened", "events_reverted", "events_failed", "events_expired"):
+        assert left.counters[name] == total.counters[name]
+
+    report = json.loads(left.write_json(tmp_path / "out" / "stats.json").read_text())
+    assert report["sample_every"] == 2
+    assert report["counters"] == left.counters
+    assert set(report["stages"]) == set(SCAN_STAGES)
+
+    text = left.write_prometheus(tmp_path / "mrscore.prom").read_text()
+    assert f"mrscore_scan_jobs_total {left.counters['jobs']}" in text
+    assert "# TYPE mrscore_scan_stage_seconds_per_job gauge" in text
+    assert 'mrscore_scan_stage_sampled_jobs_total{stage="engine"}' in text
+    assert not (tmp_path / "mrscore.prom.tmp").exists()
+    assert "NaN" in ScanStats().prometheus_text()
+
+
+def test_parallel_scan_sums_shard_stats():
+    ru = _universe()
+    config = build_config(scan_stats=True, scan_stats_sample_every=3)
+    result = scan_top_k_parallel(
+        ru,
+        config,
+        k_num=1,
+        k_den=1,
+        top_k=5,
+        workers=2,
+        n_shards=3,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    expected = _reference_counts(ru, config)
+    assert result.stats is not None
+    assert {name: result.stats.counters[name] for name in expected} == expected
+    assert result.stats.to_dict()["stages"]["engine"]["sampled_jobs"] > 0
+
+    assert scan_top_k_parallel(ru, build_config(), k_num=1, k_den=1, top_k=5, workers=1).stats is None
+
+
+def test_scan_stats_config():
+    assert make_scan_stats(build_config()) is None
+    stats = make_scan_stats(build_config(scan_stats=True, scan_stats_sample_every=7))
+    assert stats is not None and stats.sample_every == 7
+    with pytest.raises(ConfigValidationError, match="scan_stats"):
+        parse_root_config(_config_dict(scan_stats_json="stats.json"))
+    with pytest.raises(ConfigValidationError):
+        parse_root_config(_config_dict(scan_stats=True, scan_stats_sample_every=0))
@@ -1,7 +1,10 @@
+import math
+
 import numpy as np
+import pytest
 
 from mrscore.config.models import DiagnosticsConfig, ScoringConfig
-from mrscore.core.results import Direction, EventStatus, EventSummary
+from mrscore.core.results import Direction, EventStatus, EventSummary, EventTable
 from mrscore.core.scoring import score_events
 
 
@@ -70,3 +73,91 @@ def test_score_events_empty_events_nan_when_not_recording():
     assert np.isnan(result.by_direction[Direction.DOWN.value])
     assert result.by_volatility_bucket is not None
     assert np.isnan(result.by_volatility_bucket["bucket_0"])
+
+
+def _random_events(n: int, seed: int, dates=None) -> list[EventSummary]:
+    rng = np.random.default_rng(seed)
+    events = []
+    for i in range(n):
+        start = int(rng.integers(0, 50))
+        end = start + int(rng.integers(1, 20))
+        vol = float(rng.uniform(0.005, 0.02)) if rng.random() > 0.1 else float("nan")
+        events.append(
+            EventSummary(
+                direction=Direction.UP if rng.random() < 0.5 else Direction.DOWN,
+                status=list(EventStatus)[int(rng.integers(0, 3))],
+                start_index=start,
+                end_index=end,
+                duration=end - start,
+                start_price=(0.0 if i == 3 else float(rng.uniform(0.5, 2.0))),
+                start_mean=float(rng.uniform(0.5, 2.0)),
+                start_volatility=vol,
+                start_zscore=float(rng.normal()),
+                max_abs_zscore=float(rng.uniform(1.5, 4.0)),
+                end_price=float(rng.uniform(0.5, 2.0)),
+                start_time=(dates[start] if dates is not None else None),
+                end_time=(dates[end] if dates is not None else None),
+            )
+        )
+    return events
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, float) and isinstance(b, float):
+        return a == b or (math.isnan(a) and math.isnan(b))
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a)
+    return a == b
+
+
+@pytest.mark.parametrize("metric", ["reversion_rate", "direction", "volatility_bucket", "sharpe", "weighted_average"])
+@pytest.mark.parametrize("n", [0, 1, 2, 40])
+def test_score_events_table_matches_summaries(metric, n):
+    scoring = ScoringConfig(
+        by_direction=True,
+        by_volatility_bucket=True,
+        volatility_buckets=4,
+        record_empty_scores=(n == 1),
+        compute_sharpe=True,
+        score_metric=metric,
+    )
+    diagnostics = DiagnosticsConfig(enabled=True)
+    dates = np.arange(80).astype("datetime64[D]")
+    events = _random_events(n, seed=n, dates=dates)
+
+    ref = score_events(events=events, scoring=scoring, diagnostics=diagnostics)
+    fast = score_events(events=EventTable.from_summaries(events), scoring=scoring, diagnostics=diagnostics, dates=dates)
+
+    for name in ("score", "sharpe", "total_events", "reverted_events", "failed_events", "expired_events"):
+        assert _same(getattr(fast, name), getattr(ref, name))
+    assert _same(fast.by_direction, ref.by_direction)
+    assert _same(fast.by_volatility_bucket, ref.by_volatility_bucket)
+    # repr: NaN volatilities compare equal
+    assert repr(fast.events) == repr(events)
+
+
+def test_event_table_round_trip_and_slices():
+    events = _random_events(12, seed=3)
+    table = EventTable.from_summaries(events)
+
+    assert len(table) == 12
+    assert table.direction.dtype == np.int8 and table.status.dtype == np.int8
+    assert repr(table.summaries()) == repr(events)
+    assert np.array_equal(table.duration, [e.duration for e in events])
+    assert repr(table.take(slice(4, 9)).summaries()) == repr(events[4:9])
+    assert repr(table.take(np.array([11, 0])).summaries()) == repr([events[11], events[0]])
+    assert len(EventTable.empty()) == 0 and EventTable.from_rows([]).summaries() == []
+    assert [EventStatus.from_code(s.code) for s in EventStatus] == list(EventStatus)
+
+
+def test_score_events_builds_summaries_only_with_diagnostics(monkeypatch):
+    scoring = ScoringConfig(by_direction=True, by_volatility_bucket=False, record_empty_scores=False)
+    table = EventTable.from_summaries(_random_events(10, seed=1))
+
+    def fail(self, dates=None):
+        raise AssertionError("EventSummary objects built with diagnostics disabled")
+
+    monkeypatch.setattr(EventTable, "summaries", fail)
+    result = score_events(events=table, scoring=scoring, diagnostics=DiagnosticsConfig(enabled=False))
+    assert result.total_events == 10
+    assert result.events is None
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from _helpers import config_dict, log_returns, ratio_like_series
+from mrscore.app.composition_root import build_app
+from mrscore.app.sweep import expand_grid, run_sweep
+from mrscore.config.models import RootConfig
+from mrscore.utils.errors import ConfigValidationError
+
+
+def build_config(*, scoring=None, **engine) -> RootConfig:
+    return RootConfig.model_validate(
+        config_dict(
+            mean="ema",
+            vol="ewma",
+            scoring={"score_metric": "weighted_average", **(scoring or {})},
+            diagnostics={"enabled": False},
+            **engine,
+        )
+    )
+
+
+def _series(B: int, T: int, seed: int = 11) -> np.ndarray:
+    return ratio_like_series(B, T, seed)
+
+
+def _reference(config: RootConfig, prices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    engine = build_app(config).engine
+    returns = log_returns(prices)
+    results = [engine.run(prices=prices[b], returns=returns[b]) for b in range(prices.shape[0])]
+    return np.array([r.score for r in results]), np.array([r.total_events for r in results])
+
+
+GRID = {
+    "mean_estimator.params.span": [10, 20],
+    "deviation_detector.params.threshold": [1.0, 1.5, 2.0],
+    "deviation_detector.params.min_absolute_move": [0.0, 0.02],
+    "reversion_criteria.params.z_tolerance": [0.3, 0.6],
+    "failure_criteria.params.max_duration": [5, None],
+}
+
+
+@pytest.mark.parametrize(
+    "engine_kwargs",
+    [
+        {},
+        {"allow_overlapping_events": True, "max_active_events": 3},
+        {"freeze_mean_on_event": True},  # event-dependent estimators: engine fallback
+    ],
+)
+def test_sweep_matches_engine_per_point(engine_kwargs):
+    prices = _series(6, 220)
+    base = build_config(**engine_kwargs)
+    progress = []
+
+    result = run_sweep(
+        base_config=base,
+        grid=GRID,
+        prices=prices,
+        jobs=[f"r{b}" for b in range(6)],
+        block_rows=30,
+        on_progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert len(result.points) == 48
+    assert result.scores.shape == result.total_events.shape == (48, 6)
+    assert progress[-1] == (48, 48)
+    assert result.total_events.sum() > 0
+    for i, point in enumerate(result.points):
+        scores, events = _reference(point.config, prices)
+        assert np.array_equal(result.scores[i], scores, equal_nan=True), point.overrides
+        assert np.array_equal(result.total_events[i], events), point.overrides
+
+    if engine_kwargs.get("freeze_mean_on_event"):
+        assert result.timings["engine"] > 0.0 and result.timings["estimators"] == 0.0
+    else:
+        assert result.timings["engine"] == 0.0 and result.timings["estimators"] > 0.0
+
+
+@pytest.mark.parametrize("metric", ["reversion_rate", "direction", "sharpe"])
+@pytest.mark.parametrize("record_empty_scores", [False, True])
+def test_sweep_count_metrics_match_engine(metric, record_empty_scores):
+    prices = _series(5, 120, seed=3)
+    base = build_config(scoring={"score_metric": metric, "record_empty_scores": record_empty_scores})
+    grid = {
+        "deviation_detector.params.threshold": [1.0, 2.5, 6.0],  # 6.0: series without events
+        "reversion_criteria.params.z_tolerance": [0.3, 0.8],
+    }
+
+    result = run_sweep(base_config=base, grid=grid, prices=prices)
+
+    assert (result.total_events == 0).any()
+    for i, point in enumerate(result.points):
+        scores, events = _reference(point.config, prices)
+        assert np.array_equal(result.scores[i], scores, equal_nan=True), point.overrides
+        assert np.array_equal(result.total_events[i], events), point.overrides
+
+
+def test_records_flatten_the_score_table():
+    result = run_sweep(
+        base_config=build_config(),
+        grid={"deviation_detector.params.threshold": [1.0, 2.0]},
+        prices=_series(2, 80),
+        jobs=["a", "b"],
+    )
+    rows = result.records()
+    assert [(r["deviation_detector.params.threshold"], r["job"]) for r in rows] == [
+        (1.0, "a"),
+        (1.0, "b"),
+        (2.0, "a"),
+        (2.0, "b"),
+    ]
+    assert rows[3]["score"] == result.scores[1, 1] or np.isnan(rows[3]["score"])
+
+
+def test_expand_grid_validates_paths_and_values():
+    base = build_config()
+    with pytest.raises(ValueError, match="Unknown config field"):
+        expand_grid(base, {"deviation_detector.params.thresh": [1.0]})
+    with pytest.raises(ValueError, match="no values"):
+        expand_grid(base, {"deviation_detector.params.threshold": []})
+    with pytest.raises(ConfigValidationError):
+        expand_grid(base, {"deviation_detector.params.threshold": [-1.0]})
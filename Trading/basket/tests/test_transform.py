@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from mrscore.components._recursion import linear_recursion
+from mrscore.components.mean import EMA, KalmanMean, RollingSMA
+from mrscore.components.volatility import EWMAVol, GARCH11Vol, RollingStd
+
+
+def _prices(B: int, T: int, seed: int = 5) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.exp(np.cumsum(rng.normal(0.0, 0.01, size=(B, T)), axis=1))
+
+
+def _returns(B: int, T: int, seed: int = 5) -> np.ndarray:
+    p = _prices(B, T + 1, seed)
+    return np.log(p[:, 1:]) - np.log(p[:, :-1])
+
+
+ESTIMATORS = {
+    "rolling_sma": (lambda: RollingSMA(window=20), _prices),
+    "ema": (lambda: EMA(span=15, min_periods=5), _prices),
+    "ema_span1": (lambda: EMA(span=1, min_periods=3), _prices),
+    "kalman_mean": (
+        lambda: KalmanMean(process_var=0.001, obs_var=0.05, init_mean=1.0, init_var=1.0, min_periods=5),
+        _prices,
+    ),
+    "rolling_std": (lambda: RollingStd(window=20, min_periods=5, ddof=1, min_volatility=0.0005), _returns),
+    "rolling_std_ddof0": (lambda: RollingStd(window=7, min_periods=1, ddof=0), _returns),
+    "ewma": (lambda: EWMAVol(span=20, min_periods=5, min_volatility=0.0005), _returns),
+    "garch11": (lambda: GARCH11Vol(omega=1.0e-6, alpha=0.08, beta=0.9, min_volatility=0.0005), _returns),
+    # floor above the unconditional variance: binds on most bars
+    "garch11_floored": (lambda: GARCH11Vol(omega=1.0e-6, alpha=0.08, beta=0.9, min_volatility=0.012), _returns),
+}
+
+
+def _streamed(estimator, series: np.ndarray) -> np.ndarray:
+    out = np.empty_like(series)
+    for b in range(series.shape[0]):
+        estimator.reset()
+        for t, x in enumerate(series[b]):
+            out[b, t] = estimator.update(float(x))
+    return out
+
+
+@pytest.mark.parametrize("name", sorted(ESTIMATORS))
+@pytest.mark.parametrize("T", [0, 3, 400])
+def test_transform_matches_repeated_update(name, T):
+    make, data = ESTIMATORS[name]
+    series = data(4, T)
+    estimator = make()
+    expected = _streamed(make(), series)
+
+    estimator.update(123.0)  # streaming state is left alone
+    state = estimator.value
+    out = estimator.transform(series)
+
+    assert out.shape == series.shape
+    assert np.allclose(out, expected, rtol=1e-10, atol=1e-15)
+    assert np.array_equal(estimator.transform(series[2]), out[2])
+    assert estimator.value == state
+
+
+def test_transform_propagates_nan_like_update():
+    series = _prices(1, 60)
+    series[0, 30] = np.nan
+    for make, _ in ESTIMATORS.values():
+        out = make().transform(series)
+        expected = _streamed(make(), series)
+        assert np.array_equal(np.isnan(out), np.isnan(expected))
+
+
+def test_linear_recursion_time_varying_coefficients():
+    rng = np.random.default_rng(1)
+    a = rng.uniform(0.0, 1.0, size=500)
+    a[[10, 200]] = 0.0
+    b = rng.normal(size=(3, 500))
+    expected = np.empty_like(b)
+    prev = np.array([1.0, -2.0, 0.5])
+    for t in range(500):
+        prev = a[t] * prev + b[:, t]
+        expected[:, t] = prev
+
+    assert np.allclose(linear_recursion(a, b, [1.0, -2.0, 0.5]), expected, rtol=1e-10, atol=1e-12)
+    assert np.allclose(linear_recursion(np.full(500, 0.999), b, 0.0)[:, -1], linear_recursion(0.999, b, 0.0)[:, -1])
+
+
+@pytest.mark.parametrize("make", [lambda: RollingSMA(window=20), lambda: RollingStd(window=20, min_periods=2, ddof=1)])
+def test_window_transforms_stay_accurate_on_long_high_level_series(make):
+    # 200k bars around 1000: rounding of whole-series running totals would grow
+    # to ~1e-5 relative here; per-window sums keep transform at the exact value.
+    rng = np.random.default_rng(11)
+    x = 1000.0 + np.cumsum(rng.normal(0.0, 1.0, size=200_000))
+    windows = np.lib.stride_tricks.sliding_window_view(x, 20)
+    exact = windows.mean(axis=-1) if isinstance(make(), RollingSMA) else windows.std(axis=-1, ddof=1)
+
+    out = make().transform(x)
+    assert np.allclose(out[19:], exact, rtol=1e-8, atol=0.0)
+    # the streaming estimator carries one running sum over the whole series: agreement
+    # is limited by its own drift, still orders of magnitude inside the old cumsum error
+    assert np.allclose(out, _streamed(make(), x[None, :])[0], rtol=1e-6, atol=0.0)
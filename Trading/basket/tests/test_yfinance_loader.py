@@ -1,10 +1,14 @@
+import threading
+import time
+import types
 import unittest
+from tempfile import TemporaryDirectory
 from unittest import mock
 
 import numpy as np
 
 from mrscore.io.history import History
-from mrscore.io.yfinance_loader import YFinanceLoadRequest, YFinanceLoader, _history_from_single_df
+from mrscore.io.yfinance_loader import YFinanceLoadRequest, YFinanceLoader, _TokenBucket, _history_from_single_df
 
 
 class _FakeSeries:
@@ -38,6 +42,58 @@ class _FakeDF:
         return _FakeSeries(self._data[key])
 
 
+def _ohlc_df(n: int = 3, start: float = 1.0) -> _FakeDF:
+    dates = np.arange(n).astype("datetime64[D]")
+    close = np.arange(n, dtype=np.float64) + start
+    return _FakeDF(
+        columns=["Open", "High", "Low", "Close"],
+        index=_FakeIndex(dates),
+        data={"Open": close, "High": close, "Low": close, "Close": close},
+    )
+
+
+def _fake_yf_module(*, latency, failures=None, empties=None):
+    """
+    A stand-in `yfinance` module whose Ticker.history sleeps `latency(ticker)` seconds.
+    The first failures[ticker] calls raise, the next empties[ticker] return an empty frame.
+    """
+    failures = dict(failures or {})
+    empties = dict(empties or {})
+    lock = threading.Lock()
+    module = types.ModuleType("yfinance")
+    module.calls = []
+    module.active = 0
+    module.max_active = 0
+
+    class Ticker:
+        def __init__(self, ticker):
+            self.ticker = ticker
+
+        def history(self, **kwargs):
+            with lock:
+                module.calls.append(self.ticker)
+                module.active += 1
+                module.max_active = max(module.max_active, module.active)
+            try:
+                delay = latency(self.ticker)
+                if delay > 0:
+                    time.sleep(delay)
+                with lock:
+                    if failures.get(self.ticker, 0) > 0:
+                        failures[self.ticker] -= 1
+                        raise ConnectionError(f"transient failure for {self.ticker}")
+                    if empties.get(self.ticker, 0) > 0:
+                        empties[self.ticker] -= 1
+                        return _FakeDF(columns=[], index=_FakeIndex([]), data={}, empty=True)
+                return _ohlc_df(start=float(len(self.ticker)))
+            finally:
+                with lock:
+                    module.active -= 1
+
+    module.Ticker = Ticker
+    return module
+
+
 class TestYFinanceLoader(unittest.TestCase):
     def test_history_from_single_df_builds_fields(self) -> None:
         # Helper: converts a single-ticker dataframe into a History with OHLC arrays.
@@ -126,3 +182,100 @@ class TestYFinanceLoader(unittest.TestCase):
         with mock.patch.dict("sys.modules", {"yfinance": fake_yf}):
             with self.assertRaises(RuntimeError):
                 loader.load(req)
+
+
+class TestConcurrentYFinanceLoader(unittest.TestCase):
+    tickers = [f"T{i:02d}" for i in range(12)]
+
+    def _load(self, fake_yf, **kwargs):
+        with mock.patch.dict("sys.modules", {"yfinance": fake_yf}):
+            return YFinanceLoader().load(YFinanceLoadRequest(tickers=self.tickers, **kwargs))
+
+    def test_wall_time_scales_with_workers(self) -> None:
+        timings = {}
+        for workers in (1, 4):
+            fake_yf = _fake_yf_module(latency=lambda t: 0.05)
+            t0 = time.perf_counter()
+            out = self._load(fake_yf, max_workers=workers)
+            timings[workers] = time.perf_counter() - t0
+            self.assertEqual(len(out), len(self.tickers))
+            self.assertLessEqual(fake_yf.max_active, workers)
+
+        self.assertGreaterEqual(timings[1], 12 * 0.05)
+        self.assertLess(timings[4], timings[1] / 2)
+
+    def test_result_order_is_deterministic(self) -> None:
+        # later tickers finish first
+        fake_yf = _fake_yf_module(latency=lambda t: 0.04 - 0.003 * int(t[1:]))
+        out = self._load(fake_yf, max_workers=6)
+        self.assertEqual(list(out), self.tickers)
+
+    def test_retries_with_backoff_then_succeeds(self) -> None:
+        fake_yf = _fake_yf_module(latency=lambda t: 0.0, failures={"T03": 2})
+        with mock.patch("mrscore.io.yfinance_loader.time.sleep") as sleep:
+            out = self._load(fake_yf, max_workers=3, max_retries=2, retry_backoff_s=0.5)
+        self.assertEqual(fake_yf.calls.count("T03"), 3)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.5, 1.0])
+        self.assertEqual(list(out), self.tickers)
+
+        fake_yf = _fake_yf_module(latency=lambda t: 0.0, failures={"T03": 2})
+        with self.assertRaisesRegex(RuntimeError, "T03"):
+            self._load(fake_yf, max_workers=3, max_retries=1, retry_backoff_s=0.0)
+
+    def test_empty_download_is_retried(self) -> None:
+        fake_yf = _fake_yf_module(latency=lambda t: 0.0, empties={"T05": 1})
+        with mock.patch("mrscore.io.yfinance_loader.time.sleep"):
+            out = self._load(fake_yf, max_workers=3, max_retries=1)
+        self.assertEqual(fake_yf.calls.count("T05"), 2)
+        self.assertEqual(list(out), self.tickers)
+
+    def test_failed_ticker_keeps_finished_downloads_cached(self) -> None:
+        for workers in (1, 4):
+            with TemporaryDirectory() as tmp_dir:
+                # T06 fails fast; the other workers' in-flight downloads still land in the cache
+                fake_yf = _fake_yf_module(latency=lambda t: 0.0 if t == "T06" else 0.02, failures={"T06": 1})
+                with self.assertRaisesRegex(RuntimeError, "T06"):
+                    self._load(fake_yf, max_workers=workers, cache_enabled=True, cache_path=tmp_dir)
+                downloaded = set(fake_yf.calls) - {"T06"}
+                self.assertTrue(downloaded)
+
+                retry_yf = _fake_yf_module(latency=lambda t: 0.0)
+                out = self._load(retry_yf, max_workers=workers, cache_enabled=True, cache_path=tmp_dir)
+                self.assertEqual(list(out), self.tickers)
+                self.assertEqual(set(retry_yf.calls), set(self.tickers) - downloaded)
+
+    def test_cache_hits_skip_the_download_pool(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            first = self._load(_fake_yf_module(latency=lambda t: 0.0), cache_enabled=True, cache_path=tmp_dir)
+            fake_yf = _fake_yf_module(latency=lambda t: 0.0)
+            with mock.patch("mrscore.io.yfinance_loader.ThreadPoolExecutor") as pool:
+                second = self._load(fake_yf, max_workers=4, cache_enabled=True, cache_path=tmp_dir)
+
+        pool.assert_not_called()
+        self.assertEqual(fake_yf.calls, [])
+        self.assertEqual(list(second), self.tickers)
+        self.assertTrue(all(np.array_equal(first[t].close, second[t].close) for t in self.tickers))
+
+    def test_rate_limit_caps_request_rate(self) -> None:
+        fake_yf = _fake_yf_module(latency=lambda t: 0.0)
+        t0 = time.perf_counter()
+        self._load(fake_yf, max_workers=4, rate_limit_per_s=40.0, rate_burst=2)
+        # 2 burst tokens, then 10 more at 40/s
+        self.assertGreaterEqual(time.perf_counter() - t0, 10 / 40.0 * 0.9)
+
+
+def test_token_bucket_refills_at_rate():
+    now = [0.0]
+    slept = []
+
+    def sleep(dt):
+        slept.append(dt)
+        now[0] += dt
+
+    bucket = _TokenBucket(2.0, 3, clock=lambda: now[0], sleep=sleep)
+    for _ in range(5):
+        bucket.acquire()
+
+    # 3 burst tokens are free, then one token every 0.5s
+    assert slept == [0.5, 0.5]
+    assert now[0] == 1.0